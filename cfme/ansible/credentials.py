@@ -495,6 +495,7 @@ class CredentialsCollection(BaseCollection):
 @navigator.register(Server)
 class AnsibleCredentials(CFMENavigateStep):
     VIEW = CredentialsListView
+    URL_CACHEABLE = True
     prerequisite = NavigateToSibling("LoggedIn")
 
     def step(self, *args, **kwargs):
@@ -106,6 +106,7 @@ class PlaybooksCollection(BaseCollection):
 @navigator.register(Server)
 class AnsiblePlaybooks(CFMENavigateStep):
     VIEW = PlaybooksView
+    URL_CACHEABLE = True
     prerequisite = NavigateToSibling("LoggedIn")
 
     def step(self, *args, **kwargs):
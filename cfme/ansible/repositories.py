@@ -327,6 +327,7 @@ class RepositoryCollection(BaseCollection):
 @navigator.register(RepositoryCollection, 'All')
 class AnsibleRepositories(CFMENavigateStep):
     VIEW = RepositoryAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -64,6 +64,7 @@ class TowerJobsCollection(BaseCollection):
 @navigator.register(TowerJobsCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = TowerJobsDefaultView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
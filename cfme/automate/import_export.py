@@ -267,6 +267,7 @@ class AutomateImportExportsCollection(BaseCollection):
 @navigator.register(AutomateImportExportsCollection, "All")
 class AutomateImportExport(CFMENavigateStep):
     VIEW = AutomateImportExportView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute("appliance.server", "LoggedIn")
 
     def step(self, *args, **kwargs):
@@ -188,6 +188,7 @@ class AvailabilityZoneCollection(BaseCollection):
 @navigator.register(AvailabilityZoneCollection, 'All')
 class AvailabilityZoneAll(CFMENavigateStep):
     VIEW = AvailabilityZoneAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -260,6 +260,7 @@ class FlavorCollection(BaseCollection, TaggableCollection):
 @navigator.register(FlavorCollection, 'All')
 class FlavorAll(CFMENavigateStep):
     VIEW = FlavorAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -164,6 +164,7 @@ class HostAggregatesCollection(BaseCollection, TaggableCollection):
 @navigator.register(HostAggregatesCollection, 'All')
 class HostAggregatesAll(CFMENavigateStep):
     VIEW = HostAggregatesAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -268,6 +268,7 @@ class KeyPairCollection(BaseCollection):
 @navigator.register(KeyPairCollection, 'All')
 class CloudKeyPairs(CFMENavigateStep):
     VIEW = KeyPairAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -235,6 +235,7 @@ class CloudProviderCollection(BaseCollection):
 @navigator.register(CloudProviderCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = CloudProvidersView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
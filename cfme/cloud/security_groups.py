@@ -215,6 +215,7 @@ class SecurityGroupCollection(BaseCollection):
 @navigator.register(SecurityGroupCollection, 'All')
 class SecurityGroupAll(CFMENavigateStep):
     VIEW = SecurityGroupAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
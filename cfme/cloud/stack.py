@@ -354,6 +354,7 @@ class StackCollection(BaseCollection):
 @navigator.register(StackCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = StackAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -390,6 +390,7 @@ class TenantCollection(BaseCollection):
 @navigator.register(TenantCollection, 'All')
 class TenantAll(CFMENavigateStep):
     VIEW = TenantAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
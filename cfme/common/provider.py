@@ -1,9 +1,12 @@
 import datetime
 from collections import defaultdict
 from collections.abc import Iterable
+from contextlib import contextmanager
 
 import attr
 from manageiq_client.api import APIException
+from sqlalchemy import bindparam
+from sqlalchemy import text
 from widgetastic.widget import Text
 from widgetastic.widget import View
 from widgetastic_patternfly import Button
@@ -40,6 +43,92 @@ from cfme.utils.wait import wait_for
 _base_types_cache = {}
 _provider_types_cache = defaultdict(dict)
 _all_types_cache = {}
+_inventory_snapshots = {}
+
+#: ``stat: query`` of the inventory counted by :py:func:`inventory_snapshot`, each query returns
+#: ``ems_id, count`` rows of the providers whose ids match ``{ems}``
+INVENTORY_COUNTS = {
+    'num_vm': (
+        'SELECT ems_id, count(*) FROM vms WHERE template = false AND ems_id {ems} '
+        'GROUP BY ems_id'),
+    'num_template': (
+        'SELECT ems_id, count(*) FROM vms WHERE template = true AND ems_id {ems} '
+        'GROUP BY ems_id'),
+    'num_host': 'SELECT ems_id, count(*) FROM hosts WHERE ems_id {ems} GROUP BY ems_id',
+    'num_cluster': 'SELECT ems_id, count(*) FROM ems_clusters WHERE ems_id {ems} GROUP BY ems_id',
+    'num_datastore': (
+        'SELECT hosts.ems_id, count(DISTINCT storages.name) FROM hosts '
+        'JOIN host_storages ON host_storages.host_id = hosts.id '
+        'JOIN storages ON storages.id = host_storages.storage_id '
+        'WHERE hosts.ems_id {ems} GROUP BY hosts.ems_id'),
+}
+
+#: attributes of the REST API detail lookups of vms and templates
+VM_DETAILS = ('id', 'ems_id', 'name', 'type', 'vendor', 'host_id', 'power_state')
+TEMPLATE_DETAILS = ('name', 'type', 'guid')
+
+
+@contextmanager
+def shared_inventory_snapshot(appliance):
+    """Within the block, :py:func:`inventory_snapshot` of all providers queries the appliance once
+
+    So that matching several stats costs one query. Nested blocks share the snapshot of the
+    outermost one.
+    """
+    if appliance.hostname in _inventory_snapshots:
+        yield
+        return
+    _inventory_snapshots[appliance.hostname] = None
+    try:
+        yield
+    finally:
+        del _inventory_snapshots[appliance.hostname]
+
+
+def inventory_snapshot(appliance, provider_names=None):
+    """Counts of :py:data:`INVENTORY_COUNTS` per provider, in a single query
+
+    Always queries the appliance, except for all providers within a
+    :py:func:`shared_inventory_snapshot` block.
+
+    Args:
+        appliance: appliance to query the database of
+        provider_names: names of the providers to count for, all providers if not given
+    Returns:
+        ``{provider name: {stat: count}}``, every stat present for every provider
+    """
+    shared = provider_names is None and appliance.hostname in _inventory_snapshots
+    if shared and _inventory_snapshots[appliance.hostname] is not None:
+        return _inventory_snapshots[appliance.hostname]
+
+    if provider_names is None:
+        ems = 'IS NOT NULL'
+    else:
+        # counted only for these providers, not for all of them and then filtered
+        ems = 'IN (SELECT id FROM ext_management_systems WHERE name IN :names)'
+    counts = ' UNION ALL '.join(
+        "SELECT '{}' AS stat, c.* FROM ({}) c".format(stat, query.format(ems=ems))
+        for stat, query in INVENTORY_COUNTS.items())
+    query = (
+        'SELECT ems.name, counts.stat, counts.count '
+        'FROM ext_management_systems ems '
+        'LEFT JOIN ({}) counts (stat, ems_id, count) ON counts.ems_id = ems.id'.format(counts))
+    params = {}
+    if provider_names is not None:
+        query = text(query + ' WHERE ems.name IN :names').bindparams(
+            bindparam('names', expanding=True))
+        params['names'] = list(provider_names)
+    else:
+        query = text(query)
+
+    snapshot = {}
+    for name, stat, count in appliance.db.client.engine.execute(query, **params):
+        provider_counts = snapshot.setdefault(name, dict.fromkeys(INVENTORY_COUNTS, 0))
+        if stat is not None:
+            provider_counts[stat] = int(count)
+    if shared:
+        _inventory_snapshots[appliance.hostname] = snapshot
+    return snapshot
 
 
 # TODO: Move to collection when it happens
@@ -783,12 +872,26 @@ class BaseProvider(Taggable, Updateable, Navigatable, BaseEntity, CustomButtonEv
             table_str: Name of the table; e.g. 'vms' or 'hosts'
         """
         res = self.appliance.db.client.engine.execute(
-            "SELECT count(*) "
-            "FROM ext_management_systems, {0} "
-            "WHERE {0}.ems_id=ext_management_systems.id "
-            "AND ext_management_systems.name='{1}'".format(table_str, self.name))
+            text(
+                "SELECT count(*) "
+                "FROM ext_management_systems, {0} "
+                "WHERE {0}.ems_id=ext_management_systems.id "
+                "AND ext_management_systems.name=:name".format(table_str)),
+            name=self.name)
         return int(res.first()[0])
 
+    def inventory_counts(self):
+        """Counts of :py:data:`INVENTORY_COUNTS` of this provider, see :py:func:`inventory_snapshot`
+
+        Counts only this provider, unless within a :py:func:`shared_inventory_snapshot` block.
+        A provider that's not in the database has all counts 0.
+        """
+        if self.appliance.hostname in _inventory_snapshots:
+            snapshot = inventory_snapshot(self.appliance)
+        else:
+            snapshot = inventory_snapshot(self.appliance, provider_names=[self.name])
+        return snapshot.get(self.name, dict.fromkeys(INVENTORY_COUNTS, 0))
+
     def _do_stats_match(self, client, stats_to_match=None, refresh_timer=None, ui=False):
         """ A private function to match a set of statistics, with a Provider.
 
@@ -817,24 +920,28 @@ class BaseProvider(Taggable, Updateable, Navigatable, BaseEntity, CustomButtonEv
                 self.refresh_provider_relationships()
                 refresh_timer.reset()
 
-        for stat in stats_to_match:
-            try:
-                cfme_stat = getattr(self, stat)(method=method)
-                success, value = tol_check(host_stats[stat],
-                                           cfme_stat,
-                                           min_error=0.05,
-                                           low_val_correction=2)
-                logger.info(' Matching stat [%s], Host(%s), CFME(%s), '
-                    'with tolerance %s is %s', stat, host_stats[stat], cfme_stat, value, success)
-                if not success:
-                    return False
-            except KeyError:
-                raise HostStatsNotContains(
-                    "Host stats information does not contain '{}'".format(stat))
-            except AttributeError:
-                raise ProviderHasNoProperty("Provider does not know how to get '{}'".format(stat))
-        else:
-            return True
+        # one snapshot for all the stats matched from the db
+        with shared_inventory_snapshot(self.appliance):
+            for stat in stats_to_match:
+                try:
+                    cfme_stat = getattr(self, stat)(method=method)
+                    success, value = tol_check(host_stats[stat],
+                                               cfme_stat,
+                                               min_error=0.05,
+                                               low_val_correction=2)
+                    logger.info(' Matching stat [%s], Host(%s), CFME(%s), '
+                        'with tolerance %s is %s', stat, host_stats[stat], cfme_stat, value,
+                        success)
+                    if not success:
+                        return False
+                except KeyError:
+                    raise HostStatsNotContains(
+                        "Host stats information does not contain '{}'".format(stat))
+                except AttributeError:
+                    raise ProviderHasNoProperty(
+                        "Provider does not know how to get '{}'".format(stat))
+            else:
+                return True
 
     @property
     def exists(self):
@@ -963,21 +1070,42 @@ class BaseProvider(Taggable, Updateable, Navigatable, BaseEntity, CustomButtonEv
     def get_console_type_name(self):
         raise NotImplementedError("This method is not implemented for given provider")
 
+    def _iter_rest_resources(self, collection_name, attributes=None):
+        rest_api = self.appliance.rest_api
+        return rest_api.iter_resources(
+            getattr(rest_api.collections, collection_name), attributes=attributes)
+
+    def _get_rest_ids(self, collection_name):
+        try:
+            return [
+                resource['id']
+                for resource in self._iter_rest_resources(collection_name, attributes=['id'])]
+        except APIException:
+            return None
+
+    def _get_rest_details(self, collection_name, ids, attributes):
+        rest_api = self.appliance.rest_api
+        try:
+            resources = rest_api.get_resources(
+                getattr(rest_api.collections, collection_name), ids, attributes=attributes)
+        except APIException:
+            return None
+        return {
+            resource_id: {attribute: resource.get(attribute) for attribute in attributes}
+            for resource_id, resource in resources.items()}
+
     def get_all_provider_ids(self):
         """
         Returns an integer list of provider ID's via the REST API
         """
         # TODO: Move to ProviderCollection
         logger.debug('Retrieving the list of provider ids')
+        return self._get_rest_ids('providers')
 
-        provider_ids = []
-        try:
-            for prov in self.appliance.rest_api.collections.providers.all:
-                provider_ids.append(prov.id)
-        except APIException:
-            return None
-
-        return provider_ids
+    def iter_vm_ids(self):
+        """Yields the ID's of all vms via the REST API, a page at a time"""
+        for vm in self._iter_rest_resources('vms', attributes=['id']):
+            yield vm['id']
 
     def get_all_vm_ids(self):
         """
@@ -985,15 +1113,12 @@ class BaseProvider(Taggable, Updateable, Navigatable, BaseEntity, CustomButtonEv
         """
         # TODO: Move to VMCollection or BaseVMCollection
         logger.debug('Retrieving the list of vm ids')
+        return self._get_rest_ids('vms')
 
-        vm_ids = []
-        try:
-            for vm in self.appliance.rest_api.collections.vms.all:
-                vm_ids.append(vm.id)
-        except APIException:
-            return None
-
-        return vm_ids
+    def iter_host_ids(self):
+        """Yields the ID's of all hosts via the REST API, a page at a time"""
+        for host in self._iter_rest_resources('hosts', attributes=['id']):
+            yield host['id']
 
     def get_all_host_ids(self):
         """
@@ -1001,27 +1126,18 @@ class BaseProvider(Taggable, Updateable, Navigatable, BaseEntity, CustomButtonEv
         """
         # TODO: Move to HostCollection
         logger.debug('Retrieving the list of host ids')
+        return self._get_rest_ids('hosts')
 
-        host_ids = []
-        try:
-            for host in self.appliance.rest_api.collections.hosts.all:
-                host_ids.append(host.id)
-        except APIException:
-            return None
-        return host_ids
+    def iter_template_ids(self):
+        """Yields the ID's of all templates via the REST API, a page at a time"""
+        for template in self._iter_rest_resources('templates', attributes=['id']):
+            yield template['id']
 
     def get_all_template_ids(self):
         """Returns an integer list of template ID's via the Rest API"""
         # TODO: Move to TemplateCollection
         logger.debug('Retrieving the list of template ids')
-
-        template_ids = []
-        try:
-            for template in self.appliance.rest_api.collections.templates.all:
-                template_ids.append(template.id)
-        except APIException:
-            return None
-        return template_ids
+        return self._get_rest_ids('templates')
 
     def get_provider_details(self, provider_id):
         """Returns the name, and type associated with the provider_id"""
@@ -1062,6 +1178,16 @@ class BaseProvider(Taggable, Updateable, Navigatable, BaseEntity, CustomButtonEv
         details['power_state'] = vm.power_state
         return details
 
+    def get_vms_details(self, vm_ids):
+        """
+        Returns a dictionary mapping the vm_ids to the details :py:meth:`get_vm_details` returns,
+        looked up a hundred at a time. Ids of vms that don't exist are left out.
+        """
+        # TODO: Move to VMCollection.find
+        vm_ids = list(vm_ids)
+        logger.debug('Retrieving the VM details for {} ID(s)'.format(len(vm_ids)))
+        return self._get_rest_details('vms', vm_ids, VM_DETAILS)
+
     def get_template_details(self, template_id):
         """
         Returns the name, type, and guid associated with the template_id
@@ -1081,14 +1207,25 @@ class BaseProvider(Taggable, Updateable, Navigatable, BaseEntity, CustomButtonEv
         template_details['guid'] = template.guid
         return template_details
 
+    def get_templates_details(self, template_ids):
+        """
+        Returns a dictionary mapping the template_ids to their name, type, and guid, looked up a
+        hundred at a time. Ids of templates that don't exist are left out.
+        """
+        # TODO: Move to TemplateCollection.find
+        template_ids = list(template_ids)
+        logger.debug('Retrieving the template details for {} ID(s)'.format(len(template_ids)))
+        return self._get_rest_details('templates', template_ids, TEMPLATE_DETAILS)
+
     def get_all_template_details(self):
         """
         Returns a dictionary mapping template ids to their name, type, and guid
         """
         # TODO: Move to TemplateCollection.all
         all_details = {}
-        for id in self.get_all_template_ids():
-            all_details[id] = self.get_template_details(id)
+        for template in self._iter_rest_resources('templates', attributes=TEMPLATE_DETAILS):
+            all_details[template['id']] = {
+                attribute: template.get(attribute) for attribute in TEMPLATE_DETAILS}
         return all_details
 
     def get_vm_id(self, vm_name):
@@ -1097,10 +1234,9 @@ class BaseProvider(Taggable, Updateable, Navigatable, BaseEntity, CustomButtonEv
         """
         # TODO: Get Provider object from VMCollection.find, then use VM.id to get the id
         logger.debug('Retrieving the ID for VM: {}'.format(vm_name))
-        for vm_id in self.get_all_vm_ids():
-            details = self.get_vm_details(vm_id)
-            if details['name'] == vm_name:
-                return vm_id
+        for vm in self._iter_rest_resources('vms', attributes=['name']):
+            if vm.get('name') == vm_name:
+                return vm['id']
 
     def get_vm_ids(self, vm_names):
         """
@@ -1110,13 +1246,15 @@ class BaseProvider(Taggable, Updateable, Navigatable, BaseEntity, CustomButtonEv
         name_list = vm_names[:]
         logger.debug('Retrieving the IDs for {} VM(s)'.format(len(name_list)))
         id_map = {}
-        for vm_id in self.get_all_vm_ids():
-            if not name_list:
-                break
-            vm_name = self.get_vm_details(vm_id)['name']
+        if not name_list:
+            return id_map
+        for vm in self._iter_rest_resources('vms', attributes=['name']):
+            vm_name = vm.get('name')
             if vm_name in name_list:
-                id_map[vm_name] = vm_id
+                id_map[vm_name] = vm['id']
                 name_list.remove(vm_name)
+                if not name_list:
+                    break
         return id_map
 
     def get_template_guids(self, template_dict):
@@ -1172,13 +1310,7 @@ class CloudInfraProviderMixin(object):
     @variable(alias="db")
     def num_template(self):
         """ Returns the providers number of templates, as shown on the Details page."""
-        ext_management_systems = self.appliance.db.client["ext_management_systems"]
-        vms = self.appliance.db.client["vms"]
-        temlist = list(self.appliance.db.client.session.query(vms.name)
-                       .join(ext_management_systems, vms.ems_id == ext_management_systems.id)
-                       .filter(ext_management_systems.name == self.name)
-                       .filter(vms.template == True))  # NOQA
-        return len(temlist)
+        return self.inventory_counts()['num_template']
 
     @num_template.variant('ui')
     def num_template_ui(self):
@@ -1188,13 +1320,7 @@ class CloudInfraProviderMixin(object):
     @variable(alias="db")
     def num_vm(self):
         """ Returns the providers number of instances, as shown on the Details page."""
-        ext_management_systems = self.appliance.db.client["ext_management_systems"]
-        vms = self.appliance.db.client["vms"]
-        vmlist = list(self.appliance.db.client.session.query(vms.name)
-                      .join(ext_management_systems, vms.ems_id == ext_management_systems.id)
-                      .filter(ext_management_systems.name == self.name)
-                      .filter(vms.template == False))  # NOQA
-        return len(vmlist)
+        return self.inventory_counts()['num_vm']
 
     @num_vm.variant('ui')
     def num_vm_ui(self):
@@ -64,6 +64,7 @@ class BuildCollection(BaseCollection):
 @navigator.register(BuildCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = BuildDefaultView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -122,6 +122,7 @@ class ContainerCollection(GetRandomInstancesMixin, BaseCollection, TaggableColle
 @navigator.register(ContainerCollection, 'All')
 class ContainerAll(CFMENavigateStep):
     VIEW = ContainerAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
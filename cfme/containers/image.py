@@ -270,6 +270,7 @@ class ImageCollection(GetRandomInstancesMixin, BaseCollection, PolicyProfileAssi
 @navigator.register(ImageCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = ImageAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -73,6 +73,7 @@ class ImageRegistryCollection(GetRandomInstancesMixin, BaseCollection, TaggableC
 @navigator.register(ImageRegistryCollection, 'All')
 class ImageRegistryAll(CFMENavigateStep):
     VIEW = ImageRegistryAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
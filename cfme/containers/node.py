@@ -106,6 +106,7 @@ class NodeCollection(GetRandomInstancesMixin, BaseCollection, TaggableCollection
 @navigator.register(NodeCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = NodeAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
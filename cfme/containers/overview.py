@@ -24,6 +24,7 @@ class ContainersOverviewView(BaseLoggedInPage):
 @navigator.register(ContainersOverview, 'All')
 class All(CFMENavigateStep):
     VIEW = ContainersOverviewView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -86,6 +86,7 @@ class PodCollection(GetRandomInstancesMixin, BaseCollection, TaggableCollection)
 class All(CFMENavigateStep):
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
     VIEW = PodAllView
+    URL_CACHEABLE = True
 
     def step(self, *args, **kwargs):
         self.prerequisite_view.navigation.select('Compute', 'Containers', 'Pods')
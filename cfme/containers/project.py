@@ -82,6 +82,7 @@ class ProjectCollection(GetRandomInstancesMixin, BaseCollection, TaggableCollect
 class All(CFMENavigateStep):
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
     VIEW = ProjectAllView
+    URL_CACHEABLE = True
 
     def step(self, *args, **kwargs):
         self.prerequisite_view.navigation.select('Compute', 'Containers', 'Projects')
@@ -409,6 +409,7 @@ class ContainersProviderCollection(BaseCollection, TaggableCollection):
 @navigator.register(ContainersProvider, 'All')
 class All(CFMENavigateStep):
     VIEW = ContainerProvidersView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -73,6 +73,7 @@ class ReplicatorCollection(GetRandomInstancesMixin, BaseCollection):
 class All(CFMENavigateStep):
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
     VIEW = ReplicatorAllView
+    URL_CACHEABLE = True
 
     def step(self, *args, **kwargs):
         self.prerequisite_view.navigation.select('Compute', 'Containers', 'Replicators')
@@ -71,6 +71,7 @@ class RouteCollection(GetRandomInstancesMixin, BaseCollection):
 class All(CFMENavigateStep):
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
     VIEW = RouteAllView
+    URL_CACHEABLE = True
 
     def step(self, *args, **kwargs):
         self.prerequisite_view.navigation.select('Compute', 'Containers', 'Routes')
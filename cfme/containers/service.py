@@ -88,6 +88,7 @@ class ServiceCollection(GetRandomInstancesMixin, BaseCollection):
 class All(CFMENavigateStep):
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
     VIEW = ServiceAllView
+    URL_CACHEABLE = True
 
     def step(self, *args, **kwargs):
         self.prerequisite_view.navigation.select('Compute', 'Containers', 'Container Services')
@@ -72,6 +72,7 @@ class TemplateCollection(GetRandomInstancesMixin, BaseCollection, TaggableCollec
 class All(CFMENavigateStep):
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
     VIEW = TemplateAllView
+    URL_CACHEABLE = True
 
     def step(self, *args, **kwargs):
         self.prerequisite_view.navigation.select('Compute', 'Containers', 'Container Templates')
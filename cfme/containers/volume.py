@@ -68,6 +68,7 @@ class VolumeCollection(GetRandomInstancesMixin, BaseCollection):
 class All(CFMENavigateStep):
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
     VIEW = VolumeAllView
+    URL_CACHEABLE = True
 
     def step(self, *args, **kwargs):
         self.prerequisite_view.navigation.select('Compute', 'Containers', 'Volumes')
@@ -60,6 +60,7 @@ class ControlExplorerView(BaseLoggedInPage):
 @navigator.register(Server)
 class ControlExplorer(CFMENavigateStep):
     VIEW = ControlExplorerView
+    URL_CACHEABLE = True
     prerequisite = NavigateToSibling("LoggedIn")
 
     def step(self, *args, **kwargs):
@@ -459,6 +459,7 @@ class AlertCopy(CFMENavigateStep):
 @navigator.register(AlertCollection)
 class MonitorOverview(CFMENavigateStep):
     VIEW = MonitorOverviewView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute("appliance.server", "LoggedIn")
 
     def step(self, *args, **kwargs):
@@ -33,6 +33,7 @@ class ControlImportExportView(BaseLoggedInPage):
 @navigator.register(Server)
 class ControlImportExport(CFMENavigateStep):
     VIEW = ControlImportExportView
+    URL_CACHEABLE = True
     prerequisite = NavigateToSibling("LoggedIn")
 
     def step(self, *args, **kwargs):
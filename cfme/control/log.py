@@ -28,6 +28,7 @@ class ControlLogView(BaseLoggedInPage):
 @navigator.register(Server)
 class ControlLog(CFMENavigateStep):
     VIEW = ControlLogView
+    URL_CACHEABLE = True
     prerequisite = NavigateToSibling("LoggedIn")
 
     def step(self, *args, **kwargs):
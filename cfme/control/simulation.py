@@ -47,6 +47,7 @@ class ControlSimulationView(BaseLoggedInPage):
 @navigator.register(Server)
 class ControlSimulation(CFMENavigateStep):
     VIEW = ControlSimulationView
+    URL_CACHEABLE = True
     prerequisite = NavigateToSibling("LoggedIn")
 
     def step(self, *args, **kwargs):
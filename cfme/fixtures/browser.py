@@ -133,3 +133,14 @@ def pytest_sessionfinish(session, exitstatus):
     if failed_test_tracking['tests']:
         failed_tests_report = failed_tests_template.render(**failed_test_tracking)
         outfile.write(failed_tests_report)
+
+    # Time spent per navigation destination, one file per slave
+    from cfme.fixtures.pytest_store import store
+    from cfme.utils.appliance.implementations.ui import navigation_stats
+    if navigation_stats.calls:
+        stats_file = log_path.join('navigation_stats_{}.csv'.format(store.slaveid or 'master'))
+        with stats_file.open('w') as csv_file:
+            navigation_stats.write_csv(csv_file)
+        for destination, way, calls, seconds, mean in navigation_stats.rows()[:10]:
+            logger.info('navigation %s (%s): %d calls, %.1fs, %.2fs mean',
+                        destination, way, calls, seconds, mean)
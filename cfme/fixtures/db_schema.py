@@ -0,0 +1,43 @@
+"""Prefetch the appliance database schema at the start of the session
+
+With ``--db-schema-prefetch`` all tables and views of the appliance database are reflected in one
+go and pickled to the schema cache of :py:class:`cfme.utils.db.Db`, so that the parallelizer
+slaves and every ``appliance.db.client`` created later load them from disk instead of reflecting
+table by table.
+
+The tables reflected one by one during the session are saved to the schema cache at its end.
+"""
+from cfme.fixtures.pytest_store import store
+from cfme.utils.db import save_schema_caches
+from cfme.utils.log import logger
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('cfme')
+    group.addoption(
+        '--db-schema-prefetch',
+        dest='db_schema_prefetch', action='store_true', default=False,
+        help="Reflect the whole appliance database schema into the schema cache at session start")
+
+
+def pytest_sessionstart(session):
+    if store.parallelizer_role == 'slave':
+        # the master already did it, slaves load the cache
+        return
+    if not session.config.getoption('db_schema_prefetch'):
+        return
+    store.write_line('Prefetching the database schema ...')
+    try:
+        client = store.current_appliance.db.client
+        # only reflects what's not in the cache yet
+        client.reflect_all()
+    except Exception as e:
+        logger.exception('Prefetching the database schema failed')
+        store.write_line('Prefetching the database schema failed: {}'.format(e))
+        return
+    store.write_line('Cached {} tables in {}'.format(
+        len(client.metadata.tables), client.schema_cache_file))
+
+
+def pytest_sessionfinish(session):
+    save_schema_caches()
@@ -11,17 +11,25 @@ The Workflow
 - Slaves each run collection and submit them to the master, then block inside their runtest loop,
   waiting for tests to run
 - Master diffs slave collections against its own; the test ids are verified to match
-  across all nodes
+  across all nodes. With ``--parallel-collection-snapshot``, slaves whose collection matches the
+  snapshot the master stored in the pytest cache only send its key and digest
 - Master enters main runtest loop, uses a generator to build lists of test groups which are then
-  sent to slaves, one group at a time
+  sent to slaves, one group at a time; with ``--parallel-schedule duration`` the groups with the
+  longest historical durations are sent first
 - For each phase of each test, the slave serializes test reports, which are then unserialized on
   the master and handed to the normal pytest reporting hooks, which is able to deal with test
-  reports arriving out of order
+  reports arriving out of order; see :py:mod:`cfme.fixtures.parallelizer.transport` for the
+  available wire formats
 - Before running the last test in a group, the slave will request more tests from the master
 
   - If more tests are received, they are run
   - If no tests are received, the slave will shut down after running its final test
 
+- With ``--parallel-work-stealing``, a slave asks the master to claim each test before it is
+  queued to run; when the master has no tests left to send, an idle slave is given queued tests
+  that another slave has not yet claimed, and the master answers that slave's claim with
+  ``stolen`` so no test runs twice
+
 - After all slaves are shut down, the master will do its end-of-session reporting as usual, and
   shut down
 
@@ -50,6 +58,11 @@ from deepdiff import DeepDiff
 
 from cfme.fixtures import terminalreporter
 from cfme.fixtures.parallelizer import remote
+from cfme.fixtures.parallelizer.collection import CollectionSnapshot
+from cfme.fixtures.parallelizer.durations import DurationHistory
+from cfme.fixtures.parallelizer.transport import CODECS
+from cfme.fixtures.parallelizer.transport import get_codec
+from cfme.fixtures.parallelizer.transport import MasterTransport
 from cfme.fixtures.pytest_store import store
 from cfme.test_framework.appliance import PLUGIN_KEY as APPLIANCE_PLUGIN
 from cfme.utils import at_exit
@@ -65,6 +78,28 @@ if not conf.runtime['env'].get('ts'):
     conf.runtime['env']['ts'] = ts
 
 
+def pytest_addoption(parser):
+    group = parser.getgroup('cfme')
+    group.addoption('--parallel-schedule', dest='parallel_schedule', default='collection',
+                    choices=('collection', 'duration'),
+                    help='How the parallelizer master orders test groups sent to slaves. '
+                         '"collection" sends them in collection order, "duration" sends the '
+                         'longest groups first based on durations recorded in previous runs')
+    group.addoption('--parallel-work-stealing', dest='parallel_work_stealing',
+                    action='store_true', default=False,
+                    help='Let idle parallelizer slaves take over tests queued, but not yet '
+                         'started, on other slaves')
+    group.addoption('--parallel-transport', dest='parallel_transport', default='json',
+                    choices=sorted(CODECS),
+                    help='Wire format between parallelizer slaves and the master. "json" is a '
+                         'lock-step request/reply per event, "msgpack" streams events with '
+                         'batched acknowledgements')
+    group.addoption('--parallel-collection-snapshot', dest='parallel_collection_snapshot',
+                    action='store_true', default=False,
+                    help='Store the master collection in the pytest cache, so slaves with a '
+                         'matching collection only report its digest instead of every node id')
+
+
 def pytest_addhooks(pluginmanager):
     from cfme.fixtures.parallelizer import hooks
     pluginmanager.add_hookspecs(hooks)
@@ -103,6 +138,12 @@ def handle_end_session(signal, frame):
 signal.signal(signal.SIGQUIT, handle_end_session)
 
 
+def _test_group_key(nodeid):
+    # tests of the same module with the same parametrized id, as grouped by _modscope_id_splitter
+    parametrized_id = nodeid.split('[')[1].rstrip(']') if '[' in nodeid else 'no params'
+    return nodeid.split('::')[0], parametrized_id
+
+
 @attr.s(hash=False)
 class SlaveDetail(object):
 
@@ -114,6 +155,9 @@ class SlaveDetail(object):
                  repr=lambda value: value.decode('utf-8'))
     forbid_restart = attr.ib(default=False, init=False)
     tests = attr.ib(default=attr.Factory(set), repr=False)
+    # tests in the order they were sent, and the ones the slave has claimed to run
+    queue = attr.ib(default=attr.Factory(list), repr=False)
+    started = attr.ib(default=attr.Factory(set), repr=False)
     process = attr.ib(default=None, repr=False)
 
     provider_allocation = attr.ib(default=attr.Factory(list), repr=False)
@@ -148,6 +192,7 @@ class ParallelSession(object):
         self.countfailures = 0
         self.collection = []
         self.serial_collection = []  # tests that must run on a single appliance
+        self.collection_snapshot = None
         self.sent_tests = 0
         self.log = create_sublogger('master')
         self.maxfail = config.getvalue("maxfail")
@@ -156,6 +201,10 @@ class ParallelSession(object):
         self.trdist = None
         self.slaves = {}
         self.test_groups = self._test_item_generator()
+        if config.getoption('parallel_schedule') == 'duration':
+            self.durations = DurationHistory.from_cache(config.cache)
+        else:
+            self.durations = None
 
         self._pool = []
 
@@ -169,6 +218,8 @@ class ParallelSession(object):
         self.failed_slave_test_groups = deque()
         self.slave_spawn_count = 0
         self.appliances = appliances
+        # the slaves key the collection snapshot with the same version, not their appliance's
+        self.collection_version = str(version)
 
         # set up the ipc socket
 
@@ -176,6 +227,8 @@ class ParallelSession(object):
         self.zmq_ctx = zmq.Context.instance()
         self.sock = self.zmq_ctx.socket(zmq.ROUTER)
         self.sock.bind(zmq_endpoint)
+        self.transport = MasterTransport(
+            self.sock, get_codec(config.getoption('parallel_transport')))
 
         # clean out old slave config if it exists
         self.worker_config = {
@@ -185,7 +238,8 @@ class ParallelSession(object):
                 use_sprout=False,   # Slaves don't use sprout
             ),
             'zmq_endpoint': zmq_endpoint,
-            'appliance_data': getattr(self, "slave_appliances_data", {})
+            'appliance_data': getattr(self, "slave_appliances_data", {}),
+            'collection_version': self.collection_version,
         }
 
         for appliance in self.appliances:
@@ -211,6 +265,8 @@ class ParallelSession(object):
                     msg = f'{slave.id} killed due to error, respawning'
                 else:
                     msg = f'{slave.id} terminated unexpectedly with status {returncode}, respawning'
+                slave.queue, slave.started = [], set()
+                self.transport.forget(slave.id)
                 if slave.tests:
                     failed_tests, slave.tests = slave.tests, set()
                     num_failed_tests = len(failed_tests)
@@ -239,21 +295,17 @@ class ParallelSession(object):
     def send(self, slave, event_data):
         """Send data to slave.
 
-        ``event_data`` will be serialized as JSON, and so must be JSON serializable
+        ``event_data`` will be serialized with the session's transport codec, and so must be JSON
+        serializable
 
         """
-        event_json = json.dumps(event_data)
-        if not isinstance(event_json, bytes):
-            event_json = event_json.encode('utf-8')
-        self.sock.send_multipart([slave.id, b'', event_json])
+        self.transport.send(slave.id, event_data)
 
     def recv(self):
         # poll the zmq socket, populate the recv queue deque with responses
-        events = zmq.zmq_poll([(self.sock, zmq.POLLIN)], 50)
-        if not events:
+        slaveid, event_data = self.transport.poll(50)
+        if slaveid is None:
             return None, None, None
-        slaveid, _, event_json = self.sock.recv_multipart(flags=zmq.NOBLOCK)
-        event_data = json.loads(event_json)
         event_name = event_data.pop('_event_name')
         if slaveid not in self.slaves:  # its byte-string coming from recv
             self.log.error("message from terminated worker %s %s %s",
@@ -283,7 +335,7 @@ class ParallelSession(object):
 
     def ack(self, slave, event_name):
         """Acknowledge a slave's message"""
-        self.send(slave, f'ack {event_name}')
+        self.transport.ack(slave.id, event_name)
 
     def monitor_shutdown(self, slave):
         # non-daemon so slaves get every opportunity to shut down cleanly
@@ -355,12 +407,19 @@ class ParallelSession(object):
             tests = list(self.failed_slave_test_groups.popleft())
         except IndexError:
             tests = self.get(slave)
+        stolen = False
+        if not tests and self.config.getoption('parallel_work_stealing'):
+            tests = self.steal_tests(slave)
+            stolen = bool(tests)
         self.send(slave, tests)
         slave.tests.update(tests)
+        slave.queue.extend(tests)
         collect_len = len(self.collection) + len(self.serial_collection)
         tests_len = len(tests)
-        self.sent_tests += tests_len
-        if tests:
+        if not stolen:
+            # stolen tests were already counted when first sent
+            self.sent_tests += tests_len
+        if tests and not stolen:
             test_perc = self.sent_tests * 100 / collect_len
             self.print_message(
                 f'sent {tests_len} tests '
@@ -369,6 +428,65 @@ class ParallelSession(object):
             )
         return tests
 
+    def stealable_tests(self, slave):
+        """Tests sent to a slave that it has not claimed to run yet, in the order they were sent"""
+        return [test for test in slave.queue
+                if test in slave.tests and test not in slave.started]
+
+    def steal_tests(self, thief):
+        """Move queued tests from the busiest slave to an idle one
+
+        About the second half of the victim's unclaimed queue is taken, in whole groups of tests
+        from the same module with the same parametrized id (see ``_modscope_id_splitter``), so
+        module ordering stays intact. Groups the victim has started are left to it, serial tests
+        are never stolen and only tests that fit the idle slave's provider allocation are
+        considered.
+
+        """
+        serial = set(self.serial_collection)
+
+        def compatible(test):
+            provs = [pv for pv in self.provs if '[' in test and pv in test]
+            return (not provs or not thief.provider_allocation or
+                    provs[0] in thief.provider_allocation)
+
+        candidates = []
+        for victim in self.slaves.values():
+            if victim is thief:
+                continue
+            started = {_test_group_key(test) for test in victim.started}
+            groups = [list(tests) for key, tests in groupby(
+                (test for test in self.stealable_tests(victim)
+                 if test not in serial and compatible(test)),
+                key=_test_group_key)
+                if key not in started]
+            queued = sum(len(tests) for tests in groups)
+            if queued:
+                candidates.append((queued, victim, groups))
+        if not candidates:
+            return []
+        queued, victim, groups = max(candidates, key=lambda candidate: candidate[0])
+        tests = []
+        while groups and len(tests) * 2 < queued:
+            tests[:0] = groups.pop()
+        victim.tests.difference_update(tests)
+        victim.queue = [test for test in victim.queue if test in victim.tests]
+        if not thief.provider_allocation:
+            thief.provider_allocation.extend(
+                {pv for test in tests for pv in self.provs if '[' in test and pv in test})
+        self.print_message(
+            f'{thief.id.decode("utf-8")} stole {len(tests)} queued tests '
+            f'from {victim.id.decode("utf-8")}',
+            yellow=True)
+        return tests
+
+    def claim_test(self, slave, nodeid):
+        """Arbitrate a slave's request to run a test; False means the test was stolen"""
+        if nodeid not in slave.tests:
+            return False
+        slave.started.add(nodeid)
+        return True
+
     @pytest.hookimpl
     def pytest_sessionstart(self, session):
         """pytest sessionstart hook
@@ -407,6 +525,11 @@ class ParallelSession(object):
             else:
                 self.collection.append(item.nodeid)
 
+        if self.config.getoption('parallel_collection_snapshot'):
+            self.collection_snapshot = CollectionSnapshot.from_items(
+                self.session.items, self.collection_version)
+            self.collection_snapshot.save(self.config.cache)
+
         # Fire up the workers after master collection is complete
         # master and the first slave share an appliance, this is a workaround to prevent a slave
         # from altering an appliance while master collection is still taking place
@@ -441,6 +564,13 @@ class ParallelSession(object):
                     # messages are special, handle them immediately
                     self.print_message(message, slave, **markup)
                     self.ack(slave, event_name)
+                elif event_name == 'collectionfinish' and 'node_ids' not in event_data:
+                    # the slave found a matching snapshot, double check it's the master's one
+                    if self.collection_snapshot is not None and self.collection_snapshot.matches(
+                            event_data['collection_key'], event_data['collection_digest']):
+                        self.ack(slave, event_name)
+                    else:
+                        self.send(slave, 'send_collection')
                 elif event_name == 'collectionfinish':
                     slave_collection = event_data['node_ids']
                     # compare slave collection to the master, all test ids must be the same
@@ -460,6 +590,11 @@ class ParallelSession(object):
                 elif event_name == 'need_tests':
                     self.send_tests(slave)
                     self.log.info('starting master test distribution')
+                elif event_name == 'claim_test':
+                    if self.claim_test(slave, event_data['nodeid']):
+                        self.ack(slave, event_name)
+                    else:
+                        self.send(slave, 'stolen')
                 elif event_name == 'runtest_logstart':
                     self.ack(slave, event_name)
                     self.trdist.runtest_logstart(
@@ -471,6 +606,9 @@ class ParallelSession(object):
                     report = unserialize_report(event_data['report'])
                     if report.when in ('call', 'teardown'):
                         slave.tests.discard(report.nodeid)
+                        slave.started.discard(report.nodeid)
+                    if self.durations is not None:
+                        self.durations.record(report)
                     self.trdist.runtest_logreport(slave.id, report)
                 elif event_name == 'internalerror':
                     self.ack(slave, event_name)
@@ -480,6 +618,7 @@ class ParallelSession(object):
                     self.config.hook.pytest_miq_node_shutdown(
                         config=self.config, nodeinfo=slave.appliance.url)
                     self.ack(slave, event_name)
+                    self.transport.forget(slave.id)
                     del self.slaves[slave.id]
                     self.monitor_shutdown(slave)
 
@@ -502,6 +641,8 @@ class ParallelSession(object):
 
     @pytest.hookimpl(trylast=True)
     def pytest_sessionfinish(self):
+        if self.durations is not None:
+            self.durations.save()
         self.zmq_ctx.destroy()
 
     def _test_item_generator(self):
@@ -571,6 +712,9 @@ class ParallelSession(object):
             for test_group in self.test_groups:
                 self._pool.append(test_group)
                 self.used_prov.update(provs_of_tests(test_group))
+            if self.durations is not None:
+                # longest-processing-time-first, the provider affinity below still applies
+                self._pool = self.durations.sort_longest_first(self._pool)
             if self.used_prov:
                 self.ratio = float(len(self.slaves)) / len(self.used_prov)
             else:
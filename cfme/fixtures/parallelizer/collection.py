@@ -0,0 +1,69 @@
+"""Collection snapshots shared between the parallelizer master and its slaves
+
+Every slave runs its own collection, and used to ship its full list of node ids to the master to
+be diffed against the master's collection. With ``--parallel-collection-snapshot`` the master
+writes its collection to the pytest cache once, keyed by a hash of everything that influences
+collection: the conf yamls (including ``supportability.yaml``), the appliance version, and the
+mtimes of the collected files. A slave computes the same key after its own collection; if a
+snapshot exists for it and the node id digests match, only the key and digest are sent to the
+master. Anything else falls back to sending (and diffing) the full list.
+
+"""
+import hashlib
+
+import attr
+
+from cfme.utils.path import conf_path
+
+#: pytest cache key prefix the snapshots are stored under
+CACHE_PREFIX = 'parallelize/collection'
+
+
+def collection_key(items, appliance_version, conf_dir=None):
+    """Hash the inputs of a collection
+
+    Args:
+        items: collected pytest items
+        appliance_version: version of the appliance the collection was done against
+        conf_dir: directory holding the conf yamls, :py:data:`cfme.utils.path.conf_path` by default
+    """
+    conf_dir = conf_dir or conf_path
+    digest = hashlib.sha256()
+    for yaml_path in sorted(conf_dir.listdir('*.yaml'), key=str):
+        digest.update(yaml_path.basename.encode('utf-8'))
+        digest.update(yaml_path.read_binary())
+    digest.update(str(appliance_version).encode('utf-8'))
+    for fspath in sorted({item.fspath for item in items}, key=str):
+        digest.update(f'{fspath}:{fspath.mtime()}'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def collection_digest(nodeids):
+    """Order-independent digest of a list of node ids"""
+    return hashlib.sha256('\n'.join(sorted(nodeids)).encode('utf-8')).hexdigest()
+
+
+@attr.s
+class CollectionSnapshot(object):
+    key = attr.ib()
+    digest = attr.ib()
+    nodeids = attr.ib(repr=False)
+
+    @classmethod
+    def from_items(cls, items, appliance_version):
+        nodeids = [item.nodeid for item in items]
+        return cls(collection_key(items, appliance_version), collection_digest(nodeids), nodeids)
+
+    @classmethod
+    def load(cls, cache, key):
+        """Load the snapshot stored for ``key``, None if there isn't one"""
+        data = cache.get(f'{CACHE_PREFIX}/{key}', None)
+        if data is None:
+            return None
+        return cls(key=key, digest=data['digest'], nodeids=data['nodeids'])
+
+    def save(self, cache):
+        cache.set(f'{CACHE_PREFIX}/{self.key}', {'digest': self.digest, 'nodeids': self.nodeids})
+
+    def matches(self, key, digest):
+        return (key, digest) == (self.key, self.digest)
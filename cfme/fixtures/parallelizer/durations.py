@@ -0,0 +1,77 @@
+"""Historical test durations for the parallelizer scheduler
+
+The master keeps a running record of how long each test node took on previous runs, keyed by
+nodeid and stored in the pytest cache dir. When the ``duration`` schedule is selected, test groups
+are handed out longest-first (longest-processing-time-first bin packing), which keeps one slave
+from picking up a long provisioning module at the very end of a run while the others sit idle.
+
+Durations are smoothed with an exponential moving average so one slow run doesn't permanently
+skew the estimates.
+
+"""
+import attr
+
+#: pytest cache key the durations are stored under
+CACHE_KEY = 'parallelize/durations'
+
+#: weight of the most recent run when smoothing the stored duration
+SMOOTHING = 0.5
+
+
+@attr.s
+class DurationHistory(object):
+    """Per-nodeid historical durations, backed by the pytest cache
+
+    Args:
+        cache: pytest ``config.cache`` object, or None to keep the history in memory only
+        durations: mapping of nodeid to the smoothed duration in seconds
+    """
+    cache = attr.ib(repr=False)
+    durations = attr.ib(default=attr.Factory(dict), repr=False)
+    # phase durations of the tests currently running, summed up until teardown
+    _running = attr.ib(default=attr.Factory(dict), init=False, repr=False)
+
+    @classmethod
+    def from_cache(cls, cache):
+        durations = cache.get(CACHE_KEY, {}) if cache is not None else {}
+        return cls(cache=cache, durations=dict(durations))
+
+    def save(self):
+        if self.cache is not None:
+            self.cache.set(CACHE_KEY, self.durations)
+
+    def record(self, report):
+        """Accumulate the duration of a test report phase
+
+        The total of setup, call and teardown is recorded once the teardown report arrives.
+        """
+        nodeid = report.nodeid
+        self._running[nodeid] = self._running.get(nodeid, 0.0) + (report.duration or 0.0)
+        if report.when == 'teardown':
+            self.update(nodeid, self._running.pop(nodeid))
+
+    def update(self, nodeid, duration):
+        previous = self.durations.get(nodeid)
+        if previous is None:
+            self.durations[nodeid] = duration
+        else:
+            self.durations[nodeid] = SMOOTHING * duration + (1 - SMOOTHING) * previous
+
+    @property
+    def default(self):
+        """Estimate used for tests that have never run: the mean of the known durations"""
+        if not self.durations:
+            return 0.0
+        return sum(self.durations.values()) / len(self.durations)
+
+    def estimate(self, tests):
+        """Estimated total duration of a group of test nodeids"""
+        default = self.default
+        return sum(self.durations.get(nodeid, default) for nodeid in tests)
+
+    def sort_longest_first(self, test_groups):
+        """Order test groups for longest-processing-time-first distribution
+
+        Sorting is stable, so groups without any history keep their collection order.
+        """
+        return sorted(test_groups, key=self.estimate, reverse=True)
@@ -8,6 +8,8 @@ from py.path import local
 import cfme.utils
 from cfme.fixtures.log import _format_nodeid
 from cfme.fixtures.log import _test_status
+from cfme.fixtures.parallelizer.collection import CollectionSnapshot
+from cfme.fixtures.parallelizer.transport import SlaveTransport
 from cfme.utils import log
 from cfme.utils.appliance import find_appliance
 
@@ -16,20 +18,21 @@ SLAVEID = None
 
 class SlaveManager(object):
     """SlaveManager which coordinates with the master process for parallel testing"""
-    def __init__(self, config, slaveid, zmq_endpoint):
+    def __init__(self, config, slaveid, zmq_endpoint, collection_version=None):
         self.config = config
         self.session = None
         self.collection = None
+        # the appliance version the master keys its collection snapshot with
+        self.collection_version = collection_version
         self.slaveid = conf.runtime['env']['slaveid'] = slaveid
         self.log = cfme.utils.log.logger
         conf.clear()
         # Override the logger in utils.log
 
         ctx = zmq.Context.instance()
-        self.sock = ctx.socket(zmq.REQ)
-        self.sock.set_hwm(1)
-        self.sock.setsockopt_string(zmq.IDENTITY, f'{self.slaveid}')
-        self.sock.connect(zmq_endpoint)
+        self.transport = SlaveTransport.connect(
+            ctx, f'{self.slaveid}', zmq_endpoint,
+            config.option.parallel_transport)
 
         self.messages = {}
 
@@ -38,8 +41,7 @@ class SlaveManager(object):
     def send_event(self, name, **kwargs):
         kwargs['_event_name'] = name
         self.log.debug(f"sending {name} {kwargs!r}")
-        self.sock.send_json(kwargs)
-        recv = self.sock.recv_json()
+        recv = self.transport.request(kwargs)
         if recv == 'die':
             self.log.info('Slave instructed to die by master; shutting down')
             raise SystemExit()
@@ -56,13 +58,24 @@ class SlaveManager(object):
     def pytest_collection_finish(self, session):
         """pytest collection hook
 
-        - Sends collected tests to the master for comparison
+        - Sends collected tests to the master for comparison, or only the digest of the
+          collection if it matches the master's collection snapshot
 
         """
         self.log.debug('collection finished')
         self.session = session
         self.collection = {item.nodeid: item for item in session.items}
         terminalreporter.disable()
+        if self.config.option.parallel_collection_snapshot:
+            snapshot = CollectionSnapshot.from_items(session.items, self.collection_version)
+            stored = CollectionSnapshot.load(self.config.cache, snapshot.key)
+            if stored is not None and stored.digest == snapshot.digest:
+                recv = self.send_event("collectionfinish",
+                                       collection_key=snapshot.key,
+                                       collection_digest=snapshot.digest)
+                if recv != 'send_collection':
+                    return
+            self.log.info('collection does not match the master snapshot, sending all node ids')
         self.send_event("collectionfinish", node_ids=list(self.collection.keys()))
 
     @pytest.hookimpl(trylast=True)
@@ -148,7 +161,7 @@ class SlaveManager(object):
     def shutdown(self):
         self.message('shutting down')
         self.send_event('shutdown')
-        self.sock.close()
+        self.transport.close()
         self.quit_signaled = True
 
     def _test_generator(self):
@@ -169,6 +182,11 @@ class SlaveManager(object):
             if not node_ids:
                 break
             for nodeid in node_ids:
+                if self.config.option.parallel_work_stealing:
+                    # the master may have handed this test to an idle slave in the meantime
+                    if self.send_event('claim_test', nodeid=nodeid) == 'stolen':
+                        self.log.info(f'{nodeid} was taken over by another slave')
+                        continue
                 # TODO: take non-unique node ids into account
                 yield self.collection[nodeid]
 
@@ -271,7 +289,8 @@ if __name__ == '__main__':
         conf.runtime["cfme_data"]["basic_info"]["appliance_template"] = template_name
         conf.runtime["cfme_data"]["basic_info"]["appliances_provider"] = provider_name
     pytest_config = _init_config(slave_options, slave_args)
-    slave_manager = SlaveManager(pytest_config, args.worker, config['zmq_endpoint'])
+    slave_manager = SlaveManager(pytest_config, args.worker, config['zmq_endpoint'],
+                                 config.get('collection_version'))
     pytest_config.pluginmanager.register(slave_manager, 'slave_manager')
 
     pytest_config.hook.pytest_addhooks.call_historic(kwargs=dict(
@@ -0,0 +1,194 @@
+"""Wire formats for the parallelizer master/slave exchange
+
+Two transports are available, selected with ``--parallel-transport``:
+
+``json``
+    The original lock-step exchange. Slaves use a REQ socket and every event waits for the
+    master's reply before the slave continues.
+
+``msgpack``
+    Slaves use a DEALER socket and stream msgpack-encoded events. Events that only inform the
+    master (test reports, log starts, messages) don't wait for a reply; up to
+    :py:data:`WINDOW` of them can be outstanding before the slave blocks on the master's
+    acknowledgements. The master collects acks while it keeps draining its socket, and sends a
+    single cumulative ack per slave once the socket is empty. Events that need an answer
+    (``need_tests``, ``claim_test``, ...) are marked as synchronous and answered right away.
+
+Frames have the same ``[identity, b'', payload]`` envelope in both modes, so the master's
+ROUTER socket doesn't care which one a slave uses.
+
+"""
+import json
+
+import zmq
+
+#: maximum number of unacknowledged asynchronous events a slave may have in flight
+WINDOW = 64
+
+#: events the slave doesn't need an answer to
+ASYNC_EVENTS = frozenset(['message', 'runtest_logstart', 'runtest_logreport', 'internalerror'])
+
+
+class JsonCodec(object):
+    name = 'json'
+
+    @staticmethod
+    def dumps(data):
+        return json.dumps(data).encode('utf-8')
+
+    @staticmethod
+    def loads(payload):
+        return json.loads(payload)
+
+
+class MsgpackCodec(object):
+    name = 'msgpack'
+
+    @staticmethod
+    def dumps(data):
+        import msgpack
+        return msgpack.packb(data, use_bin_type=True)
+
+    @staticmethod
+    def loads(payload):
+        import msgpack
+        return msgpack.unpackb(payload, raw=False)
+
+
+CODECS = {codec.name: codec for codec in (JsonCodec, MsgpackCodec)}
+
+
+def get_codec(name):
+    return CODECS[name]
+
+
+class SlaveTransport(object):
+    """Slave side of the exchange, used by :py:class:`SlaveManager`
+
+    Args:
+        sock: a connected zmq socket; REQ for ``json``, DEALER for ``msgpack``
+        codec: one of :py:data:`CODECS`
+        window: number of asynchronous events allowed in flight
+    """
+    def __init__(self, sock, codec, window=WINDOW):
+        self.sock = sock
+        self.codec = codec
+        self.window = window
+        self.streaming = codec is not JsonCodec
+        self.seq = 0
+        self.acked = 0
+
+    @classmethod
+    def connect(cls, ctx, identity, endpoint, codec_name='json', window=WINDOW):
+        codec = get_codec(codec_name)
+        if codec is JsonCodec:
+            sock = ctx.socket(zmq.REQ)
+            sock.set_hwm(1)
+        else:
+            sock = ctx.socket(zmq.DEALER)
+            sock.set_hwm(window * 2)
+        sock.setsockopt_string(zmq.IDENTITY, identity)
+        sock.connect(endpoint)
+        return cls(sock, codec, window)
+
+    @property
+    def outstanding(self):
+        return self.seq - self.acked
+
+    def request(self, event):
+        """Send an event dict, returning the master's reply
+
+        In streaming mode, asynchronous events return ``'ack'`` without waiting, unless the
+        window is full.
+
+        """
+        if not self.streaming:
+            self.sock.send(self.codec.dumps(event))
+            return self.codec.loads(self.sock.recv())
+
+        self.seq += 1
+        seq = event['_seq'] = self.seq
+        is_async = event['_event_name'] in ASYNC_EVENTS
+        if not is_async:
+            event['_sync'] = True
+        self.sock.send_multipart([b'', self.codec.dumps(event)])
+        if is_async:
+            while self.outstanding >= self.window:
+                self._recv()
+            return 'ack'
+        while True:
+            reply = self._recv()
+            if reply.get('seq') == seq:
+                return reply['reply']
+
+    def flush(self):
+        """Block until the master has acknowledged every event sent so far"""
+        while self.streaming and self.outstanding:
+            self._recv()
+
+    def _recv(self):
+        _, payload = self.sock.recv_multipart()
+        message = self.codec.loads(payload)
+        self.acked = max(self.acked, message['ack'])
+        return message
+
+    def close(self):
+        self.sock.close()
+
+
+class MasterTransport(object):
+    """Master side of the exchange, owned by :py:class:`ParallelSession`
+
+    Keeps track of the last event received from each slave so acknowledgements of streamed
+    events can be batched.
+
+    """
+    def __init__(self, sock, codec):
+        self.sock = sock
+        self.codec = codec
+        self.streaming = codec is not JsonCodec
+        # slave id: last received sequence number, for slaves waiting on a batched ack
+        self.pending_acks = {}
+        # slave id: sequence number of the synchronous event the slave is waiting on
+        self.awaiting_reply = {}
+
+    def poll(self, timeout=50):
+        """Receive one event; returns ``(slaveid, event_data)`` or ``(None, None)``"""
+        if self.pending_acks:
+            # keep draining while there's more to read, ack everything once the socket is empty
+            timeout = 0
+        if not zmq.zmq_poll([(self.sock, zmq.POLLIN)], timeout):
+            self.flush_acks()
+            return None, None
+        slaveid, _, payload = self.sock.recv_multipart(flags=zmq.NOBLOCK)
+        event_data = self.codec.loads(payload)
+        if self.streaming:
+            seq = event_data.pop('_seq')
+            if event_data.pop('_sync', False):
+                self.awaiting_reply[slaveid] = seq
+            else:
+                self.pending_acks[slaveid] = seq
+        return slaveid, event_data
+
+    def send(self, slaveid, data):
+        if self.streaming:
+            seq = self.awaiting_reply.pop(slaveid, None)
+            ack = max(seq or 0, self.pending_acks.pop(slaveid, 0))
+            data = {'ack': ack, 'seq': seq, 'reply': data}
+        self.sock.send_multipart([slaveid, b'', self.codec.dumps(data)])
+
+    def ack(self, slaveid, event_name):
+        if not self.streaming:
+            self.send(slaveid, f'ack {event_name}')
+        elif slaveid in self.awaiting_reply:
+            self.send(slaveid, 'ack')
+        # streamed events are acked in bulk by flush_acks
+
+    def flush_acks(self):
+        for slaveid, seq in list(self.pending_acks.items()):
+            self.sock.send_multipart([slaveid, b'', self.codec.dumps({'ack': seq})])
+        self.pending_acks.clear()
+
+    def forget(self, slaveid):
+        self.pending_acks.pop(slaveid, None)
+        self.awaiting_reply.pop(slaveid, None)
@@ -70,6 +70,8 @@ def pytest_addoption(parser):
         help="Do not use type/version parametrization")
     parser.addoption('--disable-selectors', action='store_true',
         help="Do not use the selectors for parametrization")
+    parser.addoption('--disable-provider-memo', action='store_true',
+        help="Match providers for every test function instead of once per set of filters")
     parser.addoption("--provider-limit", action="store", default=1, type=int,
         help=(
             "Number of providers allowed to coexist on appliance. 0 means no limit. "
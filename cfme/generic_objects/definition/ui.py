@@ -132,6 +132,7 @@ def add_button(self, name, description, request, **kwargs):
 @navigator.register(GenericObjectDefinitionCollection)
 class All(CFMENavigateStep):
     VIEW = GenericObjectDefinitionAllView
+    URL_CACHEABLE = True
 
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
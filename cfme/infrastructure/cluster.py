@@ -352,6 +352,7 @@ class ClusterCollection(BaseCollection):
 @navigator.register(ClusterCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = ClusterAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -440,6 +440,7 @@ class DatastoreCollection(BaseCollection):
 @navigator.register(DatastoreCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = DatastoresView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -98,6 +98,7 @@ class InfraNetworkingDetailsView(InfraNetworkingView):
 @navigator.register(InfraSwitchesCollection)
 class All(CFMENavigateStep):
     VIEW = InfraSwitchesAllView
+    URL_CACHEABLE = True
 
     prerequisite = NavigateToAttribute("appliance.server", "LoggedIn")
 
@@ -111,15 +111,8 @@ class InfraProvider(BaseProvider, CloudInfraProviderMixin, Pretty, Fillable,
 
     @variable(alias='db')
     def num_datastore(self):
-        """ Returns the providers number of templates, as shown on the Details page."""
-        results = list(self.appliance.db.client.engine.execute(
-            'SELECT DISTINCT storages.name, hosts.ems_id '
-            'FROM ext_management_systems ems, hosts, storages st, host_storages hst '
-            'WHERE hosts.id=hst.host_id AND '
-            'st.id=hst.storage_id AND '
-            'hosts.ems_id=ems.id AND '
-            'ems.name=\'{}\''.format(self.name)))
-        return len(results)
+        """ Returns the providers number of datastores, as shown on the Details page."""
+        return self.inventory_counts()['num_datastore']
 
     @num_datastore.variant('ui')
     def num_datastore_ui(self):
@@ -137,12 +130,7 @@ class InfraProvider(BaseProvider, CloudInfraProviderMixin, Pretty, Fillable,
 
     @num_host.variant('db')
     def num_host_db(self):
-        ext_management_systems = self.appliance.db.client["ext_management_systems"]
-        hosts = self.appliance.db.client["hosts"]
-        hostlist = list(self.appliance.db.client.session.query(hosts.name)
-                        .join(ext_management_systems, hosts.ems_id == ext_management_systems.id)
-                        .filter(ext_management_systems.name == self.name))
-        return len(hostlist)
+        return self.inventory_counts()['num_host']
 
     @num_host.variant('ui')
     def num_host_ui(self):
@@ -165,14 +153,8 @@ class InfraProvider(BaseProvider, CloudInfraProviderMixin, Pretty, Fillable,
 
     @num_cluster.variant('db')
     def num_cluster_db(self):
-        """ Returns the providers number of templates, as shown on the Details page."""
-        ext_management_systems = self.appliance.db.client["ext_management_systems"]
-        clusters = self.appliance.db.client["ems_clusters"]
-        clulist = list(self.appliance.db.client.session.query(clusters.name)
-                       .join(ext_management_systems,
-                             clusters.ems_id == ext_management_systems.id)
-                       .filter(ext_management_systems.name == self.name))
-        return len(clulist)
+        """ Returns the providers number of clusters, as shown on the Details page."""
+        return self.inventory_counts()['num_cluster']
 
     @num_cluster.variant('ui')
     def num_cluster_ui(self):
@@ -302,6 +284,7 @@ class InfraProviderCollection(BaseCollection):
 @navigator.register(InfraProvider, 'All')
 class All(CFMENavigateStep):
     VIEW = InfraProvidersView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -213,6 +213,7 @@ class ResourcePoolCollection(BaseCollection):
 class All(CFMENavigateStep):
     """A navigation step for the All page"""
     VIEW = ResourcePoolAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -134,6 +134,7 @@ class OptimizationReportsCollection(BaseCollection):
 @navigator.register(OptimizationReportsCollection, "All")
 class OptimizationAll(CFMENavigateStep):
     VIEW = OptimizationView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute("appliance.server", "LoggedIn")
 
     def step(self, *args, **kwargs):
@@ -81,4 +81,9 @@ def pytest_generate_tests(metafunc):
         marker.process_env_mark(metafunc)
 
 
+def pytest_collection_finish(session):
+    from cfme.markers.env_markers.provider import clear_providers_memo
+    clear_providers_memo()
+
+
 glob = {}
@@ -9,6 +9,7 @@ from cfme.markers.env import EnvironmentMarker
 from cfme.utils import conf
 from cfme.utils.log import logger
 from cfme.utils.providers import all_types
+from cfme.utils.providers import global_filters
 from cfme.utils.providers import list_providers
 from cfme.utils.providers import ProviderFilter
 from cfme.utils.pytest_shortcuts import fixture_filter
@@ -24,6 +25,10 @@ ONE_PER_TYPE = 'one_per_type'
 
 PROVIDER_MARKER_FIXTURE_NAME = 'provider'
 
+# Matches of supported to available providers computed by providers() during collection, keyed by
+# providers_memo_key(); cleared when collection finishes
+_providers_memo = {}
+
 
 class DPFilter(ProviderFilter):
     def __call__(self, provider):
@@ -224,6 +229,84 @@ def all_required(miq_version, filters=None):
     return dprovs
 
 
+def _freeze(value):
+    """Hashable equivalent of a filter attribute"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def filter_key(prov_filter):
+    """Hashable value equal for filters that filter the same way"""
+    return (type(prov_filter),) + tuple(
+        sorted((name, _freeze(value)) for name, value in vars(prov_filter).items()))
+
+
+def providers_memo_key(filters, appliance_version):
+    """Key of the providers matched for the given filters, see :py:func:`match_providers`
+
+    Filters are applied one after another and all must pass, so their order doesn't matter. The
+    global filters apply to the available providers as well.
+    """
+    return (
+        frozenset(filter_key(f) for f in filters),
+        frozenset(filter_key(f) for f in global_filters.values()),
+        str(appliance_version))
+
+
+def clear_providers_memo():
+    _providers_memo.clear()
+
+
+def index_available(available_providers):
+    """Index of the available providers by type and category
+
+    Returns:
+        ``{(type, category): [(version, provider)]}``, in the order of ``available_providers``,
+        version is ``None`` for providers without a version which match any version
+    """
+    index = defaultdict(list)
+    for a_prov in available_providers:
+        try:
+            version = a_prov.version
+            if not version:
+                raise ValueError("provider {p} has no version".format(p=a_prov))
+        except (KeyError, ValueError):
+            version = None
+        index[(a_prov.type, a_prov.category)].append((version, a_prov))
+    return index
+
+
+def match_providers(filters, series):
+    """Pairs the supported providers with the available ones matching them
+
+    Returns:
+        list of ``(DataProvider, provider crud)``
+    """
+    # available_providers are the ones "available" from the yamls after all of the aal and
+    # local filters have been applied. It will be a list of crud objects.
+    available = index_available(list_providers(filters))
+
+    # supported_providers are the ones "supported" in the supportability.yaml file. It will
+    # be a list of DataProvider objects and will be filtered based upon what the test has asked for
+    supported_providers = all_required(series, filters)
+
+    # We now search through all the available providers looking for the ones that match the
+    # criteria of each supported provider
+    return [(provider, a_prov)
+            for provider in supported_providers
+            for version, a_prov in available[(provider.type_name, provider.category)]
+            if version is None or version == provider.version]
+
+
 def providers(metafunc, filters=None, selector=ONE_PER_VERSION, fixture_name='provider'):
     """ Gets providers based on given (+ global) filters
 
@@ -236,6 +319,10 @@ def providers(metafunc, filters=None, selector=ONE_PER_VERSION, fixture_name='pr
         testgen for providers now requires the usage of test_flags for collection to work.
         Please visit http://cfme-tests.readthedocs.org/guides/documenting.html#documenting-tests
         for more details.
+
+    Note:
+        The matching of supported to available providers is memoized for the filters during
+        collection, unless ``--disable-provider-memo`` is given.
     """
     filters = filters or []
     argnames = []
@@ -250,33 +337,19 @@ def providers(metafunc, filters=None, selector=ONE_PER_VERSION, fixture_name='pr
         flags_filter = ProviderFilter(required_flags=test_flags)
         filters = filters + [flags_filter]
 
-    # available_providers are the ones "available" from the yamls after all of the aal and
-    # local filters have been applied. It will be a list of crud objects.
-    available_providers = list_providers(filters)
-
-    # supported_providers are the ones "supported" in the supportability.yaml file. It will
-    # be a list of DataProvider objects and will be filtered based upon what the test has asked for
     holder = metafunc.config.pluginmanager.get_plugin('appliance-holder')
-    series = holder.held_appliance.version.series()
-    supported_providers = all_required(series, filters)
-
-    def get_valid_providers(provider):
-        # We now search through all the available providers looking for one that matches the
-        # criteria. If we don't find one, we return None
-        prov_tuples = []
-        for a_prov in available_providers:
-            try:
-                if not a_prov.version:
-                    raise ValueError("provider {p} has no version".format(p=a_prov))
-                elif (a_prov.version == provider.version and
-                        a_prov.type == provider.type_name and
-                        a_prov.category == provider.category):
-                    prov_tuples.append((provider, a_prov))
-            except (KeyError, ValueError):
-                if (a_prov.type == provider.type_name and
-                        a_prov.category == provider.category):
-                    prov_tuples.append((provider, a_prov))
-        return prov_tuples
+    version = holder.held_appliance.version
+    if metafunc.config.getoption('disable_provider_memo'):
+        matching_provs = match_providers(filters, version.series())
+    else:
+        key = providers_memo_key(filters, version)
+        if key not in _providers_memo:
+            _providers_memo[key] = match_providers(filters, version.series())
+        # the DataProviders get their key assigned below, every test gets copies of its own
+        copies = {}
+        matching_provs = [
+            (copies.setdefault(id(data_prov), attr.evolve(data_prov)), real_prov)
+            for data_prov, real_prov in _providers_memo[key]]
 
     # A small routine to check if we need to supply the idlist a provider type or
     # a real type/version
@@ -288,10 +361,6 @@ def providers(metafunc, filters=None, selector=ONE_PER_VERSION, fixture_name='pr
                     need_prov_keys = True
                     break
 
-    matching_provs = [valid_provider
-                      for prov in supported_providers
-                      for valid_provider in get_valid_providers(prov)]
-
     # Now we run through the selectors and build up a list of supported providers which match our
     # requirements. This then forms the providers that the test should run against.
     if selector == ONE:
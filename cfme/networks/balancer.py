@@ -76,6 +76,7 @@ class BalancerCollection(BaseCollection):
 @navigator.register(BalancerCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = BalancerView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -158,6 +158,7 @@ class CloudNetworkCollection(BaseCollection):
 @navigator.register(CloudNetworkCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = CloudNetworkView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -57,6 +57,7 @@ class FloatingIpCollection(BaseCollection):
 @navigator.register(FloatingIpCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = FloatingIpView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -89,6 +89,7 @@ class NetworkPortCollection(BaseCollection):
 @navigator.register(NetworkPortCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = NetworkPortView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
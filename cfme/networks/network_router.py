@@ -182,6 +182,7 @@ class NetworkRouterCollection(BaseCollection):
 @navigator.register(NetworkRouterCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = NetworkRouterView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
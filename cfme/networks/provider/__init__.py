@@ -330,6 +330,7 @@ class NetworkProviderCollection(BaseCollection):
 @navigator.register(NetworkProviderCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = NetworkProviderView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
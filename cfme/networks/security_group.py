@@ -65,6 +65,7 @@ class SecurityGroupCollection(BaseCollection):
 @navigator.register(SecurityGroupCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = SecurityGroupView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
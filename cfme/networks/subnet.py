@@ -166,6 +166,7 @@ class SubnetCollection(BaseCollection):
 @navigator.register(SubnetCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = SubnetView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
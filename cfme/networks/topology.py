@@ -23,6 +23,7 @@ class NetworkTopologyElementsCollection(BaseTopologyElementsCollection):
 @navigator.register(NetworkTopologyElementsCollection)
 class All(CFMENavigateStep):
     VIEW = NetworkTopologyView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute("appliance.server", "LoggedIn")
 
     def step(self, *args, **kwargs):
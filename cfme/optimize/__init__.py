@@ -25,6 +25,7 @@ class BottlenecksView(BaseLoggedInPage):
 @navigator.register(Server)
 class Bottlenecks(CFMENavigateStep):
     VIEW = BottlenecksView
+    URL_CACHEABLE = True
     prerequisite = NavigateToSibling("LoggedIn")
 
     def step(self, *args, **kwargs):
@@ -262,6 +262,7 @@ class PhysicalChassisView(ComputePhysicalInfrastructureChassisView):
 @navigator.register(PhysicalChassisCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = PhysicalChassisView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute("appliance.server", "LoggedIn")
 
     def step(self, *args, **kwargs):
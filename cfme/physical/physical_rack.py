@@ -272,6 +272,7 @@ class PhysicalRacksView(ComputePhysicalInfrastructureRacksView):
 @navigator.register(PhysicalRackCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = PhysicalRacksView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute("appliance.server", "LoggedIn")
 
     def step(self, *args, **kwargs):
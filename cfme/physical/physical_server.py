@@ -350,6 +350,7 @@ class PhysicalServerCollection(BaseCollection):
 @navigator.register(PhysicalServerCollection)
 class All(CFMENavigateStep):
     VIEW = PhysicalServersView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute("appliance.server", "LoggedIn")
 
     def step(self, *args, **kwargs):
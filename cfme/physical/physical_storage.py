@@ -196,6 +196,7 @@ class PhysicalStorageCollection(BaseCollection):
 @navigator.register(PhysicalStorageCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = PhysicalStoragesView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute("appliance.server", "LoggedIn")
 
     def step(self, *args, **kwargs):
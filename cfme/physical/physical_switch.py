@@ -210,6 +210,7 @@ class PhysicalSwitchCollection(BaseCollection):
 @navigator.register(PhysicalSwitchCollection)
 class All(CFMENavigateStep):
     VIEW = PhysicalSwitchesView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute("appliance.server", "LoggedIn")
 
     def step(self, *args, **kwargs):
@@ -121,6 +121,7 @@ class PhysicalProviderCollection(BaseCollection):
 class All(CFMENavigateStep):
     # This view will need to be created
     VIEW = PhysicalProvidersView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -183,6 +184,7 @@ class PhysicalOverviewView(BaseLoggedInPage):
 @navigator.register(PhysicalProviderCollection, 'Overview')
 class Overview(CFMENavigateStep):
     VIEW = PhysicalOverviewView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
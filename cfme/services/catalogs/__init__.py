@@ -67,6 +67,7 @@ class ServicesCatalogView(BaseLoggedInPage):
 @navigator.register(Server)
 class ServicesCatalog(CFMENavigateStep):
     VIEW = ServicesCatalogView
+    URL_CACHEABLE = True
     prerequisite = NavigateToSibling("LoggedIn")
 
     def step(self, *args, **kwargs):
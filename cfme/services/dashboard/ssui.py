@@ -179,6 +179,7 @@ def monthly_charges(self):
 @navigator.register(Dashboard, 'DashboardAll')
 class DashboardAll(SSUINavigateStep):
     VIEW = DashboardView
+    URL_CACHEABLE = True
 
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
@@ -301,6 +301,7 @@ def service_power(self, power=None):
 @navigator.register(MyService, 'All')
 class MyServiceAll(SSUINavigateStep):
     VIEW = MyServicesView
+    URL_CACHEABLE = True
 
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
@@ -369,6 +369,7 @@ def reconfigure_service(self):
 @navigator.register(MyService, 'All')
 class MyServiceAll(CFMENavigateStep):
     VIEW = MyServicesView
+    URL_CACHEABLE = True
 
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
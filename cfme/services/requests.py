@@ -522,6 +522,7 @@ class RequestCopyView(RequestProvisionView):
 @navigator.register(RequestCollection, 'All')
 class RequestAll(CFMENavigateStep):
     VIEW = RequestsView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -102,6 +102,7 @@ def order(self):
 @navigator.register(ServiceCatalogs, 'All')
 class ServiceCatalogAll(SSUINavigateStep):
     VIEW = ServiceCatalogsView
+    URL_CACHEABLE = True
 
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
@@ -116,6 +116,7 @@ def order(self, **kwargs):
 @navigator.register(Server)
 class ServiceCatalogsDefault(CFMENavigateStep):
     VIEW = ServiceCatalogsDefaultView
+    URL_CACHEABLE = True
 
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
@@ -162,6 +162,7 @@ class ObjectStoreContainerCollection(BaseCollection):
 @navigator.register(ObjectStoreContainerCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = ObjectStoreContainerAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
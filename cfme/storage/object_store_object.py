@@ -174,6 +174,7 @@ class ObjectStoreObjectCollection(BaseCollection):
 @navigator.register(ObjectStoreObjectCollection, 'All')
 class ObjectStoreObjectAll(CFMENavigateStep):
     VIEW = ObjectStoreObjectAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -573,6 +573,7 @@ class VolumeCollection(BaseCollection, TaggableCollection):
 @navigator.register(VolumeCollection, 'All')
 class VolumeAll(CFMENavigateStep):
     VIEW = VolumeAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -264,6 +264,7 @@ class VolumeBackupCollection(BaseCollection):
 @navigator.register(VolumeBackupCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = VolumeBackupAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -239,6 +239,7 @@ class VolumeSnapshotCollection(BaseCollection):
 @navigator.register(VolumeSnapshotCollection, 'All')
 class All(CFMENavigateStep):
     VIEW = VolumeSnapshotAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -92,6 +92,7 @@ class VolumeTypeCollection(BaseCollection, TaggableCollection):
 @navigator.register(VolumeTypeCollection, 'All')
 class VolumeTypeAll(CFMENavigateStep):
     VIEW = VolumeTypeAllView
+    URL_CACHEABLE = True
     prerequisite = NavigateToAttribute('appliance.server', 'LoggedIn')
 
     def step(self, *args, **kwargs):
@@ -1,9 +1,12 @@
 import json
 import os
+import time
 
 import attr
 import requests
 from miq_version import LATEST_DOWN_STREAM
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from cfme.utils.appliance import IPAppliance
 from cfme.utils.conf import credentials
@@ -22,6 +25,10 @@ class AuthException(SproutException):
     pass
 
 
+class UnknownMethodException(SproutException):
+    """The Sprout server doesn't have the method, it's older than the client"""
+
+
 @attr.s
 class APIMethodCall(object):
     _client = attr.ib()
@@ -38,18 +45,43 @@ class SproutClient(object):
     _port = attr.ib(default=8000)
     _entry = attr.ib(default="appliances/api")
     _auth = attr.ib(default=None)
+    _session = attr.ib(default=None, init=False, repr=False)
+    _long_poll = attr.ib(default=True, init=False, repr=False)
+
+    #: retries of connection errors and 502/503 responses, with exponential backoff; read timeouts
+    #: and 504 are not retried, the server may still be running the call
+    RETRIES = 5
+    RETRY_BACKOFF = 0.5
+    #: seconds between request_check calls when the server can't wait for the pools
+    POLL_DELAY = 5
+    #: seconds a wait_for_pools call lets the server wait, the server caps it at 25
+    POOL_WAIT = 25
 
     @property
     def api_entry(self):
         return "{}://{}:{}/{}".format(self._proto, self._host, self._port, self._entry)
 
-    def _post(self, **data):
-        return requests.post(self.api_entry, data=json.dumps(data))
-
-    def _call_post(self, **data):
+    @property
+    def session(self):
+        """The keep-alive session used for all the calls"""
+        if self._session is None:
+            session = requests.Session()
+            retry = Retry(
+                total=self.RETRIES, read=0, backoff_factor=self.RETRY_BACKOFF,
+                status_forcelist=(502, 503), method_whitelist=frozenset(['POST']),
+                raise_on_status=False)
+            session.mount('http://', HTTPAdapter(max_retries=retry))
+            session.mount('https://', HTTPAdapter(max_retries=retry))
+            self._session = session
+        return self._session
+
+    def _post(self, timeout=None, **data):
+        return self.session.post(self.api_entry, data=json.dumps(data), timeout=timeout)
+
+    def _call_post(self, timeout=None, **data):
         """Protect from the Sprout being updated (error 502,503)"""
         result = wait_for(
-            lambda: self._post(**data),
+            lambda: self._post(timeout=timeout, **data),
             num_sec=60,
             fail_condition=lambda r: r.status_code in {502, 503},
             delay=2,
@@ -57,6 +89,9 @@ class SproutClient(object):
         return result.out.json()
 
     def call_method(self, name, *args, **kwargs):
+        return self._call_method(name, args, kwargs)
+
+    def _call_method(self, name, args, kwargs, timeout=None):
         req_data = {
             "method": name,
             "args": args,
@@ -65,9 +100,12 @@ class SproutClient(object):
         logger.info("SPROUT: Called {} with {} {}".format(name, args, kwargs))
         if self._auth is not None:
             req_data["auth"] = self._auth
-        result = self._call_post(**req_data)
+        result = self._call_post(timeout=timeout, **req_data)
         try:
             if result["status"] == "exception":
+                if (result["result"]["class"] == "NameError" and
+                        result["result"]["message"] == "Method {} not found!".format(name)):
+                    raise UnknownMethodException(result["result"]["message"])
                 raise SproutException(
                     "Exception {} raised! {}".format(
                         result["result"]["class"], result["result"]["message"]))
@@ -82,6 +120,56 @@ class SproutClient(object):
     def __getattr__(self, attr):
         return APIMethodCall(self, attr)
 
+    def check_pools(self, pool_ids):
+        """request_check of several pools in one call, ``{pool_id: status}``"""
+        try:
+            statuses = self.call_method(
+                'request_check_many', [str(pool_id) for pool_id in pool_ids])
+        except UnknownMethodException:
+            return {
+                pool_id: self.call_method('request_check', str(pool_id)) for pool_id in pool_ids}
+        return {pool_id: statuses[str(pool_id)] for pool_id in pool_ids}
+
+    def wait_for_pools(self, pool_ids, versions=None, timeout=POOL_WAIT):
+        """Statuses of the pools once one of them changes
+
+        The server holds the call until a pool changes since ``versions``, returned by the
+        previous call, or for ``timeout`` seconds. Without ``versions`` it returns right away.
+        Older servers are polled every :py:attr:`POLL_DELAY` instead.
+
+        Returns:
+            ``({pool_id: status}, versions)``
+        """
+        if self._long_poll:
+            try:
+                result = self._call_method(
+                    'wait_for_pools', ([str(pool_id) for pool_id in pool_ids],),
+                    {'versions': versions or {}, 'timeout': timeout},
+                    timeout=timeout + 30)
+            except UnknownMethodException:
+                logger.info("SPROUT: the server can't wait for pools, polling them")
+                self._long_poll = False
+            else:
+                statuses = {pool_id: result['pools'][str(pool_id)] for pool_id in pool_ids}
+                return statuses, result['versions']
+        if versions is not None:
+            time.sleep(self.POLL_DELAY)
+        return self.check_pools(pool_ids), {}
+
+    def wait_for_pool_finished(self, pool_id, num_sec):
+        """Waits for the pool to be provisioned, returns its last status"""
+        versions = None
+
+        def _check():
+            nonlocal versions
+            statuses, versions = self.wait_for_pools([pool_id], versions)
+            return statuses[pool_id]
+
+        status = wait_for(
+            _check, fail_condition=lambda status: not status['finished'], num_sec=num_sec,
+            delay=0, message='pool {} to be finished'.format(pool_id))
+        return status.out
+
     @classmethod
     def from_config(cls, **kwargs):
         host = env.get("sprout", {}).get("hostname", "localhost")
@@ -124,11 +212,7 @@ class SproutClient(object):
             count=count,
             **kwargs
         )
-        wait_for(
-            lambda: self.call_method('request_check', str(request_id))['finished'],
-            num_sec=wait_time,
-            message='provision {} appliance(s) from sprout'.format(count))
-        data = self.call_method('request_check', str(request_id))
+        data = self.wait_for_pool_finished(request_id, wait_time)
         logger.debug(data)
         appliances = []
         for appliance in data['appliances']:
@@ -241,6 +241,7 @@ class SproutManager(object):
     pool = attr.ib(init=False, default=None)
     lease_time = attr.ib(init=False, default=None, repr=False)
     timer = attr.ib(init=False, default=None, repr=False)
+    pool_versions = attr.ib(init=False, default=None, repr=False)
 
     @cached_property
     def client(self):
@@ -254,7 +255,8 @@ class SproutManager(object):
             result = wait_for(
                 self.check_fullfilled,
                 num_sec=provision_request.provision_timeout * 60,
-                delay=5,
+                # check_fullfilled waits for the pool to change
+                delay=0,
                 message="requesting appliances was fulfilled"
             )
         except Exception:
@@ -314,7 +316,9 @@ class SproutManager(object):
 
     def check_fullfilled(self):
         try:
-            result = self.request_check()
+            statuses, self.pool_versions = self.client.wait_for_pools(
+                [self.pool], self.pool_versions)
+            result = statuses[self.pool]
         except SproutException as e:
             # TODO: ensure we only exit this way on sprout usage
             self.destroy_pool()
@@ -8,6 +8,7 @@ from cfme.utils.grafana import get_scenario_dashboard_urls
 from cfme.utils.log import logger
 from cfme.utils.providers import get_crud
 from cfme.utils.smem_memory_monitor import add_workload_quantifiers
+from cfme.utils.smem_memory_monitor import memory_monitor_settings
 from cfme.utils.smem_memory_monitor import SmemMemoryMonitor
 from cfme.utils.workloads import get_capacity_and_utilization_scenarios
 
@@ -40,7 +41,8 @@ def test_workload_capacity_and_utilization(request, scenario, appliance):
         'test_name': 'Capacity and Utilization',
         'appliance_roles': ','.join(roles_cap_and_util),
         'scenario': scenario}
-    monitor_thread = SmemMemoryMonitor(appliance.ssh_client, scenario_data)
+    monitor_thread = SmemMemoryMonitor(appliance.ssh_client, scenario_data,
+        **memory_monitor_settings())
 
     def cleanup_workload(scenario, from_ts, quantifiers, scenario_data):
         starttime = time.time()
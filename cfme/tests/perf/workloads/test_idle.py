@@ -7,6 +7,7 @@ from cfme.utils.conf import cfme_performance
 from cfme.utils.grafana import get_scenario_dashboard_urls
 from cfme.utils.log import logger
 from cfme.utils.smem_memory_monitor import add_workload_quantifiers
+from cfme.utils.smem_memory_monitor import memory_monitor_settings
 from cfme.utils.smem_memory_monitor import SmemMemoryMonitor
 from cfme.utils.workloads import get_idle_scenarios
 
@@ -39,7 +40,8 @@ def test_idle(appliance, request, scenario):
         'test_name': 'Idle with {} Roles'.format(scenario['name']),
         'appliance_roles': ', '.join(scenario['roles']),
         'scenario': scenario}
-    monitor_thread = SmemMemoryMonitor(appliance.ssh_client(), scenario_data)
+    monitor_thread = SmemMemoryMonitor(appliance.ssh_client(), scenario_data,
+        **memory_monitor_settings())
 
     def cleanup_workload(from_ts, quantifiers, scenario_data):
         starttime = time.time()
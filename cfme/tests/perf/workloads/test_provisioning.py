@@ -12,6 +12,7 @@ from cfme.utils.log import logger
 from cfme.utils.providers import get_crud
 from cfme.utils.rest import assert_response
 from cfme.utils.smem_memory_monitor import add_workload_quantifiers
+from cfme.utils.smem_memory_monitor import memory_monitor_settings
 from cfme.utils.smem_memory_monitor import SmemMemoryMonitor
 from cfme.utils.smem_memory_monitor import test_ts
 from cfme.utils.wait import wait_for
@@ -97,7 +98,8 @@ def test_provisioning(appliance, request, scenario):
         'test_name': 'Provisioning',
         'appliance_roles': ', '.join(roles_provisioning),
         'scenario': scenario}
-    monitor_thread = SmemMemoryMonitor(appliance.ssh_client(), scenario_data)
+    monitor_thread = SmemMemoryMonitor(appliance.ssh_client(), scenario_data,
+        **memory_monitor_settings())
 
     provision_order = []
 
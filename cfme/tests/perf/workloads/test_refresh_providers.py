@@ -9,6 +9,7 @@ from cfme.utils.grafana import get_scenario_dashboard_urls
 from cfme.utils.log import logger
 from cfme.utils.providers import get_crud
 from cfme.utils.smem_memory_monitor import add_workload_quantifiers
+from cfme.utils.smem_memory_monitor import memory_monitor_settings
 from cfme.utils.smem_memory_monitor import SmemMemoryMonitor
 from cfme.utils.workloads import get_refresh_providers_scenarios
 
@@ -42,7 +43,8 @@ def test_refresh_providers(appliance, request, scenario):
         'appliance_roles': ', '.join(roles_refresh_providers),
         'scenario': scenario
     }
-    monitor_thread = SmemMemoryMonitor(appliance.ssh_client(), scenario_data)
+    monitor_thread = SmemMemoryMonitor(appliance.ssh_client(), scenario_data,
+        **memory_monitor_settings())
 
     def cleanup_workload(scenario, from_ts, quantifiers, scenario_data):
         starttime = time.time()
@@ -7,6 +7,7 @@ import traceback
 import warnings
 from copy import copy
 from datetime import datetime
+from multiprocessing.pool import ThreadPool
 from time import sleep
 from time import time
 from urllib.parse import urlparse
@@ -22,6 +23,7 @@ from cached_property import cached_property
 from debtcollector import removals
 from manageiq_client.api import APIException
 from manageiq_client.api import ManageIQClient as VanillaMiqApi
+from requests.adapters import HTTPAdapter
 from urllib3.exceptions import ConnectionError
 from werkzeug.local import LocalProxy
 from werkzeug.local import LocalStack
@@ -84,6 +86,113 @@ current_miqqe_version = _current_miqqe_version()
 
 
 class MiqApi(VanillaMiqApi):
+    #: connections kept open to the appliance, at least as many as :py:attr:`BULK_WORKERS`
+    POOL_SIZE = 16
+    #: resources fetched per request by :py:meth:`iter_resources`
+    PAGE_SIZE = 1000
+    #: requests :py:meth:`iter_resources` and :py:meth:`get_resources` run concurrently
+    BULK_WORKERS = 4
+    #: ids looked up per request by :py:meth:`get_resources`
+    IDS_PER_REQUEST = 100
+
+    def __init__(self, *args, **kwargs):
+        super(MiqApi, self).__init__(*args, **kwargs)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_SIZE)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+    def _get_page(self, collection, params, offset):
+        return self.get(collection._href, offset=offset, **params)
+
+    def _map_pages(self, func, args, workers):
+        """Yields the results of ``func`` over ``args``, in order, running ``workers`` at once"""
+        workers = min(workers, len(args))
+        if workers <= 1:
+            for arg in args:
+                yield func(arg)
+            return
+        with ThreadPool(workers) as pool:
+            for result in pool.imap(func, args):
+                yield result
+
+    def iter_resources(self, collection, attributes=None, filters=None, page_size=None,
+                       workers=None):
+        """Streams the resources of a collection a page at a time
+
+        Only the ``attributes`` asked for (and ``id``, ``href``) are fetched. The first page tells
+        how many resources there are, the remaining pages are then fetched ``workers`` at a time
+        and yielded in the order of the collection as they arrive.
+
+        Args:
+            collection: :py:class:`manageiq_client.api.Collection` to read
+            attributes: list of attributes to fetch for every resource
+            filters: list of ``filter[]`` expressions
+            page_size: resources per request, :py:attr:`PAGE_SIZE` by default
+            workers: concurrent requests, :py:attr:`BULK_WORKERS` by default
+        Yields:
+            resources as ``dict``
+        """
+        page_size = page_size or self.PAGE_SIZE
+        params = {'expand': 'resources', 'limit': page_size}
+        if attributes:
+            params['attributes'] = ','.join(['id'] + [a for a in attributes if a != 'id'])
+        if filters:
+            params['filter[]'] = filters
+
+        data = self._get_page(collection, params, 0)
+        page = data['resources']
+        yield from page
+        if len(page) < page_size:
+            return
+
+        # count is the size of the whole collection, subquery_count that of the filtered one
+        total = data.get('subquery_count', None if filters else data.get('count'))
+        if total is None:
+            # filtered on a version that doesn't tell how many resources matched
+            offset = page_size
+            while len(page) == page_size:
+                page = self._get_page(collection, params, offset)['resources']
+                yield from page
+                offset += page_size
+            return
+
+        offsets = list(range(page_size, total, page_size))
+        pages = self._map_pages(
+            lambda offset: self._get_page(collection, params, offset), offsets,
+            workers or self.BULK_WORKERS)
+        for data in pages:
+            yield from data['resources']
+
+    def get_resources(self, collection, ids, attributes=None, workers=None):
+        """Looks up the resources of many ids at once
+
+        The ids are requested :py:attr:`IDS_PER_REQUEST` at a time, ``workers`` requests at once.
+
+        Args:
+            collection: :py:class:`manageiq_client.api.Collection` to read
+            ids: ids of the resources
+            attributes: list of attributes to fetch for every resource
+            workers: concurrent requests, :py:attr:`BULK_WORKERS` by default
+        Returns:
+            ``{id: resource}`` of the ids that exist, ids as given
+        """
+        ids = list(ids)
+        by_id = {str(resource_id): resource_id for resource_id in ids}
+        chunks = [ids[start:start + self.IDS_PER_REQUEST]
+                  for start in range(0, len(ids), self.IDS_PER_REQUEST)]
+
+        def fetch(chunk):
+            filters = ['id={}'.format(chunk[0])]
+            filters.extend('or id={}'.format(resource_id) for resource_id in chunk[1:])
+            return list(self.iter_resources(
+                collection, attributes=attributes, filters=filters, workers=1))
+
+        resources = {}
+        for chunk in self._map_pages(fetch, chunks, workers or self.BULK_WORKERS):
+            for resource in chunk:
+                resources[by_id.get(str(resource['id']), resource['id'])] = resource
+        return resources
+
     def get_entity_by_href(self, href):
         """Parses the collections"""
         parsed = urlparse(href)
@@ -2144,7 +2253,7 @@ ExecStartPre=/usr/bin/bash -c "ipcs -s|grep apache|cut -d\  -f2|while read line;
         """
         if evm_tail is None:
             logger.info('Opening /var/www/miq/vmdb/log/evm.log for tail')
-            evm_tail = SSHTail('/var/www/miq/vmdb/log/evm.log')
+            evm_tail = SSHTail.shared('/var/www/miq/vmdb/log/evm.log')
             evm_tail.set_initial_file_end()
 
         attempts = 0
@@ -1,9 +1,13 @@
 import json
 import os
+import re
 import time
+from collections import Counter
+from datetime import timedelta
 from inspect import isclass
 from time import sleep
 
+import attr
 from cached_property import cached_property
 from jsmin import jsmin
 from navmazing import Navigate
@@ -24,6 +28,7 @@ from widgetastic_patternfly import CandidateNotFound
 
 from cfme import exceptions
 from cfme.fixtures.pytest_store import store
+from cfme.utils import conf
 from cfme.utils.appliance.implementations import Implementation
 from cfme.utils.appliance.implementations.common import HandleModalsMixin
 from cfme.utils.browser import manager
@@ -61,6 +66,57 @@ class ErrorView(View):
         return None
 
 
+#: ``browser: page_safe:`` values in env.yaml; ``poll`` runs the page safety check every 0.2s,
+#: ``idle`` waits for the page in a single asynchronous script call
+PAGE_SAFE_MODES = ('poll', 'idle')
+
+
+def timeout_seconds(timeout):
+    """Seconds of a ``wait_for`` style timeout: a number, a timedelta or e.g. ``'20s'``/``'2m'``"""
+    if isinstance(timeout, timedelta):
+        return timeout.total_seconds()
+    if isinstance(timeout, (int, float)):
+        return float(timeout)
+    match = re.match(r'^\s*(\d+(?:\.\d+)?)\s*(s|sec|m|min|h)?\s*$', timeout)
+    if match is None:
+        raise ValueError('Could not parse timeout {!r}'.format(timeout))
+    value, unit = match.groups()
+    return float(value) * {'m': 60, 'min': 60, 'h': 3600}.get(unit, 1)
+
+
+@attr.s
+class PageSafeTimings(object):
+    """Number of calls and seconds spent in each kind of wait of :py:class:`MiqBrowserPlugin`
+
+    Kinds are ``ensure_page_safe``, ``before_keyboard_input`` and ``after_keyboard_input``. Reset
+    before and print after e.g. a form fill to see what the waits cost::
+
+        plugin = appliance.browser.widgetastic.plugin
+        plugin.timings.reset()
+        view.fill(values)
+        logger.info('%s', plugin.timings)
+    """
+    calls = attr.ib(default=attr.Factory(Counter))
+    seconds = attr.ib(default=attr.Factory(Counter))
+
+    def record(self, kind, seconds):
+        self.calls[kind] += 1
+        self.seconds[kind] += seconds
+
+    def reset(self):
+        self.calls.clear()
+        self.seconds.clear()
+
+    @property
+    def total(self):
+        return sum(self.seconds.values())
+
+    def __str__(self):
+        return ', '.join(
+            '{}: {} calls {:.2f}s'.format(kind, self.calls[kind], self.seconds[kind])
+            for kind in sorted(self.calls)) or 'no waits'
+
+
 class MiqBrowserPlugin(DefaultPlugin):
     # Here we dismiss notifications as they obscure lower elements which need to be clicked on
     # We don't bother iterating and instead choose [0] and [1] to simplify the codepath
@@ -120,6 +176,91 @@ class MiqBrowserPlugin(DefaultPlugin):
         }
         ''')
 
+    # Installed once per page load in ``idle`` mode. Runs the ENSURE_PAGE_SAFE check in the page
+    # whenever the DOM changes or a request finishes (and every 50ms, as not everything the check
+    # looks at raises events) and resolves the promises of the waiting scripts once it passes.
+    IDLE_TRACKER = jsmin('''\
+        if (typeof window.cfmeQeIdle === "undefined") {
+            window.cfmeQeIdle = (function() {
+                function isSafe() {''' + ENSURE_PAGE_SAFE + '''}
+                var waiting = [];
+                var scheduled = null;
+
+                function check() {
+                    scheduled = null;
+                    var safe = false;
+                    try {
+                        safe = !!isSafe();
+                    } catch(err) {
+                    }
+                    var now = Date.now();
+                    waiting = waiting.filter(function(waiter) {
+                        if (safe && now >= waiter.earliest) {
+                            waiter.resolve({safe: true, waited: now - waiter.start});
+                        } else if (now >= waiter.deadline) {
+                            waiter.resolve({safe: false, waited: now - waiter.start});
+                        } else {
+                            return true;
+                        }
+                        return false;
+                    });
+                    if (waiting.length) {
+                        schedule(50);
+                    }
+                }
+
+                function schedule(delay) {
+                    if (scheduled !== null) {
+                        if (delay) {
+                            return;
+                        }
+                        clearTimeout(scheduled);
+                    }
+                    scheduled = setTimeout(check, delay);
+                }
+
+                new MutationObserver(function() {
+                    if (waiting.length) {
+                        schedule(0);
+                    }
+                }).observe(document, {
+                    childList: true, subtree: true, attributes: true, characterData: true});
+
+                var send = XMLHttpRequest.prototype.send;
+                XMLHttpRequest.prototype.send = function() {
+                    this.addEventListener("loadend", function() {
+                        if (waiting.length) {
+                            schedule(0);
+                        }
+                    });
+                    return send.apply(this, arguments);
+                };
+
+                return {
+                    wait: function(timeout, minWait) {
+                        return new Promise(function(resolve) {
+                            var start = Date.now();
+                            waiting.push({
+                                resolve: resolve, start: start,
+                                earliest: start + minWait, deadline: start + timeout});
+                            schedule(0);
+                        });
+                    }
+                };
+            })();
+        }
+        ''')
+
+    # Resolves with null when the page was (re)loaded and the tracker needs to be installed
+    IDLE_WAIT = jsmin('''\
+        var done = arguments[arguments.length - 1];
+        if (typeof window.cfmeQeIdle === "undefined") {
+            done(null);
+        } else {
+            window.cfmeQeIdle.wait(arguments[0], arguments[1]).then(done);
+        }
+        ''')
+
     OBSERVED_FIELD_MARKERS = (
         'data-miq_observe',
         'data-miq_observe_date',
@@ -127,6 +268,15 @@ class MiqBrowserPlugin(DefaultPlugin):
     )
     DEFAULT_WAIT = .8
 
+    def __init__(self, browser):
+        super(MiqBrowserPlugin, self).__init__(browser)
+        self.page_safe_mode = conf.env.get('browser', {}).get('page_safe', 'poll')
+        if self.page_safe_mode not in PAGE_SAFE_MODES:
+            raise ValueError('browser page_safe must be one of {}, not {!r}'.format(
+                PAGE_SAFE_MODES, self.page_safe_mode))
+        self.timings = PageSafeTimings()
+        self._script_timeout = None
+
     @property
     def page_has_changes(self):
         """Checks whether current page has any changes which may lead to "Abandon Changes" alert """
@@ -180,16 +330,57 @@ class MiqBrowserPlugin(DefaultPlugin):
 
     def ensure_page_safe(self, timeout='20s'):
         # THIS ONE SHOULD ALWAYS USE JAVASCRIPT ONLY, NO OTHER SELENIUM INTERACTION
+        start = time.time()
+        try:
+            if self.page_safe_mode == 'idle' and self.wait_for_idle(timeout) is not None:
+                return
+            self._poll_page_safe(timeout)
+        finally:
+            self.timings.record('ensure_page_safe', time.time() - start)
+
+    def _poll_page_safe(self, timeout):
         def _check():
             result = self.browser.execute_script(self.ENSURE_PAGE_SAFE, silent=True)
             # TODO: Logging
             return bool(result)
         wait_for(_check, timeout=timeout, delay=0.2, silent_failure=True, very_quiet=True)
 
+    def wait_for_idle(self, timeout='20s', min_wait=0):
+        """Waits in the page until the ENSURE_PAGE_SAFE check passes, in one WebDriver call
+
+        Args:
+            timeout: how long to wait for the page
+            min_wait: seconds to wait at least, e.g. for the debounce of an observed field
+        Returns:
+            Whether the page became safe, or ``None`` if the page could not be waited for this way
+            (e.g. it was unloaded while waiting) and has to be polled.
+        """
+        timeout = timeout_seconds(timeout)
+        script_timeout = timeout + 5
+        selenium = self.browser.selenium
+        try:
+            if self._script_timeout != script_timeout:
+                selenium.set_script_timeout(script_timeout)
+                self._script_timeout = script_timeout
+            args = (int(timeout * 1000), int(min_wait * 1000))
+            result = selenium.execute_async_script(self.IDLE_WAIT, *args)
+            if result is None:
+                # new page, install the tracker
+                selenium.execute_script(self.IDLE_TRACKER)
+                result = selenium.execute_async_script(self.IDLE_WAIT, *args)
+        except WebDriverException as e:
+            self.logger.debug('waiting for idle page failed, polling instead: %s', e)
+            return None
+        if result is None:
+            return None
+        if not result['safe']:
+            self.logger.warning('page not safe after %.1fs', result['waited'] / 1000.0)
+        return result['safe']
+
     def after_keyboard_input(self, element, keyboard_input):
         observed_field_attr = None
-        for attr in self.OBSERVED_FIELD_MARKERS:
-            observed_field_attr = self.browser.get_attribute(attr, element)
+        for marker in self.OBSERVED_FIELD_MARKERS:
+            observed_field_attr = self.browser.get_attribute(marker, element)
             if observed_field_attr is not None:
                 break
         else:
@@ -197,27 +388,34 @@ class MiqBrowserPlugin(DefaultPlugin):
 
         try:
             attr_dict = json.loads(observed_field_attr)
-            interval = float(attr_dict.get('interval', self.DEFAULT_WAIT))
+            field_interval = float(attr_dict.get('interval', self.DEFAULT_WAIT))
             # Pad the detected interval, as with default_wait
-            if interval < self.DEFAULT_WAIT:
-                interval = self.DEFAULT_WAIT
+            interval = max(field_interval, self.DEFAULT_WAIT)
         except (TypeError, ValueError):
             # ValueError and TypeError happens if the attribute value couldn't be decoded as JSON
             # ValueError also happens if interval couldn't be coerced to float
             # In either case, we've detected an observed text field and should wait
             self.logger.warning('could not parse %r', observed_field_attr)
-            interval = self.DEFAULT_WAIT
-
-        self.logger.debug('observed field detected, pausing for %.1f seconds', interval)
-        time.sleep(interval)
-        self.browser.plugin.ensure_page_safe()
+            field_interval = interval = self.DEFAULT_WAIT
+
+        start = time.time()
+        # In idle mode the page tells when the observe request went through, so only the field's
+        # own interval has to pass, without padding
+        if self.page_safe_mode != 'idle' or self.wait_for_idle(min_wait=field_interval) is None:
+            self.logger.debug('observed field detected, pausing for %.1f seconds', interval)
+            time.sleep(interval)
+            self._poll_page_safe('20s')
+        self.timings.record('after_keyboard_input', time.time() - start)
         self.make_document_focused()
 
     def before_keyboard_input(self, element, keyboard_input):
         # there is an issue in different dialogs
         # when cfme doesn't see that some input fields have been updated
         # this is temporary fix until we figure out real reason and fix it
-        sleep(0.3)
+        start = time.time()
+        if self.page_safe_mode != 'idle' or self.wait_for_idle() is None:
+            sleep(0.3)
+        self.timings.record('before_keyboard_input', time.time() - start)
         self.make_document_focused()
 
     def before_click(self, element, locator):
@@ -266,6 +464,82 @@ class MiqBrowser(HandleModalsMixin, Browser):
         return self.appliance.version
 
 
+@attr.s
+class NavigationUrlCache(object):
+    """URLs successful navigations ended at, to go straight there the next time
+
+    Keyed by ``(appliance, object, destination)``. A URL is only used while it belongs to a single
+    key and stays the same: explorer pages keep their tree state in the session, so all the
+    destinations of an explorer end at the same URL and going to it doesn't say which one shows.
+    A key whose URL fails to show the view :py:attr:`MAX_FAILURES` times in a row is dropped.
+    """
+    MAX_FAILURES = 2
+
+    urls = attr.ib(default=attr.Factory(dict))
+    owners = attr.ib(default=attr.Factory(dict))
+    failures = attr.ib(default=attr.Factory(Counter))
+    unusable = attr.ib(default=attr.Factory(set))
+
+    def get(self, key):
+        return self.urls.get(key)
+
+    def record(self, key, url):
+        if key in self.unusable:
+            return
+        owner = self.owners.setdefault(url, key)
+        if owner != key:
+            self.discard(owner)
+            self.discard(key)
+        elif self.urls.setdefault(key, url) != url:
+            self.discard(key)
+
+    def succeeded(self, key):
+        self.failures.pop(key, None)
+
+    def failed(self, key):
+        self.failures[key] += 1
+        if self.failures[key] >= self.MAX_FAILURES:
+            self.discard(key)
+
+    def discard(self, key):
+        # the URL stays owned by the key, so that it's never used for another one
+        self.unusable.add(key)
+        self.urls.pop(key, None)
+
+
+@attr.s
+class NavigationStats(object):
+    """Number of navigations and seconds spent per destination and way of getting there
+
+    Ways are ``here`` (no navigation needed), ``url`` (went to the cached URL), ``walk``
+    (navigated through the prerequisites) and ``url+walk`` (the cached URL failed).
+    """
+    calls = attr.ib(default=attr.Factory(Counter))
+    seconds = attr.ib(default=attr.Factory(Counter))
+
+    def record(self, destination, way, seconds):
+        self.calls[destination, way] += 1
+        self.seconds[destination, way] += seconds
+
+    def rows(self):
+        """``(destination, way, calls, total seconds, mean seconds)``, slowest total first"""
+        return sorted(
+            ((destination, way, calls, self.seconds[destination, way],
+              self.seconds[destination, way] / calls)
+             for (destination, way), calls in self.calls.items()),
+            key=lambda row: (-row[3], row[0], row[1]))
+
+    def write_csv(self, csv_file):
+        csv_file.write('destination,way,calls,seconds,mean\n')
+        for row in self.rows():
+            csv_file.write('{},{},{},{:.3f},{:.3f}\n'.format(*row))
+
+
+#: Shared by all navigations; only used with ``navigation_cache: true`` in env.yaml ``browser:``
+navigation_urls = NavigationUrlCache()
+navigation_stats = NavigationStats()
+
+
 def can_skip_badness_test(fn):
     """Decorator for setting a noop"""
     fn._can_skip_badness_test = True
@@ -274,6 +548,10 @@ def can_skip_badness_test(fn):
 
 class CFMENavigateStep(NavigateStep):
     VIEW = None
+    #: Whether the URL this step ends at may be cached and navigated to directly, only set it on
+    #: steps whose ``step`` just navigates, e.g. selects a menu item. Anything else the step does,
+    #: like clearing a search or selecting in a tree, is skipped when going by the URL.
+    URL_CACHEABLE = False
 
     @cached_property
     def view(self):
@@ -521,11 +799,50 @@ class CFMENavigateStep(NavigateStep):
     def post_navigate(self, *args, **kwargs):
         pass
 
-    def log_message(self, msg, level="debug"):
+    @property
+    def destination(self):
         class_name = self.obj.__name__ if isclass(self.obj) else self.obj.__class__.__name__
-        str_msg = "[UI-NAV/{}/{}]: {}".format(class_name, self._name, msg)
+        return "{}/{}".format(class_name, self._name)
+
+    def log_message(self, msg, level="debug"):
+        str_msg = "[UI-NAV/{}]: {}".format(self.destination, msg)
         getattr(logger, level)(str_msg)
 
+    def url_cache_key(self, *args, **kwargs):
+        """Key of this destination in :py:data:`navigation_urls`, None if it's not cacheable
+
+        Navigations with step arguments are not cached, the arguments may change where the step
+        ends up without changing the view.
+        """
+        if (self.VIEW is None or not self.URL_CACHEABLE or args or kwargs or
+                not conf.env.get('browser', {}).get('navigation_cache', False)):
+            return None
+        appliance = getattr(self.obj, 'appliance', None)
+        obj = self.obj.__name__ if isclass(self.obj) else repr(self.obj)
+        return getattr(appliance, 'hostname', None), obj, self._name
+
+    def go_by_url(self, key):
+        """Goes straight to the URL of an earlier navigation to this destination
+
+        Returns:
+            Whether the view is displayed there
+        """
+        url = navigation_urls.get(key)
+        br = self.appliance.browser.widgetastic
+        try:
+            br.url = url
+            br.plugin.ensure_page_safe()
+            displayed = self.view.is_displayed
+        except (NoSuchElementException, NotImplementedError, WebDriverException) as e:
+            self.log_message("Checking the view at {} failed: {}".format(url, e))
+            displayed = False
+        if displayed:
+            navigation_urls.succeeded(key)
+        else:
+            self.log_message("View not displayed at {}, navigating".format(url), level="info")
+            navigation_urls.failed(key)
+        return displayed
+
     def construct_message(self, here, resetter, view, duration, waited, force):
         str_here = "Already Here" if here else "Needed Navigation"
         str_resetter = "Resetter Used" if resetter else "No Resetter"
@@ -565,20 +882,29 @@ class CFMENavigateStep(NavigateStep):
         except Exception as e:
             self.log_message(
                 "Exception raised [{}] whilst checking if already here".format(e), level="error")
+        cache_key = self.url_cache_key(*args, **kwargs)
+        way = 'here'
         if not here or nav_args['force']:
             if nav_args['force']:
                 force_used = True
-            self.log_message("Prerequisite Needed")
-            self.prerequisite_view = self.prerequisite()
-            try:
-                self.check_for_badness(self.step, _tries, nav_args, *args, **kwargs)
-            except (CandidateNotFound, exceptions.ItemNotFound) as e:
-                self.log_message(
-                    "Item/Tree Exception raised [{}] whilst running step, trying refresh"
-                    .format(e), level="error"
-                )
-                self.appliance.browser.widgetastic.refresh()
-                self.check_for_badness(self.step, _tries, nav_args, *args, **kwargs)
+            try_url = (
+                cache_key is not None and not force_used and
+                navigation_urls.get(cache_key) is not None)
+            if try_url and self.go_by_url(cache_key):
+                way = 'url'
+            else:
+                way = 'url+walk' if try_url else 'walk'
+                self.log_message("Prerequisite Needed")
+                self.prerequisite_view = self.prerequisite()
+                try:
+                    self.check_for_badness(self.step, _tries, nav_args, *args, **kwargs)
+                except (CandidateNotFound, exceptions.ItemNotFound) as e:
+                    self.log_message(
+                        "Item/Tree Exception raised [{}] whilst running step, trying refresh"
+                        .format(e), level="error"
+                    )
+                    self.appliance.browser.widgetastic.refresh()
+                    self.check_for_badness(self.step, _tries, nav_args, *args, **kwargs)
         if nav_args['use_resetter']:
             resetter_used = True
             self.check_for_badness(self.resetter, _tries, nav_args, *args, **kwargs)
@@ -592,6 +918,9 @@ class CFMENavigateStep(NavigateStep):
                 lambda: view.is_displayed, num_sec=nav_args['wait_for_view'],
                 message="Waiting for view [{}] to display".format(view.__class__.__name__)
             )
+            if cache_key is not None and way != 'url':
+                navigation_urls.record(cache_key, self.appliance.browser.widgetastic.url)
+        navigation_stats.record(self.destination, way, time.time() - start_time)
         self.log_message(
             self.construct_message(here, resetter_used, view, duration, waited, force_used),
             level="info"
@@ -1,6 +1,12 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import weakref
 from collections.abc import Mapping
 from contextlib import contextmanager
 
+import sqlalchemy
 from cached_property import cached_property
 from sqlalchemy import create_engine
 from sqlalchemy import event
@@ -9,6 +15,7 @@ from sqlalchemy import MetaData
 from sqlalchemy.exc import ArgumentError
 from sqlalchemy.exc import DisconnectionError
 from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import Pool
@@ -17,6 +24,32 @@ from sqlalchemy.sql.schema import PrimaryKeyConstraint
 from cfme.fixtures.pytest_store import store
 from cfme.utils import conf
 from cfme.utils.log import logger
+from cfme.utils.path import cache_path
+
+#: where reflected schemas are pickled, one file per schema key
+SCHEMA_CACHE_DIR = cache_path.join('db_schema')
+
+# Everything that changes the schema: the rails migrations applied and the appliance builds, plus
+# the SQLAlchemy version the metadata is pickled with
+SCHEMA_KEY_QUERY = """
+SELECT
+    (SELECT max(version) FROM schema_migrations),
+    (SELECT count(*) FROM schema_migrations),
+    (SELECT string_agg(DISTINCT concat(version, '-', build), ',') FROM miq_servers)
+"""
+
+# Dbs that reflected tables since they last saved their schema cache, by id as Db isn't hashable
+_unsaved_schemas = weakref.WeakValueDictionary()
+
+
+def save_schema_caches():
+    """Save the schema cache of every :py:class:`Db` that reflected tables since its last save
+
+    Called at the end of the session, so that the tables reflected one by one during the session
+    are written once.
+    """
+    for db in list(_unsaved_schemas.values()):
+        db.save_metadata()
 
 
 @event.listens_for(Pool, "checkout")
@@ -73,9 +106,16 @@ class Db(Mapping):
         a latent connection, this can be extremely slow, which will affect methods that return
         tables, like the mapping interface or :py:meth:`values`.
 
+        To avoid that, reflected tables are pickled to :py:data:`SCHEMA_CACHE_DIR`, keyed by
+        :py:attr:`schema_key`, and loaded from there by the next Db of an appliance with the
+        same schema. :py:meth:`reflect_all` reflects every table at once to fill the cache, tables
+        reflected one by one are saved at the end of the session by :py:func:`save_schema_caches`.
+        Pass ``schema_cache=False`` to always reflect from the database.
+
     """
-    def __init__(self, hostname=None, credentials=None, port=None):
+    def __init__(self, hostname=None, credentials=None, port=None, schema_cache=True):
         self._table_cache = {}
+        self.schema_cache = schema_cache
         self.hostname = hostname or store.current_appliance.db.address
         self.port = port or store.current_appliance.db_port
 
@@ -191,7 +231,67 @@ class Db(Mapping):
             use :py:meth:`reflect_table`.
 
         """
-        return MetaData(bind=self.engine)
+        metadata = self._load_metadata()
+        if metadata is None:
+            metadata = MetaData()
+        metadata.bind = self.engine
+        return metadata
+
+    @cached_property
+    def schema_key(self):
+        """Hash of the schema migration and appliance versions of this database
+
+        ``None`` if it couldn't be determined (e.g. not a CFME database), which disables the schema
+        cache.
+        """
+        try:
+            row = self.engine.execute(SCHEMA_KEY_QUERY).first()
+        except SQLAlchemyError as e:
+            logger.warning('[DB] could not determine the schema version: %s', e)
+            return None
+        if row is None or row[0] is None:
+            return None
+        key = '{}:{}:{}:{}'.format(row[0], row[1], row[2], sqlalchemy.__version__)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+    @property
+    def schema_cache_file(self):
+        """Pickled metadata of this database's schema, ``None`` when not caching"""
+        if not self.schema_cache or self.schema_key is None:
+            return None
+        return SCHEMA_CACHE_DIR.join('{}.pickle'.format(self.schema_key))
+
+    def _load_metadata(self):
+        cache_file = self.schema_cache_file
+        if cache_file is None or not cache_file.check(file=True):
+            return None
+        try:
+            with cache_file.open('rb') as f:
+                metadata = pickle.load(f)
+        except Exception as e:
+            # corrupt or incompatible, reflect again and overwrite it
+            logger.warning('[DB] could not load the schema cache %s: %s', cache_file, e)
+            return None
+        logger.info('[DB] loaded %d tables from %s', len(metadata.tables), cache_file)
+        return metadata
+
+    def save_metadata(self):
+        """Pickle the tables reflected so far to :py:attr:`schema_cache_file`"""
+        _unsaved_schemas.pop(id(self), None)
+        cache_file = self.schema_cache_file
+        if cache_file is None:
+            return
+        SCHEMA_CACHE_DIR.ensure(dir=True)
+        # Several pytest processes may write the same schema, replace the file atomically
+        fd, tmp_name = tempfile.mkstemp(dir=str(SCHEMA_CACHE_DIR), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(self.metadata, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, str(cache_file))
+        except Exception as e:
+            logger.warning('[DB] could not save the schema cache %s: %s', cache_file, e)
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
 
     @cached_property
     def db_url(self):
@@ -251,7 +351,21 @@ class Db(Mapping):
             table_name: The name of a table to reflect
 
         """
+        if table_name in self.metadata.tables:
+            # loaded from the schema cache
+            return
         self.metadata.reflect(only=[table_name], views=True)
+        # saved in one go with the other tables, see save_schema_caches
+        _unsaved_schemas[id(self)] = self
+
+    def reflect_all(self):
+        """Populate :py:attr:`metadata` with all tables and views in one go and cache them
+
+        Used to fill the schema cache at the start of a session, so that other processes testing
+        the same appliance version never reflect.
+        """
+        self.metadata.reflect(views=True)
+        self.save_metadata()
 
     def _table(self, table_name):
         """Retrieves, reflects, and caches table objects
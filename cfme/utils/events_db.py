@@ -1,5 +1,17 @@
 """Library for event testing.
+
+:py:class:`DbEventListener` reads new ``event_streams`` rows with keyset pagination (``id > last
+seen id``, one page at a time), polling by default. With the ``notify`` backend it installs an
+``AFTER INSERT`` trigger on ``event_streams`` that calls ``pg_notify`` and waits on ``LISTEN``, so
+new rows are picked up as soon as they're committed instead of on the next poll. The trigger only
+sends the new row id; it and its function are dropped when the listener stops, other listeners
+still waiting on them then read the table every :py:attr:`EventStreamNotifier.WAIT_TIMEOUT`.
+
+Expected events are indexed by ``event_type`` and ``target_type``; an incoming row is only parsed
+and compared against the expectations that could possibly match it.
 """
+import select
+from collections import defaultdict
 from collections.abc import Iterable
 from contextlib import contextmanager
 from datetime import datetime
@@ -278,17 +290,179 @@ class Event(object):
         return self
 
 
+def _raw_value(evt, name):
+    value = getattr(evt, name, None)
+    if isinstance(value, bytes):
+        value = str(value, 'utf8')
+    return value
+
+
+class ExpectedEventIndex(object):
+    """
+    expected events bucketed by the values they require for :py:attr:`KEYS`.
+    expectations with a custom cmp_func or without a value for a key are kept under None for it.
+    """
+    KEYS = ('event_type', 'target_type')
+
+    def __init__(self):
+        self._buckets = defaultdict(list)
+
+    def _key(self, event):
+        key = []
+        for name in self.KEYS:
+            attr = event.event_attrs.get(name)
+            if attr is None or attr.cmp_func or not attr.value:
+                key.append(None)
+            else:
+                key.append(attr.value)
+        return tuple(key)
+
+    def add(self, expected):
+        self._buckets[self._key(expected['event'])].append(expected)
+
+    def clear(self):
+        self._buckets.clear()
+
+    def candidates(self, raw_event):
+        """expected events that may match a raw event_streams row, in registration order"""
+        values = [_raw_value(raw_event, name) for name in self.KEYS]
+        found = []
+        for event_type in (values[0], None):
+            for target_type in (values[1], None):
+                found.extend(self._buckets.get((event_type, target_type), ()))
+        if len(found) > 1:
+            found.sort(key=lambda expected: expected['order'])
+        return [expected for expected in found
+                if not (expected['first_event'] and expected['matched_events'])]
+
+
+class EventStreamPoller(object):
+    """
+    reads new event_streams rows a page at a time, ordered by id.
+    waiting for new rows is just sleeping for :py:attr:`POLL_INTERVAL`.
+    """
+    PAGE_SIZE = 100
+    POLL_INTERVAL = 0.2
+
+    def __init__(self, tool, page_size=PAGE_SIZE):
+        self._tool = tool
+        self.page_size = page_size
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def page(self, last_id):
+        event_streams = self._tool.event_streams
+        query = self._tool.query(event_streams)
+        if last_id is not None:
+            query = query.filter(event_streams.id > last_id)
+        return query.order_by(event_streams.id).limit(self.page_size).all()
+
+    def pages(self, last_id):
+        """yields pages of rows with an id above last_id until there are no more"""
+        while True:
+            page = self.page(last_id)
+            if page:
+                yield page
+                last_id = page[-1].id
+            if len(page) < self.page_size:
+                return
+
+    def wait(self):
+        sleep(self.POLL_INTERVAL)
+
+
+class EventStreamNotifier(EventStreamPoller):
+    """
+    wakes up on NOTIFY sent by a trigger on event_streams inserts, reads the rows like the poller.
+    the wait times out after :py:attr:`WAIT_TIMEOUT` and the table is read anyway, so a missed
+    notification only delays events.
+    """
+    CHANNEL = 'cfme_qe_event_streams'
+    WAIT_TIMEOUT = 1.0
+    SETUP_SQL = """
+        CREATE OR REPLACE FUNCTION {channel}_notify() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('{channel}', NEW.id::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        DROP TRIGGER IF EXISTS {channel}_insert ON event_streams;
+        CREATE TRIGGER {channel}_insert AFTER INSERT ON event_streams
+            FOR EACH ROW EXECUTE PROCEDURE {channel}_notify();
+    """.format(channel=CHANNEL)
+    TEARDOWN_SQL = """
+        DROP TRIGGER IF EXISTS {channel}_insert ON event_streams;
+        DROP FUNCTION IF EXISTS {channel}_notify();
+    """.format(channel=CHANNEL)
+
+    def __init__(self, tool, page_size=EventStreamPoller.PAGE_SIZE):
+        super(EventStreamNotifier, self).__init__(tool, page_size)
+        self._connection = None
+
+    def start(self):
+        # a connection of its own, LISTEN state must not go back to the pool
+        connection = self._tool.appliance.db.client.engine.raw_connection()
+        connection.detach()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(self.SETUP_SQL)
+            connection.commit()
+            connection.connection.autocommit = True
+            cursor.execute('LISTEN {}'.format(self.CHANNEL))
+            cursor.close()
+        except Exception:
+            connection.close()
+            raise
+        self._connection = connection.connection
+
+    def stop(self):
+        if self._connection is not None:
+            try:
+                # leave the appliance database as it was, the connection is in autocommit
+                cursor = self._connection.cursor()
+                cursor.execute('UNLISTEN *')
+                cursor.execute(self.TEARDOWN_SQL)
+                cursor.close()
+            except Exception as e:
+                logger.warning('Failed to drop the event_streams trigger: {}'.format(e))
+            finally:
+                self._connection.close()
+                self._connection = None
+
+    def wait(self):
+        if select.select([self._connection], [], [], self.WAIT_TIMEOUT)[0]:
+            self._connection.poll()
+            # the ids are not needed, rows are read by id anyway
+            del self._connection.notifies[:]
+
+
 class DbEventListener(Thread):
     """
      accepts "expected" events, listens to db events and compares showed up events with expected
      events. Runs callback function if expected events have it.
+
+     Args:
+        appliance: appliance whose database is read
+        backend: ``poll`` to poll the table, ``notify`` to be woken up by a trigger on
+                 event_streams, ``auto`` to try ``notify`` and fall back to ``poll``
     """
-    def __init__(self, appliance):
+    BACKENDS = {'notify': EventStreamNotifier, 'poll': EventStreamPoller}
+
+    def __init__(self, appliance, backend='poll'):
         super(DbEventListener, self).__init__()
+        if backend != 'auto' and backend not in self.BACKENDS:
+            raise ValueError('unknown backend {}'.format(backend))
         self._appliance = appliance
         self._tool = EventTool(self._appliance)
+        self._backend = backend
+        self._source = None
 
         self._events_to_listen = []
+        self._index = ExpectedEventIndex()
         # last_id is used to ignore already arrived messages the database
         # When database is "cleared" the id of the last event is placed here. That is then used
         # in queries to prevent events of this id and earlier to get in.
@@ -299,12 +473,9 @@ class DbEventListener(Thread):
         if evt:
             self._last_processed_id = evt.event_attrs['id'].value
         else:
-            try:
-                self._last_processed_id = self._tool.query(
-                    func.max(self._tool.event_streams.id)).one()
-            except IndexError:
-                # No events yet, so do nothing
-                pass
+            # None when there are no events yet
+            self._last_processed_id = self._tool.query(
+                func.max(self._tool.event_streams.id)).scalar()
 
     def new_event(self, *attrs, **kwattrs):
         """
@@ -353,19 +524,38 @@ class DbEventListener(Thread):
             for evt in evts:
                 if isinstance(evt, Event):
                     logger.info("event {} is added to listening queue".format(evt))
-                    self._events_to_listen.append({'event': evt,
-                                                   'callback': callback,
-                                                   'matched_events': [],
-                                                   'first_event': first_event})
+                    expected = {'event': evt,
+                                'callback': callback,
+                                'matched_events': [],
+                                'first_event': first_event,
+                                'order': len(self._events_to_listen)}
+                    self._events_to_listen.append(expected)
+                    self._index.add(expected)
                 else:
                     raise ValueError("one of events doesn't belong to Event class")
         else:
             raise ValueError('incorrect is passed')
 
+    def _start_source(self):
+        if self._backend in ('auto', 'notify'):
+            source = EventStreamNotifier(self._tool)
+            try:
+                source.start()
+                return source
+            except Exception as e:
+                if self._backend == 'notify':
+                    raise
+                logger.warning('LISTEN/NOTIFY on event_streams unavailable ({}), '
+                               'polling instead'.format(e))
+        source = EventStreamPoller(self._tool)
+        source.start()
+        return source
+
     def start(self):
         logger.info('Event Listener has been started')
         self.set_last_record()
         self._stop_event.clear()
+        self._source = self._start_source()
         super(DbEventListener, self).start()
 
     def stop(self):
@@ -373,7 +563,10 @@ class DbEventListener(Thread):
         self._stop_event.set()
 
     def run(self):
-        self.process_events()
+        try:
+            self.process_events()
+        finally:
+            self._source.stop()
 
     @property
     def started(self):
@@ -385,25 +578,30 @@ class DbEventListener(Thread):
         processed events are ignored next time
         """
         while not self._stop_event.is_set():
-            events = self.get_next_portion()
-            if len(events) == 0:
-                sleep(0.2)
-                continue
-            for got_event in events:
-                logger.debug("processing event id {}".format(got_event.id))
-                got_event = Event(event_tool=self._tool).build_from_raw_event(got_event)
-                for exp_event in self._events_to_listen:
-                    if exp_event['first_event'] and len(exp_event['matched_events']) > 0:
-                        continue
-
-                    if exp_event['event'].matches(got_event):
-                        if exp_event['callback']:
-                            exp_event['callback'](exp_event=exp_event['event'], got_event=got_event)
-                        exp_event['matched_events'].append(got_event)
-                self.set_last_record(got_event)
-
-                if self._stop_event.is_set():
-                    break
+            processed = 0
+            for events in self._source.pages(self._last_processed_id):
+                for raw_event in events:
+                    self.process_event(raw_event)
+                    processed += 1
+                    if self._stop_event.is_set():
+                        return
+            if not processed:
+                self._source.wait()
+
+    def process_event(self, raw_event):
+        """
+        compares one event_streams row with the expected events it can match
+        """
+        logger.debug("processing event id {}".format(raw_event.id))
+        candidates = self._index.candidates(raw_event)
+        if candidates:
+            got_event = Event(event_tool=self._tool).build_from_raw_event(raw_event)
+            for exp_event in candidates:
+                if exp_event['event'].matches(got_event):
+                    if exp_event['callback']:
+                        exp_event['callback'](exp_event=exp_event['event'], got_event=got_event)
+                    exp_event['matched_events'].append(got_event)
+        self._last_processed_id = raw_event.id
 
     @property
     def got_events(self):
@@ -420,12 +618,11 @@ class DbEventListener(Thread):
 
     def reset_events(self):
         self._events_to_listen = []
+        self._index.clear()
 
     def get_next_portion(self):
         logger.debug("obtaining next portion of events")
-        return self._tool.query(self._tool.event_streams)\
-            .filter(self._tool.event_streams.id > self._last_processed_id)\
-            .order_by(self._tool.event_streams.id).yield_per(100).all()
+        return EventStreamPoller(self._tool).page(self._last_processed_id)
 
     def check_expected_events(self):
         return all([len(event['matched_events']) for event in self.got_events])
@@ -0,0 +1,328 @@
+"""Concurrent VM inventory scans of providers, shared by the provider maintenance scripts
+
+Every provider is scanned in a process of its own: its VMs are listed through
+:py:func:`cfme.utils.providers.get_mgmt`, filtered by name, and the requested attributes of the
+VMs are then fetched by a bounded pool of threads. Each provider scan reports how long listing and
+fetching took and how many VMs per second it got through.
+
+Attributes that don't change during the life of a VM (:py:data:`STATIC_ATTRIBUTES`) can be cached
+on disk, so that the next scan of the provider only fetches them for VMs it hasn't seen before. The
+VMs are told apart by their uuid, so a VM recreated under the same name is fetched again.
+
+Work that needs the wrapanapi VM objects, like deleting them, is done by a ``process`` callback
+that runs in the provider's process after the scan::
+
+    scans = scan_providers(['vsphere67'], ['creation_time'], name_filter=re.compile('^test_').match,
+                           process=functools.partial(delete_old_vms, max_hours=24))
+"""
+import datetime
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
+
+import attr
+import dateutil.parser
+
+from cfme.utils.log import logger
+from cfme.utils.path import cache_path
+from cfme.utils.providers import get_mgmt
+
+SCAN_CACHE_DIR = cache_path.join('inventory_scan')
+
+#: attributes of a VM that never change, reused from the cache of the previous scan
+STATIC_ATTRIBUTES = ('creation_time', 'type')
+#: attributes of a wrapanapi VM identifying it, the first one the VM has is used
+IDENTITY_ATTRIBUTES = ('uuid', 'id')
+#: version of the format of the cache files, the files of other versions are ignored
+CACHE_VERSION = 2
+
+
+def _vm_type(vm):
+    # different provider types implement different methods to get instance type info
+    if hasattr(vm, 'type'):
+        return vm.type
+    try:
+        return vm.get_hardware_configuration()
+    except (AttributeError, NotImplementedError):
+        return None
+
+
+def _vm_tags(vm):
+    # only the cloud VMs carry tags
+    return getattr(vm, 'tags', None)
+
+
+#: getters of the attributes that aren't plain properties of the wrapanapi VM
+ATTRIBUTE_GETTERS = {
+    'type': _vm_type,
+    'tags': _vm_tags,
+}
+
+
+def get_vm_attribute(vm, name):
+    """Value of the attribute ``name`` of a wrapanapi VM"""
+    getter = ATTRIBUTE_GETTERS.get(name)
+    if getter is None:
+        return getattr(vm, name)
+    return getter(vm)
+
+
+def get_vm_identity(vm):
+    """Identity of a wrapanapi VM, see :py:data:`IDENTITY_ATTRIBUTES`, None if it has none"""
+    for name in IDENTITY_ATTRIBUTES:
+        try:
+            identity = getattr(vm, name)
+        except Exception:  # noqa
+            # not implemented for the provider type, or the VM is gone
+            continue
+        if identity is not None:
+            return str(identity)
+    return None
+
+
+@attr.s
+class VmRecord(object):
+    """The scanned attributes of a VM
+
+    ``failures`` maps the attributes that could not be fetched to the error, ``identity`` is
+    :py:func:`get_vm_identity` when the scan uses the cache, ``vm`` is the wrapanapi VM, only
+    present in the provider's process.
+    """
+    provider_key = attr.ib()
+    name = attr.ib()
+    attributes = attr.ib(default=attr.Factory(dict))
+    failures = attr.ib(default=attr.Factory(dict))
+    identity = attr.ib(default=None)
+    vm = attr.ib(default=None, repr=False, eq=False)
+
+    def get(self, name, default=None):
+        return self.attributes.get(name, default)
+
+
+@attr.s
+class ProviderScan(object):
+    """Result and metrics of the scan of a provider
+
+    ``error`` is set when listing the VMs failed, ``result`` holds what the ``process`` callback
+    returned.
+    """
+    provider_key = attr.ib()
+    records = attr.ib(default=attr.Factory(list))
+    error = attr.ib(default=None)
+    result = attr.ib(default=None)
+    listed = attr.ib(default=0)
+    fetched = attr.ib(default=0)
+    cached = attr.ib(default=0)
+    list_seconds = attr.ib(default=0.0)
+    fetch_seconds = attr.ib(default=0.0)
+    process_seconds = attr.ib(default=0.0)
+
+    @property
+    def failures(self):
+        return sum(1 for record in self.records if record.failures)
+
+    @property
+    def seconds(self):
+        return self.list_seconds + self.fetch_seconds + self.process_seconds
+
+    @property
+    def vms_per_second(self):
+        """Scanned VMs per second of fetching attributes"""
+        if not self.records:
+            return 0.0
+        return len(self.records) / max(self.fetch_seconds, 0.001)
+
+    METRICS_HEADERS = (
+        'Provider', 'Listed', 'Scanned', 'Fetched', 'Cached', 'Failed', 'List s', 'Fetch s',
+        'Process s', 'VMs/s')
+
+    def metrics(self):
+        """A row of :py:attr:`METRICS_HEADERS`"""
+        return (
+            self.provider_key, self.listed, len(self.records), self.fetched, self.cached,
+            'ERROR' if self.error else self.failures, round(self.list_seconds, 1),
+            round(self.fetch_seconds, 1), round(self.process_seconds, 1),
+            round(self.vms_per_second, 1))
+
+
+def _encode(value):
+    if isinstance(value, datetime.datetime):
+        return {'datetime': value.isoformat()}
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict) and list(value) == ['datetime']:
+        return dateutil.parser.parse(value['datetime'])
+    return value
+
+
+def _cache_file(provider_key):
+    return SCAN_CACHE_DIR.join('{}.json'.format(provider_key))
+
+
+def load_cache(provider_key):
+    """``{vm name: (identity, {attribute: value})}`` of the static attributes of the last scan"""
+    cache_file = _cache_file(provider_key)
+    if not cache_file.check(file=1):
+        return {}
+    try:
+        with cache_file.open() as f:
+            cache = json.load(f)
+        if cache.get('version') != CACHE_VERSION:
+            logger.info('%r: Ignoring scan cache %s of another version', provider_key, cache_file)
+            return {}
+        return {name: (vm['identity'],
+                       {key: _decode(value) for key, value in vm['attributes'].items()})
+                for name, vm in cache['vms'].items()}
+    except (IOError, ValueError, KeyError, AttributeError):
+        logger.warning('%r: Ignoring unreadable scan cache %s', provider_key, cache_file)
+        return {}
+
+
+def save_cache(provider_key, records):
+    """Writes the static attributes of the records that were fetched without failure
+
+    The records without an identity are left out, they can't be recognized in the next scan.
+    """
+    vms = {}
+    for record in records:
+        static = {key: _encode(value) for key, value in record.attributes.items()
+                  if key in STATIC_ATTRIBUTES and key not in record.failures}
+        if static and record.identity is not None:
+            vms[record.name] = {'identity': record.identity, 'attributes': static}
+    SCAN_CACHE_DIR.ensure(dir=True)
+    fd, temp_name = tempfile.mkstemp(dir=SCAN_CACHE_DIR.strpath, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'scanned': time.time(), 'vms': vms}, f)
+        os.replace(temp_name, _cache_file(provider_key).strpath)
+    except Exception:
+        os.unlink(temp_name)
+        raise
+
+
+def fetch_identity(record):
+    """Sets the identity of the record's VM"""
+    record.identity = get_vm_identity(record.vm)
+    return record
+
+
+def fetch_attributes(record, attributes):
+    """Fetches the ``attributes`` of the record's VM that it doesn't have yet"""
+    for name in attributes:
+        if name in record.attributes:
+            continue
+        try:
+            record.attributes[name] = get_vm_attribute(record.vm, name)
+        except Exception as e:  # noqa
+            logger.exception('%r: Exception getting %s of %r', record.provider_key, name,
+                             record.name)
+            record.attributes[name] = None
+            record.failures[name] = '{}: {}'.format(type(e).__name__, e)
+    return record
+
+
+def scan_provider(provider_key, attributes, name_filter=None, workers=8, use_cache=False,
+                  process=None):
+    """Scans the VMs of a provider
+
+    Args:
+        provider_key: key of the provider in cfme_data
+        attributes: names of the VM attributes to fetch, see :py:func:`get_vm_attribute`
+        name_filter: callable taking a VM name, only the VMs it returns true for are scanned
+        workers: how many VMs to fetch attributes of at once
+        use_cache: reuse the :py:data:`STATIC_ATTRIBUTES` of the last scan of the VMs with the
+            same name and identity, and save this one
+        process: callable run with the :py:class:`ProviderScan` once the attributes are fetched,
+            while the records still have their ``vm``; its return value is the scan's ``result``
+    Returns:
+        :py:class:`ProviderScan`, the records without their ``vm``
+    """
+    scan = ProviderScan(provider_key)
+    logger.info('%r: Listing VMs', provider_key)
+    start = time.time()
+    try:
+        vms = get_mgmt(provider_key).list_vms()
+    except Exception as e:  # noqa
+        logger.exception('%r: Exception listing VMs', provider_key)
+        scan.error = '{}: {}'.format(type(e).__name__, e)
+        return scan
+    scan.list_seconds = time.time() - start
+    scan.listed = len(vms)
+    scan.records = [VmRecord(provider_key, vm.name, vm=vm)
+                    for vm in vms if name_filter is None or name_filter(vm.name)]
+    logger.info('%r: %d of %d VMs matched', provider_key, len(scan.records), scan.listed)
+
+    start = time.time()
+    with ThreadPool(max(1, min(workers, len(scan.records)))) as pool:
+        if use_cache:
+            pool.map(fetch_identity, scan.records)
+            cache = load_cache(provider_key)
+            names = Counter(record.name for record in scan.records)
+            for record in scan.records:
+                # VMs sharing a name can't be told apart in the cache, and a VM recreated under
+                # the same name must not get the attributes of the old one
+                if (names[record.name] == 1 and record.identity is not None and
+                        cache.get(record.name, (None,))[0] == record.identity):
+                    record.attributes.update(
+                        (key, value) for key, value in cache[record.name][1].items()
+                        if key in attributes)
+                    scan.cached += 1
+
+        to_fetch = [record for record in scan.records
+                    if any(name not in record.attributes for name in attributes)]
+        pool.starmap(fetch_attributes, ((record, attributes) for record in to_fetch))
+    scan.fetched = len(to_fetch)
+    scan.fetch_seconds = time.time() - start
+    logger.info('%r: Fetched %s of %d VMs in %.1fs, %d from cache', provider_key,
+                ', '.join(attributes), scan.fetched, scan.fetch_seconds, scan.cached)
+
+    if use_cache:
+        save_cache(provider_key, scan.records)
+
+    if process is not None:
+        start = time.time()
+        scan.result = process(scan)
+        scan.process_seconds = time.time() - start
+
+    for record in scan.records:
+        # wrapanapi objects don't leave the provider's process
+        record.vm = None
+    return scan
+
+
+def _scan_provider_args(args):
+    provider_key, kwargs = args
+    return scan_provider(provider_key, **kwargs)
+
+
+def scan_providers(provider_keys, attributes, processes=None, **kwargs):
+    """Scans providers in parallel, each in a process of its own
+
+    Args:
+        provider_keys: keys of the providers in cfme_data
+        attributes: names of the VM attributes to fetch
+        processes: how many providers to scan at once, all of them by default
+        **kwargs: passed to :py:func:`scan_provider`; ``name_filter`` and ``process`` have to be
+            picklable, e.g. module level functions, their partials or bound ``re`` pattern methods
+    Returns:
+        list of :py:class:`ProviderScan` in the order of ``provider_keys``
+    """
+    provider_keys = list(provider_keys)
+    if not provider_keys:
+        return []
+    start = time.time()
+    with Pool(processes or len(provider_keys)) as pool:
+        scans = pool.map(
+            _scan_provider_args,
+            [(provider_key, dict(kwargs, attributes=attributes))
+             for provider_key in provider_keys],
+            chunksize=1)
+    logger.info('Scanned %d VMs of %d providers in %.1fs',
+                sum(len(scan.records) for scan in scans), len(scans), time.time() - start)
+    return scans
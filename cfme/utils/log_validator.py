@@ -18,6 +18,63 @@ class FailPatternMatchError(Exception):
         return repr("Pattern '{p}': {m}".format(p=self.pattern, m=self.message))
 
 
+# backreferences can't survive being moved into a combined alternation, groups get renumbered
+_BACKREFERENCE = re.compile(r'\\\d|\(\?P=')
+
+
+def _strip_wildcards(pattern):
+    """Drop leading and trailing ``.*`` from a pattern
+
+    For ``re.search`` on a single line they don't change whether the pattern matches, but a
+    leading ``.*`` makes the regex engine backtrack over the whole line at every position.
+    """
+    if pattern.startswith('.*') and not pattern.startswith('.*?'):
+        pattern = pattern[2:]
+    if pattern.endswith('.*') and not pattern.endswith('\\.*'):
+        pattern = pattern[:-2]
+    return pattern
+
+
+class PatternMatcher(object):
+    """Compiled set of regex patterns that can be checked against a line in a single scan
+
+    All patterns are combined into one alternation which is used as a prefilter: most log lines
+    match none of the patterns, and those are rejected by a single regex search instead of one
+    search per pattern. Lines that do hit are then checked against the individually compiled
+    patterns, so results are the same as calling ``re.search`` for every pattern.
+
+    Leading and trailing ``.*`` wildcards are left out of the prefilter, they only slow the
+    search down. Patterns that can't be combined (backreferences, inline flags, clashing group
+    names) make the prefilter pass every line through.
+
+    Args:
+        patterns: iterable of regex patterns
+    """
+
+    def __init__(self, patterns):
+        self.patterns = [(pattern, re.compile(pattern)) for pattern in patterns]
+        self._combined = None
+        if self.patterns and not any(_BACKREFERENCE.search(p) for p, _ in self.patterns):
+            try:
+                self._combined = re.compile(
+                    '|'.join('(?:{})'.format(_strip_wildcards(pattern))
+                             for pattern, _ in self.patterns))
+            except re.error:
+                logger.debug("Patterns can't be combined, checking them one by one")
+
+    def any(self, line):
+        """Whether any of the patterns could match the line"""
+        if self._combined is None:
+            return bool(self.patterns)
+        return self._combined.search(line) is not None
+
+    def search(self, line):
+        """Yield the patterns matching the line, in the order they were given"""
+        for pattern, regex in self.patterns:
+            if regex.search(line):
+                yield pattern
+
+
 class LogValidator(object):
     """
     Log content validator class provides methods
@@ -68,7 +125,14 @@ class LogValidator(object):
         self.failure_patterns = kwargs.pop('failure_patterns', [])
         self.matched_patterns = kwargs.pop('matched_patterns', [])
 
-        self._remote_file_tail = SSHTail(remote_filename, **kwargs)
+        self._skip_matcher = PatternMatcher(self.skip_patterns)
+        self._fail_matcher = PatternMatcher(self.failure_patterns)
+        self._match_matcher = PatternMatcher(self.matched_patterns)
+        self._matcher = PatternMatcher(
+            [*self.skip_patterns, *self.failure_patterns, *self.matched_patterns])
+
+        # validators of the same remote file share one connection, each has its own position
+        self._remote_file_tail = SSHTail.shared(remote_filename, **kwargs)
         self._matches = {key: 0 for key in self.matched_patterns}
 
     def start_monitoring(self):
@@ -76,26 +140,41 @@ class LogValidator(object):
         self._remote_file_tail.set_initial_file_end()
         logger.info("Log monitoring has been started on remote file")
 
+    def stop_monitoring(self):
+        """Stop monitoring log, the shared tail doesn't keep lines for this validator anymore"""
+        self._remote_file_tail.close()
+
     def _check_skip_logs(self, line):
-        for pattern in self.skip_patterns:
-            if re.search(pattern, line):
-                logger.info(
-                    "Skip pattern %s was matched on line %s so skipping this line", pattern, line
-                )
-                return True
+        for pattern in self._skip_matcher.search(line):
+            logger.info(
+                "Skip pattern %s was matched on line %s so skipping this line", pattern, line
+            )
+            return True
         return False
 
     def _check_fail_logs(self, line):
-        for pattern in self.failure_patterns:
-            if re.search(pattern, line):
-                logger.error("Failure pattern %s was matched on line %s", pattern, line)
-                raise FailPatternMatchError(pattern, "Expected failure pattern found in log.", line)
+        for pattern in self._fail_matcher.search(line):
+            logger.error("Failure pattern %s was matched on line %s", pattern, line)
+            raise FailPatternMatchError(pattern, "Expected failure pattern found in log.", line)
 
     def _check_match_logs(self, line):
-        for pattern in self.matched_patterns:
-            if re.search(pattern, line):
-                logger.info("Expected pattern %s was matched on line %s", pattern, line)
-                self._matches[pattern] = self._matches[pattern] + 1
+        for pattern in self._match_matcher.search(line):
+            logger.info("Expected pattern %s was matched on line %s", pattern, line)
+            self._matches[pattern] = self._matches[pattern] + 1
+
+    def check_line(self, line):
+        """Check a single log line against all the patterns
+
+        Raise:
+            FailPatternMatchError: If failure pattern matched
+        """
+        # one scan for the whole pattern set, only lines that hit get checked pattern by pattern
+        if not self._matcher.any(line):
+            return
+        if self._check_skip_logs(line):
+            return
+        self._check_fail_logs(line)
+        self._check_match_logs(line)
 
     @property
     def _is_valid(self):
@@ -113,10 +192,7 @@ class LogValidator(object):
         """
 
         for line in self._remote_file_tail:
-            if self._check_skip_logs(line):
-                continue
-            self._check_fail_logs(line)
-            self._check_match_logs(line)
+            self.check_line(line)
 
         logger.info("Matches found: {}".format(self._matches))
         return self._matches
@@ -142,10 +218,16 @@ class LogValidator(object):
     @contextmanager
     def waiting(self, **kwargs):
         self.start_monitoring()
-        yield
-        self.validate(**kwargs)
+        try:
+            yield
+            self.validate(**kwargs)
+        finally:
+            self.stop_monitoring()
 
     __enter__ = start_monitoring
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self.validate()
+        try:
+            self.validate()
+        finally:
+            self.stop_monitoring()
@@ -28,6 +28,9 @@ docs_path = project_path.join('docs')
 #: log storage, ``cfme_tests/log/``
 log_path = project_path.join('log')
 
+#: local caches, ``cfme_tests/.cache/``
+cache_path = project_path.join('.cache')
+
 #: results path for performance tests, ``cfme_tests/results/``
 results_path = project_path.join('results')
 
@@ -2,6 +2,7 @@
 appliance.
 """
 import csv
+import multiprocessing
 import os
 import re
 import subprocess
@@ -59,108 +60,205 @@ miq_top = re.compile(r'([0-9]+)\s+[0-9]+\s+[A-Za-z0-9]+\s+[0-9]+\s+[0-9\-]+\s+([
     r'([0-9\.mg]+)\s+([0-9\.mg]+)\s+[SRDZ]\s+([0-9\.]+)\s+([0-9\.]+)')
 
 
-def evm_to_messages(evm_file, filters):
+# Size of the byte ranges evm.log is split into for parsing in parallel
+EVM_CHUNK_SIZE = 32 * 1024 * 1024
+
+# Columns of the appliance wide top_output time series, in the order of the regex groups above
+TOP_CPU_COLUMNS = ('cpuus', 'cpusy', 'cpuni', 'cpuid', 'cpuwa', 'cpuhi', 'cpusi', 'cpust')
+TOP_MEM_COLUMNS = ('memtot', 'memuse', 'memfre', 'buffer')
+TOP_SWAP_COLUMNS = ('swatot', 'swause', 'swafre', 'cached')
+TOP_APPLIANCE_COLUMNS = TOP_CPU_COLUMNS + TOP_MEM_COLUMNS + TOP_SWAP_COLUMNS
+TOP_WORKER_COLUMNS = ('virt', 'res', 'share', 'cpu_per', 'mem_per')
+
+# Indexes into the per message records exchanged between the evm.log parsing processes
+(REC_ID, REC_CMD, REC_ARGS, REC_PID_PUT, REC_PID_GET, REC_PUTTIME, REC_GETTIME, REC_DEQ, REC_DEL,
+    REC_TOTAL) = range(10)
+
+
+def evm_to_messages(evm_file, filters, processes=None, chunk_size=EVM_CHUNK_SIZE):
+    """Parse the queue message timings out of an evm.log
+
+    The file is split into line aligned byte ranges which are parsed in a process pool. Each
+    range produces the messages put on the queue in it, plus the gets and deliveries of messages
+    that were put in an earlier range; these are merged in file order, so the result is the same
+    as reading the file from start to end.
+
+    Args:
+        evm_file: path to the evm.log
+        filters: dict of suffix: compiled regex, a message whose args match a filter gets the
+            suffix appended to its command
+        processes: number of parsing processes, defaults to the number of CPUs. With 1, the file
+            is parsed in this process.
+        chunk_size: size in bytes of the ranges the file is split into
+    """
+    runningtime = starttime = time()
+    chunks = _evm_line_aligned_chunks(evm_file, chunk_size)
+    args = [(evm_file, chunk_start, chunk_end, filters) for chunk_start, chunk_end in chunks]
+    if processes == 1 or len(chunks) == 1:
+        results = map(_evm_parse_chunk, args)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(processes)
+        # imap keeps the results in file order, which the merge relies on
+        results = pool.imap(_evm_parse_chunk, args)
+
     test_start = ''
-    test_end = ''
+    test_end = (-1, '')
     line_count = 0
+    orphans = 0
+    records = {}
+    try:
+        for chunk_lines, chunk_start, chunk_end, chunk_records, chunk_orphans in results:
+            if test_start == '' and chunk_start:
+                test_start = chunk_start
+            if chunk_end[0] >= 0:
+                test_end = max(test_end, (chunk_end[0] + line_count, chunk_end[1]))
+            # gets/deliveries of messages put in previous chunks
+            for kind, msg_id, line_no, values in chunk_orphans:
+                record = records.get(msg_id)
+                if record is None:
+                    orphans += 1
+                    if kind == 'delivered':
+                        test_end = max(test_end, (line_no + line_count, values[0]))
+                    continue
+                test_end = max(test_end, (line_no + line_count, values[0]))
+                _evm_apply_event(record, kind, values)
+            records.update(chunk_records)
+            line_count += chunk_lines
+
+            timediff = time() - runningtime
+            runningtime = time()
+            logger.info('Count %s : Parsed %s lines in %s (%.0f lines/s)',
+                        line_count, chunk_lines, timediff, chunk_lines / max(timediff, 1e-6))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    if orphans:
+        logger.error('%s gets/deliveries of message ids that were never put on the queue', orphans)
+    timediff = time() - starttime
+    logger.info('Parsed %s lines in %s (%.0f lines/s)',
+                line_count, timediff, line_count / max(timediff, 1e-6))
+
     messages = {}
     msg_cmds = {}
+    for msg in sorted(records):
+        message = messages[msg] = MiqMsgStat.from_record(records[msg])
+        msg_cmd = message.msg_cmd
+        if msg_cmd not in msg_cmds:
+            msg_cmds[msg_cmd] = {}
+            msg_cmds[msg_cmd]['total'] = []
+            msg_cmds[msg_cmd]['queue'] = []
+            msg_cmds[msg_cmd]['execute'] = []
+        if message.total_time != 0:
+            msg_cmds[msg_cmd]['total'].append(round(message.total_time, 2))
+            msg_cmds[msg_cmd]['queue'].append(round(message.deq_time, 2))
+            msg_cmds[msg_cmd]['execute'].append(round(message.del_time, 2))
+
+    return messages, msg_cmds, test_start, test_end[1], line_count
+
+
+def _evm_line_aligned_chunks(evm_file, chunk_size):
+    """Split a file into (start, end) byte ranges that begin and end on line boundaries"""
+    file_size = os.path.getsize(evm_file)
+    chunks = []
+    with open(evm_file, 'rb') as evmlogfile:
+        chunk_start = 0
+        while chunk_start < file_size:
+            evmlogfile.seek(min(chunk_start + chunk_size, file_size))
+            evmlogfile.readline()
+            chunk_end = min(evmlogfile.tell(), file_size)
+            chunks.append((chunk_start, chunk_end))
+            chunk_start = chunk_end
+    return chunks or [(0, 0)]
+
+
+def _evm_apply_event(record, kind, values):
+    if kind == 'get':
+        record[REC_GETTIME], record[REC_PID_GET], record[REC_DEQ] = values
+    else:
+        record[REC_DEL] = values[1]
+        record[REC_TOTAL] = record[REC_DEQ] + record[REC_DEL]
 
-    runningtime = time()
-    evmlogfile = open(evm_file, 'r')
-    evm_log_line = evmlogfile.readline()
-    while evm_log_line:
-        line_count += 1
-        evm_log_line = evm_log_line.strip()
 
-        miqmsg_result = miqmsg.search(evm_log_line)
-        if miqmsg_result:
+def _evm_parse_chunk(args):
+    """Parse the messages out of a byte range of evm.log, runs in the parsing processes
+
+    Returns:
+        A tuple of the number of lines, the timestamp of the first MIQ line, the (line number,
+        timestamp) of the last message line, the records of messages put in this range by id, and
+        the gets/deliveries of messages that weren't put in this range, in file order.
+    """
+    evm_file, chunk_start, chunk_end, filters = args
+    test_start = ''
+    test_end = (-1, '')
+    line_count = 0
+    records = {}
+    orphans = []
+
+    with open(evm_file, 'rb') as evmlogfile:
+        evmlogfile.seek(chunk_start)
+        position = chunk_start
+        for raw_line in evmlogfile:
+            if position >= chunk_end:
+                break
+            position += len(raw_line)
+            line_count += 1
+            # only queue messages matter after the first MIQ line, skip the rest without decoding
+            if test_start != '' and b'MiqQueue.' not in raw_line:
+                continue
+            evm_log_line = raw_line.decode('utf-8', errors='replace').strip()
+
+            miqmsg_result = miqmsg.search(evm_log_line)
+            if not miqmsg_result:
+                continue
 
             # Obtains the first timestamp in the log file
             if test_start == '':
                 ts, pid = get_msg_timestamp_pid(evm_log_line)
                 test_start = ts
 
-            # A message was first put on the queue, this starts its queuing time
-            if (miqmsg_result.group(1) == 'MiqQueue.put'):
+            kind = miqmsg_result.group(1)
+            if kind not in ('MiqQueue.put', 'MiqQueue.get_via_drb', 'MiqQueue.delivered'):
+                continue
+            msg_id = get_msg_id(evm_log_line)
+            if not msg_id:
+                logger.error('Could not obtain message id, line #: %s', line_count)
+                continue
+            ts, pid = get_msg_timestamp_pid(evm_log_line)
 
+            # A message was first put on the queue, this starts its queuing time
+            if kind == 'MiqQueue.put':
+                test_end = (line_count, ts)
                 msg_cmd = get_msg_cmd(evm_log_line)
-                msg_id = get_msg_id(evm_log_line)
-                if msg_id:
-                    ts, pid = get_msg_timestamp_pid(evm_log_line)
-                    test_end = ts
-                    messages[msg_id] = MiqMsgStat()
-                    messages[msg_id].msg_id = msg_id
-                    messages[msg_id].msg_id = '\'' + msg_id + '\''
-                    messages[msg_id].msg_cmd = msg_cmd
-                    messages[msg_id].pid_put = pid
-                    messages[msg_id].puttime = ts
-                    msg_args = get_msg_args(evm_log_line)
-                    if msg_args is False:
-                        logger.debug('Could not obtain message args line #: %s', line_count)
-                    else:
-                        messages[msg_id].msg_args = msg_args
-                else:
-                    logger.error('Could not obtain message id, line #: %s', line_count)
-
-            elif (miqmsg_result.group(1) == 'MiqQueue.get_via_drb'):
-                msg_id = get_msg_id(evm_log_line)
-                if msg_id:
-                    if msg_id in messages:
-                        ts, pid = get_msg_timestamp_pid(evm_log_line)
-                        test_end = ts
-                        messages[msg_id].pid_get = pid
-                        messages[msg_id].gettime = ts
-                        messages[msg_id].deq_time = get_msg_deq(evm_log_line)
-                    else:
-                        logger.error('Message ID not in dictionary: %s', msg_id)
+                msg_args = get_msg_args(evm_log_line)
+                if msg_args is False:
+                    logger.debug('Could not obtain message args line #: %s', line_count)
+                    msg_args = ''
+                # Determine if the pattern matches and append to the command if it does
+                for p_filter in filters:
+                    if filters[p_filter].search(msg_args.strip()):
+                        msg_cmd = '{}{}'.format(msg_cmd, p_filter)
+                        break
+                records[msg_id] = [
+                    '\'' + msg_id + '\'', msg_cmd, msg_args, pid, '', ts, '', 0.0, 0.0, 0.0]
+            elif kind == 'MiqQueue.get_via_drb':
+                values = (ts, pid, get_msg_deq(evm_log_line))
+                if msg_id in records:
+                    test_end = (line_count, ts)
+                    _evm_apply_event(records[msg_id], 'get', values)
                 else:
-                    logger.error('Could not obtain message id, line #: %s', line_count)
-
-            elif (miqmsg_result.group(1) == 'MiqQueue.delivered'):
-                msg_id = get_msg_id(evm_log_line)
-                if msg_id:
-                    ts, pid = get_msg_timestamp_pid(evm_log_line)
-                    test_end = ts
-                    if msg_id in messages:
-                        messages[msg_id].del_time = get_msg_del(evm_log_line)
-                        messages[msg_id].total_time = messages[msg_id].deq_time + \
-                            messages[msg_id].del_time
-                    else:
-                        logger.error('Message ID not in dictionary: %s', msg_id)
+                    orphans.append(('get', msg_id, line_count, values))
+            else:
+                values = (ts, get_msg_del(evm_log_line))
+                if msg_id in records:
+                    test_end = (line_count, ts)
+                    _evm_apply_event(records[msg_id], 'delivered', values)
                 else:
-                    logger.error('Could not obtain message id, line #: %s', line_count)
-
-        if (line_count % 100000) == 0:
-            timediff = time() - runningtime
-            runningtime = time()
-            logger.info('Count {} : Parsed 100000 lines in %s', line_count, timediff)
-
-        evm_log_line = evmlogfile.readline()
-
-    # I tried to avoid two loops but this reduced the complexity of filtering on messages.
-    # By filtering over messages, we can better display what is occuring under the covers, as a
-    # daily rollup is picked up off the queue different than a hourly rollup, etc
-    for msg in sorted(messages.keys()):
-        msg_args = messages[msg].msg_args
-        # Determine if the pattern matches and append to the command if it does
-        for p_filter in filters:
-            results = filters[p_filter].search(msg_args.strip())
-            if results:
-                messages[msg].msg_cmd = '{}{}'.format(messages[msg].msg_cmd, p_filter)
-                break
-        msg_cmd = messages[msg].msg_cmd
-        if msg_cmd not in msg_cmds:
-            msg_cmds[msg_cmd] = {}
-            msg_cmds[msg_cmd]['total'] = []
-            msg_cmds[msg_cmd]['queue'] = []
-            msg_cmds[msg_cmd]['execute'] = []
-        if messages[msg].total_time != 0:
-            msg_cmds[msg_cmd]['total'].append(round(messages[msg].total_time, 2))
-            msg_cmds[msg_cmd]['queue'].append(round(messages[msg].deq_time, 2))
-            msg_cmds[msg_cmd]['execute'].append(round(messages[msg].del_time, 2))
+                    orphans.append(('delivered', msg_id, line_count, values))
 
-    return messages, msg_cmds, test_start, test_end, line_count
+    return line_count, test_start, test_end, records, orphans
 
 
 def evm_to_workers(evm_file):
@@ -238,54 +336,36 @@ def evm_to_workers(evm_file):
 
 
 def split_appliance_charts(top_appliance, charts_dir):
-    # Automatically split top_output data roughly per day
-    minutes_in_a_day = 24 * 60
-    size_data = len(top_appliance['datetimes'])
-    start_hour = top_appliance['datetimes'][0][11:13]
-    start_minute = top_appliance['datetimes'][0][14:16]
-    bracket_end = minutes_in_a_day - ((int(start_hour) * 60) + int(start_minute))
-
-    if size_data > minutes_in_a_day:
-        # Greater than one day worth of data, split
-        file_names = [generate_appliance_charts(top_appliance, charts_dir, 0, bracket_end)]
-        for start_bracket in range(bracket_end, len(top_appliance['datetimes']), minutes_in_a_day):
-            if (start_bracket + minutes_in_a_day) > size_data:
-                end_index = size_data - 1
-            else:
-                end_index = start_bracket + minutes_in_a_day
-            file_names.append(generate_appliance_charts(top_appliance, charts_dir, start_bracket,
-                end_index))
-        return file_names
-    else:
-        # Less than one day worth of data, do not split
-        return [generate_appliance_charts(top_appliance, charts_dir, 0, size_data - 1)]
+    # Split top_output data per calendar day, one set of charts per day
+    return [generate_appliance_charts(day, charts_dir) for day in top_appliance.split('D')]
 
 
-def generate_appliance_charts(top_appliance, charts_dir, start_index, end_index):
-    cpu_chart_file = '/{}-app-cpu.svg'.format(top_appliance['datetimes'][start_index])
-    mem_chart_file = '/{}-app-mem.svg'.format(top_appliance['datetimes'][start_index])
+def generate_appliance_charts(top_appliance, charts_dir):
+    cpu_chart_file = '/{}-app-cpu.svg'.format(top_appliance.start)
+    mem_chart_file = '/{}-app-mem.svg'.format(top_appliance.start)
+    top_appliance = top_appliance.downsample()
+    x_labels = [str(ts) for ts in top_appliance.datetimes()]
 
     lines = {}
-    lines['Idle'] = top_appliance['cpuid'][start_index:end_index]
-    lines['User'] = top_appliance['cpuus'][start_index:end_index]
-    lines['System'] = top_appliance['cpusy'][start_index:end_index]
-    lines['Nice'] = top_appliance['cpuni'][start_index:end_index]
-    lines['Wait'] = top_appliance['cpuwa'][start_index:end_index]
-    # lines['Hi'] = top_appliance['cpuhi'][start_index:end_index]  # IRQs %
-    # lines['Si'] = top_appliance['cpusi'][start_index:end_index]  # Soft IRQs %
-    # lines['St'] = top_appliance['cpust'][start_index:end_index]  # Steal CPU %
-    line_chart_render('CPU Usage', 'Date Time', 'Percent',
-        top_appliance['datetimes'][start_index:end_index], lines, charts_dir.join(cpu_chart_file),
-        True)
+    lines['Idle'] = top_appliance['cpuid'].tolist()
+    lines['User'] = top_appliance['cpuus'].tolist()
+    lines['System'] = top_appliance['cpusy'].tolist()
+    lines['Nice'] = top_appliance['cpuni'].tolist()
+    lines['Wait'] = top_appliance['cpuwa'].tolist()
+    # lines['Hi'] = top_appliance['cpuhi'].tolist()  # IRQs %
+    # lines['Si'] = top_appliance['cpusi'].tolist()  # Soft IRQs %
+    # lines['St'] = top_appliance['cpust'].tolist()  # Steal CPU %
+    line_chart_render('CPU Usage', 'Date Time', 'Percent', x_labels, lines,
+        charts_dir.join(cpu_chart_file), True)
 
     lines = {}
-    lines['Memory Total'] = top_appliance['memtot'][start_index:end_index]
-    lines['Memory Free'] = top_appliance['memfre'][start_index:end_index]
-    lines['Memory Used'] = top_appliance['memuse'][start_index:end_index]
-    lines['Swap Used'] = top_appliance['swause'][start_index:end_index]
-    lines['cached'] = top_appliance['cached'][start_index:end_index]
-    line_chart_render('Memory Usage', 'Date Time', 'KiB',
-        top_appliance['datetimes'][start_index:end_index], lines, charts_dir.join(mem_chart_file))
+    lines['Memory Total'] = top_appliance['memtot'].tolist()
+    lines['Memory Free'] = top_appliance['memfre'].tolist()
+    lines['Memory Used'] = top_appliance['memuse'].tolist()
+    lines['Swap Used'] = top_appliance['swause'].tolist()
+    lines['cached'] = top_appliance['cached'].tolist()
+    line_chart_render('Memory Usage', 'Date Time', 'KiB', x_labels, lines,
+        charts_dir.join(mem_chart_file))
     return cpu_chart_file, mem_chart_file
 
 
@@ -383,18 +463,20 @@ def generate_worker_charts(workers, top_workers, charts_dir):
             worker, workers[worker].worker_type)
         worker_name = '{}-{}'.format(worker, workers[worker].worker_type)
 
+        top_worker = top_workers[worker].downsample()
+        x_labels = [str(ts) for ts in top_worker.datetimes()]
+
         lines = {}
-        lines['Virt Mem'] = top_workers[worker]['virt']
-        lines['Res Mem'] = top_workers[worker]['res']
-        lines['Shared Mem'] = top_workers[worker]['share']
-        line_chart_render(worker_name, 'Date Time', 'Memory in MiB',
-            top_workers[worker]['datetimes'], lines,
+        lines['Virt Mem'] = top_worker['virt'].tolist()
+        lines['Res Mem'] = top_worker['res'].tolist()
+        lines['Shared Mem'] = top_worker['share'].tolist()
+        line_chart_render(worker_name, 'Date Time', 'Memory in MiB', x_labels, lines,
             charts_dir.join('/{}-Memory.svg'.format(worker_name)))
 
         lines = {}
-        lines['CPU %'] = top_workers[worker]['cpu_per']
-        line_chart_render(worker_name, 'Date Time', 'CPU Usage', top_workers[worker]['datetimes'],
-            lines, charts_dir.join('/{}-CPU.svg'.format(worker_name)))
+        lines['CPU %'] = top_worker['cpu_per'].tolist()
+        line_chart_render(worker_name, 'Date Time', 'CPU Usage', x_labels, lines,
+            charts_dir.join('/{}-CPU.svg'.format(worker_name)))
 
 
 def get_first_miqtop(top_log_file):
@@ -636,9 +718,9 @@ def top_to_appliance(top_file):
     top_lines = greppedtop.strip().split('\n')
     line_count = 0
 
-    top_keys = ['datetimes', 'cpuus', 'cpusy', 'cpuni', 'cpuid', 'cpuwa', 'cpuhi', 'cpusi', 'cpust',
-        'memtot', 'memuse', 'memfre', 'buffer', 'swatot', 'swause', 'swafre', 'cached']
-    top_app = dict((key, []) for key in top_keys)
+    # Import here to allow perf to install numpy separately
+    from cfme.utils.timeseries import TimeSeries
+    top_app = TimeSeries(TOP_APPLIANCE_COLUMNS)
 
     cur_time = None
     miqtop_ahead = True
@@ -675,33 +757,27 @@ def top_to_appliance(top_file):
         elif 'Cpu(s): ' in top_line:
             miq_cpu_result = miq_cpu.search(top_line)
             if miq_cpu_result:
-                top_app['datetimes'].append(str(cur_time))
-                top_app['cpuus'].append(float(miq_cpu_result.group(1).strip()))
-                top_app['cpusy'].append(float(miq_cpu_result.group(2).strip()))
-                top_app['cpuni'].append(float(miq_cpu_result.group(3).strip()))
-                top_app['cpuid'].append(float(miq_cpu_result.group(4).strip()))
-                top_app['cpuwa'].append(float(miq_cpu_result.group(5).strip()))
-                top_app['cpuhi'].append(float(miq_cpu_result.group(6).strip()))
-                top_app['cpusi'].append(float(miq_cpu_result.group(7).strip()))
-                top_app['cpust'].append(float(miq_cpu_result.group(8).strip()))
+                # Cpu(s) starts a sample, the Mem and Swap lines that follow fill in the rest
+                top_app.append(cur_time, **dict(zip(TOP_CPU_COLUMNS, (
+                    float(value.strip()) for value in miq_cpu_result.groups()))))
             else:
                 logger.error('Issue with miq_cpu regex: %s', top_line)
         elif 'Mem: ' in top_line:
             miq_mem_result = miq_mem.search(top_line)
             if miq_mem_result:
-                top_app['memtot'].append(round(float(miq_mem_result.group(1).strip()) / 1024, 2))
-                top_app['memuse'].append(round(float(miq_mem_result.group(2).strip()) / 1024, 2))
-                top_app['memfre'].append(round(float(miq_mem_result.group(3).strip()) / 1024, 2))
-                top_app['buffer'].append(round(float(miq_mem_result.group(4).strip()) / 1024, 2))
+                if top_app:
+                    top_app.set_last(**dict(zip(TOP_MEM_COLUMNS, (
+                        round(float(value.strip()) / 1024, 2)
+                        for value in miq_mem_result.groups()))))
             else:
                 logger.error('Issue with miq_mem regex: %s', top_line)
         elif 'Swap: ' in top_line:
             miq_swap_result = miq_swap.search(top_line)
             if miq_swap_result:
-                top_app['swatot'].append(round(float(miq_swap_result.group(1).strip()) / 1024, 2))
-                top_app['swause'].append(round(float(miq_swap_result.group(2).strip()) / 1024, 2))
-                top_app['swafre'].append(round(float(miq_swap_result.group(3).strip()) / 1024, 2))
-                top_app['cached'].append(round(float(miq_swap_result.group(4).strip()) / 1024, 2))
+                if top_app:
+                    top_app.set_last(**dict(zip(TOP_SWAP_COLUMNS, (
+                        round(float(value.strip()) / 1024, 2)
+                        for value in miq_swap_result.groups()))))
             else:
                 logger.error('Issue with miq_swap regex: %s', top_line)
         else:
@@ -732,6 +808,8 @@ def top_to_workers(workers, top_file):
     # Also pids can be duplicated, so careful attention to detail on when a pid starts and ends
     top_lines = greppedtop.strip().split('\n')
     line_count = 0
+    # Import here to allow perf to install numpy separately
+    from cfme.utils.timeseries import TimeSeries
     top_workers = {}
     cur_time = None
     miqtop_ahead = True
@@ -780,19 +858,9 @@ def top_to_workers(workers, top_file):
                                 (workers[worker].end_ts == '' or cur_time < workers[worker].end_ts):
                             w_id = workers[worker].worker_id
                             if w_id not in top_workers:
-                                top_workers[w_id] = {}
-                                top_workers[w_id]['datetimes'] = []
-                                top_workers[w_id]['virt'] = []
-                                top_workers[w_id]['res'] = []
-                                top_workers[w_id]['share'] = []
-                                top_workers[w_id]['cpu_per'] = []
-                                top_workers[w_id]['mem_per'] = []
-                            top_workers[w_id]['datetimes'].append(str(cur_time))
-                            top_workers[w_id]['virt'].append(top_virt)
-                            top_workers[w_id]['res'].append(top_res)
-                            top_workers[w_id]['share'].append(top_share)
-                            top_workers[w_id]['cpu_per'].append(top_cpu_per)
-                            top_workers[w_id]['mem_per'].append(top_mem_per)
+                                top_workers[w_id] = TimeSeries(TOP_WORKER_COLUMNS)
+                            top_workers[w_id].append(cur_time, virt=top_virt, res=top_res,
+                                share=top_share, cpu_per=top_cpu_per, mem_per=top_mem_per)
                             break
             else:
                 logger.error('Issue with miq_top regex or grepping of top file:%s', top_line)
@@ -1037,10 +1105,12 @@ def perf_process_evm(evm_file, top_file):
 
 
 class MiqMsgStat(object):
+    headers = ('msg_id', 'msg_cmd', 'msg_args', 'pid_put', 'pid_get', 'puttime', 'gettime',
+        'deq_time', 'del_time', 'total_time')
+    # there is one of these per message in evm.log, keep them small
+    __slots__ = headers
 
     def __init__(self):
-        self.headers = ['msg_id', 'msg_cmd', 'msg_args', 'pid_put', 'pid_get', 'puttime', 'gettime',
-            'deq_time', 'del_time', 'total_time']
         self.msg_id = ''
         self.msg_cmd = ''
         self.msg_args = ''
@@ -1052,6 +1122,14 @@ class MiqMsgStat(object):
         self.del_time = 0.0
         self.total_time = 0.0
 
+    @classmethod
+    def from_record(cls, record):
+        """Build from a record list, in the order of :py:attr:`headers`"""
+        stat = cls.__new__(cls)
+        for header, value in zip(cls.headers, record):
+            setattr(stat, header, value)
+        return stat
+
     def __iter__(self):
         for header in self.headers:
             yield header, getattr(self, header)
@@ -8,11 +8,19 @@ dict and will provide you with whatever you ask for with no limitations.
 
 The main clue to know what is limited by the filters and what isn't is the 'filters' parameter.
 """
+import hashlib
+import json
 import operator
+import os
+import threading
+import time
+from collections import Counter
 from collections import OrderedDict
 from collections.abc import Mapping
 from copy import copy
 
+import attr
+
 from cfme.common.provider import all_types
 from cfme.exceptions import UnknownProviderType
 from cfme.utils import conf
@@ -22,9 +30,140 @@ providers_data = conf.cfme_data.get("management_systems", {})
 # Dict of active provider filters {name: ProviderFilter}
 global_filters = {}
 
+
+def _probe_mgmt(mgmt):
+    """Liveness probe of a mgmt instance, a cheap call that needs a working session"""
+    if hasattr(type(mgmt), 'info'):
+        mgmt.info
+    return True
+
+
+@attr.s
+class PooledMgmt(object):
+    mgmt = attr.ib()
+    thread_id = attr.ib()
+    pid = attr.ib(factory=os.getpid)
+    last_used = attr.ib(factory=time.time)
+
+
+@attr.s
+class MgmtPool(object):
+    """Pool of the provider mgmt instances :py:func:`get_mgmt` hands out
+
+    Instances are keyed by the provider key and a hash of the provider data and credentials they
+    were made with. Every thread gets an instance of its own, up to ``size`` per key; threads past
+    that share the least recently used one. Instances idle for more than ``ttl`` seconds are
+    dropped, and an instance idle for more than ``probe_after`` seconds is probed with ``probe``
+    before it is handed out again and replaced when the probe fails. Instances inherited from a
+    parent process are never reused.
+
+    Dropped instances are not disconnected, callers may still hold them; they are left to the
+    garbage collector. Only :py:meth:`clear` disconnects.
+    """
+    size = attr.ib(default=4)
+    ttl = attr.ib(default=1800)
+    probe_after = attr.ib(default=60)
+    probe = attr.ib(default=_probe_mgmt)
+    stats = attr.ib(init=False, factory=Counter)
+    _pools = attr.ib(init=False, factory=dict)
+    _creating = attr.ib(init=False, factory=Counter)
+    _lock = attr.ib(init=False, factory=threading.Lock)
+
+    def _evict(self, now):
+        """Drops the expired and inherited instances"""
+        for key, entries in list(self._pools.items()):
+            kept = []
+            for entry in entries:
+                if entry.pid != os.getpid():
+                    self.stats['forked'] += 1
+                elif now - entry.last_used > self.ttl:
+                    self.stats['evictions'] += 1
+                else:
+                    kept.append(entry)
+            if kept:
+                entries[:] = kept
+            else:
+                del self._pools[key]
+
+    def _checkout(self, key):
+        """Picks the instance for the calling thread, None if one should be created"""
+        entries = self._pools.get(key, [])
+        thread_id = threading.get_ident()
+        for entry in entries:
+            if entry.thread_id == thread_id:
+                return entry
+        if len(entries) + self._creating[key] < self.size:
+            return None
+        if not entries:
+            # the other threads are still creating theirs
+            return None
+        return min(entries, key=lambda entry: entry.last_used)
+
+    def get(self, key, factory):
+        """Returns a live mgmt instance of ``key``, made by ``factory`` when there is none"""
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            entry = self._checkout(key)
+            if entry is not None:
+                probe = now - entry.last_used > self.probe_after
+                entry.last_used = now
+            else:
+                self._creating[key] += 1
+
+        if entry is not None:
+            if probe and not self._alive(entry):
+                with self._lock:
+                    entries = self._pools.get(key, [])
+                    if entry in entries:
+                        entries.remove(entry)
+                    self._creating[key] += 1
+                    self.stats['reconnects'] += 1
+                logger.info('mgmt of %r failed the liveness probe, reconnecting', key[0])
+            else:
+                self.stats['hits'] += 1
+                logger.debug('returning pooled mgmt class for %r', key[0])
+                return entry.mgmt
+        else:
+            self.stats['misses'] += 1
+
+        try:
+            mgmt = factory()
+        finally:
+            with self._lock:
+                self._creating[key] -= 1
+        with self._lock:
+            self._pools.setdefault(key, []).append(PooledMgmt(mgmt, threading.get_ident()))
+        return mgmt
+
+    def _alive(self, entry):
+        try:
+            return self.probe(entry.mgmt)
+        except Exception:  # noqa
+            logger.debug('liveness probe of mgmt %r failed', entry.mgmt, exc_info=True)
+            return False
+
+    def clear(self):
+        """Disconnects and drops all the instances"""
+        with self._lock:
+            entries = [entry for entries in self._pools.values() for entry in entries]
+            self._pools.clear()
+            self.stats['cleared'] += len(entries)
+        for entry in entries:
+            if entry.pid != os.getpid():
+                continue
+            try:
+                entry.mgmt.disconnect()
+            except Exception:  # noqa
+                logger.debug('failed to disconnect mgmt %r', entry.mgmt, exc_info=True)
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._pools.values())
+
+
 # Store instances of provider mgmt classes that we have instantiated before,
 # so that we don't re-generate mgmt classes for the same exact provider
-PROVIDER_MGMT_CACHE = {}
+PROVIDER_MGMT_POOL = MgmtPool()
 
 
 def load_setuptools_entrypoints():
@@ -354,7 +493,7 @@ def get_mgmt(provider_key, providers=None, credentials=None):
         credentials: A set of credentials in the same format as the ``credentials`` yamls files.
             If ``None`` then credentials are loaded from the default locations. Expects a dict.
     Return: A provider instance of the appropriate ``wrapanapi.WrapanapiAPIBase``
-        subclass
+        subclass, pooled per thread in :py:data:`PROVIDER_MGMT_POOL`
     """
     if providers is None:
         providers = providers_data
@@ -389,14 +528,13 @@ def get_mgmt(provider_key, providers=None, credentials=None):
 
     if isinstance(provider_key, str):
         provider_kwargs['provider_key'] = provider_key
+    kwargs_hash = hashlib.sha1(
+        json.dumps(provider_kwargs, sort_keys=True, default=str).encode('utf-8')).hexdigest()
     provider_kwargs['logger'] = logger
 
-    if provider_key not in PROVIDER_MGMT_CACHE:
-        mgmt_instance = get_class_from_type(provider_data['type']).mgmt_class(**provider_kwargs)
-        PROVIDER_MGMT_CACHE[provider_key] = mgmt_instance
-    else:
-        logger.debug("returning cached mgmt class for '%s'", provider_key)
-    return PROVIDER_MGMT_CACHE[provider_key]
+    return PROVIDER_MGMT_POOL.get(
+        (provider_key, kwargs_hash),
+        lambda: get_class_from_type(provider_data['type']).mgmt_class(**provider_kwargs))
 
 
 class UnknownProvider(Exception):
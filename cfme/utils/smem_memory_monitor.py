@@ -1,6 +1,7 @@
 """Monitor Memory on a CFME/Miq appliance and builds report&graphs displaying usage per process."""
 import json
 import os
+import socket
 import time
 import traceback
 from collections import OrderedDict
@@ -13,6 +14,7 @@ from yaycl import AttrDict
 from cfme.utils.conf import cfme_performance
 from cfme.utils.log import logger
 from cfme.utils.path import results_path
+from cfme.utils.path import scripts_data_path
 from cfme.utils.version import current_version
 from cfme.utils.version import get_version
 
@@ -133,12 +135,50 @@ test_ts = time.strftime('%Y%m%d%H%M%S')
 # 10s sample interval (occasionally sampling can take almost 4s on an appliance doing a lot of work)
 SAMPLE_INTERVAL = 10
 
+# Columns of the appliance and per process time series
+APPLIANCE_MEASUREMENTS = ('total', 'free', 'used', 'buffers', 'cached', 'slab', 'swap_total',
+    'swap_free')
+PROCESS_MEASUREMENTS = ('rss', 'pss', 'uss', 'vss', 'swap')
+
+# Sampler modes:
+# ssh - cat /proc/meminfo, psql and smem over ssh on every sample
+# collector - upload scripts/data/smem_collector.py once and stream its samples over one channel
+SAMPLERS = ('ssh', 'collector')
+COLLECTOR_SCRIPT = 'smem_collector.py'
+REMOTE_COLLECTOR = '/tmp/smem_collector.py'
+# interpreters the collector can run on, in order of preference
+COLLECTOR_PYTHONS = ('/usr/libexec/platform-python', 'python3', 'python2', 'python')
+
+
+def memory_monitor_settings():
+    """:py:class:`SmemMemoryMonitor` kwargs from the ``tools/memory_monitor`` perf config
+
+    e.g. ``memory_monitor: {sampler: collector, interval: 2}``, the monitor's defaults otherwise
+    """
+    settings = cfme_performance.get('tools', {}).get('memory_monitor', {})
+    return {key: settings[key] for key in ('sampler', 'interval') if key in settings}
+
 
 class SmemMemoryMonitor(Thread):
-    def __init__(self, ssh_client, scenario_data):
+    """Samples appliance and per process memory until :py:attr:`signal` is cleared
+
+    Args:
+        ssh_client: client connected to the appliance
+        scenario_data: workload description used for the report
+        sampler: ``'ssh'`` runs three commands over ssh per sample, ``'collector'`` keeps a
+            collector script running on the appliance that streams one record per sample, which
+            allows much shorter intervals
+        interval: seconds between samples
+    """
+    def __init__(self, ssh_client, scenario_data, sampler='ssh', interval=SAMPLE_INTERVAL):
         super(SmemMemoryMonitor, self).__init__()
+        if sampler not in SAMPLERS:
+            raise ValueError('Unknown sampler {!r}, expected one of {}'.format(sampler, SAMPLERS))
         self.ssh_client = ssh_client
         self.scenario_data = scenario_data
+        self.sampler = sampler
+        self.interval = interval
+        self.collector_python = None
         self.grafana_urls = {}
         self.miq_server_id = ''
         self.use_slab = False
@@ -146,59 +186,54 @@ class SmemMemoryMonitor(Thread):
 
     def create_process_result(self, process_results, starttime, process_pid, process_name,
             memory_by_pid):
-        if process_pid in list(memory_by_pid.keys()):
+        if process_pid in memory_by_pid:
+            # Import here to allow perf to install numpy separately
+            from cfme.utils.timeseries import TimeSeries
             if process_name not in process_results:
                 process_results[process_name] = OrderedDict()
-                process_results[process_name][process_pid] = OrderedDict()
             if process_pid not in process_results[process_name]:
-                process_results[process_name][process_pid] = OrderedDict()
-            process_results[process_name][process_pid][starttime] = {}
-            rss_mem = memory_by_pid[process_pid]['rss']
-            pss_mem = memory_by_pid[process_pid]['pss']
-            uss_mem = memory_by_pid[process_pid]['uss']
-            vss_mem = memory_by_pid[process_pid]['vss']
-            swap_mem = memory_by_pid[process_pid]['swap']
-            process_results[process_name][process_pid][starttime]['rss'] = rss_mem
-            process_results[process_name][process_pid][starttime]['pss'] = pss_mem
-            process_results[process_name][process_pid][starttime]['uss'] = uss_mem
-            process_results[process_name][process_pid][starttime]['vss'] = vss_mem
-            process_results[process_name][process_pid][starttime]['swap'] = swap_mem
+                process_results[process_name][process_pid] = TimeSeries(PROCESS_MEASUREMENTS)
+            process_results[process_name][process_pid].append(starttime, **{
+                measurement: memory_by_pid[process_pid][measurement]
+                for measurement in PROCESS_MEASUREMENTS})
             del memory_by_pid[process_pid]
         else:
             logger.warning('Process {} PID, not found: {}'.format(process_name, process_pid))
 
     def get_appliance_memory(self, appliance_results, plottime):
-        # 5.5/5.6 - RHEL 7 / Centos 7
-        # Application Memory Used : MemTotal - (MemFree + Slab + Cached)
-        # 5.4 - RHEL 6 / Centos 6
-        # Application Memory Used : MemTotal - (MemFree + Buffers + Cached)
-        # Available memory could potentially be better metric
-        appliance_results[plottime] = {}
-
         result = self.ssh_client.run_command('cat /proc/meminfo')
         if result.failed:
             logger.error('Exit_status nonzero in get_appliance_memory: {}, {}'
                          .format(result.rc, result.output))
-            del appliance_results[plottime]
         else:
             meminfo_raw = result.output.replace('kB', '').strip()
             meminfo = OrderedDict((k.strip(), v.strip()) for k, v in
                 (value.strip().split(':') for value in meminfo_raw.split('\n')))
-            appliance_results[plottime]['total'] = float(meminfo['MemTotal']) / 1024
-            appliance_results[plottime]['free'] = float(meminfo['MemFree']) / 1024
-            if 'MemAvailable' in meminfo:  # 5.5, RHEL 7/Centos 7
-                self.use_slab = True
-                mem_used = (float(meminfo['MemTotal']) - (float(meminfo['MemFree']) + float(
-                    meminfo['Slab']) + float(meminfo['Cached']))) / 1024
-            else:  # 5.4, RHEL 6/Centos 6
-                mem_used = (float(meminfo['MemTotal']) - (float(meminfo['MemFree']) + float(
-                    meminfo['Buffers']) + float(meminfo['Cached']))) / 1024
-            appliance_results[plottime]['used'] = mem_used
-            appliance_results[plottime]['buffers'] = float(meminfo['Buffers']) / 1024
-            appliance_results[plottime]['cached'] = float(meminfo['Cached']) / 1024
-            appliance_results[plottime]['slab'] = float(meminfo['Slab']) / 1024
-            appliance_results[plottime]['swap_total'] = float(meminfo['SwapTotal']) / 1024
-            appliance_results[plottime]['swap_free'] = float(meminfo['SwapFree']) / 1024
+            self.record_appliance_memory(appliance_results, plottime, meminfo)
+
+    def record_appliance_memory(self, appliance_results, plottime, meminfo):
+        """Add an appliance sample computed from /proc/meminfo values in kB"""
+        # 5.5/5.6 - RHEL 7 / Centos 7
+        # Application Memory Used : MemTotal - (MemFree + Slab + Cached)
+        # 5.4 - RHEL 6 / Centos 6
+        # Application Memory Used : MemTotal - (MemFree + Buffers + Cached)
+        # Available memory could potentially be better metric
+        if 'MemAvailable' in meminfo:  # 5.5, RHEL 7/Centos 7
+            self.use_slab = True
+            mem_used = (float(meminfo['MemTotal']) - (float(meminfo['MemFree']) + float(
+                meminfo['Slab']) + float(meminfo['Cached']))) / 1024
+        else:  # 5.4, RHEL 6/Centos 6
+            mem_used = (float(meminfo['MemTotal']) - (float(meminfo['MemFree']) + float(
+                meminfo['Buffers']) + float(meminfo['Cached']))) / 1024
+        appliance_results.append(plottime,
+            total=float(meminfo['MemTotal']) / 1024,
+            free=float(meminfo['MemFree']) / 1024,
+            used=mem_used,
+            buffers=float(meminfo['Buffers']) / 1024,
+            cached=float(meminfo['Cached']) / 1024,
+            slab=float(meminfo['Slab']) / 1024,
+            swap_total=float(meminfo['SwapTotal']) / 1024,
+            swap_free=float(meminfo['SwapFree']) / 1024)
 
     def get_evm_workers(self):
         result = self.ssh_client.run_command(
@@ -270,29 +305,49 @@ class SmemMemoryMonitor(Thread):
         return memory_by_pid
 
     def _real_run(self):
-        """ Result dictionaries:
-        appliance_results[timestamp][measurement] = value
-        appliance_results[timestamp]['total'] = value
-        appliance_results[timestamp]['free'] = value
-        appliance_results[timestamp]['used'] = value
-        appliance_results[timestamp]['buffers'] = value
-        appliance_results[timestamp]['cached'] = value
-        appliance_results[timestamp]['slab'] = value
-        appliance_results[timestamp]['swap_total'] = value
-        appliance_results[timestamp]['swap_free'] = value
+        """ Results, see :py:class:`cfme.utils.timeseries.TimeSeries`:
+        appliance_results = TimeSeries of APPLIANCE_MEASUREMENTS
+        appliance_results['used'] = array of values
         appliance measurements: total/free/used/buffers/cached/slab/swap_total/swap_free
-        process_results[name][pid][timestamp][measurement] = value
-        process_results[name][pid][timestamp]['rss'] = value
-        process_results[name][pid][timestamp]['pss'] = value
-        process_results[name][pid][timestamp]['uss'] = value
-        process_results[name][pid][timestamp]['vss'] = value
-        process_results[name][pid][timestamp]['swap'] = value
+        process_results[name][pid] = TimeSeries of PROCESS_MEASUREMENTS
+        process_results[name][pid]['rss'] = array of values
+        process measurements: rss/pss/uss/vss/swap
         """
-        appliance_results = OrderedDict()
+        # Import here to allow perf to install numpy separately
+        from cfme.utils.timeseries import TimeSeries
+        appliance_results = TimeSeries(APPLIANCE_MEASUREMENTS)
         process_results = OrderedDict()
-        install_smem(self.ssh_client)
+        if self.sampler == 'collector' and (self.ssh_client.is_container or
+                self.ssh_client.is_pod):
+            logger.warning('Collector sampler is not supported on containers, using ssh')
+            self.sampler = 'ssh'
+        if self.sampler == 'collector':
+            self.collector_python = self.find_collector_python()
+            if self.collector_python is None:
+                logger.warning('No python interpreter for the collector found, using ssh')
+                self.sampler = 'ssh'
+        if self.sampler == 'ssh':
+            install_smem(self.ssh_client)
         self.get_miq_server_id()
-        logger.info('Starting Monitoring Thread.')
+        logger.info('Starting Monitoring Thread, sampler: {}'.format(self.sampler))
+        if self.sampler == 'collector':
+            samples = self.collector_samples()
+        else:
+            samples = self.ssh_samples(appliance_results)
+        for plottime, meminfo, workers, memory_by_pid in samples:
+            if meminfo:
+                self.record_appliance_memory(appliance_results, plottime, meminfo)
+            self.record_process_memory(process_results, plottime, workers, memory_by_pid)
+        logger.info('Monitoring CFME Memory Terminating')
+
+        create_report(self.scenario_data, appliance_results, process_results, self.use_slab,
+            self.grafana_urls)
+
+    def ssh_samples(self, appliance_results):
+        """Sample by running commands over ssh, yields ``(time, None, workers, memory_by_pid)``
+
+        Appliance memory is recorded into ``appliance_results`` directly.
+        """
         while self.signal:
             starttime = time.time()
             plottime = datetime.now()
@@ -300,57 +355,117 @@ class SmemMemoryMonitor(Thread):
             self.get_appliance_memory(appliance_results, plottime)
             workers = self.get_evm_workers()
             memory_by_pid = self.get_pids_memory()
-
-            for worker_pid in workers:
-                self.create_process_result(process_results, plottime, worker_pid,
-                    workers[worker_pid], memory_by_pid)
-
-            for pid in sorted(memory_by_pid.keys()):
-                if memory_by_pid[pid]['name'] == 'httpd':
-                    self.create_process_result(process_results, plottime, pid, 'httpd',
-                        memory_by_pid)
-                elif memory_by_pid[pid]['name'] == 'postgres':
-                    self.create_process_result(process_results, plottime, pid, 'postgres',
-                        memory_by_pid)
-                elif memory_by_pid[pid]['name'] == 'postmaster':
-                    self.create_process_result(process_results, plottime, pid, 'postgres',
-                        memory_by_pid)
-                elif memory_by_pid[pid]['name'] == 'memcached':
-                    self.create_process_result(process_results, plottime, pid, 'memcached',
-                        memory_by_pid)
-                elif memory_by_pid[pid]['name'] == 'collectd':
-                    self.create_process_result(process_results, plottime, pid, 'collectd',
-                        memory_by_pid)
-                elif memory_by_pid[pid]['name'] == 'ruby':
-                    if 'evm_server.rb' in memory_by_pid[pid]['cmd']:
-                        self.create_process_result(process_results, plottime, pid,
-                            'MIQ Server (evm_server.rb)', memory_by_pid)
-                    elif 'MIQ Server' in memory_by_pid[pid]['cmd']:
-                        self.create_process_result(process_results, plottime, pid,
-                            'MIQ Server (evm_server.rb)', memory_by_pid)
-                    elif 'evm_watchdog.rb' in memory_by_pid[pid]['cmd']:
-                        self.create_process_result(process_results, plottime, pid,
-                            'evm_watchdog.rb', memory_by_pid)
-                    elif 'appliance_console.rb' in memory_by_pid[pid]['cmd']:
-                        self.create_process_result(process_results, plottime, pid,
-                            'appliance_console.rb', memory_by_pid)
-                    elif 'evm:dbsync:replicate' in memory_by_pid[pid]['cmd']:
-                        self.create_process_result(process_results, plottime, pid,
-                            'evm:dbsync:replicate', memory_by_pid)
-                    else:
-                        logger.debug('Unaccounted for ruby pid: {}'.format(pid))
+            yield plottime, None, workers, memory_by_pid
 
             timediff = time.time() - starttime
             logger.debug('Monitoring sampled in {}s'.format(round(timediff, 4)))
 
             # Sleep Monitoring interval
             # Roughly 10s samples, accounts for collection of memory measurements
-            time_to_sleep = abs(SAMPLE_INTERVAL - timediff)
+            time_to_sleep = abs(self.interval - timediff)
             time.sleep(time_to_sleep)
-        logger.info('Monitoring CFME Memory Terminating')
 
-        create_report(self.scenario_data, appliance_results, process_results, self.use_slab,
-            self.grafana_urls)
+    def find_collector_python(self):
+        """Path of the first of :py:data:`COLLECTOR_PYTHONS` on the appliance, None if none is"""
+        result = self.ssh_client.run_command('command -v {}'.format(' '.join(COLLECTOR_PYTHONS)))
+        # command -v prints the ones it finds and fails if any is missing, the output is enough
+        found = result.output.split()
+        return found[0] if found else None
+
+    def collector_samples(self):
+        """Stream samples from the collector script, yields ``(time, meminfo, workers, memory)``
+
+        The script is uploaded and started once; it writes a JSON record per interval to a single
+        ssh channel. Closing the channel at the end hangs up the pty, which ends the script.
+        """
+        self.ssh_client.put_file(scripts_data_path.join(COLLECTOR_SCRIPT).strpath,
+            REMOTE_COLLECTOR)
+        command = '{} {} --interval {} --server-id {}'.format(
+            self.collector_python, REMOTE_COLLECTOR, self.interval, self.miq_server_id)
+        if self.ssh_client.username != 'root':
+            command = 'sudo {}'.format(command)
+        channel = self.ssh_client.get_transport().open_session()
+        try:
+            # the pty makes the collector get a SIGHUP when the channel closes
+            channel.get_pty()
+            channel.settimeout(max(self.interval, 1) * 3)
+            channel.exec_command(command)
+            buffered = b''
+            while self.signal:
+                try:
+                    data = channel.recv(65536)
+                except socket.timeout:
+                    logger.warning('No sample from the memory collector in {}s'.format(
+                        channel.gettimeout()))
+                    continue
+                if not data:
+                    logger.error('Memory collector exited with status {}: {}'.format(
+                        channel.recv_exit_status(), buffered.decode('utf-8', 'replace')))
+                    break
+                *lines, buffered = (buffered + data).split(b'\n')
+                for line in lines:
+                    sample = self.parse_collector_record(line)
+                    if sample is not None:
+                        yield sample
+        finally:
+            channel.close()
+
+    @staticmethod
+    def parse_collector_record(line):
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            record = json.loads(line.decode('utf-8'))
+        except ValueError:
+            logger.warning('Unexpected output from the memory collector: {}'.format(line))
+            return None
+        memory_by_pid = {}
+        for pid, (rss, pss, uss, vss, swap, name, cmd) in record['processes'].items():
+            memory_by_pid[pid] = {'rss': rss / 1024, 'pss': pss / 1024, 'uss': uss / 1024,
+                'vss': vss / 1024, 'swap': swap / 1024, 'name': name, 'cmd': cmd}
+        return (datetime.fromtimestamp(record['ts']), record['meminfo'], record['workers'],
+            memory_by_pid)
+
+    def record_process_memory(self, process_results, plottime, workers, memory_by_pid):
+        for worker_pid in workers:
+            self.create_process_result(process_results, plottime, worker_pid,
+                workers[worker_pid], memory_by_pid)
+
+        for pid in sorted(memory_by_pid.keys()):
+            if memory_by_pid[pid]['name'] == 'httpd':
+                self.create_process_result(process_results, plottime, pid, 'httpd',
+                    memory_by_pid)
+            elif memory_by_pid[pid]['name'] == 'postgres':
+                self.create_process_result(process_results, plottime, pid, 'postgres',
+                    memory_by_pid)
+            elif memory_by_pid[pid]['name'] == 'postmaster':
+                self.create_process_result(process_results, plottime, pid, 'postgres',
+                    memory_by_pid)
+            elif memory_by_pid[pid]['name'] == 'memcached':
+                self.create_process_result(process_results, plottime, pid, 'memcached',
+                    memory_by_pid)
+            elif memory_by_pid[pid]['name'] == 'collectd':
+                self.create_process_result(process_results, plottime, pid, 'collectd',
+                    memory_by_pid)
+            elif memory_by_pid[pid]['name'] == 'ruby':
+                if 'evm_server.rb' in memory_by_pid[pid]['cmd']:
+                    self.create_process_result(process_results, plottime, pid,
+                        'MIQ Server (evm_server.rb)', memory_by_pid)
+                elif 'MIQ Server' in memory_by_pid[pid]['cmd']:
+                    self.create_process_result(process_results, plottime, pid,
+                        'MIQ Server (evm_server.rb)', memory_by_pid)
+                elif 'evm_watchdog.rb' in memory_by_pid[pid]['cmd']:
+                    self.create_process_result(process_results, plottime, pid,
+                        'evm_watchdog.rb', memory_by_pid)
+                elif 'appliance_console.rb' in memory_by_pid[pid]['cmd']:
+                    self.create_process_result(process_results, plottime, pid,
+                        'appliance_console.rb', memory_by_pid)
+                elif 'evm:dbsync:replicate' in memory_by_pid[pid]['cmd']:
+                    self.create_process_result(process_results, plottime, pid,
+                        'evm:dbsync:replicate', memory_by_pid)
+                else:
+                    logger.debug('Unaccounted for ruby pid: {}'.format(pid))
 
     def run(self):
         try:
@@ -432,11 +547,12 @@ def compile_per_process_results(procs_to_compile, process_results, ts_end):
             for pid in process_results[process]:
                 if ts_end in process_results[process][pid]:
                     alive_pids += 1
-                    total_running_rss += process_results[process][pid][ts_end]['rss']
-                    total_running_pss += process_results[process][pid][ts_end]['pss']
-                    total_running_uss += process_results[process][pid][ts_end]['uss']
-                    total_running_vss += process_results[process][pid][ts_end]['vss']
-                    total_running_swap += process_results[process][pid][ts_end]['swap']
+                    sample = process_results[process][pid].at(ts_end)
+                    total_running_rss += sample['rss']
+                    total_running_pss += sample['pss']
+                    total_running_uss += sample['uss']
+                    total_running_vss += sample['vss']
+                    total_running_swap += sample['swap']
                 else:
                     recycled_pids += 1
     return alive_pids, recycled_pids, total_running_rss, total_running_pss, total_running_uss, \
@@ -448,24 +564,17 @@ def generate_raw_data_csv(directory, appliance_results, process_results):
     file_name = str(directory.join('appliance.csv'))
     with open(file_name, 'w') as csv_file:
         csv_file.write('TimeStamp,Total,Free,Used,Buffers,Cached,Slab,Swap_Total,Swap_Free\n')
-        for ts in appliance_results:
-            csv_file.write('{},{},{},{},{},{},{},{},{}\n'.format(ts,
-                appliance_results[ts]['total'], appliance_results[ts]['free'],
-                appliance_results[ts]['used'], appliance_results[ts]['buffers'],
-                appliance_results[ts]['cached'], appliance_results[ts]['slab'],
-                appliance_results[ts]['swap_total'], appliance_results[ts]['swap_free']))
+        appliance_results.write_csv(csv_file)
+    file_name = str(directory.join('appliance-hourly.csv'))
+    with open(file_name, 'w') as csv_file:
+        csv_file.write('Hour,Total,Free,Used,Buffers,Cached,Slab,Swap_Total,Swap_Free\n')
+        appliance_results.resample('h').write_csv(csv_file)
     for process_name in process_results:
         for process_pid in process_results[process_name]:
             file_name = str(directory.join('{}-{}.csv'.format(process_pid, process_name)))
             with open(file_name, 'w') as csv_file:
                 csv_file.write('TimeStamp,RSS,PSS,USS,VSS,SWAP\n')
-                for ts in process_results[process_name][process_pid]:
-                    csv_file.write('{},{},{},{},{},{}\n'.format(ts,
-                        process_results[process_name][process_pid][ts]['rss'],
-                        process_results[process_name][process_pid][ts]['pss'],
-                        process_results[process_name][process_pid][ts]['uss'],
-                        process_results[process_name][process_pid][ts]['vss'],
-                        process_results[process_name][process_pid][ts]['swap']))
+                process_results[process_name][process_pid].write_csv(csv_file)
     timediff = time.time() - starttime
     logger.info('Generated Raw Data CSVs in: {}'.format(timediff))
 
@@ -476,29 +585,12 @@ def generate_summary_csv(file_name, appliance_results, process_results, provider
     with open(str(file_name), 'w') as csv_file:
         csv_file.write('Version: {}, Provider(s): {}\n'.format(version_string, provider_names))
         csv_file.write('Measurement,Start of test,End of test\n')
-        start = list(appliance_results.keys())[0]
-        end = list(appliance_results.keys())[-1]
-        csv_file.write('Appliance Total Memory,{},{}\n'.format(
-            round(appliance_results[start]['total'], 2), round(appliance_results[end]['total'], 2)))
-        csv_file.write('Appliance Free Memory,{},{}\n'.format(
-            round(appliance_results[start]['free'], 2), round(appliance_results[end]['free'], 2)))
-        csv_file.write('Appliance Used Memory,{},{}\n'.format(
-            round(appliance_results[start]['used'], 2), round(appliance_results[end]['used'], 2)))
-        csv_file.write('Appliance Buffers,{},{}\n'.format(
-            round(appliance_results[start]['buffers'], 2),
-            round(appliance_results[end]['buffers'], 2)))
-        csv_file.write('Appliance Cached,{},{}\n'.format(
-            round(appliance_results[start]['cached'], 2),
-            round(appliance_results[end]['cached'], 2)))
-        csv_file.write('Appliance Slab,{},{}\n'.format(
-            round(appliance_results[start]['slab'], 2),
-            round(appliance_results[end]['slab'], 2)))
-        csv_file.write('Appliance Total Swap,{},{}\n'.format(
-            round(appliance_results[start]['swap_total'], 2),
-            round(appliance_results[end]['swap_total'], 2)))
-        csv_file.write('Appliance Free Swap,{},{}\n'.format(
-            round(appliance_results[start]['swap_free'], 2),
-            round(appliance_results[end]['swap_free'], 2)))
+        for name, measurement in (('Total Memory', 'total'), ('Free Memory', 'free'),
+                ('Used Memory', 'used'), ('Buffers', 'buffers'), ('Cached', 'cached'),
+                ('Slab', 'slab'), ('Total Swap', 'swap_total'), ('Free Swap', 'swap_free')):
+            csv_file.write('Appliance {},{},{}\n'.format(name,
+                round(appliance_results.first(measurement), 2),
+                round(appliance_results.last(measurement), 2)))
 
         summary_csv_measurement_dump(csv_file, process_results, 'rss')
         summary_csv_measurement_dump(csv_file, process_results, 'pss')
@@ -537,17 +629,14 @@ def generate_summary_html(directory, version_string, appliance_results, process_
         html_file.write(' : <b><a href=\'workload.html\'>Workload Info</a></b>')
         html_file.write(' : <b><a href=\'graphs/\'>Graphs directory</a></b>\n')
         html_file.write(' : <b><a href=\'rawdata/\'>CSVs directory</a></b><br>\n')
-        start = list(appliance_results.keys())[0]
-        end = list(appliance_results.keys())[-1]
+        start = appliance_results.start
+        end = appliance_results.end
         timediff = end - start
         total_proc_count = 0
         for proc_name in process_results:
-            total_proc_count += len(list(process_results[proc_name].keys()))
-        growth = appliance_results[end]['used'] - appliance_results[start]['used']
-        max_used_memory = 0
-        for ts in appliance_results:
-            if appliance_results[ts]['used'] > max_used_memory:
-                max_used_memory = appliance_results[ts]['used']
+            total_proc_count += len(process_results[proc_name])
+        growth = appliance_results.last('used') - appliance_results.first('used')
+        max_used_memory = appliance_results.statistics('used')['max']
         html_file.write('<table border="1">\n')
         html_file.write('<tr><td>\n')
         # Appliance Wide Results
@@ -569,9 +658,9 @@ def generate_summary_html(directory, version_string, appliance_results, process_
         html_file.write('<td>{}</td>\n'.format(start.replace(microsecond=0)))
         html_file.write('<td>{}</td>\n'.format(end.replace(microsecond=0)))
         html_file.write('<td>{}</td>\n'.format(str(timediff).partition('.')[0]))
-        html_file.write('<td>{}</td>\n'.format(round(appliance_results[end]['total'], 2)))
-        html_file.write('<td>{}</td>\n'.format(round(appliance_results[start]['used'], 2)))
-        html_file.write('<td>{}</td>\n'.format(round(appliance_results[end]['used'], 2)))
+        html_file.write('<td>{}</td>\n'.format(round(appliance_results.last('total'), 2)))
+        html_file.write('<td>{}</td>\n'.format(round(appliance_results.first('used'), 2)))
+        html_file.write('<td>{}</td>\n'.format(round(appliance_results.last('used'), 2)))
         html_file.write('<td>{}</td>\n'.format(round(growth, 2)))
         html_file.write('<td>{}</td>\n'.format(round(max_used_memory, 2)))
         html_file.write('<td>{}</td>\n'.format(total_proc_count))
@@ -747,11 +836,8 @@ def generate_summary_html(directory, version_string, appliance_results, process_
         html_file.write('<img src=\'graphs/{}\'>\n'.format(file_name))
         file_name = '{}-appliance_swap.png'.format(version_string)
         # Check for swap usage through out time frame:
-        max_swap_used = 0
-        for ts in appliance_results:
-            swap_used = appliance_results[ts]['swap_total'] - appliance_results[ts]['swap_free']
-            if swap_used > max_swap_used:
-                max_swap_used = swap_used
+        swap_used = appliance_results['swap_total'] - appliance_results['swap_free']
+        max_swap_used = swap_used.max() if len(swap_used) else 0
         if max_swap_used < 10:  # Less than 10MiB Max, then hide graph
             html_file.write('<br><a href=\'graphs/{}\'>Swap Graph '.format(file_name))
             html_file.write('(Hidden, max_swap_used < 10 MiB)</a>\n')
@@ -777,8 +863,9 @@ def generate_summary_html(directory, version_string, appliance_results, process_
         for ordered_name in process_order:
             if ordered_name in process_results:
                 for pid in process_results[ordered_name]:
-                    start = list(process_results[ordered_name][pid].keys())[0]
-                    end = list(process_results[ordered_name][pid].keys())[-1]
+                    process_series = process_results[ordered_name][pid]
+                    start = process_series.start
+                    end = process_series.end
                     timediff = end - start
                     html_file.write('<tr>\n')
                     if len(process_results[ordered_name]) > 1:
@@ -793,19 +880,17 @@ def generate_summary_html(directory, version_string, appliance_results, process_
                     html_file.write('<td>{}</td>\n'.format(start.replace(microsecond=0)))
                     html_file.write('<td>{}</td>\n'.format(end.replace(microsecond=0)))
                     html_file.write('<td>{}</td>\n'.format(str(timediff).partition('.')[0]))
-                    rss_change = process_results[ordered_name][pid][end]['rss'] - \
-                        process_results[ordered_name][pid][start]['rss']
+                    rss_change = process_series.last('rss') - process_series.first('rss')
                     html_file.write('<td>{}</td>\n'.format(
-                        round(process_results[ordered_name][pid][start]['rss'], 2)))
+                        round(process_series.first('rss'), 2)))
                     html_file.write('<td>{}</td>\n'.format(
-                        round(process_results[ordered_name][pid][end]['rss'], 2)))
+                        round(process_series.last('rss'), 2)))
                     html_file.write('<td>{}</td>\n'.format(round(rss_change, 2)))
-                    pss_change = process_results[ordered_name][pid][end]['pss'] - \
-                        process_results[ordered_name][pid][start]['pss']
+                    pss_change = process_series.last('pss') - process_series.first('pss')
                     html_file.write('<td>{}</td>\n'.format(
-                        round(process_results[ordered_name][pid][start]['pss'], 2)))
+                        round(process_series.first('pss'), 2)))
                     html_file.write('<td>{}</td>\n'.format(
-                        round(process_results[ordered_name][pid][end]['pss'], 2)))
+                        round(process_series.last('pss'), 2)))
                     html_file.write('<td>{}</td>\n'.format(round(pss_change, 2)))
                     html_file.write('<td><a href=\'rawdata/{}-{}.csv\'>csv</a></td>\n'.format(
                         pid, ordered_name))
@@ -996,23 +1081,16 @@ def graph_appliance_measurements(graphs_path, ver, appliance_results, use_slab,
 
     starttime = time.time()
 
-    dates = list(appliance_results.keys())
-    total_memory_list = list(appliance_results[ts]['total']
-                             for ts in appliance_results.keys())
-    free_memory_list = list(appliance_results[ts]['free']
-                            for ts in appliance_results.keys())
-    used_memory_list = list(appliance_results[ts]['used']
-                            for ts in appliance_results.keys())
-    buffers_memory_list = list(appliance_results[ts]['buffers']
-                               for ts in appliance_results.keys())
-    cache_memory_list = list(appliance_results[ts]['cached']
-                             for ts in appliance_results.keys())
-    slab_memory_list = list(appliance_results[ts]['slab']
-                            for ts in appliance_results.keys())
-    swap_total_list = list(appliance_results[ts]['swap_total']
-                           for ts in appliance_results.keys())
-    swap_free_list = list(appliance_results[ts]['swap_free']
-                          for ts in appliance_results.keys())
+    appliance_results = appliance_results.downsample()
+    dates = appliance_results.datetimes()
+    total_memory_list = appliance_results['total']
+    free_memory_list = appliance_results['free']
+    used_memory_list = appliance_results['used']
+    buffers_memory_list = appliance_results['buffers']
+    cache_memory_list = appliance_results['cached']
+    slab_memory_list = appliance_results['slab']
+    swap_total_list = appliance_results['swap_total']
+    swap_free_list = appliance_results['swap_free']
 
     # Stack Plot Memory Usage
     file_name = graphs_path.join('{}-appliance_memory.png'.format(ver))
@@ -1084,7 +1162,7 @@ def graph_appliance_measurements(graphs_path, ver, appliance_results, use_slab,
     plt.xlabel('Date / Time')
     plt.ylabel('Swap (MiB)')
 
-    swap_used_list = [t - f for f, t in zip(swap_free_list, swap_total_list)]
+    swap_used_list = swap_total_list - swap_free_list
     y = [swap_used_list, swap_free_list]
     plt.stackplot(dates, *y, baseline='zero')
     ax.annotate(str(round(swap_total_list[0], 2)), xy=(dates[0], swap_total_list[0]),
@@ -1128,12 +1206,11 @@ def graph_all_miq_workers(graph_file_path, process_results, provider_names):
     for process_name in process_results:
         if 'Worker' in process_name or 'Handler' in process_name or 'Catcher' in process_name:
             for process_pid in process_results[process_name]:
-                dates = list(process_results[process_name][process_pid].keys())
+                process_series = process_results[process_name][process_pid].downsample()
+                dates = process_series.datetimes()
 
-                rss_samples = list(process_results[process_name][process_pid][ts]['rss']
-                        for ts in process_results[process_name][process_pid].keys())
-                vss_samples = list(process_results[process_name][process_pid][ts]['vss']
-                        for ts in process_results[process_name][process_pid].keys())
+                rss_samples = process_series['rss']
+                vss_samples = process_series['vss']
                 plt.plot(dates, rss_samples, linewidth=1, label='{} {} RSS'.format(process_pid,
                     process_name))
                 plt.plot(dates, vss_samples, linewidth=1, label='{} {} VSS'.format(
@@ -1163,17 +1240,13 @@ def graph_individual_process_measurements(graph_file_path, process_results, prov
 
             file_name = graph_file_path.join('{}-{}.png'.format(process_name, process_pid))
 
-            dates = list(process_results[process_name][process_pid].keys())
-            rss_samples = list(process_results[process_name][process_pid][ts]['rss']
-                    for ts in process_results[process_name][process_pid].keys())
-            pss_samples = list(process_results[process_name][process_pid][ts]['pss']
-                    for ts in process_results[process_name][process_pid].keys())
-            uss_samples = list(process_results[process_name][process_pid][ts]['uss']
-                    for ts in process_results[process_name][process_pid].keys())
-            vss_samples = list(process_results[process_name][process_pid][ts]['vss']
-                    for ts in process_results[process_name][process_pid].keys())
-            swap_samples = list(process_results[process_name][process_pid][ts]['swap']
-                    for ts in process_results[process_name][process_pid].keys())
+            process_series = process_results[process_name][process_pid].downsample()
+            dates = process_series.datetimes()
+            rss_samples = process_series['rss']
+            pss_samples = process_series['pss']
+            uss_samples = process_series['uss']
+            vss_samples = process_series['vss']
+            swap_samples = process_series['swap']
 
             fig, ax = plt.subplots()
             plt.title('Provider(s)/Size: {}\nProcess/Worker: {}\nPID: {}'.format(provider_names,
@@ -1186,27 +1259,27 @@ def graph_individual_process_measurements(graph_file_path, process_results, prov
             plt.plot(dates, vss_samples, linewidth=1, label='VSS')
             plt.plot(dates, swap_samples, linewidth=1, label='Swap')
 
-            if rss_samples:
+            if len(rss_samples):
                 ax.annotate(str(round(rss_samples[0], 2)), xy=(dates[0], rss_samples[0]),
                     xytext=(4, 4), textcoords='offset points')
                 ax.annotate(str(round(rss_samples[-1], 2)), xy=(dates[-1], rss_samples[-1]),
                     xytext=(4, -4), textcoords='offset points')
-            if pss_samples:
+            if len(pss_samples):
                 ax.annotate(str(round(pss_samples[0], 2)), xy=(dates[0], pss_samples[0]),
                     xytext=(4, 4), textcoords='offset points')
                 ax.annotate(str(round(pss_samples[-1], 2)), xy=(dates[-1], pss_samples[-1]),
                     xytext=(4, -4), textcoords='offset points')
-            if uss_samples:
+            if len(uss_samples):
                 ax.annotate(str(round(uss_samples[0], 2)), xy=(dates[0], uss_samples[0]),
                     xytext=(4, 4), textcoords='offset points')
                 ax.annotate(str(round(uss_samples[-1], 2)), xy=(dates[-1], uss_samples[-1]),
                     xytext=(4, -4), textcoords='offset points')
-            if vss_samples:
+            if len(vss_samples):
                 ax.annotate(str(round(vss_samples[0], 2)), xy=(dates[0], vss_samples[0]),
                     xytext=(4, 4), textcoords='offset points')
                 ax.annotate(str(round(vss_samples[-1], 2)), xy=(dates[-1], vss_samples[-1]),
                     xytext=(4, -4), textcoords='offset points')
-            if swap_samples:
+            if len(swap_samples):
                 ax.annotate(str(round(swap_samples[0], 2)), xy=(dates[0], swap_samples[0]),
                     xytext=(4, 4), textcoords='offset points')
                 ax.annotate(str(round(swap_samples[-1], 2)), xy=(dates[-1], swap_samples[-1]),
@@ -1248,44 +1321,40 @@ def graph_same_miq_workers(graph_file_path, process_results, provider_names):
             plt.ylabel('Memory (MiB)')
 
             for process_pid in process_results[process_name]:
-                dates = list(process_results[process_name][process_pid].keys())
-
-                rss_samples = list(process_results[process_name][process_pid][ts]['rss']
-                        for ts in process_results[process_name][process_pid].keys())
-                pss_samples = list(process_results[process_name][process_pid][ts]['pss']
-                        for ts in process_results[process_name][process_pid].keys())
-                uss_samples = list(process_results[process_name][process_pid][ts]['uss']
-                        for ts in process_results[process_name][process_pid].keys())
-                vss_samples = list(process_results[process_name][process_pid][ts]['vss']
-                        for ts in process_results[process_name][process_pid].keys())
-                swap_samples = list(process_results[process_name][process_pid][ts]['swap']
-                        for ts in process_results[process_name][process_pid].keys())
+                process_series = process_results[process_name][process_pid].downsample()
+                dates = process_series.datetimes()
+
+                rss_samples = process_series['rss']
+                pss_samples = process_series['pss']
+                uss_samples = process_series['uss']
+                vss_samples = process_series['vss']
+                swap_samples = process_series['swap']
                 plt.plot(dates, rss_samples, linewidth=1, label='{} RSS'.format(process_pid))
                 plt.plot(dates, pss_samples, linewidth=1, label='{} PSS'.format(process_pid))
                 plt.plot(dates, uss_samples, linewidth=1, label='{} USS'.format(process_pid))
                 plt.plot(dates, vss_samples, linewidth=1, label='{} VSS'.format(process_pid))
                 plt.plot(dates, swap_samples, linewidth=1, label='{} SWAP'.format(process_pid))
-                if rss_samples:
+                if len(rss_samples):
                     ax.annotate(str(round(rss_samples[0], 2)), xy=(dates[0], rss_samples[0]),
                         xytext=(4, 4), textcoords='offset points')
                     ax.annotate(str(round(rss_samples[-1], 2)), xy=(dates[-1],
                         rss_samples[-1]), xytext=(4, -4), textcoords='offset points')
-                if pss_samples:
+                if len(pss_samples):
                     ax.annotate(str(round(pss_samples[0], 2)), xy=(dates[0],
                         pss_samples[0]), xytext=(4, 4), textcoords='offset points')
                     ax.annotate(str(round(pss_samples[-1], 2)), xy=(dates[-1],
                         pss_samples[-1]), xytext=(4, -4), textcoords='offset points')
-                if uss_samples:
+                if len(uss_samples):
                     ax.annotate(str(round(uss_samples[0], 2)), xy=(dates[0],
                         uss_samples[0]), xytext=(4, 4), textcoords='offset points')
                     ax.annotate(str(round(uss_samples[-1], 2)), xy=(dates[-1],
                         uss_samples[-1]), xytext=(4, -4), textcoords='offset points')
-                if vss_samples:
+                if len(vss_samples):
                     ax.annotate(str(round(vss_samples[0], 2)), xy=(dates[0],
                         vss_samples[0]), xytext=(4, 4), textcoords='offset points')
                     ax.annotate(str(round(vss_samples[-1], 2)), xy=(dates[-1],
                         vss_samples[-1]), xytext=(4, -4), textcoords='offset points')
-                if swap_samples:
+                if len(swap_samples):
                     ax.annotate(str(round(swap_samples[0], 2)), xy=(dates[0],
                         swap_samples[0]), xytext=(4, 4), textcoords='offset points')
                     ax.annotate(str(round(swap_samples[-1], 2)), xy=(dates[-1],
@@ -1311,8 +1380,7 @@ def summary_csv_measurement_dump(csv_file, process_results, measurement):
     for ordered_name in process_order:
         if ordered_name in process_results:
             for process_pid in sorted(process_results[ordered_name]):
-                start = list(process_results[ordered_name][process_pid].keys())[0]
-                end = list(process_results[ordered_name][process_pid].keys())[-1]
+                process_series = process_results[ordered_name][process_pid]
                 csv_file.write('{},{},{},{}\n'.format(ordered_name, process_pid,
-                    round(process_results[ordered_name][process_pid][start][measurement], 2),
-                    round(process_results[ordered_name][process_pid][end][measurement], 2)))
+                    round(process_series.first(measurement), 2),
+                    round(process_series.last(measurement), 2)))
@@ -1,6 +1,8 @@
 import re
 import socket
 import sys
+import threading
+import weakref
 from functools import total_ordering
 from os import path as os_path
 from subprocess import check_call
@@ -782,12 +784,35 @@ class SSHClient(paramiko.SSHClient):
 
 
 class SSHTail(SSHClient):
+    """Tail a remote file over a single, long-lived SSH connection and SFTP session
+
+    Every iteration yields the lines appended to the file since the previous one. New data is
+    read in large chunks and split into lines locally; an incomplete last line is held back until
+    the rest of it is written. If the file shrinks, it is assumed to have been rotated or
+    truncated, and is read again from the start.
+
+    Use :py:meth:`SSHTail.shared` to have several consumers read the same remote file through
+    one tail.
+    """
+
+    #: size of the chunks new file content is read in
+    CHUNK_SIZE = 1024 * 1024
 
     def __init__(self, remote_filename, **connect_kwargs):
         super().__init__(stream_output=False, **connect_kwargs)
         self._remote_filename = remote_filename
         self._sftp_client = None
         self._remote_file_size = None
+        self._partial_line = b''
+
+    @classmethod
+    def shared(cls, remote_filename, **connect_kwargs):
+        """Get a reader of a tail shared with everyone tailing the same remote file
+
+        Returns:
+            A :py:class:`SharedSSHTailReader`, which can be used like an :py:class:`SSHTail`
+        """
+        return SharedSSHTail.get(remote_filename, **connect_kwargs).reader()
 
     def __iter__(self):
         for line in self.raw_lines():
@@ -796,36 +821,209 @@ class SSHTail(SSHClient):
     def raw_lines(self):
         with self as sshtail:
             fstat = sshtail._sftp_client.stat(self._remote_filename)
-            if self._remote_file_size is not None:
-                if self._remote_file_size < fstat.st_size:
-                    remote_file = self._sftp_client.open(self._remote_filename, 'r')
-                    remote_file.seek(self._remote_file_size, 0)
-                    while (remote_file.tell() < fstat.st_size):
-                        line = remote_file.readline()  # Note the  missing rstrip() here!
-                        yield line
-            self._remote_file_size = fstat.st_size
+            if self._remote_file_size is None:
+                self._remote_file_size = fstat.st_size
+                return
+            if fstat.st_size < self._remote_file_size:
+                logger.info('%s shrunk, assuming it was rotated', self._remote_filename)
+                self._remote_file_size = 0
+                self._partial_line = b''
+            if self._remote_file_size < fstat.st_size:
+                yield from self._read_lines(fstat.st_size)
+
+    def _read_lines(self, end):
+        """Lines from ``_remote_file_size`` up to ``end``
+
+        ``_remote_file_size`` is the offset read up to and ``_partial_line`` the bytes read past
+        the last yielded line; both are kept in sync at every line, so a consumer can stop
+        iterating at any point and the next iteration resumes after the last line it got.
+        """
+        with self._sftp_client.open(self._remote_filename, 'rb') as remote_file:
+            remote_file.seek(self._remote_file_size, 0)
+            remote_file.prefetch(end)
+            while self._remote_file_size < end:
+                chunk = remote_file.read(min(self.CHUNK_SIZE, end - self._remote_file_size))
+                if not chunk:
+                    break
+                chunk_end = self._remote_file_size + len(chunk)
+                offset = self._remote_file_size - len(self._partial_line)
+                lines = (self._partial_line + chunk).split(b'\n')
+                # the last element is either empty or a line that's still being written
+                partial_line = lines.pop()
+                for line in lines:
+                    offset += len(line) + 1
+                    self._remote_file_size, self._partial_line = offset, b''
+                    yield line.decode('utf-8', errors='replace') + '\n'
+                self._remote_file_size, self._partial_line = chunk_end, partial_line
 
     def raw_string(self):
         return ''.join(self)
 
     def __enter__(self):
-        self.connect(**self._connect_kwargs)
-        self._sftp_client = self.open_sftp()
+        if not self.connected:
+            self.connect(**self._connect_kwargs)
+            self._sftp_client = None
+        if self._sftp_client is None or self._sftp_client.sock.closed:
+            self._sftp_client = self.open_sftp()
         return self
 
     def __exit__(self, *args, **kwargs):
-        self._sftp_client.close()
+        # Keep the connection and the SFTP session for the next iteration, see close()
+        pass
+
+    def close(self):
+        if getattr(self, '_sftp_client', None) is not None:
+            self._sftp_client.close()
+            self._sftp_client = None
+        super().close()
 
     def set_initial_file_end(self):
         with self as sshtail:
             fstat = sshtail._sftp_client.stat(self._remote_filename)
             self._remote_file_size = fstat.st_size  # Seed initial size of file
+            self._partial_line = b''
 
     def lines_as_list(self):
         """Return lines as list"""
         return list(self)
 
 
+class SharedSSHTail(object):
+    """One :py:class:`SSHTail` read by several :py:class:`SharedSSHTailReader` objects
+
+    Lines read from the remote file are buffered until every reader has consumed them, but no more
+    than ``MAX_BUFFERED_LINES``; a reader lagging further behind skips the oldest lines. Tails are
+    shared per host, port, user and remote file, and closed once their last reader is closed or
+    garbage collected.
+    """
+    #: most lines kept for the readers that haven't consumed them
+    MAX_BUFFERED_LINES = 100000
+
+    _tails = weakref.WeakValueDictionary()
+    _tails_lock = threading.Lock()
+
+    def __init__(self, tail):
+        self._tail = tail
+        self._lock = threading.RLock()
+        self._lines = []
+        # absolute line number of self._lines[0]
+        self._first = 0
+        self._started = False
+        self._readers = weakref.WeakSet()
+
+    @classmethod
+    def get(cls, remote_filename, **connect_kwargs):
+        tail = SSHTail(remote_filename, **connect_kwargs)
+        key = (
+            tail._connect_kwargs['hostname'],
+            tail._connect_kwargs.get('port'),
+            tail._connect_kwargs.get('username'),
+            remote_filename)
+        with cls._tails_lock:
+            shared = cls._tails.get(key)
+            if shared is None:
+                shared = cls._tails[key] = cls(tail)
+            else:
+                tail.close()
+        return shared
+
+    @property
+    def end(self):
+        return self._first + len(self._lines)
+
+    def reader(self):
+        reader = SharedSSHTailReader(self)
+        self._readers.add(reader)
+        return reader
+
+    def poll(self, reader):
+        """Read new lines from the remote file into the buffer"""
+        with self._lock:
+            # a closed reader that is read again is tracked again
+            self._readers.add(reader)
+            if not self._started:
+                self._tail.set_initial_file_end()
+                self._started = True
+            else:
+                self._lines.extend(self._tail.raw_lines())
+                self._trim()
+
+    def read(self, reader):
+        """Lines the reader hasn't seen yet and the line number of the first one"""
+        with self._lock:
+            self._trim()
+            start = max(reader.position, self._first)
+            return start, self._lines[start - self._first:]
+
+    def _trim(self):
+        positions = [reader.position for reader in self._readers if reader.position is not None]
+        consumed = min(positions, default=self.end) - self._first
+        overflow = len(self._lines) - self.MAX_BUFFERED_LINES
+        if overflow > consumed:
+            logger.warning('%d lines of %s were dropped before all the readers consumed them',
+                           overflow - consumed, self._tail._remote_filename)
+            consumed = overflow
+        if consumed > 0:
+            del self._lines[:consumed]
+            self._first += consumed
+
+    def release(self, reader):
+        with self._lock:
+            self._readers.discard(reader)
+            if not self._readers:
+                self._tail.close()
+                self._started = False
+                self._first, self._lines = self.end, []
+            else:
+                self._trim()
+
+    def __del__(self):
+        self._tail.close()
+
+
+class SharedSSHTailReader(object):
+    """A consumer of a :py:class:`SharedSSHTail`, with the same interface as :py:class:`SSHTail`
+
+    Each reader has its own position in the file, so readers started at different times each
+    see the lines appended since their own :py:meth:`set_initial_file_end`.
+    """
+
+    def __init__(self, shared_tail):
+        self._shared_tail = shared_tail
+        self.position = None
+
+    def __iter__(self):
+        for line in self.raw_lines():
+            yield line.rstrip()
+
+    def raw_lines(self):
+        self._shared_tail.poll(self)
+        if self.position is None:
+            # like SSHTail, the first read only marks the end of the file
+            self.position = self._shared_tail.end
+            return
+        start, lines = self._shared_tail.read(self)
+        self.position = start
+        for line in lines:
+            # move on line by line, a consumer stopping early gets the rest the next time
+            self.position += 1
+            yield line
+
+    def raw_string(self):
+        return ''.join(self)
+
+    def set_initial_file_end(self):
+        self._shared_tail.poll(self)
+        self.position = self._shared_tail.end
+
+    def lines_as_list(self):
+        """Return lines as list"""
+        return list(self)
+
+    def close(self):
+        self._shared_tail.release(self)
+
+
 def keygen():
     """Generate temporary ssh keypair for appliance SSH auth
 
@@ -0,0 +1,327 @@
+"""Static inventory of the tests, read from the source without collecting them
+
+Collecting the tests with pytest needs the configuration, the providers and an appliance and takes
+minutes. For questions like "which tests are marked with tier 1" or "what's the assignee of this
+test" reading the source is enough: every test module is parsed with :py:mod:`ast` and its tests
+are indexed with their markers and docstring metadata.
+
+The index is kept in ``.cache/test_inventory.json`` and only the modules that changed since it was
+written are parsed again::
+
+    inventory = TestInventory.load()
+    inventory.update('cfme/tests')
+    tier1 = [test.nodeid for test in inventory.tests() if 1 in test.marker_args('tier')]
+
+Markers are recorded the way they are written, with arguments that are literals evaluated,
+names as strings (``InfraProvider``), calls as ``{'call': name, 'args': [...], 'kwargs': {...}}``
+and anything else, like the lambdas of ``uncollectif``, as source text. Parametrization is not
+expanded, use ``pytest --collect-only`` for the actual test items.
+"""
+import ast
+import json
+import os
+import tempfile
+from textwrap import dedent
+
+import attr
+import yaml
+
+from cfme.utils.log import logger
+from cfme.utils.path import cache_path
+from cfme.utils.path import project_path
+
+INDEX_FILE = cache_path.join('test_inventory.json')
+#: bumped when the format of the indexed tests changes, so that old indexes are rebuilt
+INDEX_VERSION = 1
+#: docstring sections holding yaml metadata, see :py:mod:`cfme.fixtures.nelson`
+METADATA_SECTIONS = ('Polarion', 'Bugzilla', 'Metadata')
+
+
+@attr.s
+class IndexedTest(object):
+    """A test function found in the source
+
+    ``markers`` are dicts with ``name``, ``args``, ``kwargs`` and ``level`` (``module``, ``class``
+    or ``function``), in the order pytest would see them, closest first. ``test_requirements``
+    markers are named ``requirement`` with the requirement as the only argument.
+    """
+    path = attr.ib()
+    name = attr.ib()
+    lineno = attr.ib()
+    cls = attr.ib(default=None)
+    markers = attr.ib(default=attr.Factory(list))
+    metadata = attr.ib(default=attr.Factory(dict))
+
+    @property
+    def nodeid(self):
+        return '::'.join(part for part in (self.path, self.cls, self.name) if part)
+
+    def get_markers(self, name):
+        return [marker for marker in self.markers if marker['name'] == name]
+
+    def has_marker(self, name):
+        return any(marker['name'] == name for marker in self.markers)
+
+    def marker_args(self, name):
+        """Arguments of all the markers called ``name``"""
+        return [arg for marker in self.get_markers(name) for arg in marker['args']]
+
+    @property
+    def polarion(self):
+        return self.metadata.get('polarion') or {}
+
+    @property
+    def blockers(self):
+        """The blockers of the ``meta`` markers"""
+        return [blocker for marker in self.get_markers('meta')
+                for blocker in marker['kwargs'].get('blockers', [])]
+
+
+class _Renderer(object):
+    """Turns marker argument nodes into JSON serializable values"""
+
+    def __init__(self, source):
+        self.lines = source.splitlines()
+
+    def source(self, node):
+        end_lineno = getattr(node, 'end_lineno', None)
+        if end_lineno is None:
+            # python < 3.8 doesn't know where nodes end, take the rest of the first line
+            return self.lines[node.lineno - 1][node.col_offset:].strip()
+        lines = self.lines[node.lineno - 1:end_lineno]
+        lines[-1] = lines[-1][:node.end_col_offset]
+        lines[0] = lines[0][node.col_offset:]
+        return '\n'.join(lines)
+
+    def value(self, node):
+        try:
+            return ast.literal_eval(node)
+        except (ValueError, SyntaxError):
+            pass
+        if isinstance(node, (ast.Name, ast.Attribute)):
+            return dotted_name(node) or self.source(node)
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            return [self.value(item) for item in node.elts]
+        if isinstance(node, ast.Call):
+            call = {'call': dotted_name(node.func) or self.source(node.func)}
+            call.update(self.arguments(node))
+            return call
+        return self.source(node)
+
+    def arguments(self, call):
+        return {
+            'args': [self.value(arg) for arg in call.args],
+            'kwargs': {kw.arg: self.value(kw.value) for kw in call.keywords if kw.arg},
+        }
+
+
+def dotted_name(node):
+    """``a.b.c`` of a name or attribute node, None for anything else"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+def parse_marker(node, renderer, level):
+    """Marker dict of a decorator or ``pytestmark`` item, None if it isn't a marker"""
+    call = node if isinstance(node, ast.Call) else None
+    name = dotted_name(call.func if call else node)
+    if name is None:
+        return None
+    if name.startswith('pytest.mark.'):
+        marker = {'name': name[len('pytest.mark.'):], 'args': [], 'kwargs': {}}
+    elif name.startswith('test_requirements.'):
+        marker = {'name': 'requirement', 'args': [name[len('test_requirements.'):]],
+                  'kwargs': {}}
+    else:
+        return None
+    if call:
+        arguments = renderer.arguments(call)
+        marker['args'].extend(arguments['args'])
+        marker['kwargs'].update(arguments['kwargs'])
+    marker['level'] = level
+    return marker
+
+
+def _pytestmark(body, renderer, level):
+    markers = []
+    for node in body:
+        if (isinstance(node, ast.Assign) and
+                any(isinstance(t, ast.Name) and t.id == 'pytestmark' for t in node.targets)):
+            items = node.value.elts if isinstance(node.value, (ast.List, ast.Tuple)) else [
+                node.value]
+            markers = [marker for marker in (parse_marker(item, renderer, level) for item in items)
+                       if marker]
+    return markers
+
+
+def _decorators(node, renderer, level):
+    # the decorator closest to the definition applies first
+    markers = (parse_marker(decorator, renderer, level) for decorator in node.decorator_list)
+    return [marker for marker in reversed(list(markers)) if marker]
+
+
+def parse_docstring_metadata(docstring):
+    """The yaml of the :py:data:`METADATA_SECTIONS` of a docstring, keyed by lowercase section"""
+    if not docstring:
+        return {}
+    metadata = {}
+    lines = docstring.expandtabs().splitlines()
+    index = 0
+    while index < len(lines):
+        header = lines[index].strip()
+        if header.endswith(':') and header[:-1] in METADATA_SECTIONS:
+            indent = len(lines[index]) - len(lines[index].lstrip())
+            block = []
+            index += 1
+            while index < len(lines) and (
+                    not lines[index].strip() or
+                    len(lines[index]) - len(lines[index].lstrip()) > indent):
+                block.append(lines[index])
+                index += 1
+            try:
+                metadata[header[:-1].lower()] = yaml.safe_load(dedent('\n'.join(block)))
+            except yaml.YAMLError:
+                metadata[header[:-1].lower()] = dedent('\n'.join(block)).strip()
+        else:
+            index += 1
+    return metadata
+
+
+def _is_test(node):
+    return (isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and
+            node.name.startswith('test'))
+
+
+def parse_module(path, source, relpath):
+    """All the tests of a module"""
+    tree = ast.parse(source, filename=str(path))
+    renderer = _Renderer(source)
+    module_markers = _pytestmark(tree.body, renderer, 'module')
+    tests = []
+
+    def add(node, cls=None, class_markers=()):
+        tests.append(IndexedTest(
+            path=relpath, name=node.name, lineno=node.lineno, cls=cls,
+            markers=_decorators(node, renderer, 'function') + list(class_markers) +
+            module_markers,
+            metadata=parse_docstring_metadata(ast.get_docstring(node, clean=False))))
+
+    for node in tree.body:
+        if _is_test(node):
+            add(node)
+        elif isinstance(node, ast.ClassDef) and node.name.startswith('Test'):
+            class_markers = (_decorators(node, renderer, 'class') +
+                             _pytestmark(node.body, renderer, 'class'))
+            for item in node.body:
+                if _is_test(item):
+                    add(item, node.name, class_markers)
+    return tests
+
+
+def _stat(path):
+    stat = os.stat(path)
+    return [stat.st_mtime, stat.st_size]
+
+
+@attr.s
+class TestInventory(object):
+    """The index of the tests of the modules under ``root``, see the module docstring"""
+    # not a test class, despite its name
+    __test__ = False
+
+    root = attr.ib(default=project_path.strpath)
+    index_file = attr.ib(default=INDEX_FILE.strpath)
+    files = attr.ib(default=attr.Factory(dict))
+
+    @classmethod
+    def load(cls, **kwargs):
+        inventory = cls(**kwargs)
+        try:
+            with open(inventory.index_file) as f:
+                data = json.load(f)
+        except (IOError, ValueError):
+            return inventory
+        if data.get('version') == INDEX_VERSION and data.get('root') == inventory.root:
+            inventory.files = data['files']
+        return inventory
+
+    def save(self):
+        directory = os.path.dirname(self.index_file)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': INDEX_VERSION, 'root': self.root, 'files': self.files}, f)
+            os.replace(temp_name, self.index_file)
+        except Exception:
+            os.unlink(temp_name)
+            raise
+
+    def _modules(self, path):
+        if os.path.isfile(path):
+            yield path
+            return
+        for directory, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith(('.', '__')))
+            for filename in sorted(filenames):
+                if filename.startswith('test_') and filename.endswith('.py'):
+                    yield os.path.join(directory, filename)
+
+    def update(self, path='cfme/tests', save=True):
+        """Parses the modules under ``path`` that changed since they were indexed
+
+        Returns:
+            the number of modules parsed
+        """
+        path = os.path.join(self.root, path)
+        prefix = os.path.relpath(path, self.root)
+        seen = set()
+        parsed = 0
+        for module in self._modules(path):
+            relpath = os.path.relpath(module, self.root)
+            seen.add(relpath)
+            stat = _stat(module)
+            indexed = self.files.get(relpath)
+            if indexed and indexed['stat'] == stat:
+                continue
+            with open(module, 'rb') as f:
+                source = f.read().decode('utf-8')
+            try:
+                tests = [attr.asdict(test) for test in parse_module(module, source, relpath)]
+            except SyntaxError:
+                logger.warning('Could not parse %s for the test inventory', relpath)
+                tests = []
+            self.files[relpath] = {'stat': stat, 'tests': tests}
+            parsed += 1
+
+        # forget the deleted modules
+        removed = [relpath for relpath in self.files
+                   if (prefix == '.' or relpath == prefix or
+                       relpath.startswith(prefix.rstrip(os.sep) + os.sep)) and
+                   relpath not in seen]
+        for relpath in removed:
+            del self.files[relpath]
+        if save and (parsed or removed):
+            self.save()
+        return parsed
+
+    def tests(self, path=None):
+        """Yields the :py:class:`IndexedTest` of the indexed modules, optionally under ``path``"""
+        for relpath in sorted(self.files):
+            if path and not (relpath == path or relpath.startswith(path.rstrip('/') + '/')):
+                continue
+            for test in self.files[relpath]['tests']:
+                yield IndexedTest(**test)
+
+
+def load_inventory(path='cfme/tests'):
+    """The :py:class:`TestInventory` of the project, up to date for ``path``"""
+    inventory = TestInventory.load()
+    inventory.update(path)
+    return inventory
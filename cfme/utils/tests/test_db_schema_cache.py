@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import create_engine
+
+from cfme.utils import db as db_module
+from cfme.utils.db import Db
+from cfme.utils.db import save_schema_caches
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+    engine.execute('CREATE TABLE vms (id INTEGER PRIMARY KEY, name VARCHAR)')
+    engine.execute('CREATE TABLE hosts (id INTEGER PRIMARY KEY, name VARCHAR)')
+    return engine
+
+
+@pytest.fixture
+def make_db(tmpdir, monkeypatch, engine):
+    monkeypatch.setattr(db_module, 'SCHEMA_CACHE_DIR', tmpdir.join('db_schema'))
+
+    def make_db():
+        db = Db(hostname='appliance', credentials={'username': 'root', 'password': 'x'},
+                port=5432)
+        # the cached properties, without a CFME database
+        db.engine, db.schema_key = engine, 'schema'
+        return db
+    return make_db
+
+
+def test_schema_cache_round_trip(make_db):
+    db = make_db()
+    db.reflect_table('vms')
+    # saved in one go at the end of the session
+    assert not db.schema_cache_file.check()
+    save_schema_caches()
+    assert db.schema_cache_file.check(file=True)
+
+    cached = make_db()
+    assert list(cached.metadata.tables) == ['vms']
+    assert [column.name for column in cached.metadata.tables['vms'].columns] == ['id', 'name']
+    assert cached.metadata.bind is cached.engine
+
+
+def test_reflect_table_skips_cached_tables(make_db, monkeypatch):
+    db = make_db()
+    db.reflect_all()
+    cached = make_db()
+    reflected = []
+    monkeypatch.setattr(cached.metadata, 'reflect', lambda **kwargs: reflected.append(kwargs))
+    cached.reflect_table('vms')
+    cached.reflect_table('hosts')
+    assert reflected == []
+    save_schema_caches()
+
+
+def test_corrupt_schema_cache(make_db):
+    db = make_db()
+    db_module.SCHEMA_CACHE_DIR.ensure(dir=True)
+    db.schema_cache_file.write_binary(b'not a pickle')
+    # reflected again and overwritten
+    assert len(db.metadata.tables) == 0
+    db.reflect_table('vms')
+    save_schema_caches()
+    assert list(make_db().metadata.tables) == ['vms']
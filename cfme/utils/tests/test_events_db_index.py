@@ -0,0 +1,54 @@
+from collections import namedtuple
+
+import pytest
+
+from cfme.utils.events_db import Event
+from cfme.utils.events_db import EventAttr
+from cfme.utils.events_db import ExpectedEventIndex
+
+
+RawEvent = namedtuple('RawEvent', 'id event_type target_type')
+
+
+class FakeTool(object):
+    event_streams_attributes = [('id', int), ('event_type', str), ('target_type', str)]
+
+
+@pytest.fixture
+def index():
+    return ExpectedEventIndex()
+
+
+def expect(index, *attrs, first_event=False):
+    expected = {'event': Event(FakeTool(), *attrs), 'callback': None, 'matched_events': [],
+                'first_event': first_event, 'order': sum(map(len, index._buckets.values()))}
+    index.add(expected)
+    return expected
+
+
+def test_candidates_by_event_and_target_type(index):
+    vm_create = expect(index, EventAttr(event_type='vm_create'),
+                       EventAttr(target_type='VmOrTemplate'))
+    host_create = expect(index, EventAttr(event_type='host_create'), EventAttr(target_type='Host'))
+    any_delete = expect(index, EventAttr(event_type='vm_delete'))
+
+    assert index.candidates(RawEvent(1, 'vm_create', 'VmOrTemplate')) == [vm_create]
+    assert index.candidates(RawEvent(2, 'host_create', 'Host')) == [host_create]
+    assert index.candidates(RawEvent(3, 'vm_delete', 'VmOrTemplate')) == [any_delete]
+    assert index.candidates(RawEvent(4, 'vm_power_on', 'VmOrTemplate')) == []
+
+
+def test_cmp_func_expectations_are_always_candidates(index):
+    by_type = expect(index, EventAttr(event_type='vm_create'))
+    by_func = expect(index, EventAttr(event_type='vm_', cmp_func=lambda x, y: y.startswith(x)))
+
+    assert index.candidates(RawEvent(1, 'vm_create', 'VmOrTemplate')) == [by_type, by_func]
+    assert index.candidates(RawEvent(2, 'vm_delete', 'VmOrTemplate')) == [by_func]
+
+
+def test_matched_first_event_is_skipped(index):
+    expected = expect(index, EventAttr(event_type='vm_create'), first_event=True)
+    raw = RawEvent(1, 'vm_create', 'VmOrTemplate')
+    assert index.candidates(raw) == [expected]
+    expected['matched_events'].append(raw)
+    assert index.candidates(raw) == []
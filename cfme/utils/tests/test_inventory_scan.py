@@ -0,0 +1,94 @@
+import datetime
+import re
+
+import attr
+import pytest
+
+from cfme.utils import inventory_scan
+
+
+@attr.s
+class FakeVm(object):
+    name = attr.ib()
+    created = attr.ib(default=None)
+    reads = attr.ib(default=0)
+    uuid = attr.ib(default=None)
+
+    @property
+    def creation_time(self):
+        self.reads += 1
+        if self.created is None:
+            raise ValueError('no creation time')
+        return self.created
+
+    @property
+    def state(self):
+        return 'running'
+
+
+@pytest.fixture
+def vms(monkeypatch, tmpdir):
+    vms = [FakeVm('test_a', datetime.datetime(2019, 1, 1, tzinfo=datetime.timezone.utc),
+                  uuid='4201'),
+           FakeVm('test_b', uuid='4202'),
+           FakeVm('prod', datetime.datetime(2019, 2, 1, tzinfo=datetime.timezone.utc),
+                  uuid='4203')]
+
+    class FakeMgmt(object):
+        def list_vms(self):
+            return vms
+
+    monkeypatch.setattr(inventory_scan, 'get_mgmt', lambda key: FakeMgmt())
+    monkeypatch.setattr(inventory_scan, 'SCAN_CACHE_DIR', tmpdir.join('scan'))
+    return vms
+
+
+def test_scan_provider(vms):
+    scan = inventory_scan.scan_provider(
+        'prov', ['creation_time', 'state'], name_filter=re.compile('^test_').match,
+        process=lambda scan: [record.vm.name for record in scan.records])
+    assert scan.result == ['test_a', 'test_b']
+    assert (scan.listed, scan.fetched, scan.cached, scan.failures) == (3, 2, 0, 1)
+    a, b = scan.records
+    assert a.attributes == {'creation_time': vms[0].created, 'state': 'running'}
+    assert b.attributes == {'creation_time': None, 'state': 'running'}
+    assert b.failures['creation_time'] == 'ValueError: no creation time'
+    assert a.vm is None and b.vm is None
+
+
+def test_scan_provider_cache(vms):
+    for _ in range(2):
+        scan = inventory_scan.scan_provider('prov', ['creation_time', 'state'], use_cache=True)
+    # only the creation time that failed is read again
+    assert [vm.reads for vm in vms] == [1, 2, 1]
+    assert scan.cached == 2
+    assert scan.records[0].attributes == {'creation_time': vms[0].created, 'state': 'running'}
+
+
+def test_scan_provider_cache_recreated_vm(vms):
+    inventory_scan.scan_provider('prov', ['creation_time'], use_cache=True)
+    # deleted and created again under the same name
+    vms[0] = FakeVm('test_a', datetime.datetime(2019, 3, 1, tzinfo=datetime.timezone.utc),
+                    uuid='4204')
+    scan = inventory_scan.scan_provider('prov', ['creation_time'], use_cache=True)
+    assert scan.cached == 1
+    assert scan.records[0].attributes == {'creation_time': vms[0].created}
+    assert vms[0].reads == 1
+
+
+def test_scan_provider_cache_without_identity(vms):
+    for vm in vms:
+        vm.uuid = None
+    for _ in range(2):
+        scan = inventory_scan.scan_provider('prov', ['creation_time'], use_cache=True)
+    assert scan.cached == 0
+    assert [vm.reads for vm in vms] == [2, 2, 2]
+
+
+def test_scan_cache_of_older_version(vms):
+    inventory_scan.SCAN_CACHE_DIR.ensure(dir=True)
+    inventory_scan.SCAN_CACHE_DIR.join('prov.json').write(
+        '{"scanned": 0, "vms": {"test_a": {"creation_time": {"datetime": "2010-01-01"}}}}')
+    assert inventory_scan.load_cache('prov') == {}
+    scan = inventory_scan.scan_provider('prov', ['creation_time'], use_cache=True)
+    assert scan.records[0].attributes == {'creation_time': vms[0].created}
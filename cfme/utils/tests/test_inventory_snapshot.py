@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import pytest
+
+from cfme.common.provider import BaseProvider
+from cfme.common.provider import INVENTORY_COUNTS
+from cfme.common.provider import inventory_snapshot
+from cfme.common.provider import shared_inventory_snapshot
+
+
+class FakeEngine(object):
+    """Records the executed queries and answers ``(provider name, stat, count)`` rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def execute(self, query, **params):
+        self.queries.append((str(query), params))
+        return iter(self.rows)
+
+
+@pytest.fixture
+def engine():
+    return FakeEngine([
+        ('vsphere', 'num_vm', 10),
+        ('vsphere', 'num_host', 3),
+        ('rhv', 'num_template', 4),
+        # a provider without any inventory
+        ('azure', None, None),
+    ])
+
+
+@pytest.fixture
+def appliance(engine):
+    return SimpleNamespace(hostname='appliance', db=SimpleNamespace(
+        client=SimpleNamespace(engine=engine)))
+
+
+def test_inventory_snapshot_query(appliance, engine):
+    inventory_snapshot(appliance)
+    (query, params), = engine.queries
+    # one query counting every stat of every provider
+    assert query.startswith('SELECT ems.name, counts.stat, counts.count '
+                            'FROM ext_management_systems ems LEFT JOIN (')
+    assert query.count(' UNION ALL ') == len(INVENTORY_COUNTS) - 1
+    for stat, stat_query in INVENTORY_COUNTS.items():
+        assert "SELECT '{}' AS stat, c.* FROM ({}) c".format(
+            stat, stat_query.format(ems='IS NOT NULL')) in query
+    assert 'WHERE ems.name IN' not in query
+    assert params == {}
+
+
+def test_inventory_snapshot_of_providers(appliance, engine):
+    inventory_snapshot(appliance, provider_names=('vsphere', 'rhv'))
+    (query, params), = engine.queries
+    assert query.endswith(' WHERE ems.name IN :names')
+    # the counts are filtered too, not counted for every provider
+    ems = 'IN (SELECT id FROM ext_management_systems WHERE name IN :names)'
+    for stat_query in INVENTORY_COUNTS.values():
+        assert stat_query.format(ems=ems) in query
+    assert params == {'names': ['vsphere', 'rhv']}
+
+
+def test_provider_inventory_counts(appliance, engine):
+    provider = SimpleNamespace(appliance=appliance, name='vsphere')
+    assert BaseProvider.inventory_counts(provider)['num_host'] == 3
+    (query, params), = engine.queries
+    assert 'WHERE ems.name IN' in query
+    assert params == {'names': ['vsphere']}
+
+    with shared_inventory_snapshot(appliance):
+        assert BaseProvider.inventory_counts(provider)['num_vm'] == 10
+        BaseProvider.inventory_counts(SimpleNamespace(appliance=appliance, name='rhv'))
+    # one query of all the providers
+    query, params = engine.queries[-1]
+    assert len(engine.queries) == 2
+    assert 'WHERE ems.name IN' not in query
+    assert params == {}
+
+
+def test_inventory_snapshot_rows(appliance):
+    empty = dict.fromkeys(INVENTORY_COUNTS, 0)
+    assert inventory_snapshot(appliance) == {
+        'vsphere': dict(empty, num_vm=10, num_host=3),
+        'rhv': dict(empty, num_template=4),
+        'azure': empty,
+    }
+
+
+def test_inventory_snapshot_shared(appliance, engine):
+    inventory_snapshot(appliance)
+    inventory_snapshot(appliance)
+    assert len(engine.queries) == 2
+
+    with shared_inventory_snapshot(appliance):
+        first = inventory_snapshot(appliance)
+        with shared_inventory_snapshot(appliance):
+            assert inventory_snapshot(appliance) is first
+        # the snapshots of some providers are not shared
+        inventory_snapshot(appliance, provider_names=['rhv'])
+    assert len(engine.queries) == 4
+
+    inventory_snapshot(appliance)
+    assert len(engine.queries) == 5
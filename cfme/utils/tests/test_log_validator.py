@@ -0,0 +1,30 @@
+import re
+
+import pytest
+
+from cfme.utils.log_validator import PatternMatcher
+
+
+@pytest.mark.parametrize('patterns', [
+    ['.*ERROR.*', 'Refresh completed', r'MIQ\(\w+\)'],
+    # backreferences and inline flags can't be combined, the matcher checks them one by one
+    [r'(\w+) \1', 'Refresh completed'],
+    ['(?i)refresh completed', 'ERROR'],
+])
+@pytest.mark.parametrize('line', [
+    '[----] I, [2019-05-01T10:00:00] INFO -- : MIQ(EmsRefresh.refresh) Refresh completed',
+    '[----] E, [2019-05-01T10:00:00] ERROR -- : something broke',
+    '[----] I, [2019-05-01T10:00:00] INFO -- : nothing to see here here',
+])
+def test_pattern_matcher_same_as_search(patterns, line):
+    matcher = PatternMatcher(patterns)
+    expected = [pattern for pattern in patterns if re.search(pattern, line)]
+    assert list(matcher.search(line)) == expected
+    if expected:
+        assert matcher.any(line)
+
+
+def test_pattern_matcher_prefilter():
+    matcher = PatternMatcher(['ERROR', 'Refresh completed'])
+    assert not matcher.any('INFO -- : nothing to see here')
+    assert not PatternMatcher([]).any('anything')
@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+
+from cfme.utils.providers import MgmtPool
+
+
+class FakeMgmt(object):
+    alive = True
+    disconnected = False
+
+    @property
+    def info(self):
+        if not self.alive:
+            raise IOError('session expired')
+        return 'fake'
+
+    def disconnect(self):
+        self.disconnected = True
+
+
+@pytest.fixture
+def pool():
+    return MgmtPool(size=2, ttl=100, probe_after=10)
+
+
+@pytest.fixture
+def in_thread():
+    """Runs a function in a new thread, the threads live until the end of the test"""
+    done = threading.Event()
+    threads = []
+
+    def run(func):
+        result = []
+        got_result = threading.Event()
+
+        def target():
+            result.append(func())
+            got_result.set()
+            # keep the thread alive so that no later thread gets its id
+            done.wait()
+        threads.append(threading.Thread(target=target))
+        threads[-1].start()
+        got_result.wait()
+        return result[0]
+
+    yield run
+    done.set()
+    for thread in threads:
+        thread.join()
+
+
+def test_instance_per_thread(pool, in_thread):
+    first = pool.get('key', FakeMgmt)
+    assert pool.get('key', FakeMgmt) is first
+    second = in_thread(lambda: pool.get('key', FakeMgmt))
+    assert second is not first
+    # the pool is full, the third thread shares the least recently used instance
+    assert in_thread(lambda: pool.get('key', FakeMgmt)) is first
+    assert pool.get('other', FakeMgmt) not in (first, second)
+    assert pool.stats == {'hits': 2, 'misses': 3}
+
+
+def test_idle_instances_are_evicted(pool):
+    first = pool.get('key', FakeMgmt)
+    pool._pools['key'][0].last_used -= 101
+    assert pool.get('key', FakeMgmt) is not first
+    # callers may still hold the dropped instance
+    assert not first.disconnected
+    assert pool.stats['evictions'] == 1
+    assert len(pool) == 1
+
+
+def test_dead_instances_are_replaced(pool):
+    first = pool.get('key', FakeMgmt)
+    first.alive = False
+    # recently used instances are not probed
+    assert pool.get('key', FakeMgmt) is first
+    pool._pools['key'][0].last_used -= 11
+    second = pool.get('key', FakeMgmt)
+    assert second is not first
+    # callers may still hold the dropped instance
+    assert not first.disconnected
+    assert pool.stats['reconnects'] == 1
+    assert len(pool) == 1
+
+
+def test_clear_disconnects(pool):
+    first = pool.get('key', FakeMgmt)
+    pool.clear()
+    assert first.disconnected
+    assert len(pool) == 0
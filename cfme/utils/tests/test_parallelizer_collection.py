@@ -0,0 +1,139 @@
+from types import SimpleNamespace
+
+import pytest
+
+from cfme.fixtures.parallelizer import collection
+from cfme.fixtures.parallelizer import remote
+from cfme.fixtures.parallelizer.collection import collection_digest
+from cfme.fixtures.parallelizer.collection import collection_key
+from cfme.fixtures.parallelizer.collection import CollectionSnapshot
+from cfme.fixtures.parallelizer.remote import SlaveManager
+
+
+class FakeCache(object):
+    """The get/set of the pytest cache, in memory"""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key, default):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+@pytest.fixture
+def conf_dir(tmpdir):
+    conf_dir = tmpdir.mkdir('conf')
+    conf_dir.join('env.yaml').write('appliances: []\n')
+    conf_dir.join('supportability.yaml').write('5.11: []\n')
+    return conf_dir
+
+
+@pytest.fixture
+def items(tmpdir):
+    test_a = tmpdir.join('test_a.py')
+    test_a.write('def test_a(): pass\n')
+    test_b = tmpdir.join('test_b.py')
+    test_b.write('def test_b(): pass\n')
+    return [SimpleNamespace(nodeid='test_a.py::test_a[rhv]', fspath=test_a),
+            SimpleNamespace(nodeid='test_a.py::test_a[vsphere]', fspath=test_a),
+            SimpleNamespace(nodeid='test_b.py::test_b', fspath=test_b)]
+
+
+def test_collection_key(conf_dir, items):
+    key = collection_key(items, '5.11.0.1', conf_dir=conf_dir)
+    assert collection_key(items[::-1], '5.11.0.1', conf_dir=conf_dir) == key
+    assert collection_key(items, '5.11.0.2', conf_dir=conf_dir) != key
+
+    conf_dir.join('supportability.yaml').write('5.11: [rhv]\n')
+    changed_conf = collection_key(items, '5.11.0.1', conf_dir=conf_dir)
+    assert changed_conf != key
+
+    items[0].fspath.setmtime(items[0].fspath.mtime() + 10)
+    assert collection_key(items, '5.11.0.1', conf_dir=conf_dir) != changed_conf
+
+
+def test_collection_digest():
+    digest = collection_digest(['test_a.py::test_a', 'test_b.py::test_b'])
+    assert collection_digest(['test_b.py::test_b', 'test_a.py::test_a']) == digest
+    assert collection_digest(['test_a.py::test_a']) != digest
+
+
+def test_snapshot_round_trip(monkeypatch, conf_dir, items):
+    monkeypatch.setattr(collection, 'conf_path', conf_dir)
+    cache = FakeCache()
+    snapshot = CollectionSnapshot.from_items(items, '5.11.0.1')
+    assert snapshot.nodeids == [item.nodeid for item in items]
+    assert CollectionSnapshot.load(cache, snapshot.key) is None
+
+    snapshot.save(cache)
+    assert CollectionSnapshot.load(cache, snapshot.key) == snapshot
+    assert CollectionSnapshot.load(cache, 'other key') is None
+    assert snapshot.matches(snapshot.key, snapshot.digest)
+    assert not snapshot.matches(snapshot.key, collection_digest(['test_a.py::test_a']))
+    assert not snapshot.matches('other key', snapshot.digest)
+
+
+@pytest.fixture
+def slave(monkeypatch, conf_dir, items):
+    monkeypatch.setattr(collection, 'conf_path', conf_dir)
+    monkeypatch.setattr(remote, 'terminalreporter', SimpleNamespace(disable=lambda: None),
+                        raising=False)
+    cache = FakeCache()
+    config = SimpleNamespace(option=SimpleNamespace(parallel_collection_snapshot=True),
+                             cache=cache)
+    # no SlaveManager.__init__, it connects to the master
+    slave = SlaveManager.__new__(SlaveManager)
+    slave.config, slave.log, slave.collection_version = config, remote.log.logger, '5.11.0.1'
+    slave.events = []
+    slave.replies = []
+
+    def send_event(name, **kwargs):
+        slave.events.append(dict(kwargs, _event_name=name))
+        return slave.replies.pop(0) if slave.replies else None
+    slave.send_event = send_event
+    return slave
+
+
+def finish_collection(slave, items):
+    slave.pytest_collection_finish(SimpleNamespace(items=items))
+    return slave.events
+
+
+def test_slave_sends_snapshot_digest(slave, items):
+    # stored by the master
+    master = CollectionSnapshot.from_items(items, '5.11.0.1')
+    master.save(slave.config.cache)
+    assert finish_collection(slave, items) == [{
+        '_event_name': 'collectionfinish', 'collection_key': master.key,
+        'collection_digest': master.digest}]
+
+
+def test_slave_sends_collection_without_snapshot(slave, items):
+    assert finish_collection(slave, items) == [{
+        '_event_name': 'collectionfinish', 'node_ids': [item.nodeid for item in items]}]
+
+
+def test_slave_sends_collection_on_digest_mismatch(slave, items):
+    # the master collected one test less with the same inputs
+    master = CollectionSnapshot.from_items(items[:2], '5.11.0.1')
+    master.key = collection_key(items, '5.11.0.1')
+    master.save(slave.config.cache)
+    assert [event.get('node_ids') for event in finish_collection(slave, items)] == [
+        [item.nodeid for item in items]]
+
+
+def test_slave_sends_collection_when_master_asks(slave, items):
+    CollectionSnapshot.from_items(items, '5.11.0.1').save(slave.config.cache)
+    # the master has another snapshot
+    slave.replies.append('send_collection')
+    first, second = finish_collection(slave, items)
+    assert 'collection_digest' in first
+    assert second['node_ids'] == [item.nodeid for item in items]
+
+
+def test_slave_uses_master_version(slave, items):
+    CollectionSnapshot.from_items(items, '5.11.0.2').save(slave.config.cache)
+    assert 'node_ids' in finish_collection(slave, items)[0]
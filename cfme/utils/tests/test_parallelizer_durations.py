@@ -0,0 +1,19 @@
+from collections import namedtuple
+
+from cfme.fixtures.parallelizer.durations import DurationHistory
+
+Report = namedtuple('Report', ['nodeid', 'when', 'duration'])
+
+
+def test_durations_recorded_on_teardown():
+    history = DurationHistory(cache=None)
+    for when, duration in (('setup', 1.0), ('call', 5.0), ('teardown', 2.0)):
+        history.record(Report('test_a.py::test_a', when, duration))
+    assert history.durations == {'test_a.py::test_a': 8.0}
+
+
+def test_durations_longest_group_first():
+    history = DurationHistory(cache=None, durations={'a': 1.0, 'b': 30.0, 'c': 5.0})
+    groups = [['a'], ['b'], ['c', 'unknown']]
+    # unknown tests are estimated with the mean of the known durations (12s)
+    assert history.sort_longest_first(groups) == [['b'], ['c', 'unknown'], ['a']]
@@ -0,0 +1,87 @@
+import pytest
+
+from cfme.fixtures.parallelizer import ParallelSession
+from cfme.fixtures.parallelizer import SlaveDetail
+
+
+@pytest.fixture
+def session():
+    # only the state used by the stealing, the real session needs a pytest config and appliances
+    session = ParallelSession.__new__(ParallelSession)
+    session.provs = ['rhv', 'vsphere']
+    session.serial_collection = []
+    session.slaves = {}
+    session.print_message = lambda *args, **kwargs: None
+    return session
+
+
+def add_slave(session, slave_id, tests=(), provider_allocation=()):
+    slave = SlaveDetail(appliance=None, worker_config=None, id=slave_id)
+    slave.tests.update(tests)
+    slave.queue.extend(tests)
+    slave.provider_allocation.extend(provider_allocation)
+    session.slaves[slave_id] = slave
+    return slave
+
+
+def test_stolen_test_refused_to_victim(session):
+    victim = add_slave(session, b'slave01', ['test_a.py::test_a', 'test_b.py::test_b'])
+    thief = add_slave(session, b'slave02')
+    assert session.claim_test(victim, 'test_a.py::test_a')
+
+    assert session.steal_tests(thief) == ['test_b.py::test_b']
+    assert victim.queue == ['test_a.py::test_a']
+    assert not session.claim_test(victim, 'test_b.py::test_b')
+    thief.tests.update(['test_b.py::test_b'])
+    assert session.claim_test(thief, 'test_b.py::test_b')
+
+
+def test_serial_tests_not_stolen(session):
+    tests = ['test_serial.py::test_a', 'test_serial.py::test_b', 'test_c.py::test_c']
+    session.serial_collection.extend(tests[:2])
+    victim = add_slave(session, b'slave01', tests)
+    thief = add_slave(session, b'slave02')
+
+    assert session.steal_tests(thief) == ['test_c.py::test_c']
+    assert session.steal_tests(thief) == []
+    assert victim.queue == tests[:2]
+
+
+def test_module_groups_kept_together(session):
+    tests = ['test_a.py::test_1[rhv]', 'test_a.py::test_2[rhv]', 'test_a.py::test_1[vsphere]',
+             'test_a.py::test_2[vsphere]', 'test_b.py::test_1']
+    victim = add_slave(session, b'slave01', tests)
+    thief = add_slave(session, b'slave02')
+
+    # the last two groups make the half, the vsphere group isn't split
+    assert session.steal_tests(thief) == tests[2:]
+    assert victim.queue == tests[:2]
+
+
+def test_started_group_not_stolen(session):
+    tests = ['test_a.py::test_1', 'test_a.py::test_2', 'test_a.py::test_3']
+    victim = add_slave(session, b'slave01', tests)
+    thief = add_slave(session, b'slave02')
+    assert session.claim_test(victim, tests[0])
+
+    assert session.steal_tests(thief) == []
+    assert victim.queue == tests
+
+
+def test_provider_allocation_respected(session):
+    tests = ['test_a.py::test_1[rhv]', 'test_a.py::test_1[vsphere]']
+    victim = add_slave(session, b'slave01', tests)
+    thief = add_slave(session, b'slave02', provider_allocation=['rhv'])
+
+    assert session.steal_tests(thief) == ['test_a.py::test_1[rhv]']
+    assert victim.queue == ['test_a.py::test_1[vsphere]']
+    assert session.steal_tests(thief) == []
+
+
+def test_thief_allocated_stolen_providers(session):
+    tests = ['test_a.py::test_1[rhv]', 'test_a.py::test_1[vsphere]']
+    add_slave(session, b'slave01', tests)
+    thief = add_slave(session, b'slave02')
+
+    assert session.steal_tests(thief) == ['test_a.py::test_1[vsphere]']
+    assert thief.provider_allocation == ['vsphere']
@@ -0,0 +1,131 @@
+from collections import deque
+
+import pytest
+
+from cfme.fixtures.parallelizer import transport
+from cfme.fixtures.parallelizer.transport import CODECS
+from cfme.fixtures.parallelizer.transport import JsonCodec
+from cfme.fixtures.parallelizer.transport import MasterTransport
+from cfme.fixtures.parallelizer.transport import MsgpackCodec
+from cfme.fixtures.parallelizer.transport import SlaveTransport
+
+
+class FakeSocket(object):
+    """Socket with the received frames queued in ``inbox`` and the sent ones kept in ``sent``"""
+
+    def __init__(self):
+        self.inbox = deque()
+        self.sent = []
+
+    def send(self, payload):
+        self.sent.append([payload])
+
+    def send_multipart(self, frames):
+        self.sent.append(frames)
+
+    def recv(self):
+        return self.inbox.popleft()[0]
+
+    def recv_multipart(self, flags=0):
+        return self.inbox.popleft()
+
+
+@pytest.fixture
+def master(monkeypatch):
+    sock = FakeSocket()
+    monkeypatch.setattr(transport.zmq, 'zmq_poll', lambda sockets, timeout: bool(sock.inbox))
+    return MasterTransport(sock, MsgpackCodec)
+
+
+def slave_event(slaveid, seq, name, sync=False, **data):
+    event = dict(data, _event_name=name, _seq=seq)
+    if sync:
+        event['_sync'] = True
+    return [slaveid, b'', MsgpackCodec.dumps(event)]
+
+
+def sent_messages(sock, codec=MsgpackCodec):
+    return [(frames[0], codec.loads(frames[-1])) for frames in sock.sent]
+
+
+@pytest.mark.parametrize('codec', sorted(CODECS))
+def test_codec_round_trip(codec):
+    codec = CODECS[codec]
+    event = {
+        '_event_name': 'runtest_logreport',
+        'report': {'nodeid': 'cfme/tests/test_a.py::test_a[vsphere-ünïcode]', 'passed': True,
+                   'duration': 1.5, 'longrepr': None, 'keywords': ['a', 'b'], 'location': [
+                       'cfme/tests/test_a.py', 10, 'test_a']},
+    }
+    assert codec.loads(codec.dumps(event)) == event
+
+
+def test_master_batches_acks(master):
+    master.sock.inbox.extend([
+        slave_event(b'slave01', 1, 'runtest_logstart'),
+        slave_event(b'slave01', 2, 'runtest_logreport'),
+        slave_event(b'slave02', 1, 'message', message='hello'),
+        slave_event(b'slave01', 3, 'runtest_logreport'),
+    ])
+    received = [master.poll() for _ in range(4)]
+    assert received[2] == (b'slave02', {'_event_name': 'message', 'message': 'hello'})
+    for slaveid, event in received:
+        master.ack(slaveid, event['_event_name'])
+    # nothing is acked while there are events to read
+    assert master.sock.sent == []
+
+    assert master.poll() == (None, None)
+    # one cumulative ack per slave once the socket is empty
+    assert sent_messages(master.sock) == [(b'slave01', {'ack': 3}), (b'slave02', {'ack': 1})]
+    assert master.pending_acks == {}
+
+
+def test_master_reply_acks_pending_events(master):
+    master.sock.inbox.extend([
+        slave_event(b'slave01', 1, 'runtest_logreport'),
+        slave_event(b'slave01', 2, 'need_tests', sync=True),
+    ])
+    master.poll()
+    slaveid, event = master.poll()
+    assert event == {'_event_name': 'need_tests'}
+    master.send(slaveid, ['test_a.py::test_a'])
+    assert sent_messages(master.sock) == [
+        (b'slave01', {'ack': 2, 'seq': 2, 'reply': ['test_a.py::test_a']})]
+    assert master.pending_acks == {}
+    assert master.awaiting_reply == {}
+
+
+def test_slave_window():
+    sock = FakeSocket()
+    slave = SlaveTransport(sock, MsgpackCodec, window=2)
+    assert slave.request({'_event_name': 'runtest_logstart'}) == 'ack'
+    # the window gets full, the slave waits for the master's acks
+    sock.inbox.append([b'', MsgpackCodec.dumps({'ack': 2})])
+    assert slave.request({'_event_name': 'runtest_logreport'}) == 'ack'
+    assert sock.inbox == deque()
+    assert slave.outstanding == 0
+    assert slave.request({'_event_name': 'runtest_logreport'}) == 'ack'
+    assert slave.outstanding == 1
+    assert [MsgpackCodec.loads(frames[1])['_seq'] for frames in sock.sent] == [1, 2, 3]
+
+
+def test_slave_sync_request():
+    sock = FakeSocket()
+    slave = SlaveTransport(sock, MsgpackCodec)
+    slave.request({'_event_name': 'runtest_logreport'})
+    sock.inbox.extend([
+        [b'', MsgpackCodec.dumps({'ack': 1})],
+        [b'', MsgpackCodec.dumps({'ack': 2, 'seq': 2, 'reply': 'stolen'})],
+    ])
+    assert slave.request({'_event_name': 'claim_test', 'nodeid': 'test_a.py::test_a'}) == 'stolen'
+    assert MsgpackCodec.loads(sock.sent[-1][1])['_sync'] is True
+    assert slave.outstanding == 0
+
+
+def test_json_lock_step():
+    sock = FakeSocket()
+    slave = SlaveTransport(sock, JsonCodec)
+    sock.inbox.append([JsonCodec.dumps('ack runtest_logreport')])
+    assert slave.request({'_event_name': 'runtest_logreport'}) == 'ack runtest_logreport'
+    # no sequence numbers on the wire
+    assert JsonCodec.loads(sock.sent[0][0]) == {'_event_name': 'runtest_logreport'}
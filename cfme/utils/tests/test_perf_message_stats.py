@@ -0,0 +1,65 @@
+import re
+
+import pytest
+
+from cfme.utils.perf_message_stats import evm_to_messages
+
+LINE = '[----] I, [2019-01-01T10:{:02d}:00.000000 #{}:2ab4]  INFO -- : MIQ({}) {}'
+PUT = ('Message id: [{}], Zone: [default], Role: [ems_inventory], Command: [{}], '
+       'State: [ready], Args: [{}]')
+GET = 'Message id: [{}], MiqWorker id: [5], Command: [{}], Dequeued in: [{}] seconds'
+DELIVERED = 'Message id: [{}], State: [ok], Delivered in [{}] seconds'
+
+
+@pytest.fixture
+def evm_log(tmpdir):
+    lines = [
+        LINE.format(0, 100, 'EvmServer.start', 'Server starting'),
+        LINE.format(1, 100, 'MiqQueue.put', PUT.format(1, 'EmsRefresh.refresh', '["Vmware", 1]')),
+        LINE.format(2, 100, 'MiqQueue.put', PUT.format(2, 'Storage.scan', '[10]')),
+        'a line without a timestamp',
+        LINE.format(3, 200, 'MiqQueue.get_via_drb', GET.format(1, 'EmsRefresh.refresh', 2.5)),
+        LINE.format(4, 300, 'MiqQueue.get_via_drb', GET.format(2, 'Storage.scan', 0.5)),
+        LINE.format(5, 100, 'MiqQueue.put', PUT.format(3, 'EmsRefresh.refresh', '["Redhat", 2]')),
+        LINE.format(6, 300, 'MiqQueue.delivered', DELIVERED.format(2, 1.25)),
+        LINE.format(7, 200, 'MiqQueue.delivered', DELIVERED.format(1, 10.0)),
+        # put before the log starts
+        LINE.format(8, 300, 'MiqQueue.delivered', DELIVERED.format(99, 1.0)),
+        LINE.format(9, 400, 'MiqQueue.get_via_drb', GET.format(3, 'EmsRefresh.refresh', 4.0)),
+    ]
+    evm_log = tmpdir.join('evm.log')
+    evm_log.write('\n'.join(lines) + '\n')
+    return evm_log.strpath
+
+
+def parse(evm_file, **kwargs):
+    messages, msg_cmds, test_start, test_end, line_count = evm_to_messages(
+        evm_file, {'-vmware': re.compile('Vmware')}, **kwargs)
+    return ({msg_id: dict(message) for msg_id, message in messages.items()},
+            msg_cmds, test_start, test_end, line_count)
+
+
+def test_evm_to_messages(evm_log):
+    messages, msg_cmds, test_start, test_end, line_count = parse(evm_log, processes=1)
+    assert (test_start, test_end, line_count) == (
+        '2019-01-01 10:00:00.000000', '2019-01-01 10:09:00.000000', 11)
+    assert messages['1'] == {
+        'msg_id': "'1'", 'msg_cmd': 'EmsRefresh.refresh-vmware', 'msg_args': '["Vmware", 1]',
+        'pid_put': '100', 'pid_get': '200', 'puttime': '2019-01-01 10:01:00.000000',
+        'gettime': '2019-01-01 10:03:00.000000', 'deq_time': 2.5, 'del_time': 10.0,
+        'total_time': 12.5}
+    # got, never delivered
+    assert (messages['3']['deq_time'], messages['3']['total_time']) == (4.0, 0.0)
+    assert msg_cmds == {
+        'EmsRefresh.refresh-vmware': {'total': [12.5], 'queue': [2.5], 'execute': [10.0]},
+        'Storage.scan': {'total': [1.75], 'queue': [0.5], 'execute': [1.25]},
+        'EmsRefresh.refresh': {'total': [], 'queue': [], 'execute': []},
+    }
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+@pytest.mark.parametrize('chunk_size', [1, 150, 400])
+def test_evm_to_messages_chunks(evm_log, processes, chunk_size):
+    # the gets and deliveries end up in other chunks than the puts of their messages
+    assert parse(evm_log, processes=processes, chunk_size=chunk_size) == parse(
+        evm_log, processes=1)
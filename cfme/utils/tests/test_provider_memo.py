@@ -0,0 +1,53 @@
+import attr
+
+from cfme.markers.env_markers import provider
+from cfme.utils.providers import ProviderFilter
+
+
+@attr.s
+class FakeProvider(object):
+    key = attr.ib()
+    type = attr.ib()
+    category = attr.ib()
+    data = attr.ib(factory=dict)
+
+    @property
+    def version(self):
+        return self.data['version']
+
+
+@attr.s
+class FakeDataProvider(object):
+    category = attr.ib()
+    type_name = attr.ib()
+    version = attr.ib()
+
+
+def test_memo_key_ignores_filter_order_and_identity():
+    def filters():
+        return [ProviderFilter(classes=[FakeProvider], required_fields=[('cleanup', True)]),
+                ProviderFilter(required_flags=['provision'])]
+
+    key = provider.providers_memo_key(filters(), '5.11.0.1')
+    assert provider.providers_memo_key(filters()[::-1], '5.11.0.1') == key
+    assert provider.providers_memo_key(filters()[:1], '5.11.0.1') != key
+    assert provider.providers_memo_key(filters(), '5.10.0.1') != key
+
+
+def test_match_providers(monkeypatch):
+    available = [FakeProvider('vsphere65', 'virtualcenter', 'infra', {'version': 6.5}),
+                 FakeProvider('vsphere67', 'virtualcenter', 'infra', {'version': 6.7}),
+                 FakeProvider('rhv', 'rhevm', 'infra'),
+                 FakeProvider('ec2', 'ec2', 'cloud', {'version': 0})]
+    supported = [FakeDataProvider('infra', 'virtualcenter', 6.7),
+                 FakeDataProvider('infra', 'rhevm', 4.3),
+                 FakeDataProvider('cloud', 'ec2', 0)]
+    monkeypatch.setattr(provider, 'list_providers', lambda filters: available)
+    monkeypatch.setattr(provider, 'all_required', lambda series, filters: supported)
+
+    assert provider.match_providers([], '5.11') == [
+        (supported[0], available[1]),
+        # providers without a version match any version
+        (supported[1], available[2]),
+        (supported[2], available[3]),
+    ]
@@ -0,0 +1,52 @@
+import pytest
+
+from cfme.utils.appliance import MiqApi
+
+
+class FakeCollection(object):
+    _href = 'https://appliance/api/vms'
+
+
+class FakeApi(MiqApi):
+    """Serves a collection of ``size`` vms, without talking to an appliance"""
+    PAGE_SIZE = 3
+    IDS_PER_REQUEST = 4
+
+    def __init__(self, size, subquery_count=True):
+        self.resources = [{'id': str(i), 'name': 'vm{}'.format(i)} for i in range(size)]
+        self.subquery_count = subquery_count
+        self.requests = []
+
+    def get(self, url, **params):
+        self.requests.append(params)
+        resources = self.resources
+        filters = params.get('filter[]')
+        if filters:
+            ids = {f.split('=')[1] for f in filters}
+            resources = [r for r in resources if r['id'] in ids]
+        offset, limit = params['offset'], params['limit']
+        data = {'count': len(self.resources),
+                'resources': resources[offset:offset + limit]}
+        if filters and self.subquery_count:
+            data['subquery_count'] = len(resources)
+        return data
+
+
+@pytest.mark.parametrize('size', [0, 2, 3, 10])
+def test_iter_resources_pages(size):
+    api = FakeApi(size)
+    resources = list(api.iter_resources(FakeCollection(), attributes=['name']))
+    assert resources == api.resources
+    assert sorted(r['offset'] for r in api.requests) == list(range(0, max(size, 1), 3))
+    assert all(r['attributes'] == 'id,name' for r in api.requests)
+
+
+@pytest.mark.parametrize('subquery_count', [True, False])
+def test_get_resources(subquery_count):
+    api = FakeApi(10, subquery_count=subquery_count)
+    resources = api.get_resources(FakeCollection(), [1, 4, 5, 42, 7])
+    assert resources == {i: api.resources[i] for i in (1, 4, 5, 7)}
+    # without subquery_count a full page of the filtered ids is followed by another request
+    offsets = sorted((r['filter[]'][0], r['offset']) for r in api.requests)
+    expected = [('id=1', 0)] + ([] if subquery_count else [('id=1', 3)]) + [('id=7', 0)]
+    assert offsets == expected
@@ -0,0 +1,28 @@
+import json
+from datetime import datetime
+
+from cfme.utils.smem_memory_monitor import SmemMemoryMonitor
+
+
+def test_parse_collector_record():
+    record = {
+        'ts': 1500000000.5,
+        'meminfo': {'MemTotal': 8192000, 'MemFree': 1024000},
+        'workers': {'1234': 'MiqGenericWorker'},
+        'processes': {'1234': [2048, 1024, 512, 4096, 0, 'ruby', 'MIQ: MiqGenericWorker id: 1']},
+    }
+    plottime, meminfo, workers, memory_by_pid = SmemMemoryMonitor.parse_collector_record(
+        json.dumps(record).encode('utf-8') + b'\r\n')
+    assert plottime == datetime.fromtimestamp(1500000000.5)
+    assert meminfo == record['meminfo']
+    assert workers == record['workers']
+    # sizes are converted from kB to MB
+    assert memory_by_pid == {'1234': {
+        'rss': 2.0, 'pss': 1.0, 'uss': 0.5, 'vss': 4.0, 'swap': 0.0, 'name': 'ruby',
+        'cmd': 'MIQ: MiqGenericWorker id: 1'}}
+
+
+def test_parse_collector_record_skips_noise():
+    assert SmemMemoryMonitor.parse_collector_record(b'  \r\n') is None
+    # e.g. a sudo warning on the pty
+    assert SmemMemoryMonitor.parse_collector_record(b'sudo: unable to resolve host') is None
@@ -0,0 +1,64 @@
+import pytest
+
+from cfme.test_framework.sprout import client as sprout_client
+from cfme.test_framework.sprout.client import SproutClient
+
+
+class FakeSprout(object):
+    """Answers the posts of a SproutClient, optionally without the batch methods"""
+
+    def __init__(self, batch=True):
+        self.batch = batch
+        self.calls = []
+        self.statuses = {'1': {'finished': False}, '2': {'finished': True}}
+
+    def __call__(self, timeout=None, **data):
+        name, args = data['method'], data['args']
+        self.calls.append((name, timeout))
+        if name == 'request_check':
+            return {'status': 'success', 'result': self.statuses[args[0]]}
+        if not self.batch:
+            return {'status': 'exception',
+                    'result': {'class': 'NameError',
+                               'message': 'Method {} not found!'.format(name)}}
+        pools = {pool_id: self.statuses[pool_id] for pool_id in args[0]}
+        if name == 'request_check_many':
+            return {'status': 'success', 'result': pools}
+        versions = {pool_id: '3' for pool_id in args[0]}
+        return {'status': 'success', 'result': {'versions': versions, 'pools': pools}}
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(sprout_client.time, 'sleep', sleeps.append)
+    return sleeps
+
+
+def test_wait_for_pools_long_polls(monkeypatch, sleeps):
+    client = SproutClient()
+    sprout = FakeSprout()
+    monkeypatch.setattr(client, '_call_post', sprout)
+
+    statuses, versions = client.wait_for_pools([1, 2], {'1': '2'}, timeout=10)
+    assert statuses == {1: {'finished': False}, 2: {'finished': True}}
+    assert versions == {'1': '3', '2': '3'}
+    assert sprout.calls == [('wait_for_pools', 40)]
+    assert sleeps == []
+
+
+def test_wait_for_pools_polls_older_servers(monkeypatch, sleeps):
+    client = SproutClient()
+    sprout = FakeSprout(batch=False)
+    monkeypatch.setattr(client, '_call_post', sprout)
+
+    statuses, versions = client.wait_for_pools([1, 2])
+    assert statuses == {1: {'finished': False}, 2: {'finished': True}}
+    # the first call doesn't wait
+    assert sleeps == []
+
+    sprout.calls = []
+    client.wait_for_pools([1], versions)
+    assert sleeps == [SproutClient.POLL_DELAY]
+    # the server isn't asked to wait again
+    assert [name for name, _ in sprout.calls] == ['request_check_many', 'request_check']
@@ -0,0 +1,137 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from cfme.utils.ssh import SharedSSHTail
+from cfme.utils.ssh import SSHTail
+
+
+class FakeSftp(object):
+    """SFTP session serving one in-memory file, recording the sizes of the reads"""
+
+    def __init__(self):
+        self.content = b''
+        self.reads = []
+
+    def stat(self, filename):
+        return SimpleNamespace(st_size=len(self.content))
+
+    def open(self, filename, mode):
+        sftp = self
+
+        class FakeFile(io.BytesIO):
+            def prefetch(self, file_size=None):
+                pass
+
+            def read(self, size=-1):
+                sftp.reads.append(size)
+                return super().read(size)
+        return FakeFile(self.content)
+
+
+class FakeTail(SSHTail):
+    """SSHTail reading a :py:class:`FakeSftp` instead of connecting"""
+    CHUNK_SIZE = 8
+
+    def __init__(self, sftp):
+        # no SSHClient.__init__, it needs the credentials and an appliance
+        self._connect_kwargs = {'hostname': 'appliance'}
+        self._remote_filename = '/var/www/miq/vmdb/log/evm.log'
+        self._sftp_client = sftp
+        self._remote_file_size = None
+        self._partial_line = b''
+
+    def __enter__(self):
+        return self
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def sftp():
+    return FakeSftp()
+
+
+@pytest.fixture
+def tail(sftp):
+    sftp.content = b'old line\n'
+    tail = FakeTail(sftp)
+    tail.set_initial_file_end()
+    return tail
+
+
+def test_lines_split_across_chunks(sftp, tail):
+    sftp.content += b'first line\nsecond\nthird line\n'
+    assert list(tail) == ['first line', 'second', 'third line']
+    assert sftp.reads == [8, 8, 8, 5]
+    assert list(tail) == []
+
+
+def test_partial_line_held_back(sftp, tail):
+    sftp.content += b'complete\nhalf of a '
+    assert list(tail) == ['complete']
+    sftp.content += b'line\n'
+    assert list(tail) == ['half of a line']
+
+
+def test_consumer_stopping_early(sftp, tail):
+    sftp.content += b'one\ntwo\nthree and more\nfour\n'
+    assert next(iter(tail)) == 'one'
+    # the next iteration resumes after the last line the consumer got
+    assert list(tail) == ['two', 'three and more', 'four']
+    lines = iter(tail)
+    sftp.content += b'five\nsix'
+    assert next(lines) == 'five'
+    del lines
+    sftp.content += b'\n'
+    assert list(tail) == ['six']
+
+
+def test_rotated_file_read_from_start(sftp, tail):
+    sftp.content += b'before rotation\nhalf'
+    assert list(tail) == ['before rotation']
+    sftp.content = b'new\n'
+    assert list(tail) == ['new']
+
+
+def test_shared_readers(sftp, tail):
+    shared = SharedSSHTail(tail)
+    first = shared.reader()
+    first.set_initial_file_end()
+    sftp.content += b'one\n'
+    second = shared.reader()
+    second.set_initial_file_end()
+    sftp.content += b'two\n'
+
+    assert list(first) == ['one', 'two']
+    assert list(second) == ['two']
+    # the lines every reader has are dropped on the next read
+    assert list(first) == []
+    assert shared._lines == []
+
+    sftp.content += b'three\nfour\n'
+    lines = iter(first)
+    assert next(lines) == 'three'
+    del lines
+    assert list(first) == ['four']
+    second.close()
+    assert shared._lines == []
+
+
+def test_shared_buffer_bounded(sftp, tail, monkeypatch):
+    monkeypatch.setattr(SharedSSHTail, 'MAX_BUFFERED_LINES', 2)
+    shared = SharedSSHTail(tail)
+    idle = shared.reader()
+    idle.set_initial_file_end()
+    busy = shared.reader()
+    busy.set_initial_file_end()
+    sftp.content += b'one\n'
+    assert list(busy) == ['one']
+    sftp.content += b'two\nthree\n'
+
+    assert list(busy) == ['two', 'three']
+    assert shared._lines == ['two\n', 'three\n']
+    # the idle reader lost the oldest line
+    assert list(idle) == ['two', 'three']
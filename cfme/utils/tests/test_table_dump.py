@@ -0,0 +1,48 @@
+import pytest
+
+from widgetastic_manageiq import expand_table_rows
+from widgetastic_manageiq import read_summary_table_dump
+from widgetastic_manageiq import read_table_dump
+from widgetastic_manageiq import TableDumpMismatch
+
+
+def cell(text, cls=None, rowspan=None, colspan=None, imgs=()):
+    return {'text': text, 'cls': cls, 'rowspan': rowspan, 'colspan': colspan, 'imgs': list(imgs)}
+
+
+def icon(cls=None, alt=None):
+    return {'cls': cls, 'alt': alt, 'title': None, 'src': None}
+
+
+def test_read_table_dump():
+    dump = {'headers': (None, 'Name', 'State'),
+            'rows': [[cell(''), cell('vm1'), cell('on')], [cell(''), cell('vm2'), cell('off')]]}
+    assert read_table_dump(dump) == [{0: '', 'Name': 'vm1', 'State': 'on'},
+                                     {0: '', 'Name': 'vm2', 'State': 'off'}]
+    dump['rows'][1].pop()
+    with pytest.raises(TableDumpMismatch):
+        read_table_dump(dump)
+
+
+def test_expand_table_rows():
+    tags = cell('Tags', rowspan='2')
+    wide = cell('none', colspan='2')
+    grid = expand_table_rows([[tags, cell('a')], [cell('b')], [wide]])
+    assert grid == [[tags, grid[0][1]], [tags, grid[1][1]], [wide, wide]]
+    assert grid[1][0] is tags
+
+
+def test_read_summary_table_dump():
+    tags = cell('My Company Tags', cls='label', rowspan='2')
+    dump = {'headers': ('My Company Tags',), 'rows': [
+        [cell('Name', cls='label'), cell('vm1')],
+        [cell('Power', cls='label'), cell('on', imgs=[icon(alt='on')])],
+        [tags, cell('Department: Engineering', imgs=[icon(cls='fa fa-tag')])],
+        [cell('Location: Brno', imgs=[icon(cls='fa fa-tag')])],
+        [cell('not a field'), cell('x')],
+    ]}
+    assert read_summary_table_dump(dump) == {
+        'Name': 'vm1',
+        'Power': 'on',
+        'My Company Tags': ['Department: Engineering', 'Location: Brno'],
+    }
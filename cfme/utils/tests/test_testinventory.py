@@ -0,0 +1,74 @@
+from textwrap import dedent
+
+from cfme.utils.testinventory import parse_module
+from cfme.utils.testinventory import TestInventory
+
+SOURCE = dedent('''
+    import pytest
+    from cfme import test_requirements
+
+    pytestmark = [pytest.mark.tier(2), test_requirements.power]
+
+
+    @pytest.mark.meta(blockers=[BZ(1234, forced_streams=['5.11'])])
+    @pytest.mark.provider([InfraProvider], selector=ONE)
+    def test_power(provider):
+        """Powers things
+
+        Polarion:
+            assignee: ghubale
+            initialEstimate: 1/4h
+        """
+
+
+    @pytest.mark.uncollectif(lambda provider: provider.one_of(SCVMMProvider))
+    class TestPower(object):
+        @pytest.mark.tier(1)
+        def test_off(self):
+            pass
+
+        def helper(self):
+            pass
+
+
+    def not_a_test():
+        pass
+''')
+
+
+def test_parse_module():
+    power, off = parse_module('test_power.py', SOURCE, 'cfme/tests/test_power.py')
+
+    assert power.nodeid == 'cfme/tests/test_power.py::test_power'
+    assert [(m['name'], m['level']) for m in power.markers] == [
+        ('provider', 'function'), ('meta', 'function'), ('tier', 'module'),
+        ('requirement', 'module')]
+    assert power.get_markers('provider')[0]['args'] == [['InfraProvider']]
+    assert power.get_markers('provider')[0]['kwargs'] == {'selector': 'ONE'}
+    assert power.blockers == [
+        {'call': 'BZ', 'args': [1234], 'kwargs': {'forced_streams': ['5.11']}}]
+    assert power.polarion == {'assignee': 'ghubale', 'initialEstimate': '1/4h'}
+
+    assert off.nodeid == 'cfme/tests/test_power.py::TestPower::test_off'
+    assert off.marker_args('tier') == [1, 2]
+    assert off.get_markers('uncollectif')[0]['args'][0].startswith('lambda provider:')
+
+
+def test_update_reparses_changed_modules(tmpdir):
+    tests = tmpdir.mkdir('cfme').mkdir('tests')
+    module = tests.join('test_power.py')
+    module.write(SOURCE)
+    inventory = TestInventory(root=tmpdir.strpath, index_file=tmpdir.join('index.json').strpath)
+    assert inventory.update('cfme/tests') == 1
+
+    inventory = TestInventory.load(root=tmpdir.strpath, index_file=inventory.index_file)
+    assert inventory.update('cfme/tests') == 0
+    assert [test.name for test in inventory.tests()] == ['test_power', 'test_off']
+
+    module.write(SOURCE + '\n\ndef test_on():\n    pass\n')
+    assert inventory.update('cfme/tests') == 1
+    assert [test.name for test in inventory.tests()] == ['test_power', 'test_off', 'test_on']
+
+    module.remove()
+    assert inventory.update('cfme/tests') == 0
+    assert list(inventory.tests()) == []
@@ -0,0 +1,78 @@
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from cfme.utils.timeseries import TimeSeries  # noqa: E402
+
+
+START = datetime(2017, 3, 1, 22, 30)
+
+
+@pytest.fixture
+def series():
+    """Three hours of samples every 10 minutes, growing by 1 MiB per sample"""
+    series = TimeSeries(('rss', 'swap'), capacity=2)
+    for i in range(18):
+        series.append(START + timedelta(minutes=10 * i), rss=100.0 + i, swap=0.0)
+    return series
+
+
+def test_append_and_columns(series):
+    assert len(series) == 18
+    assert series.start == START
+    assert series.end == START + timedelta(minutes=170)
+    assert series.first('rss') == 100.0
+    assert series.last('rss') == 117.0
+    assert series['rss'].sum() == sum(range(100, 118))
+
+
+def test_missing_measurements_are_nan():
+    series = TimeSeries(('total', 'used'))
+    series.append(START, total=10.0)
+    assert numpy.isnan(series.last('used'))
+    series.set_last(used=5.0)
+    assert series.at(START) == {'total': 10.0, 'used': 5.0}
+
+
+def test_timestamp_lookup(series):
+    assert START + timedelta(minutes=20) in series
+    assert START + timedelta(minutes=25) not in series
+    assert series.at(START + timedelta(minutes=20))['rss'] == 102.0
+    with pytest.raises(KeyError):
+        series.at(START + timedelta(minutes=25))
+
+
+def test_between_and_split(series):
+    window = series.between(START + timedelta(minutes=10), START + timedelta(minutes=40))
+    assert window['rss'].tolist() == [101.0, 102.0, 103.0]
+    days = series.split('D')
+    assert [len(day) for day in days] == [9, 9]
+    assert days[1].start == datetime(2017, 3, 2)
+
+
+def test_hourly_resample(series):
+    hourly = series.resample('h')
+    assert hourly.datetimes() == [datetime(2017, 3, 1, 22), datetime(2017, 3, 1, 23),
+                                  datetime(2017, 3, 2, 0), datetime(2017, 3, 2, 1)]
+    assert hourly['rss'].tolist() == [101.0, 105.5, 111.5, 116.0]
+    assert series.resample('h', how=numpy.max)['rss'].tolist() == [102.0, 108.0, 114.0, 117.0]
+
+
+def test_downsample_keeps_endpoints(series):
+    small = series.downsample(6)
+    assert len(small) <= 6
+    assert small.first('rss') == series.first('rss')
+    assert small.last('rss') == series.last('rss')
+    assert small.start == series.start
+    assert small.end == series.end
+    assert series.downsample(100) is series
+
+
+def test_write_csv(series, tmpdir):
+    csv_path = tmpdir.join('rss.csv')
+    with csv_path.open('w') as csv_file:
+        series.between(START, START + timedelta(minutes=20)).write_csv(csv_file, ['rss'])
+    assert csv_path.read() == '2017-03-01 22:30:00,100.0\n2017-03-01 22:40:00,101.0\n'
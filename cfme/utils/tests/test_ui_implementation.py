@@ -0,0 +1,90 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from cfme.utils.appliance.implementations import ui
+from cfme.utils.appliance.implementations.ui import CFMENavigateStep
+from cfme.utils.appliance.implementations.ui import NavigationStats
+from cfme.utils.appliance.implementations.ui import NavigationUrlCache
+from cfme.utils.appliance.implementations.ui import PageSafeTimings
+from cfme.utils.appliance.implementations.ui import timeout_seconds
+
+
+@pytest.mark.parametrize('timeout, seconds', [
+    (5, 5.0), (0.5, 0.5), ('20s', 20.0), ('2m', 120.0), ('1.5 h', 5400.0),
+    (timedelta(minutes=1), 60.0),
+])
+def test_timeout_seconds(timeout, seconds):
+    assert timeout_seconds(timeout) == seconds
+
+
+def test_timeout_seconds_unparsable():
+    with pytest.raises(ValueError):
+        timeout_seconds('tomorrow')
+
+
+def test_page_safe_timings():
+    timings = PageSafeTimings()
+    timings.record('ensure_page_safe', 0.25)
+    timings.record('ensure_page_safe', 0.5)
+    timings.record('before_keyboard_input', 0.3)
+    assert timings.total == pytest.approx(1.05)
+    assert str(timings) == ('before_keyboard_input: 1 calls 0.30s, '
+                            'ensure_page_safe: 2 calls 0.75s')
+    timings.reset()
+    assert str(timings) == 'no waits'
+
+
+def test_navigation_url_cache():
+    cache = NavigationUrlCache()
+    vms, hosts, explorer = ('a', 'vms', 'All'), ('a', 'hosts', 'All'), ('a', 'pxe', 'All')
+    cache.record(vms, 'https://a/vm_infra/show_list')
+    cache.record(hosts, 'https://a/host/show_list')
+    assert cache.get(vms) == 'https://a/vm_infra/show_list'
+
+    # explorer destinations share the URL, so it says nothing about the destination
+    cache.record(explorer, 'https://a/vm_infra/show_list')
+    assert cache.get(vms) is None
+    assert cache.get(explorer) is None
+    cache.record(vms, 'https://a/vm_infra/show_list')
+    assert cache.get(vms) is None
+
+    cache.failed(hosts)
+    cache.succeeded(hosts)
+    cache.failed(hosts)
+    assert cache.get(hosts) == 'https://a/host/show_list'
+    cache.failed(hosts)
+    assert cache.get(hosts) is None
+
+
+def test_navigation_stats():
+    stats = NavigationStats()
+    stats.record('VmsCollection/All', 'walk', 3.0)
+    stats.record('VmsCollection/All', 'url', 1.0)
+    stats.record('VmsCollection/All', 'url', 2.0)
+    assert stats.rows() == [('VmsCollection/All', 'url', 2, 3.0, 1.5),
+                            ('VmsCollection/All', 'walk', 1, 3.0, 3.0)]
+
+
+def test_navigation_url_cache_key(monkeypatch):
+    monkeypatch.setattr(ui, 'conf', SimpleNamespace(env={'browser': {'navigation_cache': True}}))
+
+    class Step(CFMENavigateStep):
+        VIEW = object
+        URL_CACHEABLE = True
+
+    class TreeStep(CFMENavigateStep):
+        VIEW = object
+
+    def step(cls):
+        # no navigator needed for the key
+        step = cls.__new__(cls)
+        step.obj, step._name = SimpleNamespace(appliance=SimpleNamespace(hostname='a')), 'All'
+        return step
+
+    assert step(Step).url_cache_key() == ('a', repr(step(Step).obj), 'All')
+    # the arguments may change where the step ends up
+    assert step(Step).url_cache_key('folder') is None
+    assert step(Step).url_cache_key(filter_folder='folder') is None
+    assert step(TreeStep).url_cache_key() is None
@@ -0,0 +1,215 @@
+"""Columnar time series storage for performance measurements
+
+The perf collectors (``top_output`` parsing in :py:mod:`cfme.utils.perf_message_stats` and the
+SMEM monitor in :py:mod:`cfme.utils.smem_memory_monitor`) sample a fixed set of measurements at a
+regular interval for hours or days. :py:class:`TimeSeries` keeps each measurement in its own NumPy
+array next to an array of timestamps, so a sample costs a few floats instead of a dict, and the
+reports can compute statistics, bucket by hour and slice chart windows without walking the samples
+in Python.
+
+NumPy is only installed with the perf requirements, so import this module where it's used rather
+than at the top of modules that get imported during normal collection.
+
+"""
+from datetime import datetime
+
+import numpy
+
+#: default number of points a series is reduced to before being charted
+CHART_MAX_POINTS = 1440
+
+
+class TimeSeries(object):
+    """Append-only series of samples, one float column per measurement
+
+    Samples are expected to be appended in time order. Storage grows geometrically, so appending is
+    amortized O(1).
+
+    Args:
+        columns: names of the measurements
+        capacity: number of samples to reserve up front
+    """
+    def __init__(self, columns, capacity=1024):
+        self.columns = tuple(columns)
+        self._column_index = {name: i for i, name in enumerate(self.columns)}
+        self._size = 0
+        self._timestamps = numpy.empty(capacity, dtype='datetime64[us]')
+        self._values = numpy.full((len(self.columns), capacity), numpy.nan)
+
+    @classmethod
+    def from_arrays(cls, timestamps, values):
+        """Build a series from a timestamp array and a mapping of column name to values"""
+        series = cls(values.keys(), capacity=max(len(timestamps), 1))
+        series._size = len(timestamps)
+        series._timestamps[:series._size] = timestamps
+        for i, column in enumerate(series.columns):
+            series._values[i, :series._size] = values[column]
+        return series
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return '<{} columns={} samples={}>'.format(
+            type(self).__name__, list(self.columns), self._size)
+
+    def _grow(self):
+        capacity = max(len(self._timestamps) * 2, 16)
+        timestamps = numpy.empty(capacity, dtype='datetime64[us]')
+        timestamps[:self._size] = self._timestamps[:self._size]
+        values = numpy.full((len(self.columns), capacity), numpy.nan)
+        values[:, :self._size] = self._values[:, :self._size]
+        self._timestamps, self._values = timestamps, values
+
+    def append(self, timestamp, **values):
+        """Add a sample; measurements not given are stored as NaN"""
+        if self._size == len(self._timestamps):
+            self._grow()
+        self._timestamps[self._size] = timestamp
+        self._size += 1
+        self.set_last(**values)
+
+    def set_last(self, **values):
+        """Fill in measurements of the latest sample, for sources that report them piecemeal"""
+        if not self._size:
+            raise IndexError('set_last() on an empty {}'.format(type(self).__name__))
+        for column, value in values.items():
+            self._values[self._column_index[column], self._size - 1] = value
+
+    @property
+    def timestamps(self):
+        """``datetime64[us]`` array of the sample times"""
+        return self._timestamps[:self._size]
+
+    def datetimes(self):
+        """Sample times as a list of :py:class:`datetime.datetime`"""
+        return self.timestamps.astype(datetime).tolist()
+
+    def __getitem__(self, column):
+        """Array of one measurement, a view that stays valid until the next append"""
+        return self._values[self._column_index[column], :self._size]
+
+    def __contains__(self, timestamp):
+        """Whether there is a sample taken at exactly ``timestamp``"""
+        timestamp = numpy.datetime64(timestamp, 'us')
+        i = numpy.searchsorted(self.timestamps, timestamp)
+        return i < self._size and self._timestamps[i] == timestamp
+
+    @property
+    def start(self):
+        return self._timestamps[0].astype(datetime)
+
+    @property
+    def end(self):
+        return self._timestamps[self._size - 1].astype(datetime)
+
+    def first(self, column):
+        return float(self[column][0])
+
+    def last(self, column):
+        return float(self[column][-1])
+
+    def at(self, timestamp):
+        """Measurements of the sample taken at ``timestamp`` as a dict"""
+        timestamp = numpy.datetime64(timestamp, 'us')
+        i = numpy.searchsorted(self.timestamps, timestamp)
+        if i == self._size or self._timestamps[i] != timestamp:
+            raise KeyError(timestamp)
+        return {column: float(self._values[c, i]) for c, column in enumerate(self.columns)}
+
+    def _slice(self, start, stop):
+        return TimeSeries.from_arrays(
+            self._timestamps[start:stop],
+            {column: self._values[c, start:stop] for c, column in enumerate(self.columns)})
+
+    def between(self, start, end):
+        """Samples with ``start <= timestamp < end``"""
+        lo, hi = numpy.searchsorted(
+            self.timestamps, [numpy.datetime64(start, 'us'), numpy.datetime64(end, 'us')])
+        return self._slice(lo, hi)
+
+    def split(self, unit='D'):
+        """Split into consecutive series at calendar boundaries of ``unit`` (a NumPy time unit)"""
+        buckets = self.timestamps.astype('datetime64[{}]'.format(unit))
+        bounds = numpy.flatnonzero(buckets[1:] != buckets[:-1]) + 1
+        edges = [0] + bounds.tolist() + [self._size]
+        return [self._slice(lo, hi) for lo, hi in zip(edges, edges[1:]) if hi > lo]
+
+    def resample(self, unit='h', how=numpy.mean):
+        """Aggregate samples into buckets of a NumPy time unit (``'h'`` is hourly)
+
+        Args:
+            unit: bucket size, e.g. ``'m'``, ``'h'`` or ``'D'``
+            how: reduction applied per bucket; :py:func:`numpy.mean`, :py:func:`numpy.max`,
+                :py:func:`numpy.min` and :py:func:`numpy.sum` are vectorized over all buckets
+        Returns:
+            a :py:class:`TimeSeries` with one sample per non-empty bucket, stamped with the start
+            of the bucket
+        """
+        if not self._size:
+            return TimeSeries(self.columns, capacity=1)
+        buckets = self.timestamps.astype('datetime64[{}]'.format(unit))
+        bucket_starts, first_index, counts = numpy.unique(
+            buckets, return_index=True, return_counts=True)
+        values = self._values[:, :self._size]
+        if how is numpy.mean:
+            reduced = numpy.add.reduceat(values, first_index, axis=1) / counts
+        elif how in (numpy.max, numpy.amax):
+            reduced = numpy.maximum.reduceat(values, first_index, axis=1)
+        elif how in (numpy.min, numpy.amin):
+            reduced = numpy.minimum.reduceat(values, first_index, axis=1)
+        elif how is numpy.sum:
+            reduced = numpy.add.reduceat(values, first_index, axis=1)
+        else:
+            reduced = numpy.column_stack(
+                [how(chunk, axis=1) for chunk in numpy.split(values, first_index[1:], axis=1)])
+        return TimeSeries.from_arrays(
+            bucket_starts.astype('datetime64[us]'),
+            {column: reduced[c] for c, column in enumerate(self.columns)})
+
+    def downsample(self, max_points=CHART_MAX_POINTS):
+        """Average consecutive samples so that at most ``max_points`` remain, for charting
+
+        The first and last sample are kept as they are, so start/end annotations on charts still
+        show the measured values.
+        """
+        if self._size <= max_points or max_points < 3:
+            return self
+        edges = numpy.linspace(1, self._size - 1, max_points - 1).astype(int)
+        edges = numpy.unique(edges)
+        inner = self._values[:, 1:self._size - 1]
+        starts = edges[:-1] - 1
+        counts = numpy.diff(edges)
+        means = numpy.add.reduceat(inner, starts, axis=1) / counts
+        # bucket timestamps are the first sample of each bucket
+        timestamps = numpy.concatenate((
+            self._timestamps[:1], self._timestamps[edges[:-1]],
+            self._timestamps[self._size - 1:self._size]))
+        values = numpy.concatenate(
+            (self._values[:, :1], means, self._values[:, self._size - 1:self._size]), axis=1)
+        return TimeSeries.from_arrays(
+            timestamps, {column: values[c] for c, column in enumerate(self.columns)})
+
+    def statistics(self, column):
+        """min, mean, max and standard deviation of a measurement, ignoring missing samples"""
+        values = self[column]
+        if not len(values) or numpy.isnan(values).all():
+            return {'min': 0.0, 'mean': 0.0, 'max': 0.0, 'stddev': 0.0}
+        return {
+            'min': float(numpy.nanmin(values)),
+            'mean': float(numpy.nanmean(values)),
+            'max': float(numpy.nanmax(values)),
+            'stddev': float(numpy.nanstd(values)),
+        }
+
+    def rows(self, columns=None):
+        """Iterate ``(datetime, value, ...)`` tuples, e.g. for writing csv files"""
+        columns = columns or self.columns
+        values = [self[column].tolist() for column in columns]
+        return zip(self.datetimes(), *values)
+
+    def write_csv(self, csv_file, columns=None):
+        """Write the samples to an open file, one ``timestamp,value,...`` line per sample"""
+        for row in self.rows(columns):
+            csv_file.write(','.join(str(field) for field in row))
+            csv_file.write('\n')
@@ -48,6 +48,7 @@ pytest_plugins = [
     "cfme.fixtures.cfme_data",
     "cfme.fixtures.cli",
     "cfme.fixtures.datafile",
+    "cfme.fixtures.db_schema",
     "cfme.fixtures.depot",
     "cfme.fixtures.dev_branch",
     "cfme.fixtures.disable_forgery_protection",
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Time the collection of the test tree with and without the provider matching memo
+
+Collects the given tests with ``--collect-only`` against the dummy appliance, once as is and once
+with ``--disable-provider-memo``, reports the wall time of each and checks that both collected the
+same tests.
+
+e.g. ./bench_collection.py cfme/tests --repeat 3 --use-provider complete
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+
+def collect(tests, extra_args, memo):
+    args = [sys.executable, '-m', 'pytest', tests, '--collect-only', '-q', '--dummy-appliance',
+            '--long-running'] + extra_args
+    if not memo:
+        args.append('--disable-provider-memo')
+    start = time.time()
+    result = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            universal_newlines=True)
+    elapsed = time.time() - start
+    node_ids = [line for line in result.stdout.splitlines() if '::' in line]
+    if result.returncode not in (0, 5):  # 5: no tests collected
+        print(result.stdout[-5000:])
+        raise SystemExit('collection failed with exit code {}'.format(result.returncode))
+    return node_ids, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('tests', nargs='?', default='cfme/tests', help='Tests to collect')
+    parser.add_argument('--repeat', type=int, default=1, help='Collections per mode')
+    parser.add_argument('--use-provider', action='append', default=[],
+                        help='Passed to pytest, repeatable')
+    args = parser.parse_args()
+
+    extra_args = []
+    for provider in args.use_provider:
+        extra_args.extend(['--use-provider', provider])
+
+    results = {}
+    for memo in (False, True):
+        times = []
+        for _ in range(args.repeat):
+            node_ids, elapsed = collect(args.tests, extra_args, memo)
+            times.append(elapsed)
+        results[memo] = node_ids
+        print('{:12s} {:6d} tests  best {:7.1f}s  mean {:7.1f}s'.format(
+            'memo' if memo else 'no memo', len(node_ids), min(times), sum(times) / len(times)))
+
+    if results[False] != results[True]:
+        missing = set(results[False]) - set(results[True])
+        extra = set(results[True]) - set(results[False])
+        print('COLLECTED TESTS DIFFER')
+        for node_id in sorted(missing):
+            print('  only without memo: {}'.format(node_id))
+        for node_id in sorted(extra):
+            print('  only with memo: {}'.format(node_id))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Benchmark LogValidator pattern matching against a recorded log file
+
+Feeds every line of a local copy of a log (e.g. an evm.log pulled from an appliance) through the
+pattern matching of :py:class:`cfme.utils.log_validator.LogValidator`, and through the previous
+approach of one ``re.search`` per pattern per line, and reports lines per second for both.
+
+e.g. ./bench_log_validator.py evm.log --skip 'PARTICULAR_ERROR' --fail '.*ERROR.*' \\
+        --match 'Refresh completed'
+"""
+import argparse
+import re
+import time
+
+from cfme.utils.log_validator import PatternMatcher
+
+
+def per_pattern(lines, skip_patterns, failure_patterns, matched_patterns):
+    hits = 0
+    for line in lines:
+        if any(re.search(pattern, line) for pattern in skip_patterns):
+            continue
+        hits += sum(1 for pattern in failure_patterns if re.search(pattern, line))
+        hits += sum(1 for pattern in matched_patterns if re.search(pattern, line))
+    return hits
+
+
+def single_pass(lines, skip_patterns, failure_patterns, matched_patterns):
+    matcher = PatternMatcher(skip_patterns + failure_patterns + matched_patterns)
+    skip = PatternMatcher(skip_patterns)
+    fail = PatternMatcher(failure_patterns)
+    match = PatternMatcher(matched_patterns)
+    hits = 0
+    for line in lines:
+        if not matcher.any(line):
+            continue
+        if any(True for _ in skip.search(line)):
+            continue
+        hits += sum(1 for _ in fail.search(line))
+        hits += sum(1 for _ in match.search(line))
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('log', help='Path to a local copy of the log file')
+    parser.add_argument('--skip', action='append', default=[], help='Skip pattern, repeatable')
+    parser.add_argument('--fail', action='append', default=[], help='Failure pattern, repeatable')
+    parser.add_argument('--match', action='append', default=[],
+                        help='Expected pattern, repeatable')
+    args = parser.parse_args()
+
+    with open(args.log, errors='replace') as f:
+        lines = [line.rstrip() for line in f]
+    print(f'{len(lines)} lines, {len(args.skip)} skip, {len(args.fail)} failure and '
+          f'{len(args.match)} expected patterns')
+
+    for name, check in (('per-pattern', per_pattern), ('single-pass', single_pass)):
+        start = time.time()
+        hits = check(lines, args.skip, args.fail, args.match)
+        elapsed = time.time() - start
+        print(f'{name:>12}: {hits} hits in {elapsed:.2f}s, {len(lines) / elapsed:.0f} lines/s')
+
+
+if __name__ == '__main__':
+    main()
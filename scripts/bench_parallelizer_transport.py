@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for the parallelizer master/slave transports
+
+Simulates N slaves, each in its own thread with its own socket, that send a stream of
+``runtest_logstart``/``runtest_logreport`` events shaped like the real ones to a master loop,
+and reports how many events per second the master handled for each transport.
+
+e.g. ./bench_parallelizer_transport.py --slaves 8 --tests 500
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import zmq
+
+from cfme.fixtures.parallelizer.transport import CODECS
+from cfme.fixtures.parallelizer.transport import get_codec
+from cfme.fixtures.parallelizer.transport import MasterTransport
+from cfme.fixtures.parallelizer.transport import SlaveTransport
+
+
+def fake_report(nodeid, when, longrepr_size):
+    return {
+        'nodeid': nodeid,
+        'location': ['cfme/tests/test_bench.py', 10, nodeid.split('::')[-1]],
+        'keywords': {'test_bench': 1, 'cfme': 1, 'tier': 1},
+        'outcome': 'passed',
+        'longrepr': 'E' * longrepr_size if when == 'call' else None,
+        'when': when,
+        'user_properties': [],
+        'sections': [['Captured log', 'x' * 200]],
+        'duration': 0.01,
+    }
+
+
+def run_slave(ctx, endpoint, slaveid, codec_name, num_tests, longrepr_size):
+    transport = SlaveTransport.connect(ctx, slaveid, endpoint, codec_name)
+    for i in range(num_tests):
+        nodeid = f'cfme/tests/test_bench.py::test_{i}[{slaveid}]'
+        transport.request({'_event_name': 'runtest_logstart', 'nodeid': nodeid,
+                           'location': ['cfme/tests/test_bench.py', 10, nodeid]})
+        for when in ('setup', 'call', 'teardown'):
+            transport.request({'_event_name': 'runtest_logreport',
+                               'report': fake_report(nodeid, when, longrepr_size)})
+    transport.request({'_event_name': 'shutdown'})
+    transport.close()
+
+
+def bench(codec_name, num_slaves, num_tests, longrepr_size):
+    ctx = zmq.Context()
+    endpoint = f'ipc://{tempfile.gettempdir()}/bench-parallelizer-{os.getpid()}-{codec_name}'
+    sock = ctx.socket(zmq.ROUTER)
+    sock.bind(endpoint)
+    master = MasterTransport(sock, get_codec(codec_name))
+
+    slaves = [
+        threading.Thread(target=run_slave,
+                         args=(ctx, endpoint, f'slave{i:02d}', codec_name, num_tests,
+                               longrepr_size))
+        for i in range(num_slaves)]
+    start = time.time()
+    for slave in slaves:
+        slave.start()
+
+    events = 0
+    running = num_slaves
+    while running:
+        slaveid, event_data = master.poll(50)
+        if slaveid is None:
+            continue
+        events += 1
+        event_name = event_data.pop('_event_name')
+        master.ack(slaveid, event_name)
+        if event_name == 'shutdown':
+            master.forget(slaveid)
+            running -= 1
+    elapsed = time.time() - start
+
+    for slave in slaves:
+        slave.join()
+    sock.close()
+    ctx.term()
+    return events, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--slaves', type=int, default=4, help='Number of simulated slaves')
+    parser.add_argument('--tests', type=int, default=250, help='Number of tests per slave')
+    parser.add_argument('--longrepr-size', type=int, default=2000,
+                        help='Size of the longrepr text sent with every call report')
+    parser.add_argument('--transport', action='append', choices=sorted(CODECS),
+                        help='Transport to benchmark, may be repeated (default: all)')
+    args = parser.parse_args()
+
+    for codec_name in args.transport or sorted(CODECS):
+        events, elapsed = bench(codec_name, args.slaves, args.tests, args.longrepr_size)
+        print(f'{codec_name:>8}: {events} events from {args.slaves} slaves in {elapsed:.2f}s, '
+              f'{events / elapsed:.0f} events/s')
+
+
+if __name__ == '__main__':
+    main()
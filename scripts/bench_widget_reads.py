@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Count the WebDriver commands (and time) tables take to read
+
+Opens a page in a local browser and reads the given tables once element by element and once with
+the bulk read of :py:func:`widgetastic_manageiq.dump_table`, counting the WebDriver commands sent
+for each and checking that both return the same result.
+
+Summary pages can be saved from an appliance (e.g. the VM summary) and benchmarked offline by
+passing the saved file instead of an URL.
+
+e.g. ./bench_widget_reads.py vm_summary.html --summary Properties --summary 'My Company Tags' \\
+        --table '//table[contains(@class, "table")]' --version 5.10
+"""
+import argparse
+import os
+import time
+
+from selenium import webdriver
+from widgetastic.browser import Browser
+from widgetastic.utils import Version
+
+from widgetastic_manageiq import NestedSummaryTable
+from widgetastic_manageiq import SummaryTable
+from widgetastic_manageiq import Table
+
+
+class BenchBrowser(Browser):
+    def __init__(self, selenium, version):
+        super(BenchBrowser, self).__init__(selenium)
+        self.version = Version(version)
+
+    @property
+    def product_version(self):
+        return self.version
+
+
+class CommandCounter(object):
+    """Counts the commands the selenium driver sends to the WebDriver server"""
+
+    def __init__(self, selenium):
+        self.count = 0
+        self._execute = selenium.execute
+        selenium.execute = self._counted
+
+    def _counted(self, *args, **kwargs):
+        self.count += 1
+        return self._execute(*args, **kwargs)
+
+
+def start_driver(name):
+    if name == 'chrome':
+        options = webdriver.ChromeOptions()
+        options.add_argument('--headless')
+        return webdriver.Chrome(options=options)
+    options = webdriver.FirefoxOptions()
+    options.add_argument('--headless')
+    return webdriver.Firefox(options=options)
+
+
+def bench(counter, widget, bulk):
+    widget.BULK_READ = bulk
+    widget.clear_cache()
+    before = counter.count
+    start = time.time()
+    result = widget.read()
+    return result, counter.count - before, time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('page', help='URL or path of a saved page')
+    parser.add_argument('--summary', action='append', default=[],
+                        help='Title of a summary table, repeatable')
+    parser.add_argument('--nested-summary', action='append', default=[],
+                        help='Title of a nested summary table, repeatable')
+    parser.add_argument('--table', action='append', default=[],
+                        help='Locator of a table, repeatable')
+    parser.add_argument('--version', default='5.10',
+                        help='Appliance version the page comes from, picks version locators')
+    parser.add_argument('--driver', choices=('firefox', 'chrome'), default='firefox')
+    args = parser.parse_args()
+
+    selenium = start_driver(args.driver)
+    try:
+        page = args.page
+        if os.path.exists(page):
+            page = 'file://{}'.format(os.path.abspath(page))
+        selenium.get(page)
+        browser = BenchBrowser(selenium, args.version)
+        counter = CommandCounter(selenium)
+
+        widgets = [SummaryTable(browser, title) for title in args.summary]
+        widgets.extend(NestedSummaryTable(browser, title) for title in args.nested_summary)
+        widgets.extend(Table(browser, locator) for locator in args.table)
+        for widget in widgets:
+            legacy, legacy_commands, legacy_time = bench(counter, widget, bulk=False)
+            bulk, bulk_commands, bulk_time = bench(counter, widget, bulk=True)
+            print(f'{widget!r}')
+            print(f'  element by element: {legacy_commands:5d} commands {legacy_time:8.3f}s')
+            print(f'  bulk:               {bulk_commands:5d} commands {bulk_time:8.3f}s')
+            if legacy != bulk:
+                print(f'  RESULTS DIFFER\n    element by element: {legacy!r}\n    bulk: {bulk!r}')
+    finally:
+        selenium.quit()
+
+
+if __name__ == '__main__':
+    main()
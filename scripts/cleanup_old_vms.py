@@ -6,8 +6,7 @@ import re
 import sys
 from collections import namedtuple
 from datetime import timedelta
-from multiprocessing import Manager
-from multiprocessing import Pool
+from functools import partial
 from multiprocessing.pool import ThreadPool
 from operator import attrgetter
 
@@ -16,10 +15,11 @@ from tabulate import tabulate
 from wrapanapi.exceptions import VMInstanceNotFound
 
 from cfme.utils.appliance import DummyAppliance
+from cfme.utils.inventory_scan import ProviderScan
+from cfme.utils.inventory_scan import scan_providers
 from cfme.utils.log import add_stdout_handler
 from cfme.utils.log import logger
 from cfme.utils.path import log_path
-from cfme.utils.providers import get_mgmt
 from cfme.utils.providers import list_providers
 from cfme.utils.providers import ProviderFilter
 
@@ -28,16 +28,11 @@ PASS = 'PASS'
 FAIL = 'FAIL'
 NULL = '--'
 
-VmProvider = namedtuple('VmProvider', 'provider_key, vm')
-VmData = namedtuple('VmData', 'provider_key, vm, age')
 VmReport = namedtuple('VmReport', 'provider_key, name, age, status, result')
 
 # log to stdout too
 add_stdout_handler(logger)
 
-# manager for queues that can be shared
-manager = Manager()
-
 
 def parse_cmd_line():
     parser = argparse.ArgumentParser(argument_default=None)
@@ -55,6 +50,13 @@ def parse_cmd_line():
     parser.add_argument('--outfile', dest='outfile',
                         default=log_path.join('cleanup_old_vms.log').strpath,
                         help='outfile to list ')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='Providers to scan at once (default all of them)')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='VMs of a provider to scan or delete at once (default 8)')
+    parser.add_argument('--cache', action='store_true', default=False,
+                        help='Reuse the creation times of the last scan, only fetching those of '
+                             'new VMs')
     parser.add_argument('text_to_match', nargs='*', default=['^test_', '^jenkins', '^i-'],
                         help='Regex in the name of vm to be affected, can be use multiple times'
                              ' (Defaults to \'^test_\' and \'^jenkins\')')
@@ -79,60 +81,42 @@ def match(matchers, vm_name):
         return False
 
 
-def cleanup_provider(provider_key, matchers, scan_failure_queue, max_hours, dryrun):
+def cleanup_provider(scan, max_hours, dryrun, workers):
     """
-    Process the VMs on a given provider, comparing name and creation time.
-    Use thread pools to scan vms, then to delete vms in batches
+    Process the scanned VMs of a provider, comparing creation time.
+    Runs in the provider's process, uses a thread pool to delete vms in batches
 
     Args:
-        provider_key (string): the provider key from yaml
-        matchers (list): A list of regex objects with match() method
-        scan_failure_queue (Queue.Queue): MP queue to hold vms that we could not compare age
+        scan (ProviderScan): the scan of the VMs matching the text filters
+        max_hours (int): age limit for deletion
+        dryrun (bool): Whether or not to actually delete VMs or just report
+        workers (int): how many VMs to delete at once
     Returns:
-        None: if there aren't any old vms to delete
-        List of VMReport tuples
+        List of VmReport tuples of the old vms and the vms that we could not compare age
     """
-    logger.info('%r: Start scan for vm text matches', provider_key)
-    try:
-        vm_list = get_mgmt(provider_key).list_vms()
-    except Exception:  # noqa
-        scan_failure_queue.put(VmReport(provider_key, FAIL, NULL, NULL, NULL))
-        logger.exception('%r: Exception listing vms', provider_key)
-        return
-
-    text_matched_vms = [vm for vm in vm_list if match(matchers, vm.name)]
-
-    logger.info('%r: NOT matching text filters: %r',
-                provider_key,
-                set([v.name for v in vm_list]) - set([v.name for v in text_matched_vms]))
-    logger.info('%r: MATCHED text filters: %r', provider_key, [vm.name for vm in text_matched_vms])
-
-    if not text_matched_vms:
-        return
-
-    with ThreadPool(4) as tp:
-        scan_args = (
-            (provider_key,
-             vm,
-             timedelta(hours=int(max_hours)),
-             scan_failure_queue)
-            for vm in text_matched_vms
-        )
-        old_vms = [
-            vm
-            for vm in tp.starmap(scan_vm, scan_args)
-            if vm is not None
-        ]
+    provider_key = scan.provider_key
+    logger.info('%r: MATCHED text filters: %r', provider_key, [r.name for r in scan.records])
+
+    delta = timedelta(hours=int(max_hours))
+    scan_failures = []
+    old_vms = []
+    for record in scan.records:
+        old_vm, failure = scan_vm(record, delta)
+        if failure is not None:
+            scan_failures.append(failure)
+        if old_vm is not None:
+            old_vms.append(old_vm)
 
     if old_vms and dryrun:
         logger.warning('DRY RUN: Would have deleted the following VMs on provider %s: \n %s',
                        provider_key,
                        [(vm[0].name, vm[1], vm[2]) for vm in old_vms])
         # for tabulate consistency on dry runs. 0=vm, 1=age, 2=status
-        return [VmReport(provider_key, vm[0].name, vm[1], vm[2], NULL) for vm in old_vms]
+        return scan_failures + [
+            VmReport(provider_key, vm[0].name, vm[1], vm[2], NULL) for vm in old_vms]
 
     elif old_vms:
-        with ThreadPool(4) as tp:
+        with ThreadPool(workers) as tp:
             delete_args = (
                 (provider_key,
                  old_tuple[0],  # vm
@@ -141,50 +125,41 @@ def cleanup_provider(provider_key, matchers, scan_failure_queue, max_hours, dryr
             )
             delete_results = tp.starmap(delete_vm, delete_args)
 
-            return delete_results
+            return scan_failures + delete_results
 
+    return scan_failures
 
-def scan_vm(provider_key, vm, delta, scan_failure_queue):
-    """Scan an individual VM for age
+
+def scan_vm(record, delta):
+    """Check the scanned age of an individual VM
 
     Args:
-        vm (obj) wrapanapi vm object
+        record (VmRecord) scanned VM, with its creation time and wrapanapi vm object
         delta (datetime.timedelta) The timedelta to compare age against for matches
-        match_queue (Queue.Queue): MP queue to hold VMs matching age requirement
-        scan_failure_queue (Queue.Queue): MP queue to hold vms that we could not compare age
 
     Returns:
-        None: Uses the Queues to 'return' data
+        tuple of (vm, age, status) if the VM matches the age requirement, otherwise None, and of
+        the VmReport of a failure to get the creation time, otherwise None
     """
+    provider_key, vm = record.provider_key, record.vm
     now = datetime.datetime.now(tz=pytz.UTC)
-    # Nested exceptions to try and be safe about the scanned values and to get complete results
-    failure = False
     status = NULL
-
-    logger.info('%r: Scan VM %r...', provider_key, vm.name)
-    # set default here in case exceptions cause vm_creation_time to not be set
-    vm_creation_time = datetime.datetime(2018, 1, 1, 0, 0).replace(tzinfo=pytz.UTC)
-    # get creation time
-    try:
-        vm_creation_time = vm.creation_time or vm_creation_time  # could be None, use the default
-    except VMInstanceNotFound:
-        logger.exception('%r: could not locate VM %s', provider_key, vm.name)
-        failure = True
-        pass
-    except Exception:  # noqa
-        logger.exception('%r: Exception getting creation time for %r', provider_key, vm.name)
-        failure = True
-        # get state of vm that doesn't have creation time
-        try:
-            status = vm.state
-        except Exception:  # noqa
-            logger.exception('%r: Exception getting status for %r', provider_key, vm.name)
-            status = NULL
-            pass
-        pass
-
-    if failure:
-        scan_failure_queue.put(VmReport(provider_key, vm.name, FAIL, status, NULL))
+    failure = None
+
+    # default in case exceptions caused creation_time to not be set, could also be None
+    vm_creation_time = (record.get('creation_time') or
+                        datetime.datetime(2018, 1, 1, 0, 0).replace(tzinfo=pytz.UTC))
+    if 'creation_time' in record.failures:
+        logger.error('%r: could not get creation time for %r: %s',
+                     provider_key, vm.name, record.failures['creation_time'])
+        if not record.failures['creation_time'].startswith(VMInstanceNotFound.__name__):
+            # get state of vm that doesn't have creation time
+            try:
+                status = vm.state
+            except Exception:  # noqa
+                logger.exception('%r: Exception getting status for %r', provider_key, vm.name)
+                status = NULL
+        failure = VmReport(provider_key, vm.name, FAIL, status, NULL)
 
     vm_delta = now - vm_creation_time
     logger.info('%r: VM %r age: %s', provider_key, vm.name, vm_delta)
@@ -192,9 +167,10 @@ def scan_vm(provider_key, vm, delta, scan_failure_queue):
     # test age to determine which queue it goes in
     if delta < vm_delta:
         logger.info('%r: VM %r MATCHED age requirement', provider_key, vm.name)
-        return (vm, vm_delta, status)
+        return (vm, vm_delta, status), failure
     else:
         logger.info('%r: VM %r did not match age requirement', provider_key, vm.name)
+        return None, failure
 
 
 def delete_vm(provider_key, vm, age):
@@ -237,13 +213,14 @@ def delete_vm(provider_key, vm, age):
         return VmReport(provider_key, vm.name, age, status, result)
 
 
-def cleanup_vms(texts, max_hours=24, providers=None, tags=None, dryrun=True):
+def cleanup_vms(texts, max_hours=24, providers=None, tags=None, dryrun=True, processes=None,
+                workers=8, use_cache=False):
     """
     Main method for the cleanup process
     Generates regex match objects
     Checks providers for cleanup boolean in yaml
     Checks provider connectivity (using ping)
-    Process Pool for provider scanning
+    Process pool for provider scanning, see cfme.utils.inventory_scan
     Each provider process will thread vm scanning and deletion
 
     Args:
@@ -252,6 +229,9 @@ def cleanup_vms(texts, max_hours=24, providers=None, tags=None, dryrun=True):
         providers (list): List of provider keys to scan and cleanup
         tags (list): List of tags to filter providers by
         dryrun (bool): Whether or not to actually delete VMs or just report
+        processes (int): How many providers to scan at once, all by default
+        workers (int): How many VMs of a provider to scan or delete at once
+        use_cache (bool): Whether to reuse the creation times of the previous scan
     Returns:
         int: return code, 0 on success, otherwise raises exception
     """
@@ -274,25 +254,21 @@ def cleanup_vms(texts, max_hours=24, providers=None, tags=None, dryrun=True):
     logger.info('Potential providers for cleanup, filtered with given tags and provider keys: \n%s',
                 '\n'.join(providers_to_scan))
 
-    # scan providers for vms with name matches
-    scan_fail_queue = manager.Queue()
-    with Pool(4) as pool:
-        deleted_vms = pool.starmap(
-            cleanup_provider,
-            ((provider_key, matchers, scan_fail_queue, max_hours, dryrun)
-             for provider_key in providers_to_scan)
-        )
-
-    # flatten deleted_vms list, as its top level is by provider process
-    # at same time remove None responses
-    deleted_vms = [report
-                   for prov_list in deleted_vms if prov_list is not None
-                   for report in prov_list]
-
-    scan_fail_vms = []
-    # add the scan failures into deleted vms for reporting sake
-    while not scan_fail_queue.empty():
-        scan_fail_vms.append(scan_fail_queue.get())
+    # scan providers for vms with name matches, deleting the old ones in the provider processes
+    scans = scan_providers(
+        providers_to_scan, ['creation_time'],
+        processes=processes,
+        workers=workers,
+        use_cache=use_cache,
+        name_filter=partial(match, matchers),
+        process=partial(cleanup_provider, max_hours=max_hours, dryrun=dryrun, workers=workers))
+
+    deleted_vms = []
+    for scan in scans:
+        if scan.error:
+            deleted_vms.append(VmReport(scan.provider_key, FAIL, NULL, NULL, NULL))
+        elif scan.result:
+            deleted_vms.extend(scan.result)
 
     with open(args.outfile, 'a') as report:
         report.write('## VM/Instances deleted via:\n'
@@ -300,16 +276,20 @@ def cleanup_vms(texts, max_hours=24, providers=None, tags=None, dryrun=True):
                      '##   age matches: {}\n'
                      .format(texts, max_hours))
         message = tabulate(
-            sorted(scan_fail_vms + deleted_vms, key=attrgetter('result')),
+            sorted(deleted_vms, key=attrgetter('result')),
             headers=['Provider', 'Name', 'Age', 'Status Before', 'Delete RC'],
             tablefmt='orgtbl'
         )
         report.write(message + '\n')
+        metrics = tabulate([scan.metrics() for scan in scans],
+                           headers=ProviderScan.METRICS_HEADERS, tablefmt='orgtbl')
+        report.write(metrics + '\n')
     logger.info(message)
+    logger.info('Scan metrics:\n%s', metrics)
     return 0
 
 
 if __name__ == "__main__":
     args = parse_cmd_line()
     sys.exit(cleanup_vms(args.text_to_match, args.max_hours, args.providers, args.tags,
-                         args.dryrun))
+                         args.dryrun, args.processes, args.workers, args.cache))
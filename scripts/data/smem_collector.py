@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""Memory sample collector run on the appliance by SmemMemoryMonitor
+
+Uploaded once and left running for the duration of a workload. Every interval it writes one JSON
+record to stdout with everything the monitor needs for a sample:
+
+``ts``
+    sample time, seconds since the epoch
+``meminfo``
+    /proc/meminfo, in kB
+``workers``
+    ``{pid: worker type}`` of the miq_workers of the given server
+``processes``
+    ``{pid: [rss, pss, uss, vss, swap, name, command]}``, sizes in kB
+
+Per process figures are read from /proc/<pid>/smaps the same way smem computes them, without
+starting smem (and a python interpreter) on every sample. The collector exits when stdout goes
+away, i.e. when the monitor closes the channel.
+
+Runs on whichever python the appliance has, so keep it python 2.7 and 3 compatible.
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+WORKERS_QUERY = 'select pid, type from miq_workers where miq_server_id = \'{}\''
+
+
+def read_meminfo():
+    meminfo = {}
+    with open('/proc/meminfo') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            meminfo[key.strip()] = int(value.split()[0])
+    return meminfo
+
+
+def read_workers(server_id):
+    if not server_id:
+        return {}
+    try:
+        output = subprocess.check_output(
+            ['psql', '-t', '-q', '-d', 'vmdb_production', '-c', WORKERS_QUERY.format(server_id)])
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    workers = {}
+    for line in output.decode('utf-8', 'replace').splitlines():
+        pid_worker = line.split('|')
+        if len(pid_worker) == 2 and pid_worker[0].strip():
+            workers[pid_worker[0].strip()] = pid_worker[1].strip()
+    return workers
+
+
+def read_process(pid):
+    """smem's rss/pss/uss/vss/swap plus name and command line of a pid, None if it's gone"""
+    rss = pss = uss = vss = swap = 0
+    try:
+        with open('/proc/{}/smaps'.format(pid)) as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key == 'Size':
+                    vss += int(value.split()[0])
+                elif key == 'Rss':
+                    rss += int(value.split()[0])
+                elif key == 'Pss':
+                    pss += int(value.split()[0])
+                elif key in ('Private_Clean', 'Private_Dirty'):
+                    uss += int(value.split()[0])
+                elif key == 'Swap':
+                    swap += int(value.split()[0])
+        # command lines aren't necessarily utf-8
+        with io.open('/proc/{}/stat'.format(pid), encoding='utf-8', errors='replace') as f:
+            stat = f.read()
+        with io.open('/proc/{}/cmdline'.format(pid), encoding='utf-8', errors='replace') as f:
+            cmdline = f.read()
+    except (IOError, OSError):
+        return None
+    if not vss:
+        # kernel threads
+        return None
+    name = stat[stat.find('(') + 1:stat.rfind(')')]
+    command = cmdline.replace('\0', ' ').strip()
+    return [rss, pss, uss, vss, swap, name, command]
+
+
+def read_processes():
+    processes = {}
+    for pid in os.listdir('/proc'):
+        if pid.isdigit() and int(pid) != os.getpid():
+            process = read_process(pid)
+            if process is not None:
+                processes[pid] = process
+    return processes
+
+
+def sample(server_id):
+    return {
+        'ts': time.time(),
+        'meminfo': read_meminfo(),
+        'workers': read_workers(server_id),
+        'processes': read_processes(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--interval', type=float, default=10.0,
+        help='Seconds between the start of two samples')
+    parser.add_argument('--server-id', default='', help='miq_servers id to list workers of')
+    args = parser.parse_args()
+
+    next_sample = time.time()
+    while True:
+        record = sample(args.server_id)
+        try:
+            sys.stdout.write(json.dumps(record))
+            sys.stdout.write('\n')
+            sys.stdout.flush()
+        except (IOError, OSError):
+            # monitor went away
+            return
+        # don't try to catch up on samples that took longer than the interval
+        next_sample = max(next_sample + args.interval, time.time())
+        time.sleep(max(0, next_sample - time.time()))
+
+
+if __name__ == '__main__':
+    main()
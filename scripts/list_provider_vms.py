@@ -1,13 +1,12 @@
 #!/usr/bin/env python3
 import argparse
-from multiprocessing import Process
-from multiprocessing import Queue
 
 from tabulate import tabulate
 
 from cfme.utils.appliance import DummyAppliance
+from cfme.utils.inventory_scan import ProviderScan
+from cfme.utils.inventory_scan import scan_providers
 from cfme.utils.path import log_path
-from cfme.utils.providers import get_mgmt
 from cfme.utils.providers import list_providers
 from cfme.utils.providers import ProviderFilter
 
@@ -36,55 +35,34 @@ def parse_cmd_line():
                         action='append',
                         help='Provider keys, can be user multiple times. If none are given '
                              'the script will use all providers from cfme_data or match tags')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='Providers to scan at once (default all of them)')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='VMs of a provider to collect metadata of at once (default 8)')
+    parser.add_argument('--cache', action='store_true', default=False,
+                        help='Reuse the creation times and types of the last scan')
 
     args = parser.parse_args()
     return args
 
 
-def list_vms(provider_key, output_queue):
+def vm_rows(scan):
     """
-    List all the vms/instances on the given provider key
     Build list of lists with basic vm info: [[provider, vm, status, age, type], [etc]]
-    :param provider_key: string provider key
-    :param output_queue: a multiprocessing.Queue object to add results to
+    :param scan: ProviderScan of the vms of a provider
     :return: list of lists of vms and basic statistics
     """
-    output_list = []
-
-    print('Listing VMS on provider {}'.format(provider_key))
-    provider = get_mgmt(provider_key)
-    # TODO thread metadata collection for further speed improvements
-    for vm in provider.list_vms():
-        # Init these meta values in case they fail to query
-        status, creation, vm_type = None, None, None
-        try:
-            print('Collecting metadata for VM {} on provider {}'.format(vm.name, provider_key))
-            status = vm.state
-            creation = vm.creation_time
-
-            # different provider types implement different methods to get instance type info
-            if hasattr(vm, 'type'):
-                vm_type = vm.type
-            else:
-                try:
-                    vm_type = vm.get_hardware_configuration()
-                except (AttributeError, NotImplementedError):
-                    vm_type = '--'
-
-        except Exception as ex:
-            print('Exception during provider processing on {}: {}'
-                  .format(provider_key, ex.message))
-            continue
-        finally:
-            # Add the VM to the list anyway, we just might not have all metadata
-            output_list.append([provider_key,
-                                vm.name,
-                                status or NULL,
-                                creation or NULL,
-                                str(vm_type) or NULL])
-
-    output_queue.put(output_list)
-    return
+    if scan.error:
+        print('Exception during provider processing on {}: {}'.format(
+            scan.provider_key, scan.error))
+        return []
+    # Add the VMs to the list anyway, we just might not have all metadata
+    return [[scan.provider_key,
+             record.name,
+             record.get('state') or NULL,
+             record.get('creation_time') or NULL,
+             str(record.get('type') or NULL)]
+            for record in scan.records]
 
 
 if __name__ == "__main__":
@@ -100,24 +78,15 @@ if __name__ == "__main__":
     with DummyAppliance('5.10.0.0'):
         providers = [prov.key for prov in list_providers(filters, use_global_filters=False)]
 
-    queue = Queue()  # for MP output
-    proc_list = [
-        Process(target=list_vms, args=(provider, queue), name='list_vms:{}'.format(provider))
-        for provider in providers
-    ]
-    for proc in proc_list:
-        proc.start()
-    for proc in proc_list:
-        proc.join()
+    print('Listing VMs on providers {}'.format(', '.join(providers)))
+    scans = scan_providers(providers, ['state', 'creation_time', 'type'],
+                           processes=args.processes, workers=args.workers,
+                           use_cache=args.cache)
 
     print('Done processing providers, assembling report...')
-
-    # Now pull all the results off of the queue
-    # Stacking the generator this way is equivalent to using list.extend instead of list.append
-    # Need to check queue.empty since a call to get will raise an Empty exception
     output_data = []
-    while not queue.empty():
-        output_data.extend(queue.get())
+    for scan in scans:
+        output_data.extend(vm_rows(scan))
 
     header = '''## VM/Instances on providers matching:
 ## providers: {}
@@ -135,3 +104,6 @@ if __name__ == "__main__":
 
         output_file.write(report)
         print(report)
+
+    print(tabulate([scan.metrics() for scan in scans], headers=ProviderScan.METRICS_HEADERS,
+                   tablefmt='orgtbl'))
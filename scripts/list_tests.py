@@ -1,45 +1,42 @@
 #!/usr/bin/env python3
-import os.path
-import re
-import sys
-
-if len(sys.argv) == 1:
-    print("""
-Invoke either by supplying a path or a file and optionally a string to find in a test name
-
-e.g. list_test . provision
-e.g. list_test file.py
-""")
-    sys.exit(1)
-
-
-def parser(filename, exp=None):
-    try:
-        with open(filename, 'r') as f:
-            data = f.read()
-    except IOError:
-        data = ""
+"""List the tests under a path, optionally only those with a string in their name
 
-    if not exp:
-        exp = ""
+The tests are read from the static test inventory (see cfme.utils.testinventory), which is only
+refreshed for the modules that changed since the last run.
 
-    p = re.findall(r'\s*def\s*[a-zA-Z0-9_]*?(test_.*?{}.*?)\('.format(exp), data)
-    for test in p:
-        if isinstance(test, str):
-            print("{} :: {}".format(filename, test))
-        else:
-            print("{} :: {}".format(filename, test[0]))
-
-
-exp = None
-if len(sys.argv) == 3:
-    exp = sys.argv[2]
-
-if sys.argv[1].endswith('.py'):
-    parser(sys.argv[1], exp)
-else:
-    files = [os.path.join(d, fn) for d, dn, fns in os.walk(sys.argv[1]) for fn in fns]
+e.g. list_tests.py . provision
+e.g. list_tests.py file.py
+e.g. list_tests.py cfme/tests/infrastructure --marker tier --json
+"""
+import argparse
+import json
+import os.path
 
-    for filename in files:
-        if filename.endswith('.py'):
-            parser(filename, exp)
+from cfme.utils.path import project_path
+from cfme.utils.testinventory import TestInventory
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', help='File or directory to list the tests of')
+    parser.add_argument('exp', nargs='?', default='', help='String to find in a test name')
+    parser.add_argument('--marker', help='Only list the tests with this marker')
+    parser.add_argument('--json', action='store_true',
+                        help='Print the indexed tests, with markers and metadata, as JSON')
+    args = parser.parse_args()
+
+    path = os.path.relpath(os.path.abspath(args.path), project_path.strpath)
+    inventory = TestInventory.load()
+    inventory.update(path)
+    tests = [test for test in inventory.tests(None if path == '.' else path)
+             if args.exp in test.name and (not args.marker or test.has_marker(args.marker))]
+    if args.json:
+        print(json.dumps([dict(vars(test), nodeid=test.nodeid) for test in tests], indent=2))
+        return
+    for test in tests:
+        print("{} :: {}".format(test.path, test.name))
+
+
+if __name__ == '__main__':
+    main()
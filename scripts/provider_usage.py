@@ -1,5 +1,6 @@
 #! /usr/bin/env python2
 import json
+import re
 from collections import defaultdict
 
 from jinja2 import Environment
@@ -8,8 +9,8 @@ from jinja2 import FileSystemLoader
 from cfme.utils import appliance
 from cfme.utils.conf import cfme_data
 from cfme.utils.conf import jenkins
+from cfme.utils.inventory_scan import scan_providers
 from cfme.utils.path import template_path
-from cfme.utils.providers import get_mgmt
 
 li = cfme_data['management_systems']
 users = jenkins['nicks']
@@ -17,11 +18,11 @@ users = jenkins['nicks']
 data = defaultdict(dict)
 
 
-def process_vm(vm, mgmt, user, prov):
+def process_vm(vm, user, prov):
     print("Inspecting: {} on {}".format(vm.name, prov))
-    if vm.is_stopped:
+    if vm.get('is_stopped', True):
         return
-    ip = vm.ip
+    ip = vm.get('ip')
     if ip:
         with appliance.IPAppliance(hostname=ip) as app:
             try:
@@ -38,24 +39,22 @@ def process_vm(vm, mgmt, user, prov):
                 for provider in providers:
                     prov_name = prov_key_db.get(provider, 'Unknown ({})'.format(prov))
                     if prov_name in data[user]:
-                        data[user][prov_name].append("{} ({})".format(vm, prov))
+                        data[user][prov_name].append("{} ({})".format(vm.name, prov))
                     else:
-                        data[user][prov_name] = ["{} ({})".format(vm, prov)]
+                        data[user][prov_name] = ["{} ({})".format(vm.name, prov)]
 
             except Exception:
                 pass
 
 
-def process_provider(mgmt, prov):
-    try:
-        vms = mgmt.list_vms()
-    except Exception:
+def process_provider(scan):
+    if scan.error:
         return
 
-    for vm in vms:
+    for vm in scan.records:
         for user in users:
             if user in vm.name:
-                process_vm(vm, mgmt, user, prov)
+                process_vm(vm, user, scan.provider_key)
 
 
 prov_key_db = {}
@@ -64,10 +63,14 @@ prov_key_db = {}
 for prov in li:
     ip = li[prov].get('ipaddress')
     prov_key_db[ip] = prov
-    if li[prov]['type'] not in ['ec2', 'scvmm']:
-        mgmt = get_mgmt(prov)
-        print("DOING {}".format(prov))
-        process_provider(mgmt, prov)
+
+# list the VMs of the users on all providers at once
+scans = scan_providers(
+    [prov for prov in li if li[prov]['type'] not in ['ec2', 'scvmm']], ['is_stopped', 'ip'],
+    name_filter=re.compile('|'.join(re.escape(user) for user in users)).search)
+for scan in scans:
+    print("DOING {}".format(scan.provider_key))
+    process_provider(scan)
 
 with open('provider_usage.json', 'w') as f:
     json.dump(data, f)
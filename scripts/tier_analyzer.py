@@ -1,12 +1,19 @@
 #!/usr/bin/env python3
 """This simple script lists all tests generated for the given provider. Then it lists all the tests
 marked with given tier marker(s). In the end it simply compares those two list, showing you tests
-that are generated for provider but NOT marked with the tier(s)."""
+that are generated for provider but NOT marked with the tier(s).
+
+With --static the tests are read from the static test inventory instead of being collected by
+pytest, which takes milliseconds instead of minutes. Parametrization isn't expanded then and the
+provider is given by the classes in the provider markers (--provider-class) instead of a key.
+"""
 import argparse
 import re
 import subprocess
 import sys
 
+from cfme.utils.testinventory import load_inventory
+
 
 def check_virtualenv():
     """Check if we are in virtualenv and if not, raise an error."""
@@ -55,6 +62,41 @@ def get_testcases_from_pytest_output(output):
     return test_cases
 
 
+class MarkerNames(dict):
+    """Marker names of a test, for evaluating -m expressions; missing names are False"""
+
+    def __init__(self, test):
+        super(MarkerNames, self).__init__()
+        self.test = test
+
+    def __missing__(self, name):
+        return self.test.has_marker(name)
+
+
+def get_testcases_from_inventory(args, use_tier_marker=False):
+    """List the node ids of the indexed tests using the provider marker, see get_pytest_..."""
+    print('Reading the test inventory for provider classes {} {} tier marker {}.'
+        .format(
+            args.provider_class or 'any',
+            'with' if use_tier_marker else 'without',
+            args.tier_marker))
+    expression = compile(args.tier_marker, '<tier marker>', 'eval')
+    test_cases = []
+    for test in load_inventory(args.test_path).tests(args.test_path):
+        providers = test.get_markers('provider')
+        if not providers:
+            continue
+        if args.provider_class:
+            classes = [cls for marker in providers for arg in marker['args'][:1]
+                       for cls in (arg if isinstance(arg, list) else [arg])]
+            if not set(args.provider_class) & set(map(str, classes)):
+                continue
+        if use_tier_marker and not eval(expression, {'__builtins__': {}}, MarkerNames(test)):
+            continue
+        test_cases.append(test.nodeid)
+    return test_cases
+
+
 def get_diff_from_lists(all, tiers):
     """Get sorted list of test cases that are not marked with tiers."""
     diff = set(all).difference(set(tiers))
@@ -90,14 +132,23 @@ if __name__ == '__main__':
     parser.add_argument('-p', '--provider', action='store', default='rhv_cfme_integration')
     parser.add_argument('-t', '--test-path', action='store', default='cfme/tests')
     parser.add_argument('-m', '--tier-marker', action='store', default='rhv1 or rhv2 or rhv3')
+    parser.add_argument('-s', '--static', action='store_true',
+                        help='Use the static test inventory instead of pytest --collect-only')
+    parser.add_argument('-c', '--provider-class', action='append', default=[],
+                        help='With --static, provider class named in the provider markers, e.g. '
+                             'RHEVMProvider or InfraProvider. Can be used multiple times')
     args = parser.parse_args()
 
-    check_virtualenv()
+    if args.static:
+        tiers_parsed = get_testcases_from_inventory(args, use_tier_marker=True)
+        all_parsed = get_testcases_from_inventory(args, use_tier_marker=False)
+    else:
+        check_virtualenv()
 
-    output_with_tiers = get_pytest_collect_only_output(args, use_tier_marker=True)
-    output_without_tiers = get_pytest_collect_only_output(args, use_tier_marker=False)
-    tiers_parsed = get_testcases_from_pytest_output(output_with_tiers)
-    all_parsed = get_testcases_from_pytest_output(output_without_tiers)
+        output_with_tiers = get_pytest_collect_only_output(args, use_tier_marker=True)
+        output_without_tiers = get_pytest_collect_only_output(args, use_tier_marker=False)
+        tiers_parsed = get_testcases_from_pytest_output(output_with_tiers)
+        all_parsed = get_testcases_from_pytest_output(output_without_tiers)
 
     tiers_count = len(tiers_parsed)
     all_count = len(all_parsed)
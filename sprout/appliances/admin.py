@@ -9,7 +9,7 @@ from django_object_actions import DjangoObjectActions
 # Register your models here.
 from appliances.models import (
     Provider, Template, Appliance, Group, AppliancePool, DelayedProvisionTask,
-    MismatchVersionMailer, UserApplianceQuota, User, BugQuery, GroupShepherd)
+    MismatchVersionMailer, UserApplianceQuota, User, BugQuery, GroupShepherd, PoolDemand)
 from appliances.tasks import service_ops
 from appliances.tasks import provisioning
 from sprout.log import create_logger
@@ -54,6 +54,12 @@ class GroupShepherdAdmin(Admin):
     pass
 
 
+@register_for(PoolDemand)
+class PoolDemandAdmin(Admin):
+    list_display = ["requested_on", "group", "version", "preconfigured", "count", "owner"]
+    list_filter = ["group", "preconfigured"]
+
+
 @register_for(Appliance)
 class ApplianceAdmin(Admin):
     objectactions = ["power_off", "power_on", "suspend", "kill"]
@@ -187,6 +193,14 @@ class ProviderAdmin(Admin):
         "appliance_load"
     ]
 
+    def changelist_view(self, request, extra_context=None):
+        # count the capacity of all the listed providers at once, the response is rendered lazily
+        with Provider.capacity_snapshot():
+            response = super(ProviderAdmin, self).changelist_view(request, extra_context)
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+
     def remaining_provisioning_slots(self, instance):
         return str(instance.remaining_provisioning_slots)
 
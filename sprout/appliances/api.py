@@ -6,10 +6,12 @@ from celery.result import AsyncResult
 from datetime import datetime
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
+from django.db.models import Q
 from django.http import HttpResponse
 from django.shortcuts import render
 from ipware.ip import get_ip
 
+from appliances import pool_events
 from appliances.models import (
     Appliance, AppliancePool, Provider, Group, Template, User, GroupShepherd)
 from appliances.tasks.provisioning import (appliance_rename, mark_appliance_ready,
@@ -93,9 +95,11 @@ class JSONApi(object):
 
     def method(self, f):
         self._methods[f.__name__] = JSONMethod(f)
+        return f
 
     def authenticated_method(self, f):
         self._methods[f.__name__] = JSONMethod(f, auth=True)
+        return f
 
     def doc(self, request):
         return render(request, 'appliances/apidoc.html', {})
@@ -242,12 +246,12 @@ def request_appliances(
         ram, cpu, provider_type, template_type).id
 
 
-@jsonapi.authenticated_method
-def request_check(user, request_id):
-    """Return status of the appliance pool"""
-    request = AppliancePool.objects.get(id=request_id)
+def _check_pool_owner(user, request):
     if user != request.owner and not user.is_staff:
         raise Exception("This pool belongs to a different user!")
+
+
+def _pool_status(request):
     return {
         "fulfilled": request.fulfilled,
         "finished": request.finished,
@@ -262,6 +266,50 @@ def request_check(user, request_id):
     }
 
 
+def _get_pools(user, request_ids):
+    """``{pool_id: pool}`` of the pools, all of them must exist and be accessible to the user"""
+    requests = AppliancePool.objects.select_related('owner').in_bulk(
+        [int(request_id) for request_id in request_ids])
+    missing = set(int(request_id) for request_id in request_ids) - set(requests)
+    if missing:
+        raise ObjectDoesNotExist("Pools {} do not exist".format(sorted(missing)))
+    for request in requests.values():
+        _check_pool_owner(user, request)
+    return requests
+
+
+@jsonapi.authenticated_method
+def request_check(user, request_id):
+    """Return status of the appliance pool"""
+    request = AppliancePool.objects.get(id=request_id)
+    _check_pool_owner(user, request)
+    return _pool_status(request)
+
+
+@jsonapi.authenticated_method
+def request_check_many(user, request_ids):
+    """Return statuses of several appliance pools, keyed by the pool id"""
+    return {
+        str(pool_id): _pool_status(request)
+        for pool_id, request in _get_pools(user, request_ids).items()}
+
+
+@jsonapi.authenticated_method
+def wait_for_pools(user, request_ids, versions=None, timeout=pool_events.MAX_WAIT):
+    """Wait until one of the appliance pools changes, then return their statuses.
+
+    Pass the ``versions`` returned by the previous call, the call returns right away when the
+    pools have changed since, otherwise after the change or after ``timeout`` seconds (at most
+    25). Returns ``{'versions': {...}, 'pools': {pool_id: status}}``.
+    """
+    if not request_ids:
+        raise ValueError("No pools to wait for")
+    # check the access before waiting
+    _get_pools(user, request_ids)
+    versions = pool_events.wait_for_pool_changes(request_ids, versions, timeout)
+    return {'versions': versions, 'pools': request_check_many(user, request_ids)}
+
+
 @jsonapi.authenticated_method
 def prolong_appliance_lease(user, id, minutes=60):
     """Prolongs the appliance's lease time by specified amount of minutes from current time."""
@@ -474,21 +522,15 @@ def get_pool_description(user, pool_id):
 @jsonapi.authenticated_method
 def find_pools_by_description(user, description, partial=False):
     """Searches pools to find a pool with matching descriptions. When partial, `in` is used"""
-    pools = []
-    for pool in AppliancePool.objects.all():
-        if not pool.description:
-            continue
-        if partial:
-            if description in pool.description:
-                pools.append(pool)
-        else:
-            if pool.description == description:
-                pools.append(pool)
-
-    def _filter(pool):
-        return (pool.owner is None and user.is_staff) or (pool.owner == user)
-
-    return [pool.id for pool in list(filter(_filter, pools))]
+    if partial:
+        pools = AppliancePool.objects.filter(description__contains=description)
+    else:
+        pools = AppliancePool.objects.filter(description=description)
+    if user.is_staff:
+        pools = pools.filter(Q(owner=user) | Q(owner=None))
+    else:
+        pools = pools.filter(owner=user)
+    return list(pools.exclude(description='').values_list('id', flat=True))
 
 
 @jsonapi.authenticated_method
@@ -0,0 +1,172 @@
+"""Demand model of the shepherds: how many appliances will be requested soon
+
+The appliance pool requests are recorded (:py:class:`appliances.models.PoolDemand`). The demand
+for the next ``horizon`` is forecast from the same time of the day of the previous days, the
+recent days weighing more, and the shepherds keep that many appliances spinned, see
+:py:meth:`appliances.models.GroupShepherd.target_pool_size`.
+
+Nothing here touches the database, :py:func:`simulate` replays recorded requests against a
+shepherd policy, to compare the policies before enabling them (see ``simulate_shepherd.py``).
+"""
+import math
+from bisect import bisect_left
+from datetime import timedelta
+
+#: How far ahead the demand is forecast, about the time it takes to spin an appliance
+HORIZON = timedelta(hours=1)
+#: How many days of history the forecast looks at
+HISTORY_DAYS = 28
+#: Days after which the weight of a day of history halves
+HALF_LIFE_DAYS = 7
+
+
+class DemandHistory(object):
+    """Appliance requests over time, ``[(requested_on, count)]``, for counting them in windows
+
+    ``start`` is when the requests were recorded from, the days after it without requests had none.
+    It's the first request if not given.
+    """
+    def __init__(self, requests=(), start=None):
+        self._start = start
+        requests = sorted(requests, key=lambda request: request[0])
+        self.times = [requested_on for requested_on, _ in requests]
+        self.totals = [0]
+        for _, count in requests:
+            self.totals.append(self.totals[-1] + count)
+
+    def __len__(self):
+        return len(self.times)
+
+    def add(self, requested_on, count):
+        """Appends a request, must not be older than the last one"""
+        if self.times and requested_on < self.times[-1]:
+            raise ValueError('Requests must be added in order')
+        self.times.append(requested_on)
+        self.totals.append(self.totals[-1] + count)
+
+    @property
+    def start(self):
+        if self._start is not None:
+            return self._start
+        return self.times[0] if self.times else None
+
+    def count(self, start, end):
+        """Appliances requested in ``[start, end)``"""
+        return (self.totals[bisect_left(self.times, end)] -
+                self.totals[bisect_left(self.times, start)])
+
+
+def _is_weekend(time):
+    return time.weekday() >= 5
+
+
+def forecast(history, now, horizon=HORIZON, days=HISTORY_DAYS, half_life=HALF_LIFE_DAYS):
+    """Expected number of appliances requested in ``[now, now + horizon)``
+
+    Averages the requests in the same window of the previous ``days`` days, only the working days
+    for a working day and the weekends for a weekend, with weights halving every ``half_life``
+    days. The days since the history starts count even if they had no requests, the days before
+    it are not counted.
+    """
+    if history.start is None:
+        return 0.0
+    weighted = total_weight = 0.0
+    for day in range(1, days + 1):
+        start = now - timedelta(days=day)
+        if start < history.start:
+            break
+        if _is_weekend(start) != _is_weekend(now):
+            continue
+        weight = 0.5 ** ((day - 1) / float(half_life))
+        weighted += weight * history.count(start, start + horizon)
+        total_weight += weight
+    return weighted / total_weight if total_weight else 0.0
+
+
+def target_size(static_size, max_size, expected, limit=None):
+    """How many appliances a shepherd should keep for the ``expected`` demand
+
+    Never less than ``static_size`` nor more than ``max_size``. Above ``static_size`` it's also
+    limited by ``limit``, how many appliances the providers can hold for the shepherd, if known.
+    """
+    target = max(static_size, min(max_size, int(math.ceil(expected))))
+    if limit is not None:
+        target = min(target, max(static_size, limit))
+    return target
+
+
+def static_policy(size):
+    """Shepherd policy keeping ``size`` appliances"""
+    return lambda history, now: size
+
+
+def predictive_policy(static_size, max_size, **forecast_kwargs):
+    """Shepherd policy following the :py:func:`forecast`"""
+    return lambda history, now: target_size(
+        static_size, max_size, forecast(history, now, **forecast_kwargs))
+
+
+def simulate(requests, policy, provision_time=timedelta(minutes=20),
+             cold_time=timedelta(minutes=25), tick=timedelta(minutes=1), history=()):
+    """Replays appliance requests against a shepherd policy
+
+    Every ``tick`` the shepherd starts one appliance if it has less than the policy wants, like
+    the shepherd task, and kills the ready surplus. An appliance takes ``provision_time`` to be
+    ready. Requests take the ready appliances, the missing ones are cloned for the pool and take
+    ``cold_time``.
+
+    Args:
+        requests: ``[(requested_on, count)]`` to replay, sorted
+        policy: ``policy(history, now)`` returning the shepherd size, see :py:func:`static_policy`
+            and :py:func:`predictive_policy`
+        history: requests that happened before, known to the policy from the start
+
+    Returns:
+        a dict of the metrics, with the wait times in minutes
+    """
+    requests = list(requests)
+    if not requests:
+        return {'requests': 0}
+    known = DemandHistory(history)
+    now = requests[0][0]
+    # the shepherd is filled when the replay starts
+    ready = policy(known, now)
+    spinning = []  # ready times of the appliances being spinned
+    waits = []
+    warm = started = killed = 0
+    idle_hours = 0.0
+    index = 0
+    while index < len(requests):
+        spinning.sort()
+        while spinning and spinning[0] <= now:
+            spinning.pop(0)
+            ready += 1
+        while index < len(requests) and requests[index][0] <= now:
+            requested_on, count = requests[index]
+            taken = min(ready, count)
+            ready -= taken
+            warm += taken
+            waits.append(0.0 if taken == count else cold_time.total_seconds() / 60)
+            known.add(requested_on, count)
+            index += 1
+        target = policy(known, now)
+        if ready + len(spinning) < target:
+            spinning.append(now + provision_time)
+            started += 1
+        elif ready > target:
+            killed += ready - target
+            ready = target
+        idle_hours += ready * tick.total_seconds() / 3600
+        now += tick
+    total = sum(count for _, count in requests)
+    waits.sort()
+    return {
+        'requests': len(waits),
+        'appliances': total,
+        'mean_wait': sum(waits) / len(waits),
+        'p90_wait': waits[min(len(waits) - 1, int(len(waits) * 0.9))],
+        'warm_ratio': float(warm) / total if total else 1.0,
+        'started': started,
+        'killed': killed,
+        'idle_appliance_hours': round(idle_hours, 1),
+    }
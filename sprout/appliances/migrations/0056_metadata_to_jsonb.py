@@ -0,0 +1,68 @@
+import django.contrib.postgres.fields.jsonb
+import django.contrib.postgres.indexes
+import yaml
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+METADATA_MODELS = [
+    'appliance', 'appliancepool', 'delayedprovisiontask', 'group', 'groupshepherd', 'provider',
+    'template']
+
+
+def yaml_to_json(apps, schema_editor):
+    for model_name in METADATA_MODELS:
+        model = apps.get_model('appliances', model_name)
+        for pk, metadata in model.objects.values_list('pk', 'object_meta_data').iterator():
+            model.objects.filter(pk=pk).update(
+                object_meta_json=yaml.safe_load(metadata) or {})
+
+
+def json_to_yaml(apps, schema_editor):
+    for model_name in METADATA_MODELS:
+        model = apps.get_model('appliances', model_name)
+        for pk, metadata in model.objects.values_list('pk', 'object_meta_json').iterator():
+            model.objects.filter(pk=pk).update(object_meta_data=yaml.safe_dump(metadata or {}))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appliances', '0055_migration_to_django225'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name=model_name,
+            name='object_meta_json',
+            field=django.contrib.postgres.fields.jsonb.JSONField(default=dict),
+        )
+        for model_name in METADATA_MODELS
+    ] + [
+        migrations.RunPython(yaml_to_json, json_to_yaml),
+    ] + [
+        migrations.RemoveField(
+            model_name=model_name,
+            name='object_meta_data',
+        )
+        for model_name in METADATA_MODELS
+    ] + [
+        migrations.RenameField(
+            model_name=model_name,
+            old_name='object_meta_json',
+            new_name='object_meta_data',
+        )
+        for model_name in METADATA_MODELS
+    ] + [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='appliancepool',
+            index=models.Index(fields=['description'], name='appliances_pool_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='appliancepool',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['description'], name='appliances_pool_desc_trgm',
+                opclasses=['gin_trgm_ops']),
+        ),
+    ]
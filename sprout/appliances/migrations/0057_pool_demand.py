@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('appliances', '0056_metadata_to_jsonb'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='groupshepherd',
+            name='max_template_pool_size',
+            field=models.IntegerField(
+                blank=True, null=True,
+                help_text='If set, keep up to this many appliances when the demand is forecast '
+                'to be higher than the pool size.'),
+        ),
+        migrations.AddField(
+            model_name='groupshepherd',
+            name='max_unconfigured_template_pool_size',
+            field=models.IntegerField(
+                blank=True, null=True,
+                help_text='If set, keep up to this many unconfigured appliances when the demand '
+                'is forecast to be higher than the pool size.'),
+        ),
+        migrations.CreateModel(
+            name='PoolDemand',
+            fields=[
+                ('id', models.AutoField(
+                    auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=32, null=True)),
+                ('preconfigured', models.BooleanField(default=True)),
+                ('count', models.IntegerField()),
+                ('requested_on', models.DateTimeField(default=django.utils.timezone.now)),
+                ('group', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE, to='appliances.Group')),
+                ('owner', models.ForeignKey(
+                    null=True, on_delete=django.db.models.deletion.SET_NULL,
+                    to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['requested_on', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pooldemand',
+            index=models.Index(
+                fields=['group', 'requested_on'], name='appliances_demand_group_idx'),
+        ),
+    ]
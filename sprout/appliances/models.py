@@ -1,6 +1,6 @@
 import base64
 import re
-import yaml
+import threading
 import pickle   # NOQA
 
 import wrapanapi
@@ -14,17 +14,21 @@ from datetime import timedelta, date
 from django.contrib.auth.models import User, Group as DjangoGroup
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models, transaction
-from django.db.models import Q
-from django.db.models.signals import pre_save
+from django.db.models import Count, F, Func, Q, Value
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
 
 from cached_property import threaded_cached_property
 
 from sprout import critical_section, redis
 from sprout.log import create_logger
 
+from appliances import demand
+from appliances.pool_events import notify_pool_changed
+
 from cfme.utils.appliance import Appliance as CFMEAppliance, IPAppliance
 from cfme.utils.bz import Bugzilla
 from cfme.utils.conf import cfme_data
@@ -57,10 +61,24 @@ def apply_if_not_none(o, meth, *args, **kwargs):
     return getattr(o, meth)(*args, **kwargs)
 
 
+class JSONBConcat(Func):
+    """``a || b`` of jsonb values, the keys of ``b`` replace those of ``a``"""
+    arg_joiner = ' || '
+    template = '(%(expressions)s)'
+    output_field = JSONField()
+
+
+class JSONBDeleteKey(Func):
+    """``a - 'key'`` of a jsonb value"""
+    arg_joiner = ' - '
+    template = '(%(expressions)s)'
+    output_field = JSONField()
+
+
 class MetadataMixin(models.Model):
     class Meta:
         abstract = True
-    object_meta_data = models.TextField(default=yaml.safe_dump({}))
+    object_meta_data = JSONField(default=dict)
     created_on = models.DateTimeField(default=timezone.now, editable=False)
     modified_on = models.DateTimeField(default=timezone.now)
 
@@ -87,25 +105,51 @@ class MetadataMixin(models.Model):
 
     @property
     def metadata(self):
-        return yaml.safe_load(self.object_meta_data)
+        return self.object_meta_data or {}
 
     @metadata.setter
     def metadata(self, value):
         if not isinstance(value, dict):
             raise TypeError("You can store only dict in metadata!")
-        self.object_meta_data = yaml.safe_dump(value)
+        self.object_meta_data = value
 
     @property
     @contextmanager
     def edit_metadata(self):
+        """Read-modify-write of the metadata with the row locked
+
+        Prefer :py:meth:`update_metadata` and :py:meth:`delete_metadata` when the new values don't
+        depend on the old ones.
+        """
         with transaction.atomic():
-            with self.metadata_lock:
-                o = type(self).objects.get(pk=self.pk)
-                metadata = o.metadata
-                yield metadata
-                o.metadata = metadata
-                o.save()
-        self.reload()
+            o = type(self).objects.select_for_update().get(pk=self.pk)
+            metadata = o.metadata
+            yield metadata
+            o.metadata = metadata
+            o.save(update_fields=['object_meta_data', 'modified_on'])
+        self.refresh_from_db(fields=['object_meta_data', 'modified_on'])
+
+    def update_metadata(self, **values):
+        """Sets the keys of the metadata in one ``UPDATE``, leaving the other keys alone"""
+        modified_on = timezone.now()
+        type(self).objects.filter(pk=self.pk).update(
+            object_meta_data=JSONBConcat(
+                F('object_meta_data'), Value(values, output_field=JSONField())),
+            modified_on=modified_on)
+        self.object_meta_data = dict(self.metadata, **values)
+        self.modified_on = modified_on
+
+    def delete_metadata(self, *keys):
+        """Removes the keys from the metadata in one ``UPDATE``, missing keys are ignored"""
+        expression = F('object_meta_data')
+        for key in keys:
+            expression = JSONBDeleteKey(expression, Value(key))
+        modified_on = timezone.now()
+        type(self).objects.filter(pk=self.pk).update(
+            object_meta_data=expression, modified_on=modified_on)
+        self.object_meta_data = {
+            key: value for key, value in self.metadata.items() if key not in keys}
+        self.modified_on = modified_on
 
     @property
     def logger(self):
@@ -128,6 +172,64 @@ class DelayedProvisionTask(MetadataMixin):
             self.provider_to_avoid.id if self.provider_to_avoid is not None else "---")
 
 
+def _appliances_count(**filters):
+    """Count of the appliances of a provider, as an annotation of Provider"""
+    return Count(
+        'provider_templates__appliance',
+        filter=Q(**{'provider_templates__appliance__{}'.format(key): value
+                    for key, value in filters.items()}),
+        distinct=True)
+
+
+#: ``counter: aggregate`` of the appliances and templates of a provider that
+#: :py:class:`CapacitySnapshot` counts for all providers at once. Each counter is also a property of
+#: :py:class:`Provider`, counted with a query of its own when there is no snapshot.
+CAPACITY_COUNTERS = {
+    'num_currently_provisioning': _appliances_count(
+        ready=False, marked_for_deletion=False, ip_address=None),
+    'num_templates_preparing': Count(
+        'provider_templates', filter=Q(provider_templates__ready=False), distinct=True),
+    'num_currently_managing': Count('provider_templates__appliance', distinct=True),
+    'num_free_shepherd_appliances': _appliances_count(
+        appliance_pool=None, marked_for_deletion=False, ready=True),
+}
+
+_capacity_local = threading.local()
+
+
+class CapacitySnapshot(object):
+    """The :py:data:`CAPACITY_COUNTERS` of all providers, counted in one ``GROUP BY`` query
+
+    Scheduling looks at the capacity of every provider several times per decision, so a task tick
+    or a page view takes one snapshot and the :py:class:`Provider` capacity properties read it
+    while it's active, see :py:meth:`Provider.capacity_snapshot`. Whoever adds appliances while
+    the snapshot is active should tell it with :py:meth:`appliance_added` or :py:meth:`refresh`.
+    """
+    def __init__(self):
+        self.counters = {}
+        self.refresh()
+
+    def refresh(self):
+        self.counters = {
+            row.pop('id'): row
+            for row in Provider.objects.order_by().annotate(**CAPACITY_COUNTERS).values(
+                'id', *CAPACITY_COUNTERS)}
+
+    def get(self, provider_id, counter):
+        """The count, None if the provider isn't in the snapshot"""
+        try:
+            return self.counters[provider_id][counter]
+        except KeyError:
+            return None
+
+    def appliance_added(self, provider_id):
+        """Accounts a new appliance that is going to be provisioned on the provider"""
+        counters = self.counters.get(provider_id)
+        if counters is not None:
+            counters['num_currently_provisioning'] += 1
+            counters['num_currently_managing'] += 1
+
+
 class Provider(MetadataMixin):
     id = models.CharField(max_length=32, primary_key=True, help_text="Provider's key in YAML.")
     working = models.BooleanField(default=False, help_text="Whether provider is available.")
@@ -196,15 +298,42 @@ class Provider(MetadataMixin):
         else:
             return get_mgmt(self.id)
 
+    @classmethod
+    @contextmanager
+    def capacity_snapshot(cls):
+        """Makes the capacity properties of all providers read one :py:class:`CapacitySnapshot`
+
+        Nested uses share the outer snapshot.
+        """
+        snapshot = getattr(_capacity_local, 'snapshot', None)
+        if snapshot is not None:
+            yield snapshot
+            return
+        _capacity_local.snapshot = CapacitySnapshot()
+        try:
+            yield _capacity_local.snapshot
+        finally:
+            _capacity_local.snapshot = None
+
+    def _capacity(self, counter, queryset):
+        snapshot = getattr(_capacity_local, 'snapshot', None)
+        if snapshot is not None:
+            count = snapshot.get(self.id, counter)
+            if count is not None:
+                return count
+        return queryset.count()
+
     @property
     def num_currently_provisioning(self):
-        return len(
+        return self._capacity(
+            'num_currently_provisioning',
             Appliance.objects.filter(
                 ready=False, marked_for_deletion=False, template__provider=self, ip_address=None))
 
     @property
     def num_templates_preparing(self):
-        return len(Template.objects.filter(provider=self, ready=False))
+        return self._capacity(
+            'num_templates_preparing', Template.objects.filter(provider=self, ready=False))
 
     @property
     def remaining_configuring_slots(self):
@@ -224,7 +353,8 @@ class Provider(MetadataMixin):
 
     @property
     def num_currently_managing(self):
-        return len(Appliance.objects.filter(template__provider=self))
+        return self._capacity(
+            'num_currently_managing', Appliance.objects.filter(template__provider=self))
 
     @property
     def currently_managed_appliances(self):
@@ -308,8 +438,7 @@ class Provider(MetadataMixin):
 
     @templates.setter
     def templates(self, value):
-        with self.edit_metadata as metadata:
-            metadata["templates"] = value
+        self.update_metadata(templates=value)
 
     @property
     def template_name_length(self):
@@ -317,8 +446,7 @@ class Provider(MetadataMixin):
 
     @template_name_length.setter
     def template_name_length(self, value):
-        with self.edit_metadata as metadata:
-            metadata["template_name_length"] = value
+        self.update_metadata(template_name_length=value)
 
     @property
     def appliances_manage_this_provider(self):
@@ -326,8 +454,7 @@ class Provider(MetadataMixin):
 
     @appliances_manage_this_provider.setter
     def appliances_manage_this_provider(self, value):
-        with self.edit_metadata as metadata:
-            metadata["appliances_manage_this_provider"] = value
+        self.update_metadata(appliances_manage_this_provider=value)
 
     @property
     def g_appliances_manage_this_provider(self):
@@ -357,6 +484,10 @@ class Provider(MetadataMixin):
         return Appliance.objects.filter(
             template__provider=self, appliance_pool=None, marked_for_deletion=False, ready=True)
 
+    @property
+    def num_free_shepherd_appliances(self):
+        return self._capacity('num_free_shepherd_appliances', self.free_shepherd_appliances)
+
     @classmethod
     def complete_user_usage(cls, user_perspective=None):
         result = {}
@@ -497,10 +628,47 @@ class GroupShepherd(MetadataMixin):
         help_text="How many appliances to keep spinned for quick taking.")
     unconfigured_template_pool_size = models.IntegerField(default=0,
         help_text="How many appliances to keep spinned for quick taking - unconfigured ones.")
+    max_template_pool_size = models.IntegerField(null=True, blank=True,
+        help_text="If set, keep up to this many appliances when the demand is forecast to be "
+        "higher than the pool size.")
+    max_unconfigured_template_pool_size = models.IntegerField(null=True, blank=True,
+        help_text="If set, keep up to this many unconfigured appliances when the demand is "
+        "forecast to be higher than the pool size.")
 
     class Meta:
         ordering = ['template_group', 'user_group', 'id']
 
+    def demand_history(self, preconfigured, days=demand.HISTORY_DAYS):
+        """:py:class:`appliances.demand.DemandHistory` of the pools requested by the user group"""
+        since = timezone.now() - timedelta(days=days)
+        return demand.DemandHistory(
+            PoolDemand.objects.filter(
+                group=self.template_group, owner__groups=self.user_group,
+                preconfigured=preconfigured, requested_on__gte=since)
+            .values_list('requested_on', 'count'),
+            start=since)
+
+    def forecast_demand(self, preconfigured, horizon=demand.HORIZON):
+        """Appliances expected to be requested in the next ``horizon``"""
+        return demand.forecast(
+            self.demand_history(preconfigured), timezone.now(), horizon=horizon)
+
+    def target_pool_size(self, preconfigured, limit=None):
+        """How many appliances to keep spinned now
+
+        The pool size, or the forecast demand up to the max pool size, if that is set, and up to
+        ``limit``, how many appliances the providers can hold for the shepherd.
+        """
+        if preconfigured:
+            static_size, max_size = self.template_pool_size, self.max_template_pool_size
+        else:
+            static_size = self.unconfigured_template_pool_size
+            max_size = self.max_unconfigured_template_pool_size
+        if not max_size or max_size <= static_size:
+            return static_size
+        return demand.target_size(
+            static_size, max_size, self.forecast_demand(preconfigured), limit)
+
     @property
     def appliances(self):
         return Appliance.objects.filter(
@@ -519,8 +687,7 @@ class GroupShepherd(MetadataMixin):
             self.appliances.filter(
                 template__preconfigured=preconfigured, appliance_pool=None,
                 marked_for_deletion=False))
-        wanted_pool_size = (
-            self.template_pool_size if preconfigured else self.unconfigured_template_pool_size)
+        wanted_pool_size = self.target_pool_size(preconfigured)
         if wanted_pool_size == 0:
             return 100
         return int(round((float(appliances_in_shepherd) / float(wanted_pool_size)) * 100.0))
@@ -683,14 +850,11 @@ class Template(MetadataMixin):
 
     @temporary_name.setter
     def temporary_name(self, name):
-        with self.edit_metadata as metadata:
-            metadata["temporary_name"] = name
+        self.update_metadata(temporary_name=name)
 
     @temporary_name.deleter
     def temporary_name(self):
-        with self.edit_metadata as metadata:
-            if "temporary_name" in metadata:
-                del metadata["temporary_name"]
+        self.delete_metadata("temporary_name")
 
     @classmethod
     def get_versions(cls, *filters, **kwfilters):
@@ -896,11 +1060,9 @@ class Appliance(MetadataMixin):
                 pass
 
         if params:
-            with transaction.atomic():
-                appliance = type(self).objects.get(pk=self.pk)
-                appliance.cpu = params['cpu']
-                appliance.ram = params['ram']
-                appliance.save(update_fields=['cpu', ['ram']])
+            type(self).objects.filter(pk=self.pk).update(cpu=params['cpu'], ram=params['ram'])
+            self.cpu = params['cpu']
+            self.ram = params['ram']
 
     @property
     def serialized(self):
@@ -1196,8 +1358,7 @@ class Appliance(MetadataMixin):
 
     @managed_providers.setter
     def managed_providers(self, value):
-        with self.edit_metadata as metadata:
-            metadata["managed_providers"] = value
+        self.update_metadata(managed_providers=value)
 
     @property
     def vnc_link(self):
@@ -1236,6 +1397,13 @@ class AppliancePool(MetadataMixin):
 
     class Meta:
         ordering = ['id']
+        indexes = [
+            # find_pools_by_description, exact and partial
+            models.Index(fields=['description'], name='appliances_pool_desc_idx'),
+            GinIndex(
+                fields=['description'], name='appliances_pool_desc_trgm',
+                opclasses=['gin_trgm_ops']),
+        ]
 
     def merge(self, source_pool):
         if not self.finished:
@@ -1367,6 +1535,9 @@ class AppliancePool(MetadataMixin):
         cls.class_logger(req.pk).info("Created")
         if num_appliances > 0:
             # Only if we have any appliances to request
+            PoolDemand.objects.create(
+                group=group, owner=owner, version=version, preconfigured=preconfigured,
+                count=num_appliances)
             request_appliance_pool.delay(req.id, time_leased)
         return req
 
@@ -1596,6 +1767,39 @@ class AppliancePool(MetadataMixin):
             self.id, self.group.id, self.total_count)
 
 
+@receiver(post_save, sender=AppliancePool)
+@receiver(post_delete, sender=AppliancePool)
+def pool_changed(sender, instance, **kwargs):
+    notify_pool_changed(instance.id)
+
+
+@receiver(post_save, sender=Appliance)
+@receiver(post_delete, sender=Appliance)
+def pool_appliance_changed(sender, instance, **kwargs):
+    if instance.appliance_pool_id is not None:
+        notify_pool_changed(instance.appliance_pool_id)
+
+
+class PoolDemand(models.Model):
+    """An appliance pool request, kept after the pool is gone, for the shepherd demand model"""
+    group = models.ForeignKey(Group, on_delete=models.CASCADE)
+    owner = models.ForeignKey(User, null=True, on_delete=models.SET_NULL)
+    version = models.CharField(max_length=32, null=True)
+    preconfigured = models.BooleanField(default=True)
+    count = models.IntegerField()
+    requested_on = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['requested_on', 'id']
+        indexes = [
+            models.Index(fields=['group', 'requested_on'], name='appliances_demand_group_idx'),
+        ]
+
+    def __unicode__(self):
+        return "{} {}x {}/{} @ {}".format(
+            type(self).__name__, self.count, self.group_id, self.version, self.requested_on)
+
+
 class MismatchVersionMailer(models.Model):
     provider = models.ForeignKey(Provider, on_delete=models.CASCADE)
     template_name = models.CharField(max_length=64)
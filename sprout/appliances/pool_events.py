@@ -0,0 +1,74 @@
+"""Notifications of appliance pool changes, for the clients waiting on their pools
+
+Every save of a pool or of one of its appliances bumps the version of the pool in redis and
+publishes it. :py:func:`wait_for_pool_changes` blocks until a pool's version differs from the one
+the client has seen, so the clients don't have to poll the pool state.
+"""
+import time
+
+from django.db import transaction
+
+from sprout import redis_client
+
+#: The longest a client can wait in one request, below the gunicorn worker timeout
+MAX_WAIT = 25
+
+
+def _version_key(pool_id):
+    return 'pool-version-{}'.format(pool_id)
+
+
+def _channel(pool_id):
+    return 'pool-changed-{}'.format(pool_id)
+
+
+def _notify(pool_id):
+    version = redis_client.incr(_version_key(pool_id))
+    redis_client.publish(_channel(pool_id), version)
+
+
+def notify_pool_changed(pool_id):
+    """Bumps the version of the pool once the current transaction, if any, commits"""
+    transaction.on_commit(lambda: _notify(pool_id))
+
+
+def pool_versions(pool_ids):
+    """``{pool_id: version}``, as strings, the pools that never changed have version ``'0'``"""
+    if not pool_ids:
+        return {}
+    versions = redis_client.mget([_version_key(pool_id) for pool_id in pool_ids])
+    return {
+        str(pool_id): (version.decode() if version is not None else '0')
+        for pool_id, version in zip(pool_ids, versions)}
+
+
+def wait_for_pool_changes(pool_ids, seen_versions=None, timeout=MAX_WAIT):
+    """Waits until one of the pools has a version different from ``seen_versions``
+
+    Returns right away if the client hasn't seen some of the pools yet.
+
+    Args:
+        pool_ids: ids of the pools to wait for
+        seen_versions: ``{pool_id: version}`` that the client got last time
+        timeout: seconds to wait at most, capped to :py:data:`MAX_WAIT`
+
+    Returns:
+        the current :py:func:`pool_versions`
+    """
+    seen_versions = {str(key): str(value) for key, value in (seen_versions or {}).items()}
+    deadline = time.time() + min(max(timeout, 0), MAX_WAIT)
+    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+    # subscribe before reading the versions so that no change can slip in between
+    pubsub.subscribe(*[_channel(pool_id) for pool_id in pool_ids])
+    try:
+        while True:
+            versions = pool_versions(pool_ids)
+            if any(seen_versions.get(pool_id) != version
+                   for pool_id, version in versions.items()):
+                return versions
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return versions
+            pubsub.get_message(timeout=remaining)
+    finally:
+        pubsub.close()
@@ -0,0 +1,153 @@
+"""Reconciliation of the appliances of a provider with the VMs the provider actually has
+
+The VM attributes are fetched from the provider concurrently, then the appliances are matched with
+the VMs in memory and only the changed rows are written, in one transaction::
+
+    vms, failed = fetch_vms(provider)
+    metrics = reconcile_appliances(provider, vms, failed)
+"""
+import time
+from collections import namedtuple
+from multiprocessing.pool import ThreadPool
+
+from django.db import transaction
+from django.utils import timezone
+
+from appliances.models import Appliance
+from appliances.pool_events import notify_pool_changed
+from sprout.log import create_logger
+
+#: Threads fetching the VM attributes from one provider
+FETCH_WORKERS = 8
+#: Status set on the reconciled appliances
+REFRESHED_STATUS = 'Appliance Refreshed'
+#: Appliance fields the reconciliation may change
+RECONCILED_FIELDS = (
+    'name', 'uuid', 'power_state', 'power_state_changed', 'swap', 'ssh_failed', 'status',
+    'status_changed')
+
+VmInfo = namedtuple('VmInfo', ['name', 'uuid', 'state'])
+
+logger = create_logger(__name__)
+
+
+def _vm_info(provider, vm):
+    """:py:class:`VmInfo` of the VM, None if the VM isn't an appliance"""
+    if provider.provider_type == 'openshift':
+        # the openshift VMs are project names, there are also service projects to skip
+        if not provider.api.is_appliance(vm):
+            return None
+        return VmInfo(
+            name=vm, uuid=provider.api.get_appliance_uuid(vm), state=provider.api.vm_status(vm))
+    return VmInfo(name=vm.name, uuid=vm.uuid, state=vm.state)
+
+
+def fetch_vms(provider, workers=FETCH_WORKERS):
+    """Lists the VMs of the provider and fetches their attributes concurrently
+
+    Returns:
+        ``(vms, failed)``, the :py:class:`VmInfo` of the appliance VMs and the names of the VMs
+        whose attributes could not be fetched
+    """
+    api = provider.api
+    vm_list = api.list_vms()
+
+    def fetch(vm):
+        try:
+            return _vm_info(provider, vm), None
+        except Exception as e:
+            try:
+                name = vm if isinstance(vm, str) else vm.name
+            except Exception:
+                name = repr(vm)
+            logger.error("Couldn't refresh vm %s because of %s", name, e)
+            return None, name
+
+    if not vm_list:
+        return [], []
+    pool = ThreadPool(min(workers, len(vm_list)))
+    try:
+        results = pool.map(fetch, vm_list)
+    finally:
+        pool.close()
+        pool.join()
+    vms = [vm for vm, _ in results if vm is not None]
+    failed = [name for _, name in results if name is not None]
+    return vms, failed
+
+
+def _reconcile(appliance, uuid_vms, name_vms, failed, now):
+    """Updates the appliance in memory from its VM, returns whether it's orphaned"""
+    orphaned = False
+    if appliance.uuid is not None and appliance.uuid in uuid_vms:
+        vm = uuid_vms[appliance.uuid]
+        # Using the UUID and change the name if it changed
+        appliance.name = vm.name
+        appliance.set_power_state(Appliance.POWER_STATES_MAPPING.get(
+            vm.state, Appliance.Power.UNKNOWN))
+    elif appliance.name in name_vms:
+        vm = name_vms[appliance.name]
+        # Using the name, and then retrieve uuid
+        if appliance.uuid != vm.uuid:
+            appliance.uuid = vm.uuid
+            logger.info("Retrieved UUID for appliance %s/%s: %s",
+                        appliance.id, appliance.name, appliance.uuid)
+        appliance.set_power_state(Appliance.POWER_STATES_MAPPING.get(
+            vm.state, Appliance.Power.UNKNOWN))
+    elif appliance.name in failed:
+        # the VM is there but we don't know its state, keep the last known one
+        return False
+    else:
+        # Orphaned :(
+        appliance.set_power_state(Appliance.Power.ORPHANED)
+        orphaned = True
+    if appliance.status != REFRESHED_STATUS:
+        appliance.status = REFRESHED_STATUS
+        appliance.status_changed = now
+    return orphaned
+
+
+def reconcile_appliances(provider, vms, failed=()):
+    """Matches the appliances of the provider with the VMs by UUID or name and writes the changes
+
+    The appliances are locked while they are compared and only the changed ones are written, with
+    one ``bulk_update``. ``bulk_update`` doesn't send the save signals, the pools of the changed
+    appliances are notified explicitly.
+
+    Returns:
+        the metrics of the reconciliation, a dict
+    """
+    uuid_vms = {vm.uuid: vm for vm in vms if vm.uuid}
+    name_vms = {vm.name: vm for vm in vms}
+    failed = set(failed)
+    now = timezone.now()
+    start = time.time()
+    changed = []
+    changed_fields = set()
+    orphaned = 0
+    with transaction.atomic():
+        appliances = list(
+            Appliance.objects.select_for_update(of=('self',)).filter(template__provider=provider))
+        for appliance in appliances:
+            before = [getattr(appliance, field) for field in RECONCILED_FIELDS]
+            orphaned += _reconcile(appliance, uuid_vms, name_vms, failed, now)
+            fields = {field for field, value in zip(RECONCILED_FIELDS, before)
+                      if getattr(appliance, field) != value}
+            if fields:
+                appliance.modified_on = now
+                changed.append(appliance)
+                changed_fields |= fields
+        if changed:
+            Appliance.objects.bulk_update(
+                changed, sorted(changed_fields) + ['modified_on'], batch_size=500)
+            for pool_id in {appliance.appliance_pool_id for appliance in changed
+                            if appliance.appliance_pool_id is not None}:
+                notify_pool_changed(pool_id)
+    return {
+        'vms': len(vms),
+        'failed_vms': len(failed),
+        'appliances': len(appliances),
+        'changed': len(changed),
+        'orphaned': orphaned,
+        'write_seconds': round(time.time() - start, 3),
+    }
@@ -1,6 +1,6 @@
 import re
 import socket
-from collections import namedtuple
+import time
 from datetime import timedelta
 
 import command
@@ -14,6 +14,7 @@ from paramiko import SSHException
 from wrapanapi import Openshift
 
 from . import parsedate, singleton_task, provider_error_logger
+from appliances import reconciliation
 from appliances.models import (Provider, Group, Template, Appliance, AppliancePool,
                                MismatchVersionMailer, User)
 from cfme.utils.path import project_path
@@ -487,8 +488,7 @@ def check_templates_in_provider(self, provider_id):
         self.logger.info("Provider %s will be marked as working", provider_id)
         provider.working = True
         provider.save(update_fields=['working'])
-        with provider.edit_metadata as metadata:
-            metadata["templates"] = templates
+        provider.templates = templates
     if not provider.working:
         return
     # Check Sprout template existence
@@ -518,52 +518,17 @@ def refresh_appliances_provider(self, provider_id):
     if not hasattr(provider.api, "list_vms"):
         # Ignore this provider
         return
-    vms = provider.api.list_vms()
-    dict_vms = {}
-    uuid_vms = {}
-    FakeVm = namedtuple('FakeVm', ['ip', 'name', 'uuid', 'state'])
-
-    for vm in vms:
-        try:
-            if provider.provider_type == 'openshift':
-                if not provider.api.is_appliance(vm):
-                    # there are some service projects in openshift which we need to skip here
-                    continue
-
-                vm_data = dict(ip=provider.api.get_appliance_url(vm),
-                               name=vm,
-                               uuid=provider.api.get_appliance_uuid(vm),
-                               state=provider.api.vm_status(vm))
-                vm = FakeVm(**vm_data)
-
-            dict_vms[vm.name] = vm
-            if vm.uuid:
-                uuid_vms[vm.uuid] = vm
-        except Exception as e:
-            self.logger.error("Couldn't refresh vm {} because of {}".format(vm.name, e.message))
-            continue
-
-    for appliance in Appliance.objects.filter(template__provider=provider):
-        if appliance.uuid is not None and appliance.uuid in uuid_vms:
-            vm = uuid_vms[appliance.uuid]
-            # Using the UUID and change the name if it changed
-            appliance.name = vm.name
-            appliance.set_power_state(Appliance.POWER_STATES_MAPPING.get(
-                vm.state, Appliance.Power.UNKNOWN))
-        elif appliance.name in dict_vms:
-            vm = dict_vms[appliance.name]
-            # Using the name, and then retrieve uuid
-            appliance.uuid = vm.uuid
-            appliance.set_power_state(Appliance.POWER_STATES_MAPPING.get(
-                vm.state, Appliance.Power.UNKNOWN))
-            self.logger.info("Retrieved UUID for appliance {}/{}: {}".format(
-                appliance.id, appliance.name, appliance.uuid))
-        else:
-            # Orphaned :(
-            appliance.set_power_state(Appliance.Power.ORPHANED)
-        with transaction.atomic():
-            appliance.save()
-        appliance.set_status('Appliance Refreshed')
+    start = time.time()
+    vms, failed = reconciliation.fetch_vms(provider)
+    fetch_seconds = time.time() - start
+    metrics = reconciliation.reconcile_appliances(provider, vms, failed)
+    metrics['fetch_seconds'] = round(fetch_seconds, 3)
+    metrics['finished_on'] = timezone.now().isoformat()
+    provider.update_metadata(refresh_metrics=metrics)
+    self.logger.info(
+        "Refreshed appliances in %s: %s", provider_id,
+        ", ".join("{}={}".format(key, value) for key, value in sorted(metrics.items())))
+    return metrics
 
 
 @singleton_task()
@@ -487,46 +487,52 @@ def process_delayed_provision_tasks(self):
     Goes one task by one and when some of them can be provisioned, it starts the provisioning and
     then deletes the task.
     """
-    for task in DelayedProvisionTask.objects.order_by("id"):
-        if task.pool.not_needed_anymore:
-            task.delete()
-            continue
-        # Try retrieve from shepherd
-        appliances_given = Appliance.give_to_pool(task.pool, 1)
-        if appliances_given == 0:
-            # No free appliance in shepherd, so do it on our own
-            tpls = task.pool.possible_provisioning_templates
-            if task.provider_to_avoid is not None:
-                filtered_tpls = [tpl for tpl in tpls if tpl.provider != task.provider_to_avoid]
-                if filtered_tpls:
-                    # There are other providers to provision on, so try one of them
-                    tpls = filtered_tpls
-                # If there is no other provider to provision on, we will use the original list.
-                # This will cause additional rejects until the provider quota is met
-            if tpls:
-                clone_template_to_pool(tpls[0].id, task.pool.id, task.lease_time)
+    with Provider.capacity_snapshot() as capacity:
+        for task in DelayedProvisionTask.objects.order_by("id"):
+            if task.pool.not_needed_anymore:
                 task.delete()
+                continue
+            # Try retrieve from shepherd
+            appliances_given = Appliance.give_to_pool(task.pool, 1)
+            if appliances_given == 0:
+                # No free appliance in shepherd, so do it on our own
+                tpls = task.pool.possible_provisioning_templates
+                if task.provider_to_avoid is not None:
+                    filtered_tpls = [tpl for tpl in tpls if tpl.provider != task.provider_to_avoid]
+                    if filtered_tpls:
+                        # There are other providers to provision on, so try one of them
+                        tpls = filtered_tpls
+                    # If there is no other provider to provision on, we will use the original
+                    # list. This will cause additional rejects until the provider quota is met
+                if tpls:
+                    clone_template_to_pool(tpls[0].id, task.pool.id, task.lease_time)
+                    capacity.appliance_added(tpls[0].provider_id)
+                    task.delete()
+                else:
+                    # Try freeing up some space in provider
+                    for provider in task.pool.possible_providers:
+                        if not provider.num_free_shepherd_appliances:
+                            continue
+                        appl = provider.free_shepherd_appliances.exclude(
+                            **task.pool.appliance_filter_params).order_by('?').first()
+                        if appl is not None:
+                            self.logger.info(
+                                'Freeing some space in provider by '
+                                'killing appliance {}/{}'.format(appl.id, appl.name))
+                            Appliance.kill(appl)
+                            break  # Just one
             else:
-                # Try freeing up some space in provider
-                for provider in task.pool.possible_providers:
-                    appliances = provider.free_shepherd_appliances.exclude(
-                        **task.pool.appliance_filter_params)
-                    if appliances:
-                        appl = random.choice(appliances)
-                        self.logger.info(
-                            'Freeing some space in provider by '
-                            'killing appliance {}/{}'.format(appl.id, appl.name))
-                        Appliance.kill(appl)
-                        break  # Just one
-        else:
-            # There was a free appliance in shepherd, so we took it and we don't need this task more
-            task.delete()
+                # There was a free appliance in shepherd, so we took it and we don't need this task
+                # more
+                task.delete()
 
 
 @singleton_task()
 def free_appliance_shepherd(self):
-    generic_shepherd(self, True)
-    generic_shepherd(self, False)
+    # both passes account their new appliances in the same capacity snapshot
+    with Provider.capacity_snapshot() as capacity:
+        generic_shepherd(self, True, capacity)
+        generic_shepherd(self, False, capacity)
 
 
 @singleton_task()
@@ -663,11 +669,14 @@ def process_docker_images_from_url_group(self, group_id, version, docker_version
             create_docker_vm.delay(group.id, provider.id, version, date, pull_url)
 
 
-def generic_shepherd(self, preconfigured):
+def generic_shepherd(self, preconfigured, capacity):
     """This task takes care of having the required templates spinned into required number of
     appliances. For each template group, it keeps the last template's appliances spinned up in
     required quantity. If new template comes out of the door, it automatically kills the older
-    running template's appliances and spins up new ones. Sorts the groups by the fulfillment."""
+    running template's appliances and spins up new ones. Sorts the groups by the fulfillment.
+
+    The new appliances are accounted in the ``capacity``
+    :py:class:`appliances.models.CapacitySnapshot`."""
     for gs in sorted(
             GroupShepherd.objects.all(), key=lambda g: g.get_fulfillment_percentage(preconfigured)):
         prov_filter = {'provider__user_groups': gs.user_group}
@@ -721,7 +730,15 @@ def generic_shepherd(self, preconfigured):
         # If we then want to delete some templates, better kill the eldest. status_changed
         # says which one was provisioned when, because nothing else then touches that field.
         appliances.sort(key=lambda appliance: appliance.status_changed)
-        pool_size = gs.template_pool_size if preconfigured else gs.unconfigured_template_pool_size
+        # the forecast demand may only use what the providers can still take
+        providers = {
+            t.provider for t in possible_templates_for_provision if not t.provider.disabled}
+        if any(provider.appliance_limit is None for provider in providers):
+            limit = None
+        else:
+            limit = len(appliances) + sum(
+                provider.remaining_appliance_slots for provider in providers)
+        pool_size = gs.target_pool_size(preconfigured, limit)
         if len(appliances) < pool_size and possible_templates_for_provision:
             # There must be some templates in order to run the provisioning
             # Provision ONE appliance at time for each group, that way it is possible to maintain
@@ -739,6 +756,7 @@ def generic_shepherd(self, preconfigured):
                         name=new_appliance_name
                     )
                     appliance.save()
+                    capacity.appliance_added(chosen_template.provider_id)
                     self.logger.info("Adding an appliance to shepherd: %s/%s",
                                      appliance.id, appliance.name)
                     clone_template_to_appliance.delay(appliance.id, None)
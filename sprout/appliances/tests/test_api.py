@@ -0,0 +1,51 @@
+import json
+from unittest import mock
+
+from django.test import RequestFactory
+from django.test import TestCase
+
+from appliances.api import jsonapi
+from appliances.api import wait_for_pools
+from appliances.models import AppliancePool
+from appliances.models import Group
+from appliances.models import User
+
+
+class WaitForPoolsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('tester', password='secret')
+        self.pool = AppliancePool.objects.create(
+            total_count=0, group=Group.objects.create(id='downstream-510z'), owner=self.user)
+        patcher = mock.patch(
+            'appliances.pool_events.wait_for_pool_changes', return_value={str(self.pool.id): '3'})
+        self.wait_for_pool_changes = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def call(self, method, *args, **kwargs):
+        request = RequestFactory().post(
+            '/json_api/', content_type='application/json', data=json.dumps({
+                'method': method, 'args': args, 'kwargs': kwargs,
+                'auth': ['tester', 'secret']}))
+        return json.loads(jsonapi(request).content.decode('utf-8'))
+
+    def test_wait_for_pools(self):
+        response = self.call('wait_for_pools', [self.pool.id], versions={str(self.pool.id): '2'})
+        self.assertEqual(response['status'], 'success', response['result'])
+        self.assertEqual(response['result']['versions'], {str(self.pool.id): '3'})
+        status = response['result']['pools'][str(self.pool.id)]
+        self.assertEqual(status['appliances'], [])
+        self.assertEqual(status['progress'], 100)
+        self.wait_for_pool_changes.assert_called_once_with(
+            [self.pool.id], {str(self.pool.id): '2'}, 25)
+
+    def test_wait_for_pools_of_other_user(self):
+        other = User.objects.create_user('other', password='secret')
+        with self.assertRaises(Exception):
+            wait_for_pools(other, [self.pool.id])
+        self.wait_for_pool_changes.assert_not_called()
+
+    def test_wait_for_missing_pools(self):
+        response = self.call('wait_for_pools', [self.pool.id, self.pool.id + 1])
+        self.assertEqual(response['status'], 'exception')
+        self.assertEqual(response['result']['class'], 'ObjectDoesNotExist')
+        self.wait_for_pool_changes.assert_not_called()
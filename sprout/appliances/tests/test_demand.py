@@ -0,0 +1,90 @@
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+
+from appliances import demand
+from appliances.demand import DemandHistory
+
+# a Monday
+MONDAY = datetime(2019, 1, 14, 9, 0)
+
+
+def requests_on(days, count, at=timedelta(minutes=10)):
+    return [(MONDAY + timedelta(days=day) + at, count) for day in days]
+
+
+def test_forecast_weekdays_and_weekends():
+    # every day of the three weeks before, more requests on the weekends
+    days = range(-21, 0)
+    history = DemandHistory(
+        requests_on([day for day in days if (MONDAY + timedelta(days=day)).weekday() < 5], 4) +
+        requests_on([day for day in days if (MONDAY + timedelta(days=day)).weekday() >= 5], 100))
+    assert demand.forecast(history, MONDAY) == pytest.approx(4.0)
+    assert demand.forecast(history, MONDAY - timedelta(days=2)) == pytest.approx(100.0)
+    # nothing requested in the following hour
+    assert demand.forecast(history, MONDAY + timedelta(hours=1)) == 0.0
+
+
+def test_forecast_half_life():
+    history = DemandHistory(requests_on([0], 6) + requests_on([1], 3),
+                            start=MONDAY - timedelta(days=1))
+    # on Wednesday, Tuesday weighs twice as much as Monday
+    assert demand.forecast(history, MONDAY + timedelta(days=2), days=2,
+                           half_life=1) == pytest.approx((3 + 6 * 0.5) / 1.5)
+
+
+def test_forecast_history_start():
+    history = DemandHistory(requests_on([0], 6))
+    assert history.start == MONDAY + timedelta(minutes=10)
+    # the days before the first request are not known
+    assert demand.forecast(history, MONDAY + timedelta(days=1)) == 0.0
+
+    # recorded since Thursday, Friday had no requests
+    history = DemandHistory(requests_on([0], 6), start=MONDAY - timedelta(days=4, hours=9))
+    assert history.start == datetime(2019, 1, 10)
+    assert demand.forecast(history, MONDAY + timedelta(days=1),
+                           half_life=float('inf')) == pytest.approx(6 / 3.0)
+    assert demand.forecast(DemandHistory(), MONDAY) == 0.0
+
+
+def test_history_count():
+    history = DemandHistory([(MONDAY + timedelta(minutes=30), 2), (MONDAY, 1)])
+    history.add(MONDAY + timedelta(hours=1), 4)
+    assert len(history) == 3
+    assert history.count(MONDAY, MONDAY + timedelta(hours=1)) == 3
+    assert history.count(MONDAY, MONDAY + timedelta(hours=2)) == 7
+    with pytest.raises(ValueError):
+        history.add(MONDAY, 1)
+
+
+@pytest.mark.parametrize('expected, limit, size', [
+    (0.2, None, 2),
+    (4.1, None, 5),
+    (25, None, 10),
+    (8, 5, 5),
+    (3, 6, 3),
+    # the static size is kept even if the providers are full
+    (8, 1, 2),
+])
+def test_target_size(expected, limit, size):
+    assert demand.target_size(2, 10, expected, limit=limit) == size
+
+
+def test_simulate_policies():
+    # 5 appliances every working day at 9:30 for three weeks
+    history = requests_on(
+        [day for day in range(-21, 0) if (MONDAY + timedelta(days=day)).weekday() < 5], 5,
+        at=timedelta(minutes=30))
+    replay = requests_on([0, 1], 5, at=timedelta(minutes=30))
+    static = demand.simulate(replay, demand.static_policy(1), history=history)
+    predictive = demand.simulate(replay, demand.predictive_policy(1, 10), history=history)
+
+    assert static['requests'] == predictive['requests'] == 2
+    assert static['warm_ratio'] == pytest.approx(0.2)
+    assert static['mean_wait'] == 25.0
+    # the shepherd is filled before the requests
+    assert predictive['warm_ratio'] == 1.0
+    assert predictive['mean_wait'] == 0.0
+    assert predictive['started'] > static['started']
+    assert demand.simulate([], demand.static_policy(1)) == {'requests': 0}
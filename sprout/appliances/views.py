@@ -73,6 +73,8 @@ def index(request):
     return render(request, 'index.html', locals())
 
 
+# the capacity of all the shown providers is counted at once
+@Provider.capacity_snapshot()
 def providers(request, provider_id=None):
     if request.user.is_staff or request.user.is_superuser:
         user_filter = {}
@@ -274,6 +276,7 @@ def date_for_group_and_version(request):
 
 
 @only_authenticated
+@Provider.capacity_snapshot()
 def providers_for_date_group_and_version(request):
     total_provisioning_slots = 0
     total_appliance_slots = 0
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Compare the static and the predictive shepherd policies on recorded pool requests
+
+The requests are read from the Sprout database (``--group``, optionally ``--user-group``), or from
+a CSV file with ``requested_on`` (ISO 8601) and ``count`` columns. The first ``--warmup-days`` are
+only history for the forecast, the rest is replayed with appliances/demand.py ``simulate``.
+
+e.g. ./simulate_shepherd.py --group downstream-511z --static 2 --max 8
+e.g. ./simulate_shepherd.py --csv requests.csv --static 2 --max 8 --provision-minutes 15
+"""
+import argparse
+import csv
+import os
+import sys
+from datetime import timedelta
+
+from dateutil import parser as date_parser
+
+from appliances import demand
+
+
+def requests_from_csv(path, preconfigured):
+    with open(path) as f:
+        return sorted(
+            (date_parser.parse(row['requested_on']), int(row['count']))
+            for row in csv.DictReader(f)
+            if row.get('preconfigured', 'true').lower() == str(preconfigured).lower())
+
+
+def requests_from_db(group, user_group, preconfigured):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sprout.settings")
+    import django
+    django.setup()
+    from appliances.models import PoolDemand
+    demands = PoolDemand.objects.filter(group__id=group, preconfigured=preconfigured)
+    if user_group:
+        demands = demands.filter(owner__groups__name=user_group)
+    return list(demands.order_by('requested_on').values_list('requested_on', 'count'))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--group', help='Template group of the recorded requests to replay')
+    source.add_argument('--csv', help='CSV file with requested_on and count columns')
+    parser.add_argument('--user-group', help='Only the requests of this user group')
+    parser.add_argument('--unconfigured', action='store_true',
+                        help='Replay the requests of unconfigured appliances')
+    parser.add_argument('--static', type=int, default=0, help='Static pool size')
+    parser.add_argument('--max', type=int, required=True, help='Max pool size of the forecast')
+    parser.add_argument('--warmup-days', type=int, default=demand.HISTORY_DAYS,
+                        help='Days of history before the replay')
+    parser.add_argument('--horizon-minutes', type=int,
+                        default=int(demand.HORIZON.total_seconds() / 60),
+                        help='How far ahead the demand is forecast')
+    parser.add_argument('--provision-minutes', type=int, default=20,
+                        help='Time to spin an appliance in the shepherd')
+    parser.add_argument('--cold-minutes', type=int, default=25,
+                        help='Time to clone an appliance for a pool')
+    args = parser.parse_args()
+
+    preconfigured = not args.unconfigured
+    if args.csv:
+        requests = requests_from_csv(args.csv, preconfigured)
+    else:
+        requests = requests_from_db(args.group, args.user_group, preconfigured)
+    if not requests:
+        print('No requests to replay')
+        return 1
+    replay_start = requests[0][0] + timedelta(days=args.warmup_days)
+    history = [request for request in requests if request[0] < replay_start]
+    replay = [request for request in requests if request[0] >= replay_start]
+    if not replay:
+        print('All the {} requests are in the warmup period'.format(len(requests)))
+        return 1
+
+    policies = [
+        ('static {}'.format(args.static), demand.static_policy(args.static)),
+        ('predictive {}-{}'.format(args.static, args.max), demand.predictive_policy(
+            args.static, args.max, horizon=timedelta(minutes=args.horizon_minutes))),
+    ]
+    print('Replaying {} requests from {} after {} of history'.format(
+        len(replay), replay_start, len(history)))
+    print('{:20s} {:>9s} {:>9s} {:>6s} {:>8s} {:>7s} {:>10s}'.format(
+        'policy', 'mean wait', 'p90 wait', 'warm', 'started', 'killed', 'idle hours'))
+    for name, policy in policies:
+        result = demand.simulate(
+            replay, policy, history=history,
+            provision_time=timedelta(minutes=args.provision_minutes),
+            cold_time=timedelta(minutes=args.cold_minutes))
+        print('{:20s} {:8.1f}m {:8.1f}m {:5.0f}% {:8d} {:7d} {:10.1f}'.format(
+            name, result['mean_wait'], result['p90_wait'], result['warm_ratio'] * 100,
+            result['started'], result['killed'], result['idle_appliance_hours']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -43,6 +43,7 @@ from widgetastic.widget import Text
 from widgetastic.widget import TextInput
 from widgetastic.widget import View
 from widgetastic.widget import Widget
+from widgetastic.xpath import normalize_space
 from widgetastic.xpath import quote
 from widgetastic_patternfly import Accordion as PFAccordion
 from widgetastic_patternfly import AggregateStatusCard
@@ -520,6 +521,174 @@ class TableColumn(VanillaTableColumn):
             self.browser.click(self.checkbox)
 
 
+#: Serializes a table in one WebDriver round trip. Called with the table element, the rows xpath
+#: and the headers xpath, returns the header texts and, for every row, the text, class,
+#: rowspan/colspan and direct ``i``/``img`` children of each cell.
+TABLE_DUMP_JS = jsmin(
+    """
+    function snapshot(xpath, node) {
+        var result = document.evaluate(
+            xpath, node, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var i = 0; i < result.snapshotLength; i++) {
+            nodes.push(result.snapshotItem(i));
+        }
+        return nodes;
+    }
+    function text(element) {
+        return element.innerText || element.textContent || "";
+    }
+    var table = arguments[0];
+    return {
+        headers: snapshot(arguments[2], table).map(text),
+        rows: snapshot(arguments[1], table).map(function(row) {
+            return snapshot("./td", row).map(function(cell) {
+                return {
+                    text: text(cell),
+                    cls: cell.getAttribute("class"),
+                    rowspan: cell.getAttribute("rowspan"),
+                    colspan: cell.getAttribute("colspan"),
+                    imgs: snapshot("./i|./img", cell).map(function(img) {
+                        return {
+                            cls: img.getAttribute("class"),
+                            alt: img.getAttribute("alt"),
+                            title: img.getAttribute("title"),
+                            src: img.src || img.getAttribute("src")
+                        };
+                    })
+                };
+            });
+        })
+    };
+"""
+)
+
+
+class TableDumpMismatch(Exception):
+    """Raised when a table dump can't reproduce what reading the table element by element does"""
+
+    pass
+
+
+def dump_table(table):
+    """Reads the whole DOM of ``table`` with :py:data:`TABLE_DUMP_JS`.
+
+    Texts are normalized the same way :py:meth:`widgetastic.browser.Browser.text` does.
+
+    Returns:
+        A dict with ``headers`` (a tuple, ``None`` for empty headers) and ``rows`` (a list of lists
+        of cell dicts), or ``None`` if bulk reading is disabled on the table or the script failed.
+    """
+    if not table.BULK_READ:
+        return None
+    try:
+        dump = table.browser.execute_script(
+            TABLE_DUMP_JS, table, table.ROWS, table.HEADERS, silent=True
+        )
+    except WebDriverException as e:
+        table.logger.debug("bulk read failed, reading element by element: %s", e)
+        return None
+    return {
+        "headers": tuple(normalize_space(header) or None for header in dump["headers"]),
+        "rows": [
+            [dict(cell, text=normalize_space(cell["text"])) for cell in row]
+            for row in dump["rows"]
+        ],
+    }
+
+
+def _span(cell, name):
+    try:
+        return max(int(cell[name]), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def expand_table_rows(rows):
+    """Lays dumped rows out on a grid, like the table tree does for rowspan/colspan tables.
+
+    A cell spanning several rows or columns is repeated in every position it covers, positions not
+    covered by any cell are ``None``.
+    """
+    grid = []
+    spanned = {}
+    for row in rows:
+        cells = list(row)
+        logical = []
+        while cells or any(column >= len(logical) for column in spanned):
+            column = len(logical)
+            if column in spanned:
+                cell, remaining = spanned.pop(column)
+                if remaining > 1:
+                    spanned[column] = (cell, remaining - 1)
+                logical.append(cell)
+            elif cells:
+                cell = cells.pop(0)
+                rowspan = _span(cell, "rowspan")
+                for _ in range(_span(cell, "colspan")):
+                    if rowspan > 1:
+                        spanned[len(logical)] = (cell, rowspan - 1)
+                    logical.append(cell)
+            else:
+                logical.append(None)
+        grid.append(logical)
+    return grid
+
+
+def read_table_dump(dump):
+    """Per row ``{header or position: text}`` of a plain (no rowspan/colspan) table dump."""
+    result = []
+    for row in dump["rows"]:
+        if len(row) < len(dump["headers"]):
+            raise TableDumpMismatch("Row has less cells than the table has headers")
+        if any(cell["rowspan"] is not None or cell["colspan"] is not None for cell in row):
+            raise TableDumpMismatch("Table has rowspan/colspan cells")
+        result.append(
+            {header or i: row[i]["text"] for i, header in enumerate(dump["headers"])}
+        )
+    return result
+
+
+def read_summary_table_dump(dump):
+    """Builds what :py:meth:`SummaryTable.read` returns from a table dump.
+
+    Rowspan fields (e.g. My Company Tags) read the texts of all the cells whose icon has the class
+    (or alt) of the first icon next to the field, as :py:meth:`SummaryTable.get_field` does.
+    """
+    grid = expand_table_rows(dump["rows"])
+    result = {}
+    for row in grid:
+        if not row or row[0] is None or not row[0]["cls"] or row[0]["text"] in result:
+            continue
+        name = row[0]["text"]
+        field_row = next(r for r in grid if r and r[0] is not None and r[0]["text"] == name)
+        field = field_row[0]
+        if field["rowspan"] is None:
+            if len(field_row) < 2 or field_row[1] is None:
+                raise TableDumpMismatch("Field {!r} has no value".format(name))
+            result[name] = field_row[1]["text"]
+            continue
+        for dumped_row in dump["rows"]:
+            positions = [i for i, cell in enumerate(dumped_row) if cell is field]
+            if positions:
+                siblings = dumped_row[positions[0] + 1:]
+                break
+        images = [image for cell in siblings for image in cell["imgs"]]
+        key = (images[0]["cls"] or images[0]["alt"]) if images else None
+        if not key:
+            raise TableDumpMismatch("Field {!r} has no icon to group by".format(name))
+        result[name] = [
+            cell["text"]
+            for dumped_row in dump["rows"]
+            for cell in dumped_row
+            if any(
+                key in (image["cls"] if image["cls"] is not None else image["alt"] or "")
+                for image in cell["imgs"]
+            )
+        ]
+    return result
+
+
 class TableRow(VanillaTableRow):
     Column = TableColumn
 
@@ -551,6 +720,8 @@ class Table(VanillaTable):
     )
     SORT_LINK = VersionPick({Version.lowest(): "./thead/tr/th[{}]/a", "5.9": "./thead/tr/th[{}]"})
     Row = TableRow
+    #: Read the table with a single :py:func:`dump_table` call instead of element by element
+    BULK_READ = True
 
     @property
     def checkbox_all(self):
@@ -637,6 +808,57 @@ class Table(VanillaTable):
             self.click_sort(column)
             self.logger.debug("sort_by(%r, %r): order already selected", column, order)
 
+    def _bulk_read_rows(self):
+        """Rows as read by :py:meth:`TableRow.read`, from a table dump.
+
+        Returns ``None`` when the table needs to be read element by element: column widgets,
+        customized row/column reading, rowspan/colspan cells or a failed dump.
+        """
+        if (
+            self.column_widgets
+            or self.Row.read is not VanillaTableRow.read
+            or self.Row.Column.read is not VanillaTableColumn.read
+        ):
+            return None
+        dump = dump_table(self)
+        if dump is None:
+            return None
+        try:
+            return read_table_dump(dump)
+        except TableDumpMismatch as e:
+            self.logger.debug("bulk read not possible, reading element by element: %s", e)
+            return None
+
+    def read(self):
+        rows = self._bulk_read_rows()
+        if rows is None:
+            return super(Table, self).read()
+        # Same as VanillaTable.read, on the already read rows
+        if self.rows_ignore_top is not None:
+            rows = rows[self.rows_ignore_top:]
+        if self.rows_ignore_bottom is not None and self.rows_ignore_bottom > 0:
+            rows = rows[: -self.rows_ignore_bottom]
+        if self.assoc_column_position is None:
+            return rows
+        result = {}
+        for row_read in rows:
+            for key in (
+                self.header_index_mapping.get(self.assoc_column_position),
+                self.assoc_column_position,
+                self.assoc_column,
+            ):
+                if key in row_read:
+                    key = row_read.pop(key)
+                    break
+            else:
+                raise ValueError(
+                    "The assoc_column={!r} could not be retrieved".format(self.assoc_column)
+                )
+            if key in result:
+                raise ValueError("Duplicate value for {}={!r}".format(key, result[key]))
+            result[key] = row_read
+        return result
+
 
 class SummaryTable(VanillaTable):
     """Table used in Provider, VM, Host, ... summaries.
@@ -650,6 +872,8 @@ class SummaryTable(VanillaTable):
 
     BASELOC = ".//table[./thead/tr/th[normalize-space(.)={}]]"
     Image = namedtuple("Image", ["alt", "title", "src"])
+    #: Read the table with a single :py:func:`dump_table` call instead of field by field
+    BULK_READ = True
 
     def __init__(self, parent, title, *args, **kwargs):
         VanillaTable.__init__(self, parent, self.BASELOC.format(quote(title)), *args, **kwargs)
@@ -739,6 +963,12 @@ class SummaryTable(VanillaTable):
         return self.get_field(field_name)[1].click()
 
     def read(self):
+        dump = dump_table(self)
+        if dump is not None:
+            try:
+                return read_summary_table_dump(dump)
+            except TableDumpMismatch as e:
+                self.logger.debug("bulk read not possible, reading field by field: %s", e)
         return {field: self.get_text_of(field) for field in self.fields}
 
 
@@ -762,6 +992,18 @@ class NestedSummaryTable(SummaryTable):
             yield self.Row(self, row_pos)
 
     def read(self):
+        dump = dump_table(self)
+        if dump is not None:
+            try:
+                rows = read_table_dump(dump)
+            except TableDumpMismatch as e:
+                self.logger.debug("bulk read not possible, reading row by row: %s", e)
+            else:
+                headers = dump["headers"]
+                return [
+                    {header: row[header or i] for i, header in enumerate(headers)}
+                    for row in rows
+                ]
         return [{key: col.text for key, col in row} for row in self]
 
 